@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Acao, Inscricao, Notificacao
+from .models import Acao, AcaoArquivada, Inscricao, Notificacao, SerieAcao, TokenApi
+from .tokens import revogar
 
 # Classe para mostrar Inscrições "inline" (dentro da página da Ação)
 class InscricaoInline(admin.TabularInline):
@@ -23,4 +24,43 @@ class InscricaoAdmin(admin.ModelAdmin):
 @admin.register(Notificacao)
 class NotificacaoAdmin(admin.ModelAdmin):
     list_display = ('destinatario', 'mensagem', 'lida', 'created_at')
-    list_filter = ('lida', 'created_at')
\ No newline at end of file
+    list_filter = ('lida', 'created_at')
+
+# Ações arquivadas (somente consulta)
+@admin.register(AcaoArquivada)
+class AcaoArquivadaAdmin(admin.ModelAdmin):
+    list_display = ('titulo', 'organizador', 'data', 'total_aceitos', 'arquivada_em')
+    list_filter = ('categoria',)
+    search_fields = ('titulo',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Séries recorrentes (as ocorrências aparecem em Ações)
+@admin.register(SerieAcao)
+class SerieAcaoAdmin(admin.ModelAdmin):
+    list_display = ('titulo', 'organizador', 'frequencia', 'inicio', 'fim', 'ativa', 'materializada_ate')
+    list_filter = ('frequencia', 'ativa', 'categoria')
+    search_fields = ('titulo',)
+
+# Tokens da API: só consulta e revogação (o token em si não é guardado)
+@admin.register(TokenApi)
+class TokenApiAdmin(admin.ModelAdmin):
+    list_display = ('usuario', 'nome', 'criado_em', 'expira_em', 'revogado_em')
+    list_filter = ('revogado_em',)
+    search_fields = ('usuario__username', 'nome')
+    actions = ['revogar_tokens']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description='Revogar tokens selecionados')
+    def revogar_tokens(self, request, queryset):
+        revogados = revogar(queryset.values_list('chave', flat=True))
+        self.message_user(request, f'{revogados} token(s) revogado(s).')
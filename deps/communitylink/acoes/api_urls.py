@@ -1,15 +1,20 @@
 from django.urls import path, include
 from rest_framework.routers import SimpleRouter
-from .viewset import AcaoViewSet, InscricaoViewSet, NotificacaoViewSet, PerfilViewSet
+from .viewset import (
+    AcaoViewSet, InscricaoViewSet, LoteView, NotificacaoViewSet, PainelViewSet, PerfilViewSet, TokenView,
+)
 
 router = SimpleRouter()
 router.register(r'acoes', AcaoViewSet)
 router.register(r'inscricoes', InscricaoViewSet)
 router.register(r'notificacoes', NotificacaoViewSet)
 router.register(r'perfis', PerfilViewSet)
+router.register(r'painel', PainelViewSet, basename='painel')
 
 #app_name = 'api'
 
 urlpatterns = [
+    path('batch/', LoteView.as_view(), name='batch'),
+    path('token/', TokenView.as_view(), name='token'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Arquivamento de ações passadas (camada fria).
+
+`arquivar_acoes()` move, em lotes e cada lote numa transação, as ações com
+data anterior ao corte para AcaoArquivada (e suas inscrições, com os
+comentários, para InscricaoArquivada), apagando-as das tabelas quentes.
+
+O histórico dos usuários vem de RegistroHistorico (acoes.historico), que
+não depende da camada onde a ação está: cada lote é materializado antes
+de sair das tabelas quentes.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .historico import materializar_acoes
+from .models import Acao, AcaoArquivada, Inscricao, InscricaoArquivada
+
+CAMPOS_ACAO = ('id', 'titulo', 'descricao', 'data', 'local', 'numero_vagas', 'categoria',
+               'organizador_id', 'notas_organizador', 'duracao_horas')
+CAMPOS_INSCRICAO = ('id', 'acao_id', 'voluntario_id', 'status', 'data_inscricao', 'comentario')
+
+
+def corte_arquivo(meses=None, agora=None):
+    """ Data antes da qual as ações vão para o arquivo (mês = 30 dias). """
+    meses = getattr(settings, 'ARQUIVO_MESES', 12) if meses is None else meses
+    return (agora or timezone.now()) - timedelta(days=30 * meses)
+
+
+def _arquivar_lote(ids):
+    # O histórico materializado sobrevive ao arquivamento; garante que o lote já está nele
+    materializar_acoes(Acao.objects.filter(pk__in=ids, historico_materializado=False).values_list('pk', flat=True))
+    acoes = list(Acao.objects.com_vagas_preenchidas().filter(pk__in=ids).values(*CAMPOS_ACAO, 'total_aceitos'))
+    inscricoes = list(Inscricao.objects.filter(acao_id__in=ids).values(*CAMPOS_INSCRICAO))
+    AcaoArquivada.objects.bulk_create([AcaoArquivada(**dados) for dados in acoes])
+    InscricaoArquivada.objects.bulk_create([InscricaoArquivada(**dados) for dados in inscricoes])
+    # O CASCADE apaga as inscrições quentes junto
+    Acao.objects.filter(pk__in=ids).delete()
+    return len(acoes), len(inscricoes)
+
+
+def arquivar_acoes(antes_de, tamanho_lote=500):
+    """ Arquiva as ações com data < antes_de. Retorna (ações, inscrições) movidas. """
+    total_acoes = total_inscricoes = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Acao.objects.filter(data__lt=antes_de).order_by('pk').values_list('pk', flat=True)[:tamanho_lote]
+            )
+            if not ids:
+                break
+            acoes, inscricoes = _arquivar_lote(ids)
+        total_acoes += acoes
+        total_inscricoes += inscricoes
+    return total_acoes, total_inscricoes
+
@@ -0,0 +1,103 @@
+"""
+Utilitários compartilhados pelos comandos de benchmark.
+
+Os resultados são gravados em JSON para que duas execuções (por exemplo,
+de commits diferentes) possam ser comparadas com `--comparar`.
+"""
+
+import json
+import math
+import platform
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+# Percentis reportados em todos os benchmarks
+PERCENTIS = (50, 90, 95, 99)
+
+
+def percentil(amostras_ordenadas, p):
+    """ Percentil com interpolação linear (amostras já ordenadas). """
+    if not amostras_ordenadas:
+        return 0.0
+    if len(amostras_ordenadas) == 1:
+        return float(amostras_ordenadas[0])
+    posicao = (len(amostras_ordenadas) - 1) * (p / 100)
+    inferior = math.floor(posicao)
+    superior = math.ceil(posicao)
+    if inferior == superior:
+        return float(amostras_ordenadas[inferior])
+    peso = posicao - inferior
+    return amostras_ordenadas[inferior] * (1 - peso) + amostras_ordenadas[superior] * peso
+
+
+def resumir(amostras_ms):
+    """ Resume uma lista de latências (em ms) em min/média/percentis/máx. """
+    ordenadas = sorted(amostras_ms)
+    resumo = {
+        'n': len(ordenadas),
+        'min_ms': round(ordenadas[0], 3) if ordenadas else 0.0,
+        'media_ms': round(sum(ordenadas) / len(ordenadas), 3) if ordenadas else 0.0,
+        'max_ms': round(ordenadas[-1], 3) if ordenadas else 0.0,
+    }
+    for p in PERCENTIS:
+        resumo[f'p{p}_ms'] = round(percentil(ordenadas, p), 3)
+    return resumo
+
+
+def _commit_atual():
+    """ Hash do commit atual (ou None fora de um repositório git). """
+    try:
+        saida = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return saida.stdout.strip() or None
+
+
+def metadados():
+    """ Informações do ambiente gravadas junto com os resultados. """
+    return {
+        'commit': _commit_atual(),
+        'executado_em': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'banco': connection.vendor,
+    }
+
+
+def salvar_resultados(caminho, nome, resultados):
+    """ Grava os resultados de um benchmark em JSON e retorna o documento. """
+    documento = {
+        'benchmark': nome,
+        'metadados': metadados(),
+        'resultados': resultados,
+    }
+    if caminho:
+        Path(caminho).write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding='utf-8')
+    return documento
+
+
+def carregar_resultados(caminho):
+    return json.loads(Path(caminho).read_text(encoding='utf-8'))
+
+
+def comparar(anterior, atual, metrica='p95_ms'):
+    """
+    Compara dois documentos de resultados pela chave de cada item.
+    Retorna uma lista de (chave, valor_anterior, valor_atual, variacao_percentual).
+    """
+    anteriores = {item['chave']: item for item in anterior.get('resultados', [])}
+    linhas = []
+    for item in atual.get('resultados', []):
+        antigo = anteriores.get(item['chave'])
+        if antigo is None or metrica not in antigo or metrica not in item:
+            continue
+        valor_antigo, valor_novo = antigo[metrica], item[metrica]
+        variacao = ((valor_novo - valor_antigo) / valor_antigo * 100) if valor_antigo else 0.0
+        linhas.append((item['chave'], valor_antigo, valor_novo, round(variacao, 1)))
+    return linhas
@@ -0,0 +1,135 @@
+"""
+Feeds iCalendar (RFC 5545) por usuário: participações aceitas e ações
+organizadas, acessados por um link secreto (FeedCalendario.token).
+
+O corpo é gerado em streaming (iterator() nas duas consultas) e guardado no
+cache com a versão do feed na chave. A versão sobe pelos signals em
+models.py quando muda algo que aparece no feed, então:
+- cliente com o ETag atual recebe 304 (só a consulta do token);
+- cliente sem ETag recebe o corpo do cache (também uma consulta);
+- o feed só é regenerado depois de uma mudança real.
+"""
+
+import datetime
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Acao, FeedCalendario, Inscricao
+
+CONTENT_TYPE = 'text/calendar; charset=utf-8'
+CAMPOS = ('pk', 'titulo', 'data', 'duracao_horas', 'local', 'descricao')
+
+
+def gerar_token():
+    return secrets.token_urlsafe(32)
+
+
+def invalidar_calendarios(usuario_id=None, acao=None):
+    """ Sobe a versão do feed do usuário e/ou de todos os envolvidos na `acao`. """
+    filtro = Q()
+    if usuario_id is not None:
+        filtro |= Q(usuario_id=usuario_id)
+    if acao is not None:
+        aceitos = Inscricao.objects.filter(acao_id=acao.pk, status='ACEITO').values('voluntario_id')
+        filtro |= Q(usuario_id=acao.organizador_id) | Q(usuario_id__in=aceitos)
+    FeedCalendario.objects.filter(filtro).update(versao=F('versao') + 1)
+
+
+def etag(feed):
+    return f'"{feed.usuario_id}-{feed.versao}"'
+
+
+def chave_cache(feed):
+    return f'calendario:{feed.usuario_id}:{feed.versao}'
+
+
+# --- Formatação iCalendar ---
+
+def _texto(valor):
+    valor = (valor or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+    return valor.replace('\r\n', '\\n').replace('\n', '\\n')
+
+
+def _data_utc(valor):
+    return valor.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _dobrar(linha):
+    """ Quebra linhas com mais de 75 octetos (continuação começa com espaço). """
+    codificada = linha.encode('utf-8')
+    if len(codificada) <= 75:
+        return linha + '\r\n'
+    partes, atual, tamanho = [], '', 0
+    for caractere in linha:
+        octetos = len(caractere.encode('utf-8'))
+        if tamanho + octetos > (75 if not partes else 74):
+            partes.append(atual)
+            atual, tamanho = '', 0
+        atual += caractere
+        tamanho += octetos
+    partes.append(atual)
+    return '\r\n '.join(partes) + '\r\n'
+
+
+def _evento(papel, pk, titulo, data, duracao, local, descricao, url_base, carimbo):
+    prefixo = 'Organização: ' if papel == 'organizacao' else ''
+    linhas = [
+        'BEGIN:VEVENT',
+        f'UID:acao-{pk}-{papel}@communitylink',
+        f'DTSTAMP:{carimbo}',
+        f'DTSTART:{_data_utc(data)}',
+        f'DTEND:{_data_utc(data + datetime.timedelta(hours=duracao))}',
+        f'SUMMARY:{_texto(prefixo + titulo)}',
+        f'LOCATION:{_texto(local)}',
+        f'DESCRIPTION:{_texto(descricao)}',
+        f"URL:{url_base}{reverse('acoes:acao_detail', kwargs={'pk': pk})}",
+        'STATUS:CONFIRMED',
+        'END:VEVENT',
+    ]
+    return ''.join(_dobrar(linha) for linha in linhas)
+
+
+def gerar_ics(usuario_id, url_base, tamanho_lote=500):
+    """ Gera o feed em pedaços (bytes). """
+    carimbo = _data_utc(timezone.now())
+    yield (
+        'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//CommunityLink//Acoes//PT-BR\r\n'
+        'CALSCALE:GREGORIAN\r\nX-WR-CALNAME:CommunityLink\r\n'
+    ).encode('utf-8')
+
+    participacoes = (
+        Inscricao.objects.filter(voluntario_id=usuario_id, status='ACEITO')
+        .order_by('acao__data')
+        .values_list(*(f'acao__{campo}' for campo in CAMPOS))
+    )
+    organizadas = Acao.objects.filter(organizador_id=usuario_id).order_by('data').values_list(*CAMPOS)
+    for papel, consulta in (('participacao', participacoes), ('organizacao', organizadas)):
+        bloco = []
+        for linha in consulta.iterator(chunk_size=tamanho_lote):
+            bloco.append(_evento(papel, *linha, url_base, carimbo))
+            if len(bloco) >= tamanho_lote:
+                yield ''.join(bloco).encode('utf-8')
+                bloco = []
+        if bloco:
+            yield ''.join(bloco).encode('utf-8')
+    yield b'END:VCALENDAR\r\n'
+
+
+def gerar_e_guardar(feed, url_base):
+    """ Repassa os pedaços de gerar_ics e guarda o corpo no cache ao final (se couber). """
+    limite = getattr(settings, 'CALENDARIO_CACHE_MAX_BYTES', 1024 * 1024)
+    partes, tamanho = [], 0
+    for parte in gerar_ics(feed.usuario_id, url_base):
+        yield parte
+        if partes is not None:
+            partes.append(parte)
+            tamanho += len(parte)
+            if tamanho > limite:
+                partes = None  # feed grande demais: só streaming
+    if partes is not None:
+        cache.set(chave_cache(feed), b''.join(partes), getattr(settings, 'CALENDARIO_CACHE_TTL', 24 * 3600))
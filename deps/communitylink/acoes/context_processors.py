@@ -12,8 +12,10 @@ def auth_groups_processor(request):
     # Precisamos checar se o usuário está logado
     # pois um AnonymousUser (usuário não logado) não tem .groups
     if request.user.is_authenticated:
-        is_organizador = request.user.groups.filter(name='Organizadores').exists()
-        is_voluntario = request.user.groups.filter(name='Voluntarios').exists()
+        # Uma única query para os dois grupos
+        grupos = set(request.user.groups.values_list('name', flat=True))
+        is_organizador = 'Organizadores' in grupos
+        is_voluntario = 'Voluntarios' in grupos
 
         # --- Conta as notificações não lidas ---
         unread_notification_count = Notificacao.objects.filter(
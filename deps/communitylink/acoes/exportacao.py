@@ -0,0 +1,173 @@
+"""
+Exportação das listas de inscritos (CSV e XLSX) em streaming.
+
+As linhas saem do banco com `iterator(chunk_size=...)` (cursor do servidor
+no PostgreSQL) e vão sendo escritas na resposta em blocos, então a memória
+fica constante mesmo com centenas de milhares de inscrições.
+
+O XLSX é montado aqui mesmo (sem openpyxl): um pacote zip com a planilha
+em XML e strings inline, escrito incrementalmente pelo zipfile num
+destino sem seek — o mesmo formato que o Excel e o LibreOffice abrem.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Inscricao, InscricaoArquivada
+
+TAMANHO_LOTE = 2000
+# Bytes acumulados antes de mandar um pedaço da resposta
+TAMANHO_BLOCO = 64 * 1024
+
+CABECALHO = ('Ação', 'Data da ação', 'Voluntário', 'Nome', 'E-mail', 'Status', 'Inscrito em')
+CAMPOS = ('acao__titulo', 'acao__data', 'voluntario__username', 'voluntario__first_name',
+          'voluntario__last_name', 'voluntario__email', 'status', 'data_inscricao')
+ORDEM = ('-acao__data', 'acao_id', 'data_inscricao')
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def _data(valor):
+    return timezone.localtime(valor).strftime('%d/%m/%Y %H:%M')
+
+
+def linhas_inscricoes(**filtro):
+    """ Linhas (já formatadas) das inscrições das duas camadas que casam com `filtro`. """
+    status = dict(Inscricao.STATUS_CHOICES)
+    consultas = (
+        modelo.objects.filter(**filtro).order_by(*ORDEM).values_list(*CAMPOS).iterator(chunk_size=TAMANHO_LOTE)
+        for modelo in (Inscricao, InscricaoArquivada)
+    )
+    for titulo, data, usuario, nome, sobrenome, email, situacao, inscrito_em in chain.from_iterable(consultas):
+        yield (
+            titulo, _data(data), usuario, f'{nome} {sobrenome}'.strip(), email,
+            status.get(situacao, situacao), _data(inscrito_em),
+        )
+
+
+# --- CSV ---
+
+def _celula_csv(valor):
+    # Evita que planilhas interpretem títulos/nomes digitados pelos usuários como fórmula
+    if isinstance(valor, str) and valor[:1] in ('=', '+', '-', '@'):
+        return "'" + valor
+    return valor
+
+
+def gerar_csv(linhas):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    # BOM: o Excel só reconhece UTF-8 (acentos) com ele
+    buffer.write('\ufeff')
+    escritor.writerow(CABECALHO)
+    for linha in linhas:
+        escritor.writerow([_celula_csv(valor) for valor in linha])
+        if buffer.tell() >= TAMANHO_BLOCO:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+# --- XLSX ---
+
+_CABECALHO_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_PLANILHA = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_RELACOES = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_TIPO_RELACAO = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+_PARTES_XLSX = {
+    '[Content_Types].xml': (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        f'<Relationships xmlns="{_NS_RELACOES}">'
+        f'<Relationship Id="rId1" Type="{_TIPO_RELACAO}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        f'<workbook xmlns="{_NS_PLANILHA}" xmlns:r="{_TIPO_RELACAO}">'
+        '<sheets><sheet name="Inscricoes" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        f'<Relationships xmlns="{_NS_RELACOES}">'
+        f'<Relationship Id="rId1" Type="{_TIPO_RELACAO}/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+# Caracteres de controle não são permitidos em XML 1.0
+_INVALIDOS_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class _DestinoZip:
+    """ Arquivo só de escrita (sem tell/seek) cujo conteúdo é drenado em pedaços. """
+
+    def __init__(self):
+        self.partes = []
+        self.tamanho = 0
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        self.tamanho += len(dados)
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = b''.join(self.partes)
+        self.partes.clear()
+        self.tamanho = 0
+        return dados
+
+
+def _linha_xml(valores):
+    celulas = ''.join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_INVALIDOS_XML.sub("", str(valor)))}</t></is></c>'
+        for valor in valores
+    )
+    return f'<row>{celulas}</row>'.encode('utf-8')
+
+
+def gerar_xlsx(linhas):
+    destino = _DestinoZip()
+    with zipfile.ZipFile(destino, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        for nome, conteudo in _PARTES_XLSX.items():
+            pacote.writestr(nome, _CABECALHO_XML + conteudo)
+        # force_zip64: o tamanho final da planilha não é conhecido de antemão
+        with pacote.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as planilha:
+            planilha.write(f'{_CABECALHO_XML}<worksheet xmlns="{_NS_PLANILHA}"><sheetData>'.encode('utf-8'))
+            planilha.write(_linha_xml(CABECALHO))
+            for linha in linhas:
+                planilha.write(_linha_xml(linha))
+                if destino.tamanho >= TAMANHO_BLOCO:
+                    yield destino.esvaziar()
+            planilha.write(b'</sheetData></worksheet>')
+    yield destino.esvaziar()
+
+
+def resposta_exportacao(linhas, formato, nome_arquivo):
+    """ StreamingHttpResponse com as `linhas` no formato pedido ('csv' ou 'xlsx'). """
+    gerador = gerar_xlsx(linhas) if formato == 'xlsx' else gerar_csv(linhas)
+    response = StreamingHttpResponse(gerador, content_type=FORMATOS[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}.{formato}"'
+    return response
@@ -3,7 +3,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from .models import Acao, Perfil
+from .models import Acao, Perfil, SerieAcao
 
 class AcaoForm(forms.ModelForm):
     # Configura o campo 'data' para usar um widget de data/hora bonitinho
@@ -15,7 +15,7 @@ class AcaoForm(forms.ModelForm):
     class Meta:
         model = Acao
         # Campos que o *usuário* deve preencher
-        fields = ['titulo', 'descricao', 'data', 'local', 'categoria', 'numero_vagas']
+        fields = ['titulo', 'descricao', 'data', 'local', 'categoria', 'numero_vagas', 'duracao_horas']
         # O 'organizador' será definido automaticamente na view
         # Os 'voluntarios' serão gerenciados pelas inscrições
 
@@ -25,6 +25,56 @@ class AcaoForm(forms.ModelForm):
             data = timezone.make_aware(data)
         return data
 
+    def clean_duracao_horas(self):
+        # Opcional no formulário: em branco usa o padrão do modelo
+        duracao = self.cleaned_data.get('duracao_horas')
+        if duracao is None:
+            return Acao._meta.get_field('duracao_horas').default
+        return duracao
+
+
+class SerieAcaoForm(forms.ModelForm):
+    dias_semana = forms.MultipleChoiceField(
+        choices=SerieAcao.DIA_SEMANA_CHOICES,
+        widget=forms.CheckboxSelectMultiple,
+        required=False,
+        label='Dias da semana',
+        help_text='Séries semanais. Em branco, usa o dia da semana da data de início.',
+    )
+
+    class Meta:
+        model = SerieAcao
+        fields = ['titulo', 'descricao', 'local', 'categoria', 'numero_vagas', 'duracao_horas',
+                  'frequencia', 'intervalo', 'dias_semana', 'hora', 'inicio', 'fim']
+        widgets = {
+            'hora': forms.TimeInput(attrs={'type': 'time'}, format='%H:%M'),
+            'inicio': forms.DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'),
+            'fim': forms.DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'),
+        }
+        labels = {'intervalo': 'Repetir a cada', 'inicio': 'Primeiro dia', 'fim': 'Último dia (opcional)'}
+
+    def clean_dias_semana(self):
+        return ','.join(self.cleaned_data['dias_semana'])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        inicio, fim = cleaned_data.get('inicio'), cleaned_data.get('fim')
+        if inicio and inicio < timezone.localdate():
+            self.add_error('inicio', 'A série não pode começar no passado.')
+        if inicio and fim and fim < inicio:
+            self.add_error('fim', 'O último dia deve ser depois do primeiro.')
+        return cleaned_data
+
+
+class ImportacaoAcoesForm(forms.Form):
+    arquivo = forms.FileField(
+        label='Arquivo (.csv ou .json)',
+        help_text='Colunas: titulo, descricao, data, local, categoria, numero_vagas, duracao_horas.',
+    )
+    somente_validar = forms.BooleanField(
+        required=False, label='Só validar (não criar as ações)',
+    )
+
 
 class SignUpForm(UserCreationForm):
     email = forms.EmailField(required=True, widget=forms.EmailInput(attrs={'placeholder': 'email@exemplo.com', 'class': 'input-text'}))
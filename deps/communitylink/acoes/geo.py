@@ -0,0 +1,242 @@
+"""
+Coordenadas e busca por proximidade ("ações perto de mim").
+
+Ação e Perfil guardam latitude/longitude, preenchidas a partir do texto
+(`local` / `endereco`) pelo geocodificador configurado em GEOCODIFICADOR
+(caminho de uma função texto -> (lat, lon) ou None). O padrão funciona
+offline: aceita coordenadas digitadas ("-7.115, -34.86") e nomes de cidades
+de uma pequena tabela (GEO_LOCALIDADES acrescenta outras).
+
+Índice espacial sem extensão do banco (funciona no SQLite): cada ação cai
+numa célula de uma grade de TAMANHO_CELULA graus, numerada linha a linha
+(`geo_celula`, indexado). Um raio vira poucas faixas contíguas de células
+(uma por linha da grade), cada uma um BETWEEN no índice; só as ações dessas
+faixas têm a distância calculada e ordenada.
+"""
+
+import math
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Sqrt
+from django.utils.module_loading import import_string
+
+from .locais import dobrar_texto
+from .models import Acao, Perfil
+
+TAMANHO_CELULA = 0.1  # graus (~11 km de latitude)
+COLUNAS = round(360 / TAMANHO_CELULA)
+LINHAS = round(180 / TAMANHO_CELULA)
+KM_POR_GRAU = 111.32
+RAIO_MAXIMO_KM = 500
+
+# Cidades conhecidas pelo geocodificador offline (nome sem acento, minúsculo)
+LOCALIDADES = {
+    'joao pessoa': (-7.1195, -34.8450),
+    'campina grande': (-7.2306, -35.8811),
+    'cabedelo': (-6.9811, -34.8339),
+    'santa rita': (-7.1139, -34.9781),
+    'bayeux': (-7.1253, -34.9322),
+    'patos': (-7.0244, -37.2800),
+    'sousa': (-6.7594, -38.2311),
+    'cajazeiras': (-6.8897, -38.5614),
+    'guarabira': (-6.8550, -35.4900),
+    'monteiro': (-7.8894, -37.1200),
+    'recife': (-8.0476, -34.8770),
+    'natal': (-5.7945, -35.2110),
+    'fortaleza': (-3.7319, -38.5267),
+    'maceio': (-9.6658, -35.7353),
+    'aracaju': (-10.9472, -37.0731),
+    'salvador': (-12.9714, -38.5014),
+    'teresina': (-5.0892, -42.8019),
+    'sao luis': (-2.5307, -44.3068),
+    'belem': (-1.4558, -48.4902),
+    'manaus': (-3.1190, -60.0217),
+    'brasilia': (-15.7939, -47.8828),
+    'goiania': (-16.6869, -49.2648),
+    'belo horizonte': (-19.9167, -43.9345),
+    'rio de janeiro': (-22.9068, -43.1729),
+    'sao paulo': (-23.5505, -46.6333),
+    'curitiba': (-25.4284, -49.2733),
+    'florianopolis': (-27.5954, -48.5480),
+    'porto alegre': (-30.0346, -51.2177),
+}
+
+_COORDENADAS = re.compile(r'(-?\d{1,2}(?:\.\d+)?)\s*[,;]\s*(-?\d{1,3}(?:\.\d+)?)')
+
+
+def coordenadas_validas(lat, lon):
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def geocodificar_offline(texto):
+    """ Geocodificador padrão: coordenadas no próprio texto ou cidade conhecida. """
+    encontrado = _COORDENADAS.search(texto)
+    if encontrado:
+        lat, lon = float(encontrado.group(1)), float(encontrado.group(2))
+        if coordenadas_validas(lat, lon):
+            return lat, lon
+    normalizado = f' {dobrar_texto(texto)} '
+    for nome, coordenadas in _localidades(tuple(getattr(settings, 'GEO_LOCALIDADES', {}).items())):
+        if f' {nome} ' in normalizado:
+            return coordenadas
+    return None
+
+
+@lru_cache(maxsize=8)
+def _localidades(extras):
+    localidades = {**LOCALIDADES, **{dobrar_texto(nome): tuple(c) for nome, c in extras}}
+    # Nome mais longo primeiro: "campina grande" antes de um eventual "grande"
+    return sorted(localidades.items(), key=lambda item: len(item[0]), reverse=True)
+
+
+@lru_cache(maxsize=None)
+def _geocodificador(caminho):
+    return import_string(caminho)
+
+
+def geocodificar(texto):
+    """ (lat, lon) do texto pelo GEOCODIFICADOR configurado, ou None. """
+    if not texto:
+        return None
+    caminho = getattr(settings, 'GEOCODIFICADOR', 'acoes.geo.geocodificar_offline')
+    return _geocodificador(caminho)(texto)
+
+
+def celula(lat, lon):
+    """ Número da célula da grade que contém o ponto. """
+    linha = min(int((lat + 90) / TAMANHO_CELULA), LINHAS - 1)
+    coluna = int((lon + 180) / TAMANHO_CELULA) % COLUNAS
+    return linha * COLUNAS + coluna
+
+
+def precisa_geocodificar(objeto, campo_texto):
+    """
+    True se o texto (`local`/`endereco`) mudou desde a leitura do banco e as
+    coordenadas não foram informadas junto (a API pode mandá-las prontas).
+    """
+    texto, latitude, longitude = getattr(objeto, '_geo_original', (None, None, None))
+    return getattr(objeto, campo_texto) != texto and (objeto.latitude, objeto.longitude) == (latitude, longitude)
+
+
+def preencher_coordenadas(objeto, texto, mudou):
+    """
+    Geocodifica `texto` quando ele mudou (`mudou`) e, em Acao, recalcula a
+    célula. Chamado pelo save() dos modelos e por quem usa bulk_create.
+    """
+    if mudou:
+        objeto.latitude, objeto.longitude = geocodificar(texto) or (None, None)
+    if hasattr(objeto, 'geo_celula'):
+        tem_coordenadas = objeto.latitude is not None and objeto.longitude is not None
+        objeto.geo_celula = celula(objeto.latitude, objeto.longitude) if tem_coordenadas else None
+
+
+def geocodificar_cadastrados(refazer=False, tamanho_lote=1000):
+    """
+    Preenche as coordenadas de ações e perfis já cadastrados (sem coordenadas,
+    ou todos com `refazer`, ex.: depois de trocar o GEOCODIFICADOR).
+    Retorna {'acoes': n, 'perfis': n} com quantos ganharam coordenadas.
+    """
+    resultado = {}
+    for chave, modelo, campo_texto, campos in (
+        ('acoes', Acao, 'local', ['latitude', 'longitude', 'geo_celula']),
+        ('perfis', Perfil, 'endereco', ['latitude', 'longitude']),
+    ):
+        consulta = modelo.objects.exclude(**{f'{campo_texto}__isnull': True}).exclude(**{campo_texto: ''})
+        if not refazer:
+            consulta = consulta.filter(latitude__isnull=True)
+        total, lote = 0, []
+        for objeto in consulta.only('pk', campo_texto, *campos).order_by('pk').iterator(chunk_size=tamanho_lote):
+            preencher_coordenadas(objeto, getattr(objeto, campo_texto), True)
+            if objeto.latitude is not None:
+                total += 1
+            lote.append(objeto)
+            if len(lote) >= tamanho_lote:
+                modelo.objects.bulk_update(lote, campos)
+                lote = []
+        modelo.objects.bulk_update(lote, campos)
+        resultado[chave] = total
+    return resultado
+
+
+def faixas_de_celulas(lat, lon, raio_km):
+    """ Intervalos (inicio, fim) de células que cobrem o círculo, um ou dois por linha da grade. """
+    dlat = raio_km / KM_POR_GRAU
+    # A longitude encolhe com o cosseno da latitude: usa a borda mais próxima do polo
+    lat_extrema = min(abs(lat) + dlat, 89.9)
+    dlon = raio_km / (KM_POR_GRAU * math.cos(math.radians(lat_extrema)))
+    primeira = max(int((lat - dlat + 90) / TAMANHO_CELULA), 0)
+    ultima = min(int((lat + dlat + 90) / TAMANHO_CELULA), LINHAS - 1)
+    if 2 * dlon >= 360:
+        colunas = [(0, COLUNAS - 1)]
+    else:
+        inicio = math.floor((lon - dlon + 180) / TAMANHO_CELULA)
+        fim = math.floor((lon + dlon + 180) / TAMANHO_CELULA)
+        if inicio < 0:  # atravessa o antimeridiano
+            colunas = [(inicio + COLUNAS, COLUNAS - 1), (0, fim)]
+        elif fim >= COLUNAS:
+            colunas = [(inicio, COLUNAS - 1), (0, fim - COLUNAS)]
+        else:
+            colunas = [(inicio, fim)]
+    return [
+        (linha * COLUNAS + de, linha * COLUNAS + ate)
+        for linha in range(primeira, ultima + 1)
+        for de, ate in colunas
+    ]
+
+
+def ler_ponto(valor):
+    """ 'lat,lon' -> (lat, lon); None se inválido. """
+    try:
+        lat, lon = (float(parte) for parte in valor.split(','))
+    except (AttributeError, ValueError):
+        return None
+    return (lat, lon) if coordenadas_validas(lat, lon) else None
+
+
+def filtrar_por_proximidade(queryset, lat, lon, raio_km, prefix=''):
+    """
+    Ações (ou inscrições, com prefix='acao__') a até `raio_km` do ponto,
+    anotadas com `distancia_km` e ordenadas da mais próxima para a mais longe.
+    """
+    raio_km = min(raio_km, RAIO_MAXIMO_KM)
+    celulas = Q()
+    for inicio, fim in faixas_de_celulas(lat, lon, raio_km):
+        celulas |= Q(**{f'{prefix}geo_celula__range': (inicio, fim)})
+    # Distância plana (equiretangular): sem trigonometria por linha e, para
+    # raios de até algumas centenas de km, com erro bem abaixo de 1%
+    escala_lon = math.cos(math.radians(lat))
+    dy = (F(f'{prefix}latitude') - lat) * KM_POR_GRAU
+    dx = (F(f'{prefix}longitude') - lon) * (KM_POR_GRAU * escala_lon)
+    return (
+        queryset.filter(celulas)
+        .annotate(distancia_km=Sqrt(dx * dx + dy * dy, output_field=FloatField()))
+        .filter(distancia_km__lte=raio_km)
+        .order_by('distancia_km')
+    )
+
+
+def aplicar_filtro_da_requisicao(request, queryset, prefix=''):
+    """
+    Filtro `?perto_de=lat,lon&raio_km=N`. Sem `perto_de`, usa as coordenadas do
+    perfil do usuário logado ("perto de mim"). Parâmetros inválidos são ignorados,
+    como os demais filtros da listagem.
+    """
+    try:
+        raio_km = float(request.GET.get('raio_km', ''))
+    except ValueError:
+        return queryset
+    if not 0 < raio_km:
+        return queryset
+    if request.GET.get('perto_de'):
+        ponto = ler_ponto(request.GET['perto_de'])
+    elif request.user.is_authenticated:
+        perfil = Perfil.objects.filter(user=request.user).values_list('latitude', 'longitude').first()
+        ponto = perfil if perfil and None not in perfil else None
+    else:
+        ponto = None
+    if ponto is None:
+        return queryset
+    return filtrar_por_proximidade(queryset, *ponto, raio_km, prefix=prefix)
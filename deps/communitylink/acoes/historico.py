@@ -0,0 +1,161 @@
+"""
+Histórico materializado por usuário (RegistroHistorico + ResumoImpacto).
+
+- `atualizar_historico()` materializa, em lotes, as ações que já passaram da
+  data e ainda não estão no histórico (varredura pelo índice
+  historico_materializado + data). Roda pelo comando atualizar_historico
+  (cron); as páginas de histórico e impacto só adiantam um lote pequeno
+  (HISTORICO_LOTE_PAGINA) das ações do próprio usuário.
+- `materializar_acoes(ids)` (re)constrói as linhas de ações específicas;
+  os signals em models.py a usam quando uma ação já materializada muda
+  (comentário, notas, status alterado pelo admin...).
+- `recalcular_resumos(ids)` refaz os totais de impacto dos usuários afetados
+  com duas agregações agrupadas, sem varrer o histórico de todo mundo.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Acao, Inscricao, RegistroHistorico, ResumoImpacto
+
+CAMPOS_ACAO = ('id', 'titulo', 'data', 'local', 'categoria', 'duracao_horas', 'organizador_id', 'notas_organizador')
+STATUS_HISTORICO = ('ACEITO', 'CANCELADO')
+
+
+def _dados_acao(acao):
+    return dict(
+        acao_id=acao['id'], titulo=acao['titulo'], data=acao['data'], local=acao['local'],
+        categoria=acao['categoria'], duracao_horas=acao['duracao_horas'],
+    )
+
+
+def _registros(acoes, inscricoes):
+    por_acao = {acao['id']: acao for acao in acoes}
+    registros = [
+        RegistroHistorico(
+            usuario_id=acao['organizador_id'], papel='ORGANIZACAO', notas_organizador=acao['notas_organizador'],
+            participantes=acao['total_aceitos'], **_dados_acao(acao),
+        )
+        for acao in acoes
+    ]
+    registros += [
+        RegistroHistorico(
+            usuario_id=inscricao['voluntario_id'], papel='PARTICIPACAO', inscricao_id=inscricao['id'],
+            status=inscricao['status'], comentario=inscricao['comentario'], **_dados_acao(por_acao[inscricao['acao_id']]),
+        )
+        for inscricao in inscricoes
+    ]
+    return registros
+
+
+@transaction.atomic
+def materializar_acoes(ids):
+    """ (Re)constrói o histórico das ações `ids` e os resumos de quem participou. """
+    ids = list(ids)
+    if not ids:
+        return 0
+    agora = timezone.now()
+    acoes = list(Acao.objects.com_vagas_preenchidas().filter(pk__in=ids).values(*CAMPOS_ACAO, 'total_aceitos'))
+    # Ação remarcada para o futuro sai do histórico até passar de novo
+    futuras = [acao['id'] for acao in acoes if acao['data'] >= agora]
+    if futuras:
+        Acao.objects.filter(pk__in=futuras).update(historico_materializado=False)
+        acoes = [acao for acao in acoes if acao['data'] < agora]
+    # Só das ações que ficaram (as remarcadas para o futuro não entram)
+    inscricoes = list(
+        Inscricao.objects.filter(acao_id__in=[acao['id'] for acao in acoes], status__in=STATUS_HISTORICO)
+        .values('id', 'acao_id', 'voluntario_id', 'status', 'comentario')
+    )
+    antigos = RegistroHistorico.objects.filter(acao_id__in=ids)
+    afetados = set(antigos.values_list('usuario_id', flat=True))
+    antigos.delete()
+
+    registros = _registros(acoes, inscricoes)
+    RegistroHistorico.objects.bulk_create(registros)
+    Acao.objects.filter(pk__in=[acao['id'] for acao in acoes], historico_materializado=False).update(
+        historico_materializado=True
+    )
+
+    afetados.update(r.usuario_id for r in registros)
+    recalcular_resumos(afetados)
+    return len(registros)
+
+
+def atualizar_historico(agora=None, tamanho_lote=500, max_lotes=None, usuario_id=None):
+    """
+    Materializa as ações que já passaram. Retorna quantas ações entraram.
+
+    `max_lotes` limita o trabalho (None = até acabar) e `usuario_id` restringe
+    às ações que o usuário organizou ou em que se inscreveu.
+    """
+    agora = agora or timezone.now()
+    pendentes = Acao.objects.filter(historico_materializado=False, data__lt=agora).order_by('data')
+    if usuario_id is not None:
+        inscritas = Inscricao.objects.filter(voluntario_id=usuario_id, status__in=STATUS_HISTORICO).values('acao_id')
+        pendentes = pendentes.filter(Q(organizador_id=usuario_id) | Q(pk__in=inscritas))
+    total = lotes = 0
+    # Sem nada pendente (caso comum na página de histórico) custa só este EXISTS
+    while (max_lotes is None or lotes < max_lotes) and pendentes.exists():
+        with transaction.atomic():
+            # skip_locked: execuções simultâneas (cron + página) pegam lotes diferentes
+            ids = list(pendentes.select_for_update(skip_locked=True).values_list('pk', flat=True)[:tamanho_lote])
+            if not ids:
+                break
+            materializar_acoes(ids)
+        total += len(ids)
+        lotes += 1
+    return total
+
+
+def adiantar_historico(usuario, agora=None):
+    """ Para as páginas: no máximo um lote (HISTORICO_LOTE_PAGINA) das ações de `usuario`. """
+    return atualizar_historico(
+        agora, tamanho_lote=getattr(settings, 'HISTORICO_LOTE_PAGINA', 50), max_lotes=1, usuario_id=usuario.pk,
+    )
+
+
+def recalcular_resumos(usuario_ids):
+    usuario_ids = list(usuario_ids)
+    if not usuario_ids:
+        return
+    resumos = {
+        uid: ResumoImpacto(usuario_id=uid, por_categoria={}) for uid in usuario_ids
+    }
+    por_categoria = defaultdict(dict)
+
+    participacoes = (
+        RegistroHistorico.objects.filter(usuario_id__in=usuario_ids, papel='PARTICIPACAO', status='ACEITO')
+        .values('usuario_id', 'categoria')
+        .annotate(total=Count('pk'), horas=Sum('duracao_horas'))
+        .order_by()
+    )
+    for linha in participacoes:
+        resumo = resumos[linha['usuario_id']]
+        resumo.participacoes += linha['total']
+        resumo.horas_voluntariadas += linha['horas'] or 0
+        por_categoria[linha['usuario_id']][linha['categoria']] = linha['total']
+
+    organizacoes = (
+        RegistroHistorico.objects.filter(usuario_id__in=usuario_ids, papel='ORGANIZACAO')
+        .values('usuario_id')
+        .annotate(total=Count('pk'), pessoas=Sum('participantes'))
+        .order_by()
+    )
+    for linha in organizacoes:
+        resumo = resumos[linha['usuario_id']]
+        resumo.acoes_organizadas = linha['total']
+        resumo.voluntarios_mobilizados = linha['pessoas'] or 0
+
+    agora = timezone.now()
+    for uid, resumo in resumos.items():
+        resumo.por_categoria = por_categoria.get(uid, {})
+        resumo.atualizado_em = agora
+    ResumoImpacto.objects.bulk_create(
+        resumos.values(), update_conflicts=True, unique_fields=['usuario'],
+        update_fields=['participacoes', 'horas_voluntariadas', 'acoes_organizadas',
+                       'voluntarios_mobilizados', 'por_categoria', 'atualizado_em'],
+    )
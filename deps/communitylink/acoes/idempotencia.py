@@ -0,0 +1,129 @@
+"""
+Chaves de idempotência para as ações da API que mudam estado.
+
+O cliente manda `Idempotency-Key: <valor único>` num POST; se a rede cair e
+ele repetir a requisição com a mesma chave, recebe a resposta original (com
+`Idempotent-Replayed: true`) sem que a view rode de novo. Sem o cabeçalho,
+nada muda.
+
+A resposta fica em RespostaIdempotente por IDEMPOTENCIA_TTL_HORAS: chave e
+assinatura guardadas como sha256 e o corpo como JSON comprimido. A primeira
+requisição reserva a chave com um INSERT antes de executar a view, então
+duplicatas simultâneas esbarram na chave primária e recebem 409 (tente de
+novo) em vez de executar em paralelo. Erros 5xx e exceções liberam a chave
+para a próxima tentativa. O scheduler apaga as expiradas (limpar_expiradas).
+"""
+
+import hashlib
+import json
+import zlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import metrics
+from .models import RespostaIdempotente
+
+CABECALHO = 'Idempotency-Key'
+TAMANHO_MAXIMO_CHAVE = 255
+# Reserva de uma requisição em andamento; passado isso (processo morreu), a chave é liberada
+EM_ANDAMENTO_SEGUNDOS = 60
+
+
+def _sha256(*partes):
+    return hashlib.sha256('\x1f'.join(partes).encode()).hexdigest()
+
+
+def assinatura(request):
+    """ Método + caminho + corpo: a mesma chave não pode ser usada para outra requisição. """
+    corpo = json.dumps(request.data, sort_keys=True, default=str, ensure_ascii=False)
+    return _sha256(request.method, request.get_full_path(), corpo)
+
+
+def reservar(chave, assinatura_requisicao, agora):
+    """ None se a chave foi reservada agora; senão a RespostaIdempotente já existente. """
+    existente = None
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                RespostaIdempotente.objects.create(
+                    chave=chave, assinatura=assinatura_requisicao,
+                    expira_em=agora + timedelta(seconds=EM_ANDAMENTO_SEGUNDOS),
+                )
+            return None
+        except IntegrityError:
+            existente = RespostaIdempotente.objects.filter(chave=chave).first()
+            if existente is not None and existente.expira_em > agora:
+                return existente
+            # Expirada (ou apagada entre o INSERT e a leitura): tenta reservar de novo
+            RespostaIdempotente.objects.filter(chave=chave, expira_em__lte=agora).delete()
+    return existente
+
+
+def guardar(chave, response, agora):
+    corpo = json.dumps(response.data, cls=JSONEncoder, ensure_ascii=False).encode()
+    RespostaIdempotente.objects.filter(chave=chave).update(
+        status=response.status_code,
+        corpo=zlib.compress(corpo),
+        expira_em=agora + timedelta(hours=getattr(settings, 'IDEMPOTENCIA_TTL_HORAS', 24)),
+    )
+
+
+def liberar(chave):
+    RespostaIdempotente.objects.filter(chave=chave).delete()
+
+
+def repetir(resposta):
+    dados = json.loads(zlib.decompress(resposta.corpo)) if resposta.corpo else None
+    return Response(dados, status=resposta.status, headers={'Idempotent-Replayed': 'true'})
+
+
+def idempotente(view):
+    """ Decorator para ações de ViewSet (POST) que aceitam Idempotency-Key. """
+    @wraps(view)
+    def _view(self, request, *args, **kwargs):
+        chave_cliente = request.headers.get(CABECALHO)
+        if not chave_cliente:
+            return view(self, request, *args, **kwargs)
+        if len(chave_cliente) > TAMANHO_MAXIMO_CHAVE:
+            return Response({'detail': f'{CABECALHO} deve ter até {TAMANHO_MAXIMO_CHAVE} caracteres.'}, status=400)
+
+        # Por usuário: a mesma chave de dois clientes não colide
+        chave = _sha256(str(request.user.pk or ''), chave_cliente)
+        assinatura_requisicao = assinatura(request)
+        agora = timezone.now()
+        existente = reservar(chave, assinatura_requisicao, agora)
+        if existente is not None:
+            metrics.registrar_cache('idempotencia', True)
+            if existente.assinatura != assinatura_requisicao:
+                return Response({'detail': f'{CABECALHO} já usada em outra requisição.'}, status=422)
+            if existente.status is None:
+                return Response(
+                    {'detail': 'Requisição com esta chave ainda em andamento.'}, status=409,
+                    headers={'Retry-After': '1'},
+                )
+            return repetir(existente)
+        metrics.registrar_cache('idempotencia', False)
+
+        try:
+            response = view(self, request, *args, **kwargs)
+        except Exception:
+            liberar(chave)
+            raise
+        if response.status_code >= 500 or not hasattr(response, 'data'):
+            liberar(chave)
+        else:
+            guardar(chave, response, agora)
+        return response
+    return _view
+
+
+def limpar_expiradas(agora=None):
+    """ Apaga as respostas vencidas. Retorna quantas foram apagadas. """
+    apagadas, _ = RespostaIdempotente.objects.filter(expira_em__lte=agora or timezone.now()).delete()
+    return apagadas
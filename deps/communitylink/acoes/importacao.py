@@ -0,0 +1,129 @@
+"""
+Importação de ações em lote (CSV ou JSON).
+
+Cada linha é validada pelo AcaoForm (as mesmas regras do cadastro manual e
+da API: formatos de data, fuso, vagas >= 1, duração 1-24, categoria) mais a
+trava de data no passado de acao_create. As linhas válidas entram com um
+único bulk_create numa transação; as inválidas voltam com os erros por
+campo, sem impedir as demais.
+
+Usado pela página de importação, pela API (/api/acoes/importar/) e pelo
+comando importar_acoes.
+"""
+
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .calendario import invalidar_calendarios
+from .forms import AcaoForm
+from .geo import preencher_coordenadas
+from .locais import registrar_locais
+from .models import Acao
+from .rollups import marcar_dias
+
+CAMPOS = AcaoForm._meta.fields
+FORMATOS = ('csv', 'json')
+
+
+class ErroImportacao(Exception):
+    """ Arquivo que não pode ser lido (formato, codificação, tamanho). """
+
+
+def limite_linhas():
+    return getattr(settings, 'IMPORTACAO_MAX_LINHAS', 10000)
+
+
+def formato_do_arquivo(nome):
+    extensao = nome.rsplit('.', 1)[-1].lower() if '.' in nome else ''
+    if extensao not in FORMATOS:
+        raise ErroImportacao('Envie um arquivo .csv ou .json.')
+    return extensao
+
+
+def ler_linhas(conteudo, formato):
+    """ Converte o conteúdo (bytes ou str) em uma lista de dicts. """
+    if isinstance(conteudo, bytes):
+        try:
+            # utf-8-sig: aceita o BOM que o Excel grava (e que a exportação usa)
+            conteudo = conteudo.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ErroImportacao('O arquivo deve estar em UTF-8.')
+
+    if formato == 'json':
+        try:
+            return linhas_de_json(json.loads(conteudo))
+        except ValueError as erro:
+            raise ErroImportacao(f'JSON inválido: {erro}')
+
+    try:
+        dialeto = csv.Sniffer().sniff(conteudo.split('\n', 1)[0], delimiters=',;')
+    except csv.Error:
+        dialeto = csv.excel
+    return _conferir_tamanho(list(csv.DictReader(io.StringIO(conteudo), dialect=dialeto)))
+
+
+def linhas_de_json(dados):
+    """ Aceita uma lista de objetos ou {"acoes": [...]} (JSON já decodificado). """
+    if isinstance(dados, dict):
+        dados = dados.get('acoes')
+    if not isinstance(dados, list) or not all(isinstance(linha, dict) for linha in dados):
+        raise ErroImportacao('O JSON deve ser uma lista de objetos (ou {"acoes": [...]}).')
+    return _conferir_tamanho(dados)
+
+
+def _conferir_tamanho(linhas):
+    if len(linhas) > limite_linhas():
+        raise ErroImportacao(f'Máximo de {limite_linhas()} ações por importação.')
+    return linhas
+
+
+def validar_linha(dados, agora):
+    """ Retorna (Acao não salva, None) ou (None, {campo: [mensagens]}). """
+    dados = {campo: ('' if dados.get(campo) is None else dados.get(campo)) for campo in CAMPOS}
+    form = AcaoForm(data=dados)
+    if form.is_valid():
+        if form.cleaned_data['data'] < agora:
+            return None, {'data': ['A data da ação não pode ser no passado.']}
+        return form.save(commit=False), None
+    return None, {campo: list(mensagens) for campo, mensagens in form.errors.items()}
+
+
+def importar_acoes(linhas, organizador, somente_validar=False, tamanho_lote=1000):
+    """
+    Valida e insere as ações de `linhas`. Retorna
+    {'total': n, 'validas': n, 'criadas': n, 'erros': [{'linha': i, 'erros': {...}}]}
+    com `linha` contando a partir de 1 (sem o cabeçalho do CSV).
+    """
+    agora = timezone.now()
+    validas, erros = [], []
+    for numero, dados in enumerate(linhas, 1):
+        acao, erro = validar_linha(dados, agora)
+        if erro:
+            erros.append({'linha': numero, 'erros': erro})
+        else:
+            acao.organizador = organizador
+            validas.append(acao)
+
+    if validas and not somente_validar:
+        # bulk_create não chama Acao.save(): geocodifica e normaliza o local aqui
+        for acao in validas:
+            preencher_coordenadas(acao, acao.local, True)
+        with transaction.atomic():
+            registrar_locais(validas)
+            Acao.objects.bulk_create(validas, batch_size=tamanho_lote)
+            # bulk_create não dispara os signals: marca os dias do painel e
+            # invalida o feed de calendário do organizador aqui
+            marcar_dias((organizador.pk, acao.data) for acao in validas)
+            invalidar_calendarios(usuario_id=organizador.pk)
+
+    return {
+        'total': len(linhas),
+        'criadas': 0 if somente_validar else len(validas),
+        'validas': len(validas),
+        'erros': erros,
+    }
@@ -0,0 +1,128 @@
+"""
+Lembretes das ações para os voluntários aceitos.
+
+Cada inscrição ACEITA ganha um Lembrete por antecedência configurada
+(LEMBRETES_ANTECEDENCIAS_HORAS, ex.: 24h e 2h antes de Acao.data), criados
+pelos signals em models.py. O comando run_scheduler chama
+`enviar_lembretes()`, que pega os vencidos em ordem de `enviar_em` (índice
+parcial só dos não enviados) e, na mesma transação, cria as notificações em
+lote e marca os lembretes como enviados. Se o processo cair no meio, a
+transação é desfeita e o lote volta a ser processado: nada sai duplicado.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, Value, When
+from django.urls import reverse
+from django.utils import timezone
+
+from . import metrics
+from .models import Inscricao, Lembrete, Notificacao
+
+TAMANHO_LOTE = 1000
+
+
+def antecedencias():
+    """ Antecedências (em horas) configuradas, da maior para a menor. """
+    return sorted(set(getattr(settings, 'LEMBRETES_ANTECEDENCIAS_HORAS', (24, 2))), reverse=True)
+
+
+def _novos(inscricao_id, data_acao, agora):
+    return [
+        Lembrete(inscricao_id=inscricao_id, antecedencia_horas=horas,
+                 enviar_em=data_acao - datetime.timedelta(hours=horas))
+        for horas in antecedencias()
+    ] if data_acao > agora else []
+
+
+def agendar(inscricao_ids, data_acao, agora=None):
+    """ Cria, num INSERT, os lembretes das inscrições aceitas de uma ação (idempotente). """
+    agora = agora or timezone.now()
+    novos = [lembrete for inscricao_id in inscricao_ids for lembrete in _novos(inscricao_id, data_acao, agora)]
+    # unique_together (inscricao, antecedencia_horas): agendar de novo não duplica
+    Lembrete.objects.bulk_create(novos, ignore_conflicts=True)
+
+
+def cancelar(inscricao_id):
+    """ Descarta os lembretes ainda não enviados (inscrição deixou de estar aceita). """
+    Lembrete.objects.filter(inscricao_id=inscricao_id, enviado_em__isnull=True).delete()
+
+
+def reagendar_acao(acao_id, data_acao):
+    """ Ação mudou de horário: recalcula, num único UPDATE, os lembretes pendentes. """
+    Lembrete.objects.filter(inscricao__acao_id=acao_id, enviado_em__isnull=True).update(
+        enviar_em=Case(*(
+            When(antecedencia_horas=horas, then=Value(data_acao - datetime.timedelta(hours=horas)))
+            for horas in antecedencias()
+        ), default=Value(data_acao)),
+    )
+
+
+def agendar_pendentes(agora=None, tamanho_lote=TAMANHO_LOTE):
+    """
+    Agenda os lembretes que faltam nas inscrições aceitas em ações futuras
+    (ex.: criadas por bulk_create, que não dispara signals, ou de antes de uma
+    nova antecedência ser configurada). Retorna quantas inscrições completou.
+    """
+    agora = agora or timezone.now()
+    incompletas = (
+        Inscricao.objects.filter(status='ACEITO', acao__data__gt=agora)
+        .annotate(agendados=Count('lembretes'))
+        .filter(agendados__lt=len(antecedencias()))
+        .values_list('pk', 'acao__data')
+    )
+    total, novos = 0, []
+    for inscricao_id, data_acao in incompletas.iterator(chunk_size=tamanho_lote):
+        novos.extend(_novos(inscricao_id, data_acao, agora))
+        total += 1
+        if len(novos) >= tamanho_lote:
+            Lembrete.objects.bulk_create(novos, ignore_conflicts=True)
+            novos = []
+    Lembrete.objects.bulk_create(novos, ignore_conflicts=True)
+    return total
+
+
+def _quando(data_acao, agora):
+    local = timezone.localtime(data_acao)
+    dias = (local.date() - timezone.localdate(agora)).days
+    dia = {0: 'hoje', 1: 'amanhã'}.get(dias, local.strftime('%d/%m'))
+    return f"{dia} às {local.strftime('%H:%M')}"
+
+
+def enviar_lembretes(agora=None, tamanho_lote=TAMANHO_LOTE):
+    """
+    Envia os lembretes vencidos até `agora`, `tamanho_lote` por transação.
+    Lembretes de ações que já começaram (scheduler parado por muito tempo)
+    são só marcados, sem notificação. Retorna quantas notificações saíram.
+    """
+    agora = agora or timezone.now()
+    vencidos = (
+        Lembrete.objects.filter(enviado_em__isnull=True, enviar_em__lte=agora)
+        .order_by('enviar_em')
+        .values_list('pk', 'inscricao__voluntario_id', 'inscricao__acao_id',
+                     'inscricao__acao__titulo', 'inscricao__acao__data')
+    )
+    enviados = 0
+    while True:
+        with transaction.atomic():
+            # skip_locked: dois schedulers ao mesmo tempo pegam lotes diferentes
+            lote = list(vencidos.select_for_update(skip_locked=True, of=('self',))[:tamanho_lote])
+            if not lote:
+                break
+            notificacoes = [
+                Notificacao(
+                    destinatario_id=voluntario_id,
+                    mensagem=f"Lembrete: a ação '{titulo[:150]}' começa {_quando(data_acao, agora)}.",
+                    link=reverse('acoes:acao_detail', args=[acao_id]),
+                )
+                for _, voluntario_id, acao_id, titulo, data_acao in lote if data_acao > agora
+            ]
+            Notificacao.objects.bulk_create(notificacoes)
+            Lembrete.objects.filter(pk__in=[linha[0] for linha in lote]).update(enviado_em=agora)
+        enviados += len(notificacoes)
+        metrics.registrar_fanout('lembrete', len(notificacoes))
+        if len(lote) < tamanho_lote:
+            break
+    return enviados
@@ -0,0 +1,181 @@
+"""
+Limites de taxa da API e das telas de login/cadastro.
+
+Cada escopo tem uma taxa "N/período" em LIMITES_TAXA (ex.: '60/min'). A
+contagem é uma janela deslizante aproximada: um contador por janela fixa
+do período, e a janela anterior entra com o peso da fração que ainda se
+sobrepõe à janela deslizante. Aceita até N requisições por período, com
+reposição gradual conforme a janela anterior sai da conta.
+
+Cada verificação é um add + incr no cache LIMITES_CACHE (e um get do
+contador anterior). O incr é atômico, então requisições simultâneas recebem
+contagens distintas e nunca passam mais de N, mesmo entre processos. Para
+valer entre vários workers, o cache precisa ser compartilhado e ter incr
+atômico (Redis/Memcached; no DatabaseCache o incr é get + set). O
+LocMemCache padrão é o substituto local, por processo.
+
+Escopos:
+- 'anonimo' (por IP) e 'usuario' (por usuário): toda a API;
+- `throttle_scope` da view/ação (ex.: 'importacao'), por usuário ou IP;
+- 'login' (por IP): POST em signin/signup, que gastam CPU com o hash da senha.
+
+As respostas levam X-RateLimit-Limit/Remaining/Reset (LimitesMiddleware) e,
+quando bloqueadas, 429 com Retry-After.
+"""
+
+import math
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+PERIODOS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# permitida: bool; limite: N da taxa; restantes: requisições que ainda cabem;
+# reset: segundos até a contagem zerar; espera: segundos até caber mais uma (se bloqueada)
+Cota = namedtuple('Cota', 'permitida limite restantes reset espera')
+
+
+def ler_taxa(taxa):
+    """ '60/min' -> (60, 60.0); '1000/hour' -> (1000, 3600.0). """
+    quantidade, periodo = taxa.split('/')
+    return int(quantidade), float(PERIODOS[periodo.strip()[0]])
+
+
+def taxa_do_escopo(escopo):
+    return getattr(settings, 'LIMITES_TAXA', {}).get(escopo)
+
+
+def consumir(escopo, identidade, taxa, agora=None):
+    """ Conta uma requisição em (escopo, identidade) e devolve a Cota resultante. """
+    capacidade, periodo = ler_taxa(taxa)
+    agora = time.time() if agora is None else agora
+    armazenamento = caches[getattr(settings, 'LIMITES_CACHE', 'default')]
+    janela = int(agora // periodo)
+    decorrido = agora - janela * periodo
+    chave = f'limite:{escopo}:{identidade}:{janela}'
+
+    # Contadores vivem duas janelas: a atual e, depois, como "anterior"
+    armazenamento.add(chave, 0, timeout=math.ceil(2 * periodo) + 1)
+    try:
+        atual = armazenamento.incr(chave)
+    except ValueError:  # expulso do cache entre o add e o incr
+        armazenamento.set(chave, 1, timeout=math.ceil(2 * periodo) + 1)
+        atual = 1
+    anterior = armazenamento.get(f'limite:{escopo}:{identidade}:{janela - 1}', 0)
+    peso = 1 - decorrido / periodo
+    estimado = anterior * peso + atual
+
+    if estimado > capacidade + 1e-9:
+        # Recusada não conta: quem espera volta a passar quando a janela desliza
+        armazenamento.decr(chave)
+        espera = _espera(capacidade, periodo, decorrido, anterior, atual - 1)
+        return Cota(False, capacidade, 0, _reset(periodo, decorrido, anterior, atual - 1), espera)
+    restantes = math.floor(round(capacidade - estimado, 6))
+    return Cota(True, capacidade, restantes, _reset(periodo, decorrido, anterior, atual), 0)
+
+
+def _espera(capacidade, periodo, decorrido, anterior, atual):
+    """ Segundos até caber mais uma requisição. """
+    if atual < capacidade and anterior:
+        # Basta a janela anterior perder peso: anterior * (1 - d/p) + atual + 1 <= N
+        alvo = periodo * (1 - (capacidade - atual - 1) / anterior)
+        return max(1, math.ceil(alvo - decorrido))
+    # A janela atual já está cheia: ela vira a anterior e precisa perder peso
+    alvo = periodo * max(0.0, 1 - (capacidade - 1) / atual) if atual else 0.0
+    return max(1, math.ceil(periodo - decorrido + alvo))
+
+
+def _reset(periodo, decorrido, anterior, atual):
+    """ Segundos até a contagem zerar. """
+    if atual:
+        return math.ceil(2 * periodo - decorrido)
+    return math.ceil(periodo - decorrido) if anterior else 0
+
+
+def anexar_cota(request, cota):
+    """ Guarda no HttpRequest a cota mais apertada, para o LimitesMiddleware. """
+    request = getattr(request, '_request', request)
+    atual = getattr(request, 'cota', None)
+    if atual is None or not cota.permitida or (atual.permitida and cota.restantes < atual.restantes):
+        request.cota = cota
+
+
+def identidade_por_ip(request):
+    # Respeita NUM_PROXIES do REST_FRAMEWORK ao ler X-Forwarded-For
+    return f'ip:{BaseThrottle().get_ident(request)}'
+
+
+def verificar(request, escopo, identidade):
+    """ Consome uma ficha; retorna a Cota (None se o escopo não tem taxa). """
+    taxa = taxa_do_escopo(escopo)
+    if not taxa:
+        return None
+    cota = consumir(escopo, identidade, taxa)
+    anexar_cota(request, cota)
+    if not cota.permitida:
+        metrics.registrar_limite(escopo)
+    return cota
+
+
+def tentativa_de_login_bloqueada(request):
+    """ Segundos de espera se o IP passou do limite 'login'; 0 se pode tentar. """
+    cota = verificar(request, 'login', identidade_por_ip(request))
+    return cota.espera if cota and not cota.permitida else 0
+
+
+class LimiteThrottle(BaseThrottle):
+    """ Throttle do DRF sobre `consumir`; as subclasses definem escopo e identidade. """
+
+    def escopo(self, view):
+        raise NotImplementedError
+
+    def identidade(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        escopo = self.escopo(view)
+        identidade = self.identidade(request) if escopo else None
+        if identidade is None:
+            return True
+        cota = verificar(request, escopo, identidade)
+        self.espera = cota.espera if cota else 0
+        return cota is None or cota.permitida
+
+    def wait(self):
+        return self.espera
+
+
+class AnonimoThrottle(LimiteThrottle):
+    def escopo(self, view):
+        return 'anonimo'
+
+    def identidade(self, request):
+        return None if request.user.is_authenticated else identidade_por_ip(request)
+
+
+class UsuarioThrottle(LimiteThrottle):
+    def escopo(self, view):
+        return 'usuario'
+
+    def identidade(self, request):
+        return f'u:{request.user.pk}' if request.user.is_authenticated else None
+
+
+class RotaThrottle(LimiteThrottle):
+    """ Limite extra das rotas caras: `throttle_scope` da view ou da @action. """
+
+    def escopo(self, view):
+        return getattr(view, 'throttle_scope', None)
+
+    def identidade(self, request):
+        return f'u:{request.user.pk}' if request.user.is_authenticated else identidade_por_ip(request)
+
+
+def limpar():
+    """ Zera todos os contadores (testes). """
+    caches[getattr(settings, 'LIMITES_CACHE', 'default')].clear()
@@ -0,0 +1,207 @@
+"""
+Dicionário normalizado de locais e autocompletar.
+
+`Acao.local` continua texto livre (é o que aparece na página), mas cada ação
+aponta para um `Local` cuja chave é o texto dobrado: sem acento, minúsculo,
+pontuação e espaços colapsados e sem a UF no final ("Centro", "centro ",
+"Centro - SP" -> "centro"). O filtro de local usa igualdade nessa chave
+(índice) quando ela existe; senão cai no icontains de sempre.
+
+O autocompletar é servido de um índice em memória por processo (prefixo +
+trigramas), carregado no início (wsgi/asgi, ou na primeira consulta),
+atualizado quando um novo local é gravado e recarregado incrementalmente a
+cada LOCAIS_RECARGA_SEGUNDOS para ver os locais criados por outros processos.
+"""
+
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from .models import Acao, Local
+
+LIMITE_SUGESTOES = 10
+# Similaridade mínima (Jaccard dos trigramas) para sugestões que não são prefixo
+SIMILARIDADE_MINIMA = 0.3
+
+UFS = {
+    'ac', 'al', 'ap', 'am', 'ba', 'ce', 'df', 'es', 'go', 'ma', 'mt', 'ms', 'mg', 'pa',
+    'pb', 'pr', 'pe', 'pi', 'rj', 'rn', 'rs', 'ro', 'rr', 'sc', 'sp', 'se', 'to',
+}
+_SEPARADOR_UF = re.compile(r'\s*[-/,]\s*([A-Za-z]{2})\s*$')
+
+
+def dobrar_texto(texto):
+    """ Sem acentos, minúsculo e só letras/números separados por um espaço. """
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.findall(r'[a-z0-9]+', texto.lower()))
+
+
+def normalizar_local(texto):
+    """ Chave do Local: texto dobrado, sem a UF final ("Centro - SP" -> "centro"). """
+    texto = texto or ''
+    uf = _SEPARADOR_UF.search(texto)
+    if uf and uf.group(1).lower() in UFS and texto[:uf.start()].strip():
+        texto = texto[:uf.start()]
+    return dobrar_texto(texto)[:Local._meta.get_field('chave').max_length]
+
+
+def _trigramas(chave):
+    texto = f'  {chave} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceLocais:
+    """ Índice em memória (thread-safe) das chaves de Local para o autocompletar. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        with self._lock:
+            self._nomes = {}
+            self._chaves = []  # ordenadas, para busca de prefixo com bisect
+            self._postings = defaultdict(set)
+            self._carregado_em = None
+            self._visto_ate = None
+
+    @property
+    def carregado(self):
+        return self._carregado_em is not None
+
+    def _adicionar(self, chave, nome):
+        if chave in self._nomes:
+            return
+        self._nomes[chave] = nome
+        bisect.insort(self._chaves, chave)
+        for trigrama in _trigramas(chave):
+            self._postings[trigrama].add(chave)
+
+    def adicionar(self, pares):
+        with self._lock:
+            for chave, nome in pares:
+                self._adicionar(chave, nome)
+
+    def carregar(self, desde=None):
+        """ Lê os Locais do banco (todos, ou os criados a partir de `desde`). """
+        consulta = Local.objects.order_by()
+        if desde is not None:
+            consulta = consulta.filter(criado_em__gte=desde)
+        agora = time.monotonic()
+        pares = list(consulta.values_list('chave', 'nome', 'criado_em').iterator(chunk_size=5000))
+        with self._lock:
+            for chave, nome, criado_em in pares:
+                self._adicionar(chave, nome)
+                if self._visto_ate is None or criado_em > self._visto_ate:
+                    self._visto_ate = criado_em
+            self._carregado_em = agora
+
+    def atualizar(self):
+        """ Carrega na primeira vez e recarrega o que é novo a cada LOCAIS_RECARGA_SEGUNDOS. """
+        if not self.carregado:
+            self.carregar()
+        elif time.monotonic() - self._carregado_em >= getattr(settings, 'LOCAIS_RECARGA_SEGUNDOS', 60):
+            desde = self._visto_ate
+            if desde is not None:
+                # criado_em é gravado no INSERT, não no commit: um Local de uma
+                # transação que fechou depois de outro mais novo já visto tem
+                # criado_em < _visto_ate. A margem relê esse trecho (adicionar é idempotente).
+                desde -= timedelta(seconds=getattr(settings, 'LOCAIS_RECARGA_MARGEM_SEGUNDOS', 600))
+            self.carregar(desde=desde)
+
+    def contem(self, chave):
+        return chave in self._nomes
+
+    def sugerir(self, termo, limite=LIMITE_SUGESTOES):
+        """ [(chave, nome)]: primeiro as chaves que começam com o termo, depois as parecidas. """
+        chave = dobrar_texto(termo)
+        if not chave:
+            return []
+        with self._lock:
+            inicio = bisect.bisect_left(self._chaves, chave)
+            prefixos = []
+            for candidata in self._chaves[inicio:]:
+                if not candidata.startswith(chave) or len(prefixos) >= limite:
+                    break
+                prefixos.append(candidata)
+
+            parecidas = []
+            # Termos curtos ficam só no prefixo (os trigramas casariam com quase tudo)
+            if len(prefixos) < limite and len(chave) >= 3:
+                trigramas = _trigramas(chave)
+                acertos = Counter()
+                for trigrama in trigramas:
+                    acertos.update(self._postings.get(trigrama, ()))
+                ja_incluidas = set(prefixos)
+                for candidata, comuns in acertos.items():
+                    if candidata in ja_incluidas:
+                        continue
+                    # Texto com padding tem len + 1 trigramas (repetidos são raros)
+                    similaridade = comuns / (len(trigramas) + len(candidata) + 1 - comuns)
+                    if similaridade >= SIMILARIDADE_MINIMA:
+                        parecidas.append((-similaridade, candidata))
+                parecidas = [candidata for _, candidata in sorted(parecidas)[:limite - len(prefixos)]]
+
+            return [(candidata, self._nomes[candidata]) for candidata in prefixos + parecidas]
+
+
+indice = IndiceLocais()
+
+
+def aquecer_indice():
+    """ Carrega o índice no início do processo (wsgi/asgi); sem banco, fica para a 1ª consulta. """
+    try:
+        indice.carregar()
+    except DatabaseError:
+        pass
+
+
+def local_conhecido(chave):
+    indice.atualizar()
+    return indice.contem(chave)
+
+
+def sugerir_locais(termo, limite=LIMITE_SUGESTOES):
+    indice.atualizar()
+    return indice.sugerir(termo, limite)
+
+
+def registrar_locais(acoes):
+    """
+    Preenche `local_normalizado` das ações e garante os Locais (um INSERT
+    idempotente). Chamado pelo Acao.save() e por quem usa bulk_create.
+    """
+    novos = {}
+    for acao in acoes:
+        chave = normalizar_local(acao.local)
+        acao.local_normalizado_id = chave or None
+        if chave:
+            novos.setdefault(chave, (acao.local or '').strip()[:255])
+    if not novos:
+        return
+    Local.objects.bulk_create([Local(chave=chave, nome=nome) for chave, nome in novos.items()], ignore_conflicts=True)
+    # Só entra no índice se a transação confirmar
+    transaction.on_commit(lambda: indice.adicionar(novos.items()))
+
+
+def normalizar_cadastrados(tamanho_lote=1000):
+    """ Liga ao dicionário as ações ainda sem `local_normalizado`. Retorna quantas foram ligadas. """
+    pendentes = Acao.objects.filter(local_normalizado__isnull=True).exclude(local='').only('pk', 'local')
+    total, ultimo_pk = 0, 0
+    while True:
+        lote = list(pendentes.filter(pk__gt=ultimo_pk).order_by('pk')[:tamanho_lote])
+        if not lote:
+            return total
+        ultimo_pk = lote[-1].pk
+        with transaction.atomic():
+            registrar_locais(lote)
+            lote = [acao for acao in lote if acao.local_normalizado_id]
+            Acao.objects.bulk_update(lote, ['local_normalizado'])
+        total += len(lote)
@@ -0,0 +1,109 @@
+"""
+Lote de leituras da API (/api/batch/).
+
+A tela inicial do app precisa de ações, inscrições, notificações e perfil;
+em vez de quatro requisições (cada uma com sessão, autenticação e
+middlewares), o cliente manda um POST com a lista de GETs:
+
+    [{"url": "/api/acoes/?fields=id,titulo"}, {"url": "/api/perfis/meu_perfil/"}]
+
+ou {"requisicoes": [...]}, e recebe, na mesma ordem, um item por
+sub-requisição com o próprio status:
+
+    [{"url": "/api/acoes/?fields=id,titulo", "status": 200, "corpo": [...]}, ...]
+
+As sub-requisições rodam em sequência no mesmo processo e conexão, com o
+usuário já autenticado do lote (sem nova consulta de sessão/usuário, e com
+os grupos lidos uma vez, ver permissions.no_grupo). Só GET em rotas dos
+viewsets da API; permissões e limites de taxa de cada rota continuam
+valendo. No máximo API_LOTE_MAXIMO sub-requisições por lote.
+"""
+
+import copy
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import QueryDict
+from django.urls import Resolver404, get_script_prefix, resolve
+from rest_framework.viewsets import ViewSetMixin
+
+logger = logging.getLogger(__name__)
+
+
+class ErroLote(Exception):
+    """ Corpo do lote inválido (vira 400 com a mensagem). """
+
+
+def ler_pedidos(dados):
+    """ Lista de URLs do corpo (lista ou {"requisicoes": [...]}), validada. """
+    if isinstance(dados, dict):
+        dados = dados.get('requisicoes')
+    if not isinstance(dados, list) or not dados:
+        raise ErroLote('Envie uma lista de requisições ou {"requisicoes": [...]}.')
+    maximo = getattr(settings, 'API_LOTE_MAXIMO', 20)
+    if len(dados) > maximo:
+        raise ErroLote(f'No máximo {maximo} requisições por lote.')
+
+    urls = []
+    for posicao, pedido in enumerate(dados, start=1):
+        if not isinstance(pedido, dict) or not isinstance(pedido.get('url'), str):
+            raise ErroLote(f'Requisição {posicao}: informe "url".')
+        if str(pedido.get('metodo', 'GET')).upper() != 'GET':
+            raise ErroLote(f'Requisição {posicao}: o lote só aceita GET.')
+        urls.append(pedido['url'])
+    return urls
+
+
+def executar_lote(request, urls):
+    """ Executa cada GET com o usuário de `request` (DRF) e devolve os resultados. """
+    return [{'url': url, **_executar(request, url)} for url in urls]
+
+
+def _executar(request, url):
+    partes = urlsplit(url)
+    prefixo = get_script_prefix()
+    if not partes.path.startswith(prefixo):
+        return _erro(404, 'Rota não encontrada.')
+    caminho = '/' + partes.path[len(prefixo):]
+    try:
+        rota = resolve(caminho)
+    except Resolver404:
+        return _erro(404, 'Rota não encontrada.')
+    if not issubclass(getattr(rota.func, 'cls', object), ViewSetMixin):
+        return _erro(400, 'O lote só executa rotas da API.')
+
+    try:
+        resposta = rota.func(_sub_requisicao(request, partes.path, caminho, partes.query, rota), *rota.args, **rota.kwargs)
+    except Exception:
+        logger.exception('Erro na sub-requisição %s do lote', url)
+        return _erro(500, 'Erro interno.')
+    return {'status': resposta.status_code, 'corpo': getattr(resposta, 'data', None)}
+
+
+def _sub_requisicao(request, caminho, caminho_info, consulta, rota):
+    original = request._request
+    sub = copy.copy(original)
+    parametros = QueryDict(consulta, mutable=True)
+    # Sempre JSON: ?format=ndjson responderia em streaming, fora do corpo do lote
+    parametros.pop('format', None)
+    sub.method = 'GET'
+    sub.path, sub.path_info = caminho, caminho_info
+    sub.GET = parametros
+    sub.POST = QueryDict()
+    sub.META = {
+        **{chave: valor for chave, valor in original.META.items() if chave not in ('CONTENT_TYPE', 'CONTENT_LENGTH')},
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': caminho_info,
+        'QUERY_STRING': parametros.urlencode(),
+        'HTTP_ACCEPT': 'application/json',
+    }
+    sub.resolver_match = rota
+    # O DRF usa este usuário sem autenticar de novo
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _erro(status, mensagem):
+    return {'status': status, 'corpo': {'detail': mensagem}}
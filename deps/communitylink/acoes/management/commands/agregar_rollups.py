@@ -0,0 +1,31 @@
+"""
+Reagrega os rollups diários do painel do organizador (RollupDiario).
+Incremental: só processa os dias marcados em DiaPendente pelos signals.
+
+Exemplo (cron a cada poucos minutos):
+    python manage.py agregar_rollups
+
+Reconstruir os rollups de todos os dias com ações (quente + arquivo):
+    python manage.py agregar_rollups --reconstruir
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.rollups import agregar_rollups, marcar_todos_os_dias
+
+
+class Command(BaseCommand):
+    help = 'Atualiza os rollups diários do painel com os dias que mudaram.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=200, help='Dias por transação.')
+        parser.add_argument('--reconstruir', action='store_true',
+                            help='Marca todos os dias com ações antes de agregar.')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        if options['reconstruir']:
+            marcar_todos_os_dias()
+        total = agregar_rollups(tamanho_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'{total} dias reagregados.'))
@@ -0,0 +1,39 @@
+"""
+Move ações passadas (e suas inscrições e comentários) para o arquivo.
+
+Exemplo (ações de mais de 12 meses atrás, em lotes de 500):
+    python manage.py arquivar_acoes --meses 12
+
+Pode rodar periodicamente (cron); cada lote é uma transação.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.arquivo import arquivar_acoes, corte_arquivo
+from acoes.models import Acao
+
+
+class Command(BaseCommand):
+    help = 'Arquiva ações com mais de N meses (tabelas AcaoArquivada/InscricaoArquivada).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meses', type=int, default=getattr(settings, 'ARQUIVO_MESES', 12),
+                            help='Idade mínima (em meses) das ações arquivadas.')
+        parser.add_argument('--lote', type=int, default=500, help='Ações por transação.')
+        parser.add_argument('--simular', action='store_true', help='Só mostra quantas ações seriam arquivadas.')
+
+    def handle(self, *args, **options):
+        if options['meses'] < 1 or options['lote'] < 1:
+            raise CommandError('--meses e --lote devem ser positivos.')
+
+        corte = corte_arquivo(options['meses'])
+        if options['simular']:
+            total = Acao.objects.filter(data__lt=corte).count()
+            self.stdout.write(f'{total} ações anteriores a {corte:%d/%m/%Y} seriam arquivadas.')
+            return
+
+        acoes, inscricoes = arquivar_acoes(corte, options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{acoes} ações e {inscricoes} inscrições anteriores a {corte:%d/%m/%Y} arquivadas.'
+        ))
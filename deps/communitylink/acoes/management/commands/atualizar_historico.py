@@ -0,0 +1,32 @@
+"""
+Materializa no histórico (RegistroHistorico/ResumoImpacto) as ações que já
+passaram da data. Incremental: só processa ações ainda não materializadas.
+
+Exemplo (cron a cada poucos minutos):
+    python manage.py atualizar_historico
+
+Reconstruir tudo que está nas tabelas quentes:
+    python manage.py atualizar_historico --reconstruir
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.historico import atualizar_historico
+from acoes.models import Acao
+
+
+class Command(BaseCommand):
+    help = 'Atualiza o histórico materializado com as ações que já aconteceram.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help='Ações por transação.')
+        parser.add_argument('--reconstruir', action='store_true',
+                            help='Refaz o histórico de todas as ações passadas das tabelas quentes.')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        if options['reconstruir']:
+            Acao.objects.filter(historico_materializado=True).update(historico_materializado=False)
+        total = atualizar_historico(tamanho_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'{total} ações adicionadas ao histórico.'))
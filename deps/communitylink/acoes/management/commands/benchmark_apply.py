@@ -0,0 +1,146 @@
+"""
+Mede a vazão de escrita de `acao_apply` com clientes concorrentes no banco
+configurado em DATABASES['default'] (perfil em settings.DATABASE_PROFILE).
+
+Compare perfis rodando o mesmo comando com settings diferentes:
+    python manage.py benchmark_apply --clientes 1,4,16 --saida padrao.json
+    DJANGO_SETTINGS_MODULE=communitylink.settings_production DJANGO_SECRET_KEY=x \\
+        python manage.py benchmark_apply --clientes 1,4,16 --saida wal.json --comparar padrao.json
+"""
+
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes import benchmark
+from acoes.models import Acao, Inscricao
+
+
+class Command(BaseCommand):
+    help = 'Mede a vazão de inscrições (acao_apply) com clientes concorrentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clientes', default='1,4,8',
+                            help='Quantidades de clientes concorrentes, separadas por vírgula.')
+        parser.add_argument('--por-cliente', type=int, default=50, help='Inscrições feitas por cliente.')
+        parser.add_argument('--saida', help='Arquivo JSON onde gravar os resultados.')
+        parser.add_argument('--comparar', help='Arquivo JSON de uma execução anterior para comparar.')
+        parser.add_argument('--manter', action='store_true', help='Não apaga os dados criados para o teste.')
+
+    def handle(self, *args, **options):
+        try:
+            niveis = [int(n) for n in options['clientes'].split(',') if n.strip()]
+        except ValueError:
+            raise CommandError('--clientes deve ser uma lista de inteiros (ex: 1,4,8).')
+        if not niveis or min(niveis) <= 0 or options['por_cliente'] <= 0:
+            raise CommandError('Use valores positivos em --clientes e --por-cliente.')
+
+        perfil = getattr(settings, 'DATABASE_PROFILE', connections['default'].vendor)
+        self.stdout.write(f'Perfil de banco: {perfil}')
+
+        resultados = []
+        for clientes in niveis:
+            resultado = self._rodar(clientes, options['por_cliente'], options['manter'])
+            resultado['chave'] = f'{perfil}:{clientes}'
+            resultado['perfil'] = perfil
+            resultados.append(resultado)
+            self.stdout.write(
+                f"{clientes:>3} clientes: {resultado['vazao_por_s']:>8.1f} inscrições/s  "
+                f"p50 {resultado['p50_ms']:.1f}ms  p95 {resultado['p95_ms']:.1f}ms  erros {resultado['erros']}"
+            )
+
+        documento = benchmark.salvar_resultados(options.get('saida'), 'acao_apply', resultados)
+        if options.get('comparar'):
+            anterior = benchmark.carregar_resultados(options['comparar'])
+            anteriores = {r['chave'].split(':')[-1]: r for r in anterior['resultados']}
+            self.stdout.write(f"\nComparação com {anterior['resultados'][0].get('perfil') if anterior['resultados'] else '?'}:")
+            for item in documento['resultados']:
+                antigo = anteriores.get(item['chave'].split(':')[-1])
+                if antigo:
+                    self.stdout.write(
+                        f"{item['clientes']:>3} clientes: {antigo['vazao_por_s']:.1f} -> {item['vazao_por_s']:.1f} inscrições/s"
+                    )
+
+    def _preparar(self, clientes, por_cliente):
+        prefixo = f'bapply_{uuid.uuid4().hex[:6]}'
+        organizador = User.objects.create_user(username=f'{prefixo}_org')
+        grupo, _ = Group.objects.get_or_create(name='Organizadores')
+        organizador.groups.add(grupo)
+        data = timezone.now() + timedelta(days=30)
+        # Todos os clientes disputam as mesmas ações (contenção realista)
+        acoes = Acao.objects.bulk_create([
+            Acao(titulo=f'{prefixo} {i}', descricao='benchmark', data=data, local='Centro',
+                 numero_vagas=clientes + 1, categoria='OUTRO', organizador=organizador)
+            for i in range(por_cliente)
+        ])
+        voluntarios = [User.objects.create_user(username=f'{prefixo}_v{i}') for i in range(clientes)]
+        return organizador, [a.pk for a in acoes], voluntarios
+
+    def _rodar(self, clientes, por_cliente, manter):
+        organizador, acoes, voluntarios = self._preparar(clientes, por_cliente)
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        urls = [reverse('acoes:acao_apply', args=[pk]) for pk in acoes]
+        barreira = threading.Barrier(clientes)
+        latencias, erros = [], []
+        lock = threading.Lock()
+
+        def trabalhador(voluntario):
+            client = Client(HTTP_HOST=host, raise_request_exception=False)
+            client.force_login(voluntario)
+            minhas_latencias, meus_erros = [], 0
+            if clientes > 1:
+                barreira.wait()
+            for url in urls:
+                inicio = time.perf_counter()
+                try:
+                    resposta = client.post(url)
+                    if resposta.status_code >= 500:
+                        meus_erros += 1
+                except Exception:
+                    meus_erros += 1
+                minhas_latencias.append((time.perf_counter() - inicio) * 1000)
+            with lock:
+                latencias.extend(minhas_latencias)
+                erros.append(meus_erros)
+
+        inicio = time.perf_counter()
+        if clientes == 1:
+            trabalhador(voluntarios[0])
+        else:
+            def executar(voluntario):
+                try:
+                    trabalhador(voluntario)
+                finally:
+                    connections.close_all()
+
+            threads = [threading.Thread(target=executar, args=(v,)) for v in voluntarios]
+            inicio = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        duracao = time.perf_counter() - inicio
+
+        criadas = Inscricao.objects.filter(acao_id__in=acoes).count()
+        resultado = {
+            'clientes': clientes,
+            'requisicoes': len(latencias),
+            'inscricoes_criadas': criadas,
+            'erros': sum(erros),
+            'duracao_s': round(duracao, 3),
+            'vazao_por_s': round(criadas / duracao, 2) if duracao else 0.0,
+        }
+        resultado.update(benchmark.resumir(latencias))
+
+        if not manter:
+            User.objects.filter(pk__in=[organizador.pk] + [v.pk for v in voluntarios]).delete()
+        return resultado
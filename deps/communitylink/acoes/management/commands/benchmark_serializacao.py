@@ -0,0 +1,102 @@
+"""
+Mede a vazão de serialização da listagem de ações da API (queryset -> bytes
+JSON) em três variantes:
+    drf          AcaoSerializer(many=True) + JSONRenderer do DRF (antes)
+    drf_rapido   AcaoSerializer(many=True) + JSONRapidoRenderer
+    plano        AcaoPlanaSerializer (.values()) + JSONRapidoRenderer (depois)
+
+As ações são criadas numa transação desfeita no final (não sobra nada no banco).
+
+Exemplos:
+    python manage.py benchmark_serializacao                         # 10k ações
+    python manage.py benchmark_serializacao --acoes 1000 --repeticoes 3 --saida serializacao.json
+    python manage.py benchmark_serializacao --saida novo.json --comparar serializacao.json
+"""
+
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from acoes import benchmark
+from acoes.models import Acao
+from acoes.renderers import JSONRapidoRenderer, orjson
+from acoes.serializers import AcaoPlanaSerializer, AcaoSerializer
+
+VARIANTES = {
+    'drf': lambda consulta: JSONRenderer().render(AcaoSerializer(consulta, many=True).data),
+    'drf_rapido': lambda consulta: JSONRapidoRenderer().render(AcaoSerializer(consulta, many=True).data),
+    'plano': lambda consulta: JSONRapidoRenderer().render(AcaoPlanaSerializer(consulta).data),
+}
+
+
+class Command(BaseCommand):
+    help = 'Mede a vazão de serialização JSON da listagem de ações da API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--acoes', type=int, default=10_000, help='Ações serializadas em cada repetição.')
+        parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por variante.')
+        parser.add_argument('--saida', help='Arquivo JSON onde gravar os resultados.')
+        parser.add_argument('--comparar', help='Arquivo JSON de uma execução anterior para comparar.')
+
+    def handle(self, *args, **options):
+        if options['acoes'] <= 0 or options['repeticoes'] <= 0:
+            raise CommandError('Use valores positivos em --acoes e --repeticoes.')
+        self.stdout.write(f"orjson: {'sim' if orjson else 'não (json da biblioteca padrão)'}")
+
+        with transaction.atomic():
+            consulta = self._preparar(options['acoes'])
+            resultados = [
+                self._medir(nome, gerar, consulta, options['acoes'], options['repeticoes'])
+                for nome, gerar in VARIANTES.items()
+            ]
+            transaction.set_rollback(True)
+
+        base = resultados[0]['vazao_por_s']
+        for item in resultados:
+            self.stdout.write(
+                f"{item['chave']:<12} {item['vazao_por_s']:>10.0f} ações/s  p50 {item['p50_ms']:.1f}ms  "
+                f"{item['bytes'] / 1024:.0f} KiB  ({item['vazao_por_s'] / base:.1f}x)"
+            )
+
+        documento = benchmark.salvar_resultados(options.get('saida'), 'serializacao', resultados)
+        if options.get('comparar'):
+            anterior = benchmark.carregar_resultados(options['comparar'])
+            self.stdout.write(f"\nComparação com {anterior['metadados'].get('commit')} (p50):")
+            for chave, antes, depois, variacao in benchmark.comparar(anterior, documento, metrica='p50_ms'):
+                self.stdout.write(f'{chave:<12} {antes:>10.2f} -> {depois:>10.2f} ms ({variacao:+.1f}%)')
+
+    def _preparar(self, quantidade):
+        organizador = User.objects.create_user(username=f'bserial_{uuid.uuid4().hex[:6]}', first_name='Org')
+        data = timezone.now() + timedelta(days=30)
+        Acao.objects.bulk_create([
+            Acao(
+                titulo=f'Ação {i}', descricao='Descrição da ação de benchmark ' * 4, data=data + timedelta(hours=i),
+                local='Centro', numero_vagas=10, categoria='OUTRO', organizador=organizador,
+                latitude=-7.12, longitude=-34.85,
+            )
+            for i in range(quantidade)
+        ], batch_size=1000)
+        # Mesmo queryset da listagem da API
+        return Acao.objects.com_vagas_preenchidas().select_related('organizador').filter(organizador=organizador)
+
+    def _medir(self, nome, gerar, consulta, quantidade, repeticoes):
+        gerar(consulta.all())  # aquecimento
+        amostras, tamanho = [], 0
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            tamanho = len(gerar(consulta.all()))
+            amostras.append((time.perf_counter() - inicio) * 1000)
+        resumo = benchmark.resumir(amostras)
+        return {
+            'chave': nome,
+            'acoes': quantidade,
+            'bytes': tamanho,
+            'vazao_por_s': round(quantidade / (resumo['p50_ms'] / 1000), 1) if resumo['p50_ms'] else 0.0,
+            **resumo,
+        }
@@ -0,0 +1,176 @@
+"""
+Compara as estratégias de sessão (SESSION_STRATEGY: db, cached_db,
+signed_cookies) com clientes logados concorrentes no banco configurado em
+DATABASES['default']. Cada cliente alterna uma página autenticada
+(minhas_inscricoes) com uma inscrição (acao_apply), ou seja, as leituras de
+sessão disputam o mesmo arquivo SQLite que as escritas de Inscricao.
+
+Por estratégia são medidas as queries em django_session por requisição
+(leituras e escritas), o total de queries, a latência e os erros (ex.:
+"database is locked" vira 500).
+
+Exemplos:
+    python manage.py benchmark_sessoes
+    python manage.py benchmark_sessoes --clientes 8 --por-cliente 30 --saida sessoes.json
+    python manage.py benchmark_sessoes --salvar-sempre          # como SESSION_SAVE_EVERY_REQUEST
+    python manage.py benchmark_sessoes --saida novo.json --comparar sessoes.json
+"""
+
+import threading
+import time
+import uuid
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes import benchmark
+from acoes.models import Acao, Inscricao
+from acoes.profiling import ColetorRequisicao
+from communitylink.sessoes import ESTRATEGIAS, motor_de_sessao
+
+
+class Command(BaseCommand):
+    help = 'Compara as estratégias de sessão (db, cached_db, signed_cookies) com clientes concorrentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--estrategias', default=','.join(ESTRATEGIAS),
+                            help='Estratégias medidas, separadas por vírgula.')
+        parser.add_argument('--clientes', type=int, default=4, help='Clientes logados concorrentes.')
+        parser.add_argument('--por-cliente', type=int, default=20,
+                            help='Rodadas (página + inscrição) por cliente.')
+        parser.add_argument('--salvar-sempre', action='store_true',
+                            help='Grava a sessão em toda requisição (SESSION_SAVE_EVERY_REQUEST).')
+        parser.add_argument('--saida', help='Arquivo JSON onde gravar os resultados.')
+        parser.add_argument('--comparar', help='Arquivo JSON de uma execução anterior para comparar.')
+
+    def handle(self, *args, **options):
+        estrategias = [e.strip() for e in options['estrategias'].split(',') if e.strip()]
+        desconhecidas = [e for e in estrategias if e not in ESTRATEGIAS]
+        if not estrategias or desconhecidas:
+            raise CommandError(f"Estratégias válidas: {', '.join(ESTRATEGIAS)}.")
+        if options['clientes'] <= 0 or options['por_cliente'] <= 0:
+            raise CommandError('Use valores positivos em --clientes e --por-cliente.')
+
+        perfil = getattr(settings, 'DATABASE_PROFILE', connections['default'].vendor)
+        self.stdout.write(f'Perfil de banco: {perfil}')
+
+        resultados = []
+        for estrategia in estrategias:
+            ajustes = {
+                'SESSION_ENGINE': motor_de_sessao(estrategia),
+                'SESSION_SAVE_EVERY_REQUEST': options['salvar_sempre'],
+            }
+            with override_settings(**ajustes):
+                resultado = self._rodar(options['clientes'], options['por_cliente'])
+            resultado.update(chave=estrategia, perfil=perfil)
+            resultados.append(resultado)
+            self.stdout.write(
+                f"{estrategia:<15} sessão/req {resultado['sessao_por_requisicao']:.2f} "
+                f"(escritas {resultado['escritas_sessao']})  queries/req {resultado['queries_por_requisicao']:.1f}  "
+                f"{resultado['vazao_por_s']:>7.1f} req/s  p95 {resultado['p95_ms']:.1f}ms  erros {resultado['erros']}"
+            )
+
+        documento = benchmark.salvar_resultados(options.get('saida'), 'sessoes', resultados)
+        if options.get('comparar'):
+            anterior = benchmark.carregar_resultados(options['comparar'])
+            self.stdout.write(f"\nComparação com {anterior['metadados'].get('commit')} (p95):")
+            for chave, antes, depois, variacao in benchmark.comparar(anterior, documento, metrica='p95_ms'):
+                self.stdout.write(f'{chave:<15} {antes:>10.2f} -> {depois:>10.2f} ms ({variacao:+.1f}%)')
+
+    def _preparar(self, clientes, por_cliente):
+        prefixo = f'bsessao_{uuid.uuid4().hex[:6]}'
+        organizador = User.objects.create_user(username=f'{prefixo}_org')
+        grupo, _ = Group.objects.get_or_create(name='Organizadores')
+        organizador.groups.add(grupo)
+        data = timezone.now() + timedelta(days=30)
+        acoes = Acao.objects.bulk_create([
+            Acao(titulo=f'{prefixo} {i}', descricao='benchmark', data=data, local='Centro',
+                 numero_vagas=clientes + 1, categoria='OUTRO', organizador=organizador)
+            for i in range(por_cliente)
+        ])
+        voluntarios = [User.objects.create_user(username=f'{prefixo}_v{i}') for i in range(clientes)]
+        return organizador, [a.pk for a in acoes], voluntarios
+
+    def _rodar(self, clientes, por_cliente):
+        organizador, acoes, voluntarios = self._preparar(clientes, por_cliente)
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        pagina = reverse('acoes:minhas_inscricoes')
+        inscricoes = [reverse('acoes:acao_apply', args=[pk]) for pk in acoes]
+        barreira = threading.Barrier(clientes)
+        latencias, queries, sessoes, lock = [], [], [], threading.Lock()
+        totais = {'erros': 0, 'leituras_sessao': 0, 'escritas_sessao': 0}
+
+        def trabalhador(voluntario):
+            client = Client(HTTP_HOST=host, raise_request_exception=False)
+            client.force_login(voluntario)
+            minhas_latencias, meus_erros = [], 0
+            if clientes > 1:
+                barreira.wait()
+            # execute_wrapper por thread (CaptureQueriesContext mexe em sinais globais)
+            with ColetorRequisicao() as coletor:
+                for url in inscricoes:
+                    for fazer in (lambda: client.get(pagina), lambda: client.post(url)):
+                        inicio = time.perf_counter()
+                        try:
+                            if fazer().status_code >= 500:
+                                meus_erros += 1
+                        except Exception:
+                            meus_erros += 1
+                        minhas_latencias.append((time.perf_counter() - inicio) * 1000)
+            minhas_queries = [sql for sql, _ in coletor.queries]
+            com_sessao = [sql for sql in minhas_queries if 'django_session' in sql]
+            leituras = sum(sql.lstrip().upper().startswith('SELECT') for sql in com_sessao)
+            with lock:
+                latencias.extend(minhas_latencias)
+                queries.append(len(minhas_queries))
+                sessoes.append(client.cookies.get(settings.SESSION_COOKIE_NAME))
+                totais['erros'] += meus_erros
+                totais['leituras_sessao'] += leituras
+                totais['escritas_sessao'] += len(com_sessao) - leituras
+
+        inicio = time.perf_counter()
+        if clientes == 1:
+            trabalhador(voluntarios[0])
+        else:
+            def executar(voluntario):
+                try:
+                    trabalhador(voluntario)
+                finally:
+                    connections.close_all()
+
+            threads = [threading.Thread(target=executar, args=(v,)) for v in voluntarios]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        duracao = time.perf_counter() - inicio
+
+        requisicoes = len(latencias)
+        resultado = {
+            'clientes': clientes,
+            'requisicoes': requisicoes,
+            'inscricoes_criadas': Inscricao.objects.filter(acao_id__in=acoes).count(),
+            'erros': totais['erros'],
+            'leituras_sessao': totais['leituras_sessao'],
+            'escritas_sessao': totais['escritas_sessao'],
+            'sessao_por_requisicao': round((totais['leituras_sessao'] + totais['escritas_sessao']) / requisicoes, 3),
+            'queries_por_requisicao': round(sum(queries) / requisicoes, 2),
+            'duracao_s': round(duracao, 3),
+            'vazao_por_s': round(requisicoes / duracao, 2) if duracao else 0.0,
+        }
+        resultado.update(benchmark.resumir(latencias))
+
+        # Remove as sessões criadas (no banco e/ou no cache, conforme a estratégia)
+        armazenamento = import_module(settings.SESSION_ENGINE).SessionStore
+        for cookie in sessoes:
+            if cookie is not None:
+                armazenamento(cookie.value).delete()
+        User.objects.filter(pk__in=[organizador.pk] + [v.pk for v in voluntarios]).delete()
+        return resultado
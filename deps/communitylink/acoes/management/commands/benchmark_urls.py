@@ -0,0 +1,163 @@
+"""
+Mede latência (percentis) e número de queries de cada rota do app `acoes`
+(páginas HTML de `acoes/urls.py` e rotas da API de `acoes/api_urls.py`).
+
+Exemplo:
+    python manage.py seed_benchmark --escala 0.01
+    python manage.py benchmark_urls --repeticoes 30 --saida resultados.json
+    python manage.py benchmark_urls --saida novo.json --comparar resultados.json
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from acoes import benchmark
+from acoes.models import Acao, Inscricao, Notificacao, Perfil
+
+# Qual objeto preenche o <pk> de cada rota (o padrão é a Ação)
+MODELO_POR_PREFIXO = {
+    'inscricao': Inscricao,
+    'notificacao': Notificacao,
+    'perfil': Perfil,
+}
+
+
+def listar_rotas(namespace='acoes'):
+    """
+    Percorre o URLconf e retorna (nome, parâmetros) de todas as rotas nomeadas
+    dentro do namespace informado, incluindo as rotas geradas pelo router da API.
+    """
+    rotas = []
+
+    def visitar(padroes, ns_atual):
+        for padrao in padroes:
+            if isinstance(padrao, URLResolver):
+                ns = padrao.namespace or ns_atual
+                if ns_atual and padrao.namespace:
+                    ns = f'{ns_atual}:{padrao.namespace}'
+                visitar(padrao.url_patterns, ns)
+            elif isinstance(padrao, URLPattern) and padrao.name and ns_atual == namespace:
+                parametros = list(padrao.pattern.regex.groupindex)
+                rotas.append((f'{namespace}:{padrao.name}', parametros))
+
+    visitar(get_resolver().url_patterns, None)
+    return rotas
+
+
+class Command(BaseCommand):
+    help = 'Mede latência e número de queries das rotas HTML e da API do app acoes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=20, help='Requisições medidas por rota.')
+        parser.add_argument('--usuario', help='Username usado nas rotas autenticadas (padrão: um organizador com ações).')
+        parser.add_argument('--filtro', help='Mede apenas rotas cujo nome contenha este texto.')
+        parser.add_argument('--saida', help='Arquivo JSON onde gravar os resultados.')
+        parser.add_argument('--comparar', help='Arquivo JSON de uma execução anterior para comparar.')
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+        if repeticoes <= 0:
+            raise CommandError('--repeticoes deve ser maior que zero.')
+
+        usuario = self._escolher_usuario(options.get('usuario'))
+        objetos = self._objetos_de_exemplo(usuario)
+
+        client = Client(HTTP_HOST=self._host())
+        client.force_login(usuario)
+
+        resultados = []
+        for nome, parametros in listar_rotas():
+            if options.get('filtro') and options['filtro'] not in nome:
+                continue
+            caminho = self._montar_caminho(nome, parametros, objetos)
+            if caminho is None:
+                self.stdout.write(f'{nome}: ignorada (parâmetros não suportados: {", ".join(parametros)})')
+                continue
+            resultados.append(self._medir(client, nome, caminho, repeticoes))
+
+        documento = benchmark.salvar_resultados(options.get('saida'), 'urls', resultados)
+        self._imprimir(resultados)
+
+        if options.get('comparar'):
+            anterior = benchmark.carregar_resultados(options['comparar'])
+            self.stdout.write(f"\nComparação com {anterior['metadados'].get('commit')} (p95):")
+            for chave, antes, depois, variacao in benchmark.comparar(anterior, documento):
+                self.stdout.write(f'{chave:<40} {antes:>10.2f} -> {depois:>10.2f} ms ({variacao:+.1f}%)')
+
+    def _host(self):
+        # Fora do test runner 'testserver' não está em ALLOWED_HOSTS
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*':
+                return host.lstrip('.')
+        return 'localhost'
+
+    def _escolher_usuario(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'Usuário "{username}" não encontrado.')
+        acao = Acao.objects.order_by('pk').select_related('organizador').first()
+        if acao is None:
+            raise CommandError('Nenhuma ação cadastrada. Rode "manage.py seed_benchmark" antes.')
+        return acao.organizador
+
+    def _objetos_de_exemplo(self, usuario):
+        """ Escolhe um objeto de cada modelo para preencher os <pk> das rotas. """
+        return {
+            Acao: Acao.objects.filter(organizador=usuario).order_by('pk').first() or Acao.objects.order_by('pk').first(),
+            Inscricao: (Inscricao.objects.filter(voluntario=usuario).order_by('pk').first()
+                        or Inscricao.objects.order_by('pk').first()),
+            Notificacao: (Notificacao.objects.filter(destinatario=usuario).order_by('pk').first()
+                          or Notificacao.objects.order_by('pk').first()),
+            Perfil: Perfil.objects.filter(user=usuario).first(),
+        }
+
+    def _montar_caminho(self, nome, parametros, objetos):
+        if not parametros:
+            return reverse(nome)
+        if parametros != ['pk']:
+            return None
+        nome_curto = nome.split(':', 1)[1]
+        modelo = Acao
+        for prefixo, candidato in MODELO_POR_PREFIXO.items():
+            if nome_curto.startswith(prefixo):
+                modelo = candidato
+        objeto = objetos.get(modelo)
+        if objeto is None:
+            return None
+        return reverse(nome, kwargs={'pk': objeto.pk})
+
+    def _medir(self, client, nome, caminho, repeticoes):
+        # Aquecimento (carrega templates, caches de URL, etc.)
+        resposta = client.get(caminho)
+        latencias, queries = [], []
+        for _ in range(repeticoes):
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                resposta = client.get(caminho)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            queries.append(len(capturadas))
+        resultado = {'chave': nome, 'caminho': caminho, 'status': resposta.status_code}
+        resultado.update(benchmark.resumir(latencias))
+        resultado.update({
+            'queries_min': min(queries),
+            'queries_max': max(queries),
+            'queries_media': round(sum(queries) / len(queries), 2),
+        })
+        return resultado
+
+    def _imprimir(self, resultados):
+        self.stdout.write(f"\n{'rota':<40} {'status':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}")
+        for r in resultados:
+            self.stdout.write(
+                f"{r['chave']:<40} {r['status']:>6} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+                f"{r['p99_ms']:>9.2f} {r['queries_max']:>8}"
+            )
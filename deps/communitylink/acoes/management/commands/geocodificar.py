@@ -0,0 +1,28 @@
+"""
+Preenche as coordenadas (busca por proximidade) das ações e perfis já
+cadastrados. Os novos são geocodificados ao salvar.
+
+Exemplos:
+    python manage.py geocodificar              # só quem ainda não tem coordenadas
+    python manage.py geocodificar --refazer    # todos (ex.: depois de trocar o GEOCODIFICADOR)
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.geo import geocodificar_cadastrados
+
+
+class Command(BaseCommand):
+    help = 'Geocodifica o local das ações e o endereço dos perfis.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Registros por UPDATE em lote.')
+        parser.add_argument('--refazer', action='store_true', help='Geocodifica de novo quem já tem coordenadas.')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        total = geocodificar_cadastrados(refazer=options['refazer'], tamanho_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{total['acoes']} ações e {total['perfis']} perfis com coordenadas."
+        ))
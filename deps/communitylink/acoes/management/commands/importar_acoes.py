@@ -0,0 +1,50 @@
+"""
+Importa ações em lote de um arquivo CSV ou JSON para um organizador.
+
+Exemplo:
+    python manage.py importar_acoes programa_2026.csv --organizador maria
+    python manage.py importar_acoes programa_2026.json --organizador maria --validar
+"""
+
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.importacao import ErroImportacao, formato_do_arquivo, importar_acoes, ler_linhas
+
+
+class Command(BaseCommand):
+    help = 'Importa ações de um arquivo CSV ou JSON (mesmas validações do cadastro).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do arquivo .csv ou .json.')
+        parser.add_argument('--organizador', required=True, help='Username do organizador das ações.')
+        parser.add_argument('--validar', action='store_true', help='Só valida, sem criar as ações.')
+        parser.add_argument('--lote', type=int, default=1000, help='Ações por INSERT.')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        try:
+            organizador = User.objects.get(username=options['organizador'])
+        except User.DoesNotExist:
+            raise CommandError(f'Usuário "{options["organizador"]}" não encontrado.')
+
+        caminho = Path(options['arquivo'])
+        if not caminho.is_file():
+            raise CommandError(f'Arquivo "{caminho}" não encontrado.')
+        try:
+            linhas = ler_linhas(caminho.read_bytes(), formato_do_arquivo(caminho.name))
+        except ErroImportacao as erro:
+            raise CommandError(str(erro))
+
+        resultado = importar_acoes(
+            linhas, organizador, somente_validar=options['validar'], tamanho_lote=options['lote'],
+        )
+        for item in resultado['erros']:
+            detalhes = '; '.join(f'{campo}: {" ".join(msgs)}' for campo, msgs in item['erros'].items())
+            self.stderr.write(f"Linha {item['linha']}: {detalhes}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['total']} linhas, {resultado['validas']} válidas, {resultado['criadas']} ações criadas."
+        ))
@@ -0,0 +1,24 @@
+"""
+Cria as ocorrências das séries recorrentes que entraram na janela móvel
+(SERIES_JANELA_DIAS dias à frente). Incremental e idempotente.
+
+Exemplo (cron diário):
+    python manage.py materializar_series
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.series import materializar_series
+
+
+class Command(BaseCommand):
+    help = 'Cria as próximas ocorrências das séries de ações recorrentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=100, help='Séries por transação.')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        total = materializar_series(tamanho_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'{total} ocorrências criadas.'))
@@ -0,0 +1,24 @@
+"""
+Liga as ações já cadastradas ao dicionário de locais normalizados (Local).
+As novas são ligadas ao salvar.
+
+Exemplo (uma vez, depois da migração):
+    python manage.py normalizar_locais
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from acoes.locais import normalizar_cadastrados
+
+
+class Command(BaseCommand):
+    help = 'Preenche o local normalizado das ações cadastradas antes do dicionário de locais.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Ações por transação.')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        total = normalizar_cadastrados(tamanho_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'{total} ações ligadas a um local normalizado.'))
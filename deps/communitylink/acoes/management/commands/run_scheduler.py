@@ -0,0 +1,66 @@
+"""
+Scheduler dos lembretes: envia, em lotes, os lembretes vencidos (e apaga as
+respostas idempotentes expiradas) e dorme até a próxima rodada. Não depende de broker; vários processos podem rodar
+juntos (cada lote é travado com skip_locked).
+
+Exemplos:
+    python manage.py run_scheduler                  # laço contínuo (a cada 30s)
+    python manage.py run_scheduler --uma-vez        # uma rodada (cron)
+    python manage.py run_scheduler --agendar        # completa lembretes faltantes antes
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections
+
+from acoes.idempotencia import limpar_expiradas
+from acoes.lembretes import agendar_pendentes, enviar_lembretes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Envia os lembretes das ações aos voluntários aceitos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa os vencidos e sai.')
+        parser.add_argument('--intervalo', type=int, default=30, help='Segundos entre as rodadas.')
+        parser.add_argument('--lote', type=int, default=1000, help='Lembretes por transação.')
+        parser.add_argument(
+            '--agendar', action='store_true',
+            help='Antes de começar, agenda os lembretes que faltam (inscrições criadas em lote).',
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        if options['intervalo'] < 1:
+            raise CommandError('--intervalo deve ser positivo.')
+
+        if options['agendar']:
+            total = agendar_pendentes(tamanho_lote=options['lote'])
+            self.stdout.write(f'{total} inscrições com lembretes agendados.')
+
+        try:
+            while True:
+                # Como o request_started faz nas views: respeita CONN_MAX_AGE e
+                # descarta a conexão que caiu (restart/failover do banco)
+                close_old_connections()
+                try:
+                    enviados = enviar_lembretes(tamanho_lote=options['lote'])
+                    limpar_expiradas()
+                except DatabaseError:
+                    if options['uma_vez']:
+                        raise
+                    # O lote foi desfeito; tenta de novo na próxima rodada com outra conexão
+                    logger.exception('Rodada do scheduler falhou; nova tentativa em %ss', options['intervalo'])
+                else:
+                    if enviados or options['uma_vez']:
+                        self.stdout.write(self.style.SUCCESS(f'{enviados} lembretes enviados.'))
+                    if options['uma_vez']:
+                        break
+                time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write('Scheduler encerrado.')
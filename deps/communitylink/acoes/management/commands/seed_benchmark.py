@@ -0,0 +1,256 @@
+"""
+Gera dados em volume de produção para benchmarks.
+
+Exemplo (escala padrão: 100k usuários, 1M ações, 10M inscrições, 20M notificações):
+    python manage.py seed_benchmark
+
+Exemplo reduzido (1% do volume):
+    python manage.py seed_benchmark --escala 0.01
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from acoes.models import Acao, Inscricao, Notificacao, Perfil
+
+# Todos os usuários gerados usam este prefixo (facilita a limpeza)
+PREFIXO_USUARIO = 'bench_'
+
+TITULOS = [
+    'Mutirão de limpeza', 'Campanha de vacinação', 'Aula de reforço', 'Feira de adoção',
+    'Plantio de mudas', 'Doação de sangue', 'Oficina de leitura', 'Coleta de alimentos',
+    'Visita ao abrigo', 'Horta comunitária',
+]
+LOCAIS = [
+    'Centro', 'Parque da Cidade', 'Escola Municipal', 'Praça Central', 'Bairro Alto',
+    'Vila Nova', 'Jardim América', 'Associação de Moradores', 'Posto de Saúde', 'Orla',
+]
+CATEGORIAS = [valor for valor, _ in Acao.CATEGORIA_CHOICES]
+# Distribuição aproximada de status observada em produção
+STATUS_PESOS = [('PENDENTE', 30), ('ACEITO', 50), ('REJEITADO', 10), ('CANCELADO', 10)]
+
+
+def inserir_em_lotes(model, campos, linhas, tamanho_lote):
+    """
+    Insere `linhas` (tuplas na ordem de `campos`) com executemany em lotes.
+    Bem mais rápido que bulk_create para milhões de linhas porque não
+    instancia objetos do modelo. Campos de data/hora são adaptados ao banco.
+    """
+    opts = model._meta
+    fields = [opts.get_field(nome) for nome in campos]
+    colunas = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+    marcadores = ', '.join(['%s'] * len(fields))
+    sql = f'INSERT INTO {connection.ops.quote_name(opts.db_table)} ({colunas}) VALUES ({marcadores})'
+    indices_datas = [i for i, f in enumerate(fields) if isinstance(f, models.DateTimeField)]
+
+    total = 0
+    lote = []
+
+    def gravar():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, lote)
+
+    for linha in linhas:
+        if indices_datas:
+            linha = list(linha)
+            for i in indices_datas:
+                linha[i] = connection.ops.adapt_datetimefield_value(linha[i])
+        lote.append(linha)
+        if len(lote) >= tamanho_lote:
+            gravar()
+            total += len(lote)
+            lote = []
+    if lote:
+        gravar()
+        total += len(lote)
+    return total
+
+
+class Command(BaseCommand):
+    help = 'Gera usuários, perfis, ações, inscrições e notificações em volume para benchmarks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=100_000)
+        parser.add_argument('--acoes', type=int, default=1_000_000)
+        parser.add_argument('--inscricoes', type=int, default=10_000_000)
+        parser.add_argument('--notificacoes', type=int, default=20_000_000)
+        parser.add_argument('--escala', type=float, default=1.0,
+                            help='Multiplica todos os volumes (ex: 0.01 para 1%%).')
+        parser.add_argument('--proporcao-organizadores', type=float, default=0.1)
+        parser.add_argument('--lote', type=int, default=5000, help='Linhas por INSERT em lote.')
+        parser.add_argument('--semente', type=int, default=42, help='Semente do gerador aleatório.')
+        parser.add_argument('--limpar', action='store_true',
+                            help=f'Remove os dados gerados anteriormente (usuários "{PREFIXO_USUARIO}*") antes de gerar.')
+
+    def handle(self, *args, **options):
+        escala = options['escala']
+        n_usuarios = max(2, int(options['usuarios'] * escala))
+        n_acoes = int(options['acoes'] * escala)
+        n_inscricoes = int(options['inscricoes'] * escala)
+        n_notificacoes = int(options['notificacoes'] * escala)
+        lote = options['lote']
+        if lote <= 0:
+            raise CommandError('--lote deve ser maior que zero.')
+
+        self.rng = random.Random(options['semente'])
+        self.agora = timezone.now()
+
+        if options['limpar']:
+            removidos, _ = User.objects.filter(username__startswith=PREFIXO_USUARIO).delete()
+            self.stdout.write(f'{removidos} registros anteriores removidos.')
+        elif User.objects.filter(username__startswith=PREFIXO_USUARIO).exists():
+            raise CommandError(f'Já existem usuários "{PREFIXO_USUARIO}*". Use --limpar para gerar de novo.')
+
+        inicio = time.perf_counter()
+        usuarios = self._gerar_usuarios(n_usuarios, lote)
+        n_organizadores = max(1, int(len(usuarios) * options['proporcao_organizadores']))
+        organizadores = usuarios[:n_organizadores]
+        self._gerar_grupos(organizadores, usuarios[n_organizadores:], lote)
+        acoes = self._gerar_acoes(n_acoes, organizadores, lote)
+        self._gerar_inscricoes(n_inscricoes, acoes, usuarios, lote)
+        self._gerar_notificacoes(n_notificacoes, usuarios, lote)
+
+        self.stdout.write(self.style.SUCCESS(f'Concluído em {time.perf_counter() - inicio:.1f}s.'))
+
+    # --- Etapas ---
+
+    def _etapa(self, nome, total, inicio):
+        duracao = time.perf_counter() - inicio
+        taxa = total / duracao if duracao else 0
+        self.stdout.write(f'{nome}: {total} linhas em {duracao:.1f}s ({taxa:,.0f} linhas/s)')
+
+    def _ids_novos(self, model, maior_id_anterior):
+        return list(
+            model.objects.filter(pk__gt=maior_id_anterior).order_by('pk').values_list('pk', flat=True)
+        )
+
+    def _maior_id(self, model):
+        return model.objects.aggregate(maior=models.Max('pk'))['maior'] or 0
+
+    def _gerar_usuarios(self, n, lote):
+        inicio = time.perf_counter()
+        # Um único hash para todos: o custo de PBKDF2 por usuário dominaria a geração
+        senha = make_password('benchmark')
+        maior_anterior = self._maior_id(User)
+        linhas = (
+            (f'{PREFIXO_USUARIO}{i}', f'{PREFIXO_USUARIO}{i}@exemplo.com', senha, f'Usuário {i}', '',
+             False, True, False, self.agora)
+            for i in range(n)
+        )
+        inserir_em_lotes(
+            User,
+            ['username', 'email', 'password', 'first_name', 'last_name',
+             'is_staff', 'is_active', 'is_superuser', 'date_joined'],
+            linhas, lote,
+        )
+        usuarios = self._ids_novos(User, maior_anterior)
+        self._etapa('Usuários', len(usuarios), inicio)
+
+        # bulk insert não dispara o signal que cria o Perfil, então criamos aqui
+        inicio = time.perf_counter()
+        preferencias = [','.join(self.rng.sample(CATEGORIAS, 2)) for _ in range(16)]
+        total = inserir_em_lotes(
+            Perfil,
+            ['user', 'endereco', 'preferencias'],
+            ((uid, f'Rua {uid % 500}, {self.rng.choice(LOCAIS)}', self.rng.choice(preferencias)) for uid in usuarios),
+            lote,
+        )
+        self._etapa('Perfis', total, inicio)
+        return usuarios
+
+    def _gerar_grupos(self, organizadores, voluntarios, lote):
+        inicio = time.perf_counter()
+        grupo_org, _ = Group.objects.get_or_create(name='Organizadores')
+        grupo_vol, _ = Group.objects.get_or_create(name='Voluntarios')
+        relacao = User.groups.through
+        linhas = [(uid, grupo_org.pk) for uid in organizadores] + [(uid, grupo_vol.pk) for uid in voluntarios]
+        total = inserir_em_lotes(relacao, ['user', 'group'], linhas, lote)
+        self._etapa('Grupos', total, inicio)
+
+    def _gerar_acoes(self, n, organizadores, lote):
+        inicio = time.perf_counter()
+        maior_anterior = self._maior_id(Acao)
+        rng = self.rng
+
+        def linhas():
+            for i in range(n):
+                # Espalha as ações entre 1 ano atrás e 1 ano à frente
+                data = self.agora + timedelta(minutes=rng.randint(-525_600, 525_600))
+                yield (
+                    f'{rng.choice(TITULOS)} #{i}',
+                    'Ação gerada para benchmark.',
+                    data,
+                    rng.choice(LOCAIS),
+                    rng.randint(5, 50),
+                    rng.choice(CATEGORIAS),
+                    rng.choice(organizadores),
+                    rng.randint(1, 8),
+                    False,
+                )
+
+        # historico_materializado=False: as passadas entram no histórico com atualizar_historico
+        # (os rollups do painel vêm de agregar_rollups --reconstruir)
+        inserir_em_lotes(
+            Acao,
+            ['titulo', 'descricao', 'data', 'local', 'numero_vagas', 'categoria', 'organizador',
+             'duracao_horas', 'historico_materializado'],
+            linhas(), lote,
+        )
+        acoes = self._ids_novos(Acao, maior_anterior)
+        self._etapa('Ações', len(acoes), inicio)
+        return acoes
+
+    def _gerar_inscricoes(self, n, acoes, usuarios, lote):
+        if not acoes or not n:
+            return
+        inicio = time.perf_counter()
+        rng = self.rng
+        status_valores = [s for s, _ in STATUS_PESOS]
+        status_pesos = [p for _, p in STATUS_PESOS]
+        por_acao, resto = divmod(n, len(acoes))
+        por_acao = min(por_acao, len(usuarios))
+
+        def linhas():
+            for indice, acao_id in enumerate(acoes):
+                k = min(por_acao + (1 if indice < resto else 0), len(usuarios))
+                # sample garante voluntários distintos (unique_together acao/voluntario)
+                for posicao in rng.sample(range(len(usuarios)), k):
+                    yield (
+                        acao_id,
+                        usuarios[posicao],
+                        rng.choices(status_valores, status_pesos)[0],
+                        self.agora - timedelta(minutes=rng.randint(0, 525_600)),
+                    )
+
+        total = inserir_em_lotes(
+            Inscricao, ['acao', 'voluntario', 'status', 'data_inscricao'], linhas(), lote,
+        )
+        self._etapa('Inscrições', total, inicio)
+
+    def _gerar_notificacoes(self, n, usuarios, lote):
+        if not n:
+            return
+        inicio = time.perf_counter()
+        rng = self.rng
+
+        def linhas():
+            for _ in range(n):
+                yield (
+                    rng.choice(usuarios),
+                    'Notificação gerada para benchmark.',
+                    rng.random() < 0.7,
+                    self.agora - timedelta(minutes=rng.randint(0, 525_600)),
+                    '',
+                )
+
+        total = inserir_em_lotes(
+            Notificacao, ['destinatario', 'mensagem', 'lida', 'created_at', 'link'], linhas(), lote,
+        )
+        self._etapa('Notificações', total, inicio)
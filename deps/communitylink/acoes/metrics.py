@@ -0,0 +1,448 @@
+"""
+Métricas operacionais no formato texto do Prometheus.
+
+- Contadores e histogramas ficam em memória no processo (incremento barato,
+  um lock e uma soma).
+- Com METRICS_MULTIPROC_DIR definido (gunicorn com vários workers), cada
+  processo grava periodicamente seu estado num arquivo próprio e o
+  endpoint /metrics soma os arquivos de todos os processos. Ao começar a
+  gravar, o processo soma os arquivos de processos que já não existem em
+  metricas_encerrados.json e os apaga, sem que os totais diminuam.
+- Medidores "coletados" (inscrições pendentes, notificações não lidas) são
+  calculados no banco no momento da coleta, com cache de METRICS_GAUGE_TTL.
+"""
+
+import atexit
+import hmac
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock (e sem gunicorn com vários workers)
+    fcntl = None
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseForbidden
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_QUANTIDADE = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+logger = logging.getLogger(__name__)
+
+# No METRICS_MULTIPROC_DIR: soma dos processos encerrados (entra no glob
+# metricas_*.json da coleta) e a trava entre a limpeza e as coletas
+ARQUIVO_ENCERRADOS = 'metricas_encerrados.json'
+ARQUIVO_TRAVA = 'metricas.lock'
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _formatar_numero(valor):
+    if valor == math.inf:
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+def _formatar_rotulos(nomes, valores, extra=None):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(f'{extra[0]}="{_escapar(extra[1])}"')
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+class Contador:
+    tipo = 'counter'
+
+    def __init__(self, nome, ajuda, rotulos, lock):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, tuple(rotulos)
+        self._lock = lock
+        self.valores = {}
+
+    def inc(self, valor=1, **rotulos):
+        chave = tuple(str(rotulos.get(r, '')) for r in self.rotulos)
+        with self._lock:
+            self.valores[chave] = self.valores.get(chave, 0) + valor
+
+    def estado(self):
+        return [[list(chave), valor] for chave, valor in self.valores.items()]
+
+    @staticmethod
+    def somar(atual, novo):
+        return atual + novo
+
+    def exportar(self, valores):
+        for chave, valor in sorted(valores.items()):
+            yield f'{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}'
+
+
+class Histograma:
+    tipo = 'histogram'
+
+    def __init__(self, nome, ajuda, rotulos, lock, buckets):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, tuple(rotulos)
+        self._lock = lock
+        self.buckets = tuple(buckets)
+        self.valores = {}  # chave -> [contagem por bucket..., soma, total]
+
+    def observar(self, valor, **rotulos):
+        chave = tuple(str(rotulos.get(r, '')) for r in self.rotulos)
+        with self._lock:
+            dados = self.valores.get(chave)
+            if dados is None:
+                dados = self.valores[chave] = [0] * (len(self.buckets) + 2)
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    dados[i] += 1
+                    break
+            dados[-2] += valor
+            dados[-1] += 1
+
+    def estado(self):
+        return [[list(chave), list(dados)] for chave, dados in self.valores.items()]
+
+    @staticmethod
+    def somar(atual, novo):
+        return [a + b for a, b in zip(atual, novo)]
+
+    def exportar(self, valores):
+        for chave, dados in sorted(valores.items()):
+            acumulado = 0
+            for limite, quantidade in zip(self.buckets, dados):
+                acumulado += quantidade
+                rotulos = _formatar_rotulos(self.rotulos, chave, ('le', _formatar_numero(limite)))
+                yield f'{self.nome}_bucket{rotulos} {acumulado}'
+            rotulos = _formatar_rotulos(self.rotulos, chave, ('le', '+Inf'))
+            yield f'{self.nome}_bucket{rotulos} {dados[-1]}'
+            yield f'{self.nome}_sum{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(dados[-2])}'
+            yield f'{self.nome}_count{_formatar_rotulos(self.rotulos, chave)} {dados[-1]}'
+
+
+class MedidorColetado:
+    """ Gauge calculado na hora da coleta (não depende do processo). """
+    tipo = 'gauge'
+
+    def __init__(self, nome, ajuda, funcao):
+        self.nome, self.ajuda, self.funcao = nome, ajuda, funcao
+        self.rotulos = ()
+
+    def exportar(self, valores=None):
+        yield f'{self.nome} {_formatar_numero(self.funcao())}'
+
+
+class Registro:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.metricas = {}
+        self._ultima_gravacao = 0.0
+        self._pid = None
+        self._id_processo = None
+        self._diretorios_limpos = set()
+
+    def _registrar(self, metrica):
+        self.metricas[metrica.nome] = metrica
+        return metrica
+
+    def contador(self, nome, ajuda, rotulos=()):
+        return self._registrar(Contador(nome, ajuda, rotulos, self._lock))
+
+    def histograma(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        return self._registrar(Histograma(nome, ajuda, rotulos, self._lock, buckets))
+
+    def medidor_coletado(self, nome, ajuda, funcao):
+        return self._registrar(MedidorColetado(nome, ajuda, funcao))
+
+    def limpar(self):
+        """ Zera os valores deste processo (usado nos testes). """
+        with self._lock:
+            for metrica in self.metricas.values():
+                if hasattr(metrica, 'valores'):
+                    metrica.valores.clear()
+
+    # --- Modo multiprocesso ---
+
+    def _diretorio(self):
+        diretorio = getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+        return Path(diretorio) if diretorio else None
+
+    def estado(self):
+        with self._lock:
+            return {
+                nome: metrica.estado()
+                for nome, metrica in self.metricas.items()
+                if hasattr(metrica, 'estado')
+            }
+
+    def _arquivo_processo(self, diretorio):
+        # Recalculado após fork (gunicorn --preload importa o módulo no master).
+        # O sufixo aleatório evita sobrescrever o arquivo de um pid reaproveitado.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._id_processo = f'{self._pid}-{uuid.uuid4().hex[:8]}'
+        return diretorio / f'metricas_{self._id_processo}.json'
+
+    def _limpar_mortos(self, diretorio):
+        """
+        Tira do diretório os arquivos de processos que já terminaram (e os de
+        um processo anterior com o mesmo pid). Os contadores e histogramas
+        deles são somados antes em ARQUIVO_ENCERRADOS: apagar sem somar faria
+        os totais exportados caírem, e o Prometheus leria isso como um reset
+        (pico em rate()/increase() a cada reciclagem de worker).
+        """
+        if os.name != 'posix':  # os.kill(pid, 0) só testa o processo no POSIX
+            return
+        mortos = []
+        for arquivo in diretorio.glob('metricas_*'):
+            pid = arquivo.name[len('metricas_'):].split('-', 1)[0]
+            if not pid.isdigit() or arquivo.name.startswith(f'metricas_{self._id_processo}'):
+                continue
+            if int(pid) == self._pid or not _processo_vivo(int(pid)):
+                mortos.append(arquivo)
+        if not mortos:
+            return
+
+        with _trava(diretorio, exclusiva=True):
+            encerrados = diretorio / ARQUIVO_ENCERRADOS
+            somados = {}
+            for arquivo in [encerrados] + [a for a in mortos if a.suffix == '.json']:
+                try:
+                    _acumular(somados, json.loads(arquivo.read_text(encoding='utf-8')), self.metricas)
+                except FileNotFoundError:
+                    continue  # outro processo já somou este (ou ainda não há encerrados)
+                except ValueError:
+                    logger.warning('Arquivo de métricas inválido descartado: %s', arquivo)
+            _gravar_json(diretorio, encerrados, {
+                nome: [[list(chave), valor] for chave, valor in series.items()]
+                for nome, series in somados.items()
+            })
+            # Só depois de somados: uma falha acima deixa os arquivos para a próxima tentativa
+            for arquivo in mortos:
+                try:
+                    arquivo.unlink()
+                except OSError:
+                    pass
+
+    def gravar(self):
+        """
+        Grava o estado deste processo (escrita atômica com os.replace). Cada
+        gravação usa um temporário próprio, então threads concorrentes não se
+        atropelam; falhas de disco só vão para o log, nunca para a requisição.
+        """
+        diretorio = self._diretorio()
+        if diretorio is None:
+            return
+        self._ultima_gravacao = time.monotonic()
+        try:
+            diretorio.mkdir(parents=True, exist_ok=True)
+            destino = self._arquivo_processo(diretorio)
+            if (self._id_processo, diretorio) not in self._diretorios_limpos:
+                self._diretorios_limpos.add((self._id_processo, diretorio))
+                self._limpar_mortos(diretorio)
+            _gravar_json(diretorio, destino, self.estado())
+        except OSError:
+            logger.warning('Não foi possível gravar as métricas em %s', diretorio, exc_info=True)
+
+    def talvez_gravar(self):
+        """ Grava no máximo uma vez a cada METRICS_FLUSH_INTERVAL segundos. """
+        if self._diretorio() is None:
+            return
+        intervalo = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0)
+        if time.monotonic() - self._ultima_gravacao >= intervalo:
+            self.gravar()
+
+    def _estados_agregados(self):
+        diretorio = self._diretorio()
+        if diretorio is None:
+            return [self.estado()]
+        # Garante que o arquivo deste processo está atualizado antes de somar
+        self.gravar()
+        estados = []
+        # Compartilhada: não lê um worker morto já somado em ARQUIVO_ENCERRADOS e ainda não apagado
+        with _trava(diretorio, exclusiva=False):
+            for arquivo in sorted(diretorio.glob('metricas_*.json')):
+                try:
+                    estados.append(json.loads(arquivo.read_text(encoding='utf-8')))
+                except (OSError, ValueError):
+                    continue  # arquivo sendo substituído; entra na próxima coleta
+        return estados
+
+    # --- Exposição ---
+
+    def exportar(self):
+        somados = {nome: {} for nome in self.metricas}
+        for estado in self._estados_agregados():
+            _acumular(somados, estado, self.metricas)
+
+        linhas = []
+        for nome, metrica in self.metricas.items():
+            linhas.append(f'# HELP {nome} {metrica.ajuda}')
+            linhas.append(f'# TYPE {nome} {metrica.tipo}')
+            linhas.extend(metrica.exportar(somados[nome]))
+        return '\n'.join(linhas) + '\n'
+
+
+def _somar_valores(atual, novo):
+    """ Soma de métricas que este processo não conhece mais (contador ou buckets). """
+    if isinstance(atual, list):
+        return [a + b for a, b in zip(atual, novo)]
+    return atual + novo
+
+
+def _acumular(somados, estado, metricas):
+    """ Soma `estado` (formato dos arquivos) em somados[nome][rótulos]. """
+    for nome, series in estado.items():
+        metrica = metricas.get(nome)
+        somar = metrica.somar if metrica is not None and hasattr(metrica, 'somar') else _somar_valores
+        destino = somados.setdefault(nome, {})
+        for rotulos, valor in series:
+            chave = tuple(rotulos)
+            atual = destino.get(chave)
+            destino[chave] = valor if atual is None else somar(atual, valor)
+
+
+def _gravar_json(diretorio, destino, dados):
+    """ Escrita atômica: temporário próprio no mesmo diretório + os.replace. """
+    with tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=diretorio, prefix=f'{destino.stem}-', suffix='.tmp', delete=False,
+    ) as arquivo:
+        temporario = arquivo.name
+        try:
+            json.dump(dados, arquivo)
+        except BaseException:
+            arquivo.close()
+            os.unlink(temporario)
+            raise
+    try:
+        os.replace(temporario, destino)
+    except OSError:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _trava(diretorio, exclusiva):
+    """ flock em ARQUIVO_TRAVA entre a limpeza (exclusiva) e as coletas (compartilhada). """
+    if fcntl is None:
+        yield
+        return
+    with open(diretorio / ARQUIVO_TRAVA, 'a') as trava:
+        fcntl.flock(trava, fcntl.LOCK_EX if exclusiva else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(trava, fcntl.LOCK_UN)
+
+
+def _processo_vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # existe, mas é de outro usuário
+        return True
+    return True
+
+
+registro = Registro()
+atexit.register(registro.gravar)
+
+# --- Métricas da aplicação ---
+
+requisicoes = registro.contador(
+    'communitylink_http_requests_total', 'Requisições HTTP por rota, método e status.',
+    ('view', 'method', 'status'),
+)
+latencia = registro.histograma(
+    'communitylink_http_request_duration_seconds', 'Latência das requisições HTTP por rota.',
+    ('view',),
+)
+queries_por_requisicao = registro.histograma(
+    'communitylink_db_queries_per_request', 'Queries ao banco por requisição.',
+    ('view',), buckets=BUCKETS_QUANTIDADE,
+)
+cache_consultas = registro.contador(
+    'communitylink_cache_requests_total', 'Consultas a caches da aplicação (hit/miss).',
+    ('cache', 'result'),
+)
+notificacoes_fanout = registro.histograma(
+    'communitylink_notification_fanout', 'Notificações criadas por evento (fan-out).',
+    ('event',), buckets=BUCKETS_QUANTIDADE,
+)
+limites_excedidos = registro.contador(
+    'communitylink_throttled_requests_total', 'Requisições bloqueadas pelos limites de taxa (429).',
+    ('scope',),
+)
+
+
+def registrar_cache(nome, acerto):
+    """ Conta um hit/miss de cache (a taxa é hit / (hit + miss) no Prometheus). """
+    cache_consultas.inc(cache=nome, result='hit' if acerto else 'miss')
+
+
+def registrar_fanout(evento, quantidade):
+    notificacoes_fanout.observar(quantidade, event=evento)
+
+
+def registrar_limite(escopo):
+    limites_excedidos.inc(scope=escopo)
+
+
+def _contagem_em_cache(chave, calcular):
+    """ Contagens no banco são caras em tabelas grandes: guarda por METRICS_GAUGE_TTL. """
+    valor = cache.get(chave)
+    if valor is None:
+        valor = calcular()
+        cache.set(chave, valor, getattr(settings, 'METRICS_GAUGE_TTL', 60))
+    return valor
+
+
+def _inscricoes_pendentes():
+    from .models import Inscricao
+    return _contagem_em_cache(
+        'metricas:inscricoes_pendentes', lambda: Inscricao.objects.filter(status='PENDENTE').count()
+    )
+
+
+def _notificacoes_nao_lidas():
+    from .models import Notificacao
+    return _contagem_em_cache(
+        'metricas:notificacoes_nao_lidas', lambda: Notificacao.objects.filter(lida=False).count()
+    )
+
+
+registro.medidor_coletado(
+    'communitylink_pending_inscriptions', 'Inscrições aguardando análise do organizador.', _inscricoes_pendentes,
+)
+registro.medidor_coletado(
+    'communitylink_unread_notifications', 'Notificações ainda não lidas.', _notificacoes_nao_lidas,
+)
+
+
+def metrics_view(request):
+    """ Endpoint /metrics no formato texto do Prometheus. """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        # Sem token só é aberto onde isso é permitido (desenvolvimento)
+        if getattr(settings, 'METRICS_REQUIRE_TOKEN', False):
+            return HttpResponseForbidden()
+    elif not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+        return HttpResponseForbidden()
+    return HttpResponse(registro.exportar(), content_type=CONTENT_TYPE)
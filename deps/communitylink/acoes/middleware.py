@@ -0,0 +1,157 @@
+import cProfile
+import io
+import logging
+import pstats
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics
+from .profiling import ColetorRequisicao, instalar_medicao_templates
+
+logger = logging.getLogger('acoes.profiling')
+
+
+class ProfilingMiddleware:
+    """
+    Mede cada requisição (tempo total, tempo e número de queries, queries
+    repetidas e tempo de template) e registra no logger 'acoes.profiling'
+    as que passarem de PROFILING_SLOW_MS, junto com as queries mais lentas.
+
+    Uma fração PROFILING_SAMPLE_RATE das requisições também é executada
+    sob cProfile e tem as funções mais custosas registradas.
+
+    Opt-in: com PROFILING_ENABLED = False o middleware se remove da cadeia
+    (MiddlewareNotUsed), sem custo nenhum por requisição.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.limite_lento_ms = getattr(settings, 'PROFILING_SLOW_MS', 500)
+        self.taxa_amostragem = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.top_sql = getattr(settings, 'PROFILING_TOP_SQL', 5)
+        instalar_medicao_templates()
+
+    def __call__(self, request):
+        perfilador = None
+        if self.taxa_amostragem and random.random() < self.taxa_amostragem:
+            perfilador = cProfile.Profile()
+
+        with ColetorRequisicao() as coletor:
+            if perfilador:
+                try:
+                    perfilador.enable()
+                except ValueError:
+                    # Outra thread já está sob cProfile (só um perfilador ativo por vez)
+                    perfilador = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if perfilador:
+                    perfilador.disable()
+
+        resumo = coletor.resumo()
+        # Disponível para outros middlewares/métricas
+        request.perfil_requisicao = resumo
+        response['Server-Timing'] = (
+            f"total;dur={resumo['tempo_total_ms']}, db;dur={resumo['tempo_sql_ms']}, "
+            f"tpl;dur={resumo['tempo_template_ms']}"
+        )
+
+        lenta = resumo['tempo_total_ms'] >= self.limite_lento_ms
+        if lenta:
+            logger.warning(self._relatorio(request, response, coletor, resumo))
+        else:
+            logger.debug('%s %s %s %s', request.method, request.path, response.status_code, resumo)
+
+        if perfilador:
+            logger.info('cProfile de %s %s:\n%s', request.method, request.path, self._estatisticas(perfilador))
+
+        return response
+
+    def _relatorio(self, request, response, coletor, resumo):
+        linhas = [
+            f"Requisição lenta: {request.method} {request.path} -> {response.status_code} "
+            f"em {resumo['tempo_total_ms']}ms (sql {resumo['tempo_sql_ms']}ms em {resumo['queries']} queries, "
+            f"template {resumo['tempo_template_ms']}ms)"
+        ]
+        if coletor.queries:
+            linhas.append('Queries mais lentas:')
+            for sql, duracao in coletor.queries_mais_lentas(self.top_sql):
+                linhas.append(f'  {duracao * 1000:.2f}ms {sql}')
+        repetidas = coletor.queries_repetidas()
+        if repetidas:
+            linhas.append('Queries repetidas:')
+            for sql, vezes in repetidas[:self.top_sql]:
+                linhas.append(f'  {vezes}x {sql}')
+        return '\n'.join(linhas)
+
+    def _estatisticas(self, perfilador, limite=25):
+        saida = io.StringIO()
+        pstats.Stats(perfilador, stream=saida).sort_stats('cumulative').print_stats(limite)
+        return saida.getvalue()
+
+
+class MetricsMiddleware:
+    """
+    Alimenta as métricas de /metrics: requisições e latência por nome de
+    rota (ex: acoes:acao_list) e número de queries por requisição.
+    Desligável com METRICS_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        total_queries = 0
+
+        def contar_query(execute, sql, params, many, context):
+            nonlocal total_queries
+            total_queries += 1
+            return execute(sql, params, many, context)
+
+        inicio = time.perf_counter()
+        with ExitStack() as pilha:
+            for conexao in connections.all():
+                pilha.enter_context(conexao.execute_wrapper(contar_query))
+            response = self.get_response(request)
+        duracao = time.perf_counter() - inicio
+
+        # Nome da rota em vez do path: mantém a cardinalidade baixa
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'nao_resolvida'
+        metrics.requisicoes.inc(view=view, method=request.method, status=response.status_code)
+        metrics.latencia.observar(duracao, view=view)
+        metrics.queries_por_requisicao.observar(total_queries, view=view)
+        metrics.registro.talvez_gravar()
+        return response
+
+
+class LimitesMiddleware:
+    """
+    Expõe a cota consumida pelos limites de taxa (acoes.limites) nos
+    cabeçalhos X-RateLimit-Limit/Remaining/Reset e, no 429, Retry-After.
+    Requisições que não passam por nenhum limite saem sem os cabeçalhos.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        cota = getattr(request, 'cota', None)
+        if cota is not None:
+            response['X-RateLimit-Limit'] = str(cota.limite)
+            response['X-RateLimit-Remaining'] = str(cota.restantes)
+            response['X-RateLimit-Reset'] = str(cota.reset)
+            if not cota.permitida:
+                response['Retry-After'] = str(cota.espera)
+        return response
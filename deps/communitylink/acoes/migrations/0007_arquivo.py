@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0006_merge_20251204_1156'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AcaoArquivada',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('titulo', models.CharField(max_length=200)),
+                ('descricao', models.TextField()),
+                ('data', models.DateTimeField()),
+                ('local', models.CharField(max_length=255)),
+                ('numero_vagas', models.PositiveIntegerField()),
+                ('categoria', models.CharField(choices=[('SAUDE', 'Saúde'), ('EDUCACAO', 'Educação'), ('MEIO_AMBIENTE', 'Meio Ambiente'), ('ANIMAIS', 'Animais'), ('OUTRO', 'Outro')], default='OUTRO', max_length=50)),
+                ('notas_organizador', models.TextField(blank=True, null=True)),
+                ('total_aceitos', models.PositiveIntegerField(default=0)),
+                ('arquivada_em', models.DateTimeField(auto_now_add=True)),
+                ('organizador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='acoes_arquivadas', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InscricaoArquivada',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('ACEITO', 'Aceito'), ('REJEITADO', 'Rejeitado'), ('CANCELADO', 'Cancelado')], max_length=10)),
+                ('data_inscricao', models.DateTimeField()),
+                ('comentario', models.TextField(blank=True, null=True)),
+                ('acao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscricoes', to='acoes.acaoarquivada')),
+                ('voluntario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscricoes_arquivadas', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='acaoarquivada',
+            index=models.Index(fields=['organizador', '-data'], name='acoes_acaoa_organiz_d89637_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricaoarquivada',
+            index=models.Index(fields=['voluntario', 'status'], name='acoes_inscr_volunta_013bb4_idx'),
+        ),
+    ]
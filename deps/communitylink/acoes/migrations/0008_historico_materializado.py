@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:18
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0007_arquivo'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroHistorico',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('papel', models.CharField(choices=[('PARTICIPACAO', 'Participação'), ('ORGANIZACAO', 'Organização')], max_length=12)),
+                ('acao_id', models.IntegerField()),
+                ('inscricao_id', models.IntegerField(blank=True, null=True, unique=True)),
+                ('titulo', models.CharField(max_length=200)),
+                ('data', models.DateTimeField()),
+                ('local', models.CharField(max_length=255)),
+                ('categoria', models.CharField(choices=[('SAUDE', 'Saúde'), ('EDUCACAO', 'Educação'), ('MEIO_AMBIENTE', 'Meio Ambiente'), ('ANIMAIS', 'Animais'), ('OUTRO', 'Outro')], max_length=50)),
+                ('duracao_horas', models.PositiveSmallIntegerField(default=2)),
+                ('status', models.CharField(blank=True, choices=[('PENDENTE', 'Pendente'), ('ACEITO', 'Aceito'), ('REJEITADO', 'Rejeitado'), ('CANCELADO', 'Cancelado')], max_length=10)),
+                ('comentario', models.TextField(blank=True, null=True)),
+                ('notas_organizador', models.TextField(blank=True, null=True)),
+                ('participantes', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumoImpacto',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resumo_impacto', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('participacoes', models.PositiveIntegerField(default=0)),
+                ('horas_voluntariadas', models.PositiveIntegerField(default=0)),
+                ('acoes_organizadas', models.PositiveIntegerField(default=0)),
+                ('voluntarios_mobilizados', models.PositiveIntegerField(default=0)),
+                ('por_categoria', models.JSONField(default=dict)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='acao',
+            name='duracao_horas',
+            field=models.PositiveSmallIntegerField(blank=True, default=2, help_text='Duração prevista, em horas (usada no resumo de impacto dos voluntários).', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(24)]),
+        ),
+        migrations.AddField(
+            model_name='acao',
+            name='historico_materializado',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='acaoarquivada',
+            name='duracao_horas',
+            field=models.PositiveSmallIntegerField(default=2),
+        ),
+        migrations.AddIndex(
+            model_name='acao',
+            index=models.Index(fields=['historico_materializado', 'data'], name='acoes_acao_histori_acff65_idx'),
+        ),
+        migrations.AddField(
+            model_name='registrohistorico',
+            name='usuario',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registros_historico', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='registrohistorico',
+            index=models.Index(fields=['usuario', 'papel', '-data'], name='acoes_regis_usuario_ba9e7a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='registrohistorico',
+            unique_together={('usuario', 'papel', 'acao_id')},
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0008_historico_materializado'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('organizador_id', models.IntegerField()),
+                ('dia', models.DateField()),
+                ('marcado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('organizador_id', 'dia')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('categoria', models.CharField(choices=[('SAUDE', 'Saúde'), ('EDUCACAO', 'Educação'), ('MEIO_AMBIENTE', 'Meio Ambiente'), ('ANIMAIS', 'Animais'), ('OUTRO', 'Outro')], max_length=50)),
+                ('dia', models.DateField()),
+                ('acoes', models.PositiveIntegerField(default=0)),
+                ('vagas', models.PositiveIntegerField(default=0)),
+                ('inscricoes', models.PositiveIntegerField(default=0)),
+                ('pendentes', models.PositiveIntegerField(default=0)),
+                ('aceitos', models.PositiveIntegerField(default=0)),
+                ('rejeitados', models.PositiveIntegerField(default=0)),
+                ('cancelados', models.PositiveIntegerField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('organizador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups_diarios', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organizador', 'dia'], name='acoes_rollu_organiz_8dacae_idx')],
+                'unique_together': {('organizador', 'categoria', 'dia')},
+            },
+        ),
+    ]
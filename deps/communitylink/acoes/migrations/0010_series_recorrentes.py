@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:33
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0009_rollups_painel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerieAcao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(max_length=200)),
+                ('descricao', models.TextField()),
+                ('local', models.CharField(max_length=255)),
+                ('categoria', models.CharField(choices=[('SAUDE', 'Saúde'), ('EDUCACAO', 'Educação'), ('MEIO_AMBIENTE', 'Meio Ambiente'), ('ANIMAIS', 'Animais'), ('OUTRO', 'Outro')], default='OUTRO', max_length=50)),
+                ('numero_vagas', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('duracao_horas', models.PositiveSmallIntegerField(default=2, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(24)])),
+                ('frequencia', models.CharField(choices=[('DIARIA', 'Diária'), ('SEMANAL', 'Semanal'), ('MENSAL', 'Mensal')], default='SEMANAL', max_length=10)),
+                ('intervalo', models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('dias_semana', models.CharField(blank=True, max_length=20)),
+                ('hora', models.TimeField()),
+                ('inicio', models.DateField()),
+                ('fim', models.DateField(blank=True, null=True)),
+                ('ativa', models.BooleanField(default=True)),
+                ('materializada_ate', models.DateField(blank=True, editable=False, null=True)),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('organizador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='acao',
+            name='serie',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ocorrencias', to='acoes.serieacao'),
+        ),
+        migrations.AddIndex(
+            model_name='acao',
+            index=models.Index(fields=['data'], name='acoes_acao_data_fbb12a_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='acao',
+            constraint=models.UniqueConstraint(fields=('serie', 'data'), name='acao_serie_data_unica'),
+        ),
+        migrations.AddIndex(
+            model_name='serieacao',
+            index=models.Index(fields=['ativa', 'materializada_ate'], name='acoes_serie_ativa_4282e6_idx'),
+        ),
+    ]
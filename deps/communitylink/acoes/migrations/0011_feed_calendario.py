@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0010_series_recorrentes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCalendario',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_calendario', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('token', models.CharField(max_length=64, unique=True)),
+                ('versao', models.PositiveIntegerField(default=1)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0011_feed_calendario'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Lembrete',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('antecedencia_horas', models.PositiveSmallIntegerField()),
+                ('enviar_em', models.DateTimeField()),
+                ('enviado_em', models.DateTimeField(blank=True, null=True)),
+                ('inscricao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lembretes', to='acoes.inscricao')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('enviado_em__isnull', True)), fields=['enviar_em'], name='lembrete_pendente_idx')],
+                'unique_together': {('inscricao', 'antecedencia_horas')},
+            },
+        ),
+    ]
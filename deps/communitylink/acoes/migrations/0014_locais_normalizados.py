@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0013_coordenadas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Local',
+            fields=[
+                ('chave', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('nome', models.CharField(max_length=255)),
+                ('criado_em', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='acao',
+            name='local_normalizado',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='acoes', to='acoes.local'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0014_locais_normalizados'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RespostaIdempotente',
+            fields=[
+                ('chave', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('assinatura', models.CharField(max_length=64)),
+                ('status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('corpo', models.BinaryField(blank=True, default=b'')),
+                ('expira_em', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
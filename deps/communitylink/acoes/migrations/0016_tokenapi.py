@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0015_idempotencia'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenApi',
+            fields=[
+                ('chave', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('nome', models.CharField(blank=True, max_length=100)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('expira_em', models.DateTimeField()),
+                ('revogado_em', models.DateTimeField(blank=True, null=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens_api', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoes', '0016_tokenapi'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='acaoarquivada',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='inscricaoarquivada',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='registrohistorico',
+            name='acao_id',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='registrohistorico',
+            name='inscricao_id',
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -3,10 +3,42 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core import validators
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
+class AcaoQuerySet(models.QuerySet):
+    def com_vagas_preenchidas(self):
+        """
+        Anota `total_aceitos` (inscrições ACEITAS) em cada ação, evitando um
+        COUNT por linha quando a listagem usa vagas_preenchidas/esta_cheia.
+        Usa subquery correlacionada: o banco só conta as linhas devolvidas
+        (após o LIMIT da paginação), sem GROUP BY na tabela inteira.
+        """
+        aceitos = (
+            Inscricao.objects.filter(acao=OuterRef('pk'), status='ACEITO')
+            .order_by()
+            .values('acao')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return self.annotate(total_aceitos=Coalesce(Subquery(aceitos), 0))
+
+
+class Local(models.Model):
+    """ Local normalizado (acoes.locais): variações de grafia viram a mesma chave. """
+    # Texto dobrado: sem acento, minúsculo, sem pontuação e sem a UF final
+    chave = models.CharField(max_length=255, primary_key=True)
+    # Grafia da primeira ação com esse local (exibida no autocompletar)
+    nome = models.CharField(max_length=255)
+    criado_em = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.nome
+
+
 class Acao(models.Model):
     # Campos que você definiu
     titulo = models.CharField(max_length=200)
@@ -45,6 +77,50 @@ class Acao(models.Model):
     )
 
     notas_organizador = models.TextField(blank=True, null=True, help_text="Notas privadas do organizador sobre a execução da ação.")
+
+    duracao_horas = models.PositiveSmallIntegerField(
+        default=2, blank=True,
+        validators=[validators.MinValueValidator(1), validators.MaxValueValidator(24)],
+        help_text="Duração prevista, em horas (usada no resumo de impacto dos voluntários).",
+    )
+
+    # True depois que a ação passou e entrou no histórico materializado (RegistroHistorico)
+    historico_materializado = models.BooleanField(default=False, editable=False)
+
+    # Ocorrência de uma série recorrente (criada por acoes.series); None nas ações avulsas
+    serie = models.ForeignKey(
+        'SerieAcao', on_delete=models.SET_NULL, null=True, blank=True, editable=False,
+        related_name='ocorrencias',
+    )
+
+    # Chave normalizada do `local` (filtro por igualdade e autocompletar)
+    local_normalizado = models.ForeignKey(
+        Local, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='acoes',
+    )
+
+    # Coordenadas (acoes.geo): geocodificadas a partir de `local` quando ele muda
+    latitude = models.FloatField(
+        null=True, blank=True, validators=[validators.MinValueValidator(-90), validators.MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True, blank=True, validators=[validators.MinValueValidator(-180), validators.MaxValueValidator(180)],
+    )
+    # Célula da grade espacial (índice da busca por proximidade)
+    geo_celula = models.IntegerField(null=True, blank=True, editable=False, db_index=True)
+
+    objects = AcaoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Ações passadas ainda não materializadas (varredura de acoes.historico)
+            models.Index(fields=['historico_materializado', 'data']),
+            # acao_list: data >= hoje ORDER BY data (avulsas e ocorrências de séries juntas)
+            models.Index(fields=['data']),
+        ]
+        constraints = [
+            # Materialização idempotente: uma ocorrência por série e horário
+            models.UniqueConstraint(fields=['serie', 'data'], name='acao_serie_data_unica'),
+        ]
     
     # --- Propriedades Úteis (Lógica no Modelo) ---
 
@@ -56,6 +132,10 @@ class Acao(models.Model):
     @property
     def vagas_preenchidas(self):
         """ Retorna a contagem de voluntários ACEITOS. """
+        # Usa a anotação de com_vagas_preenchidas() quando disponível
+        total = getattr(self, 'total_aceitos', None)
+        if total is not None:
+            return total
         return self.inscricao_set.filter(status='ACEITO').count()
 
     @property
@@ -74,7 +154,21 @@ class Acao(models.Model):
         #garante que a data seja sempre timezone-aware
         if self.data and timezone.is_naive(self.data):
             self.data = timezone.make_aware(self.data)
+        from .geo import preencher_coordenadas, precisa_geocodificar
+        from .locais import registrar_locais
+        preencher_coordenadas(self, self.local, precisa_geocodificar(self, 'local'))
+        registrar_locais([self])
         super().save(*args, **kwargs)
+        self._geo_original = (self.local, self.latitude, self.longitude)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Organizador/data como vieram do banco: se mudarem, o dia antigo
+        # também precisa ser reagregado nos rollups do painel
+        instance._dia_original = (instance.__dict__.get('organizador_id'), instance.__dict__.get('data'))
+        instance._geo_original = tuple(instance.__dict__.get(campo) for campo in ('local', 'latitude', 'longitude'))
+        return instance
 
 
 class Inscricao(models.Model):
@@ -107,6 +201,299 @@ class Inscricao(models.Model):
         return f'{self.voluntario.username} em {self.acao.titulo} ({self.status})'
 
 
+# --- LEMBRETES ---
+# Um por inscrição aceita e antecedência (LEMBRETES_ANTECEDENCIAS_HORAS),
+# agendados pelos signals abaixo e enviados pelo comando run_scheduler.
+
+class Lembrete(models.Model):
+    inscricao = models.ForeignKey(Inscricao, on_delete=models.CASCADE, related_name='lembretes')
+    antecedencia_horas = models.PositiveSmallIntegerField()
+    enviar_em = models.DateTimeField()
+    # None enquanto não enviado
+    enviado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Agendamento idempotente: um lembrete por inscrição e antecedência
+        unique_together = ('inscricao', 'antecedencia_horas')
+        indexes = [
+            # Fila do scheduler: só os pendentes, em ordem de envio
+            models.Index(fields=['enviar_em'], condition=models.Q(enviado_em__isnull=True),
+                         name='lembrete_pendente_idx'),
+        ]
+
+    def __str__(self):
+        return f'Lembrete {self.antecedencia_horas}h da inscrição {self.inscricao_id}'
+
+
+# --- SÉRIES RECORRENTES ---
+# A série guarda o modelo da ação e a regra de recorrência. As ocorrências são
+# Acoes comuns (vagas e inscrições próprias), criadas aos poucos pelo comando
+# materializar_series numa janela móvel (SERIES_JANELA_DIAS) à frente de hoje.
+
+class SerieAcao(models.Model):
+    FREQUENCIA_CHOICES = [
+        ('DIARIA', 'Diária'),
+        ('SEMANAL', 'Semanal'),
+        ('MENSAL', 'Mensal'),
+    ]
+    DIA_SEMANA_CHOICES = [
+        ('0', 'Segunda'), ('1', 'Terça'), ('2', 'Quarta'), ('3', 'Quinta'),
+        ('4', 'Sexta'), ('5', 'Sábado'), ('6', 'Domingo'),
+    ]
+
+    organizador = models.ForeignKey(User, on_delete=models.CASCADE, related_name='series')
+    titulo = models.CharField(max_length=200)
+    descricao = models.TextField()
+    local = models.CharField(max_length=255)
+    categoria = models.CharField(max_length=50, choices=Acao.CATEGORIA_CHOICES, default='OUTRO')
+    numero_vagas = models.PositiveIntegerField(validators=[validators.MinValueValidator(1)])
+    duracao_horas = models.PositiveSmallIntegerField(
+        default=2, validators=[validators.MinValueValidator(1), validators.MaxValueValidator(24)],
+    )
+
+    # --- Regra de recorrência ---
+    frequencia = models.CharField(max_length=10, choices=FREQUENCIA_CHOICES, default='SEMANAL')
+    # A cada N dias/semanas/meses
+    intervalo = models.PositiveSmallIntegerField(default=1, validators=[validators.MinValueValidator(1)])
+    # Séries semanais: dias da semana separados por vírgula (0 = segunda). Ex: "5" (sábados)
+    dias_semana = models.CharField(max_length=20, blank=True)
+    hora = models.TimeField()
+    inicio = models.DateField()
+    fim = models.DateField(null=True, blank=True)
+
+    ativa = models.BooleanField(default=True)
+    # Até onde as ocorrências já foram criadas (janela móvel)
+    materializada_ate = models.DateField(null=True, blank=True, editable=False)
+    criada_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['ativa', 'materializada_ate'])]
+
+    def get_dias_semana_list(self):
+        return [int(dia) for dia in self.dias_semana.split(',') if dia != '']
+
+    def __str__(self):
+        return f'{self.titulo} ({self.get_frequencia_display()})'
+
+
+# --- ARQUIVO (camada fria) ---
+# Ações passadas há mais de ARQUIVO_MESES meses saem de Acao/Inscricao (comando
+# arquivar_acoes) e vêm para cá mantendo a mesma pk. Assim as tabelas quentes,
+# consultadas por todas as listagens, ficam pequenas. Só o histórico e o
+# detalhe de ações antigas leem estas tabelas.
+
+class AcaoArquivada(models.Model):
+    """ Cópia somente leitura de uma Ação passada (mesma pk da original). """
+    # BigInteger como o BigAutoField de Acao (DEFAULT_AUTO_FIELD)
+    id = models.BigIntegerField(primary_key=True)
+    titulo = models.CharField(max_length=200)
+    descricao = models.TextField()
+    data = models.DateTimeField()
+    local = models.CharField(max_length=255)
+    numero_vagas = models.PositiveIntegerField()
+    categoria = models.CharField(max_length=50, choices=Acao.CATEGORIA_CHOICES, default='OUTRO')
+    organizador = models.ForeignKey(User, on_delete=models.CASCADE, related_name='acoes_arquivadas')
+    notas_organizador = models.TextField(blank=True, null=True)
+    duracao_horas = models.PositiveSmallIntegerField(default=2)
+    # Congelado no arquivamento: ações passadas não recebem mais inscrições
+    total_aceitos = models.PositiveIntegerField(default=0)
+    arquivada_em = models.DateTimeField(auto_now_add=True)
+
+    arquivada = True
+    ja_aconteceu = True
+    esta_cheia = False
+
+    class Meta:
+        indexes = [models.Index(fields=['organizador', '-data'])]
+
+    @property
+    def vagas_preenchidas(self):
+        return self.total_aceitos
+
+    def __str__(self):
+        return self.titulo
+
+    def get_absolute_url(self):
+        return reverse('acoes:acao_detail', kwargs={'pk': self.pk})
+
+
+class InscricaoArquivada(models.Model):
+    """ Inscrição de uma ação arquivada (mesma pk da original). """
+    id = models.BigIntegerField(primary_key=True)
+    acao = models.ForeignKey(AcaoArquivada, on_delete=models.CASCADE, related_name='inscricoes')
+    voluntario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='inscricoes_arquivadas')
+    status = models.CharField(max_length=10, choices=Inscricao.STATUS_CHOICES)
+    data_inscricao = models.DateTimeField()
+    comentario = models.TextField(blank=True, null=True)
+
+    arquivada = True
+
+    class Meta:
+        indexes = [models.Index(fields=['voluntario', 'status'])]
+
+    def __str__(self):
+        return f'{self.voluntario.username} em {self.acao.titulo} ({self.status})'
+
+
+# --- HISTÓRICO MATERIALIZADO ---
+# Uma linha por ação passada e por pessoa envolvida (organizador ou voluntário
+# ACEITO/CANCELADO), com os dados que a página de histórico mostra. Mantida
+# por acoes.historico; a página lê só esta tabela (sem JOIN nem COUNT por ação)
+# e continua válida depois que a ação vai para o arquivo.
+
+class RegistroHistorico(models.Model):
+    PAPEL_CHOICES = [
+        ('PARTICIPACAO', 'Participação'),
+        ('ORGANIZACAO', 'Organização'),
+    ]
+
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='registros_historico')
+    papel = models.CharField(max_length=12, choices=PAPEL_CHOICES)
+    # Sem FK: a ação pode estar em Acao ou em AcaoArquivada (mesma pk)
+    acao_id = models.BigIntegerField()
+    inscricao_id = models.BigIntegerField(null=True, blank=True, unique=True)
+
+    titulo = models.CharField(max_length=200)
+    data = models.DateTimeField()
+    local = models.CharField(max_length=255)
+    categoria = models.CharField(max_length=50, choices=Acao.CATEGORIA_CHOICES)
+    duracao_horas = models.PositiveSmallIntegerField(default=2)
+
+    # Participação
+    status = models.CharField(max_length=10, choices=Inscricao.STATUS_CHOICES, blank=True)
+    comentario = models.TextField(blank=True, null=True)
+    # Organização
+    notas_organizador = models.TextField(blank=True, null=True)
+    participantes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('usuario', 'papel', 'acao_id')
+        indexes = [models.Index(fields=['usuario', 'papel', '-data'])]
+
+    @property
+    def vagas_preenchidas(self):
+        return self.participantes
+
+    def __str__(self):
+        return f'{self.usuario_id} - {self.get_papel_display()} em {self.titulo}'
+
+    def get_absolute_url(self):
+        return reverse('acoes:acao_detail', kwargs={'pk': self.acao_id})
+
+
+class ResumoImpacto(models.Model):
+    """ Totais do histórico de um usuário, recalculados junto com os registros. """
+    usuario = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='resumo_impacto')
+    participacoes = models.PositiveIntegerField(default=0)
+    horas_voluntariadas = models.PositiveIntegerField(default=0)
+    acoes_organizadas = models.PositiveIntegerField(default=0)
+    voluntarios_mobilizados = models.PositiveIntegerField(default=0)
+    # {"SAUDE": 3, "EDUCACAO": 1} (participações aceitas por categoria)
+    por_categoria = models.JSONField(default=dict)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    def categorias(self):
+        """ [(rótulo, quantidade)] em ordem decrescente, para o template. """
+        rotulos = dict(Acao.CATEGORIA_CHOICES)
+        itens = sorted(self.por_categoria.items(), key=lambda item: (-item[1], item[0]))
+        return [(rotulos.get(categoria, categoria), total) for categoria, total in itens]
+
+    def __str__(self):
+        return f'Impacto de {self.usuario_id}'
+
+
+# --- ROLLUPS DO PAINEL DO ORGANIZADOR ---
+# Contagens diárias por organizador/categoria (dia = data local da ação), nas
+# duas camadas (quente + arquivo). O painel soma só estas linhas em vez de
+# agregar Inscricao. Mantidas por acoes.rollups: os signals marcam o dia em
+# DiaPendente e o comando agregar_rollups reprocessa apenas os dias marcados.
+
+class RollupDiario(models.Model):
+    organizador = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rollups_diarios')
+    categoria = models.CharField(max_length=50, choices=Acao.CATEGORIA_CHOICES)
+    dia = models.DateField()
+
+    acoes = models.PositiveIntegerField(default=0)
+    vagas = models.PositiveIntegerField(default=0)
+    inscricoes = models.PositiveIntegerField(default=0)
+    pendentes = models.PositiveIntegerField(default=0)
+    aceitos = models.PositiveIntegerField(default=0)
+    rejeitados = models.PositiveIntegerField(default=0)
+    cancelados = models.PositiveIntegerField(default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('organizador', 'categoria', 'dia')
+        indexes = [models.Index(fields=['organizador', 'dia'])]
+
+    def __str__(self):
+        return f'{self.organizador_id} - {self.categoria} em {self.dia}'
+
+
+class DiaPendente(models.Model):
+    """ Fila de dias (por organizador) que precisam ser reagregados. """
+    organizador_id = models.IntegerField()
+    dia = models.DateField()
+    marcado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('organizador_id', 'dia')
+
+    def __str__(self):
+        return f'{self.organizador_id} em {self.dia}'
+
+
+# --- FEED DE CALENDÁRIO (iCal) ---
+# Link secreto por usuário. `versao` sobe (signals abaixo) sempre que muda
+# alguma linha que aparece no feed; vira o ETag e a chave do cache, então
+# clientes que consultam a cada 15 minutos custam uma query (304 ou cache).
+
+class FeedCalendario(models.Model):
+    usuario = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='feed_calendario')
+    token = models.CharField(max_length=64, unique=True)
+    versao = models.PositiveIntegerField(default=1)
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Calendário de {self.usuario_id}'
+
+    def get_absolute_url(self):
+        return reverse('acoes:calendario_feed', kwargs={'token': self.token})
+
+
+# --- IDEMPOTÊNCIA DA API ---
+# Resposta guardada por (usuário, Idempotency-Key) para que a repetição de um
+# POST devolva a resposta original sem executar a view de novo. `status` nulo
+# = primeira requisição ainda em andamento. Ver acoes.idempotencia.
+
+class RespostaIdempotente(models.Model):
+    # sha256 de usuário + chave enviada pelo cliente
+    chave = models.CharField(max_length=64, primary_key=True)
+    # sha256 de método + caminho + corpo: mesma chave com outra requisição é erro
+    assinatura = models.CharField(max_length=64)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    # JSON da resposta comprimido com zlib
+    corpo = models.BinaryField(blank=True, default=b'')
+    expira_em = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'Resposta idempotente {self.chave[:12]}'
+
+
+class TokenApi(models.Model):
+    """ Token de acesso à API (Authorization: Bearer); o token em si não é guardado. """
+    # sha256 do token entregue ao cliente
+    chave = models.CharField(max_length=64, primary_key=True)
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tokens_api')
+    nome = models.CharField(max_length=100, blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    expira_em = models.DateTimeField()
+    revogado_em = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Token {self.chave[:12]} de {self.usuario_id}'
+
+
 class Notificacao(models.Model):
     """ Modelo para notificações no sistema. """
     destinatario = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -131,9 +518,30 @@ class Perfil(models.Model):
     # Ex: "SAUDE,EDUCACAO"
     preferencias = models.CharField(max_length=255, blank=True, null=True)
 
+    # Coordenadas do endereço (acoes.geo), usadas no filtro "perto de mim"
+    latitude = models.FloatField(
+        null=True, blank=True, validators=[validators.MinValueValidator(-90), validators.MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True, blank=True, validators=[validators.MinValueValidator(-180), validators.MaxValueValidator(180)],
+    )
+
     def __str__(self):
         return f"Perfil de {self.user.username}"
 
+    def save(self, *args, **kwargs):
+        from .geo import preencher_coordenadas, precisa_geocodificar
+        preencher_coordenadas(self, self.endereco, precisa_geocodificar(self, 'endereco'))
+        super().save(*args, **kwargs)
+        self._geo_original = (self.endereco, self.latitude, self.longitude)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Só geocodifica de novo quando o endereço muda (o perfil é salvo a cada login)
+        instance._geo_original = tuple(instance.__dict__.get(campo) for campo in ('endereco', 'latitude', 'longitude'))
+        return instance
+
     # Método auxiliar para pegar as preferências como lista no template
     def get_preferencias_list(self):
         if self.preferencias:
@@ -148,4 +556,138 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    instance.perfil.save()
\ No newline at end of file
+    instance.perfil.save()
+
+
+# --- SIGNALS (tokens da API) ---
+# O cache dos tokens guarda os dados e os grupos do usuário: qualquer mudança
+# neles invalida os tokens do usuário (sem query, só um incremento no cache).
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidar_tokens_do_usuario(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    from .tokens import invalidar_usuarios
+    invalidar_usuarios([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidar_tokens_por_grupo(sender, instance, action, reverse, pk_set, **kwargs):
+    from .tokens import invalidar_usuarios
+    if action == 'pre_clear' and reverse:
+        # group.user_set.clear(): os membros só são conhecidos antes de sair
+        invalidar_usuarios(instance.user_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        invalidar_usuarios((pk_set or ()) if reverse else [instance.pk])
+
+
+# --- SIGNALS (histórico materializado) ---
+# Só mudanças em ações que já entraram no histórico precisam ser propagadas;
+# ações que ainda vão acontecer são materializadas quando passam da data.
+
+@receiver(post_save, sender=Acao)
+def atualizar_historico_da_acao(sender, instance, raw=False, **kwargs):
+    if instance.historico_materializado and not raw:
+        from .historico import materializar_acoes
+        materializar_acoes([instance.pk])
+
+
+@receiver(post_save, sender=Inscricao)
+def atualizar_historico_da_inscricao(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # Uma única leitura da ação serve ao histórico, aos rollups do painel e aos lembretes
+    if Inscricao.acao.is_cached(instance):
+        acao = instance.acao
+        dados = (acao.organizador_id, acao.data, acao.historico_materializado)
+    else:
+        dados = Acao.objects.filter(pk=instance.acao_id).values_list(
+            'organizador_id', 'data', 'historico_materializado'
+        ).first()
+    if dados is None:
+        return
+    organizador_id, data, materializada = dados
+    from .rollups import marcar_dias
+    marcar_dias([(organizador_id, data)])
+    from . import lembretes
+    if instance.status == 'ACEITO':
+        lembretes.agendar([instance.pk], data)
+    elif not created:
+        lembretes.cancelar(instance.pk)
+    if materializada:
+        from .historico import materializar_acoes
+        materializar_acoes([instance.acao_id])
+
+
+@receiver(post_save, sender=InscricaoArquivada)
+def atualizar_comentario_arquivado(sender, instance, raw=False, **kwargs):
+    if not raw:
+        RegistroHistorico.objects.filter(inscricao_id=instance.pk).update(
+            status=instance.status, comentario=instance.comentario,
+        )
+
+
+@receiver(post_save, sender=AcaoArquivada)
+def atualizar_notas_arquivadas(sender, instance, raw=False, **kwargs):
+    if not raw:
+        RegistroHistorico.objects.filter(acao_id=instance.pk, papel='ORGANIZACAO').update(
+            notas_organizador=instance.notas_organizador,
+        )
+
+
+# --- SIGNALS (rollups do painel) ---
+# Marcar o dia é um INSERT idempotente; a agregação fica para o agregar_rollups.
+
+@receiver(post_save, sender=Acao)
+def marcar_dia_da_acao(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .rollups import marcar_dias
+    dias = [(instance.organizador_id, instance.data)]
+    original = getattr(instance, '_dia_original', None)
+    if original and None not in original:
+        dias.append(original)
+    marcar_dias(dias)
+    instance._dia_original = (instance.organizador_id, instance.data)
+
+
+@receiver(post_delete, sender=Acao)
+def marcar_dia_da_acao_removida(sender, instance, **kwargs):
+    from .rollups import marcar_dias
+    marcar_dias([(instance.organizador_id, instance.data)])
+
+
+# --- SIGNALS (lembretes) ---
+# Inscrições são tratadas em atualizar_historico_da_inscricao (já lê a data da ação).
+
+@receiver(post_save, sender=Acao)
+def reagendar_lembretes_da_acao(sender, instance, created, raw=False, **kwargs):
+    # Um UPDATE pelos lembretes pendentes da ação (nenhum na criação)
+    if not raw and not created:
+        from .lembretes import reagendar_acao
+        reagendar_acao(instance.pk, instance.data)
+
+
+# --- SIGNALS (feed de calendário) ---
+# Um UPDATE só nos usuários que têm feed; quem não tem não paga nada além dele.
+
+@receiver(post_save, sender=Inscricao)
+def invalidar_calendario_da_inscricao(sender, instance, raw=False, **kwargs):
+    if not raw:
+        from .calendario import invalidar_calendarios
+        invalidar_calendarios(usuario_id=instance.voluntario_id)
+
+
+@receiver(post_save, sender=Acao)
+def invalidar_calendario_da_acao(sender, instance, raw=False, **kwargs):
+    if not raw:
+        from .calendario import invalidar_calendarios
+        invalidar_calendarios(acao=instance)
+
+
+@receiver(pre_delete, sender=Acao)
+def invalidar_calendario_da_acao_removida(sender, instance, **kwargs):
+    # pre_delete: as inscrições (e os voluntários a avisar) ainda existem
+    from .calendario import invalidar_calendarios
+    invalidar_calendarios(acao=instance)
@@ -0,0 +1,95 @@
+"""
+Decisão em lote das inscrições de uma ação (aceitar/rejeitar várias de uma vez).
+
+Tudo numa transação com a linha da ação travada (select_for_update), então
+dois lotes simultâneos (duas abas, página + API) não passam do número de
+vagas: os aceites seguem a ordem de inscrição (FIFO) até lotar e o resto
+volta como `sem_vaga`. O número de queries não depende do tamanho do lote:
+um UPDATE para as inscrições e um INSERT para as notificações.
+
+Usado pela página de gerenciamento (acao_manage_lote) e pela API
+(POST /api/acoes/{id}/inscricoes/bulk/).
+"""
+
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from . import lembretes, metrics
+from .calendario import invalidar_calendarios
+from .models import Acao, Inscricao, Notificacao
+from .rollups import marcar_dias
+
+# Status de destino -> como aparece na notificação ao voluntário
+DECISOES = {'ACEITO': 'Aceita', 'REJEITADO': 'Rejeitada'}
+
+
+class ErroModeracao(Exception):
+    """ Lote que não pode ser aplicado (status inválido, ação já realizada). """
+
+
+def ler_ids(valores):
+    """ Lista de ids (strings do formulário ou inteiros do JSON) -> set de int. """
+    try:
+        return {int(valor) for valor in valores}
+    except (TypeError, ValueError):
+        raise ErroModeracao('Informe os ids das inscrições.')
+
+
+def decidir_inscricoes(acao_id, inscricao_ids, status, agora=None):
+    """
+    Aplica `status` ('ACEITO' ou 'REJEITADO') às inscrições PENDENTES de
+    `inscricao_ids`. Retorna {'status', 'aplicadas', 'sem_vaga', 'ignoradas'}
+    (listas de ids); `ignoradas` são as que não existem na ação ou não estão pendentes.
+    """
+    if status not in DECISOES:
+        raise ErroModeracao('Status inválido.')
+    agora = agora or timezone.now()
+    ids = ler_ids(inscricao_ids)
+
+    with transaction.atomic():
+        # Trava a ação: lotes simultâneos disputam as mesmas vagas
+        acao = Acao.objects.select_for_update().get(pk=acao_id)
+        if acao.data < agora:
+            raise ErroModeracao('Esta ação já foi concluída. Não é possível alterar inscrições.')
+
+        selecionadas = list(
+            Inscricao.objects.filter(acao_id=acao.pk, pk__in=ids, status='PENDENTE')
+            .order_by('data_inscricao', 'pk')
+            .values_list('pk', 'voluntario_id')
+        )
+        aplicadas, sem_vaga = selecionadas, []
+        if status == 'ACEITO':
+            vagas = max(acao.numero_vagas - Inscricao.objects.filter(acao_id=acao.pk, status='ACEITO').count(), 0)
+            aplicadas, sem_vaga = selecionadas[:vagas], selecionadas[vagas:]
+
+        if aplicadas:
+            aplicadas_ids = [pk for pk, _ in aplicadas]
+            Inscricao.objects.filter(pk__in=aplicadas_ids).update(status=status)
+            # update() não dispara os signals de Inscricao: os mesmos efeitos, em lote
+            marcar_dias([(acao.organizador_id, acao.data)])
+            if status == 'ACEITO':
+                lembretes.agendar(aplicadas_ids, acao.data, agora)
+                invalidar_calendarios(acao=acao)
+            if acao.historico_materializado:
+                from .historico import materializar_acoes
+                materializar_acoes([acao.pk])
+
+            link = reverse('acoes:acao_detail', args=[acao.pk])
+            Notificacao.objects.bulk_create([
+                Notificacao(
+                    destinatario_id=voluntario_id,
+                    mensagem=f"Sua inscrição para '{acao.titulo[:150]}' foi {DECISOES[status]}.",
+                    link=link,
+                )
+                for _, voluntario_id in aplicadas
+            ])
+            metrics.registrar_fanout('inscricoes_decididas', len(aplicadas))
+
+    encontradas = {pk for pk, _ in selecionadas}
+    return {
+        'status': status,
+        'aplicadas': [pk for pk, _ in aplicadas],
+        'sem_vaga': [pk for pk, _ in sem_vaga],
+        'ignoradas': sorted(ids - encontradas),
+    }
@@ -1,6 +1,19 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
 
+def no_grupo(user, nome):
+    """
+    O usuário está no grupo `nome`? Os grupos são lidos numa query e guardados
+    no próprio objeto, então as sub-requisições de um lote (/api/batch/), que
+    compartilham o usuário, não repetem a consulta.
+    """
+    if not user.is_authenticated:
+        return False
+    if not hasattr(user, '_nomes_grupos'):
+        user._nomes_grupos = set(user.groups.values_list('name', flat=True))
+    return nome in user._nomes_grupos
+
+
 class IsOrganizadorOrReadOnly(BasePermission):
     """
     Permite leitura para qualquer usuário.
@@ -13,10 +26,7 @@ class IsOrganizadorOrReadOnly(BasePermission):
             return True
 
         # Escrita apenas para organizadores autenticados
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name='Organizadores').exists()
-        )
+        return no_grupo(request.user, 'Organizadores')
 
     def has_object_permission(self, request, view, obj):
         # Leitura liberada
@@ -38,9 +48,14 @@ class IsVoluntarioOrReadOnly(BasePermission):
             return True
 
         # Escrita apenas para voluntários autenticados
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name='Voluntários').exists()
-        )
+        return no_grupo(request.user, 'Voluntários')
+
 
-from rest_framework.permissions import BasePermission, SAFE_METHODS
\ No newline at end of file
+class IsOrganizador(BasePermission):
+    """
+    Acesso apenas para usuários autenticados do grupo 'Organizadores' (ou
+    superusuários, como nas páginas do site).
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_superuser or no_grupo(request.user, 'Organizadores')
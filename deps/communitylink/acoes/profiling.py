@@ -0,0 +1,119 @@
+"""
+Coleta de métricas por requisição usada pelo ProfilingMiddleware.
+
+- ColetorRequisicao: tempo total, tempo/quantidade de queries, queries
+  repetidas (por impressão digital) e tempo de renderização de templates.
+- instalar_medicao_templates(): envolve Template.render uma única vez para
+  somar o tempo de renderização da requisição em andamento.
+"""
+
+import contextvars
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.db import connections
+from django.template.base import Template
+
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_LISTA_IN = re.compile(r'\bIN \((?:\?, )*\?\)')
+_RE_ESPACOS = re.compile(r'\s+')
+
+# Coletor da requisição em andamento (None quando não há medição)
+_coletor_atual = contextvars.ContextVar('coletor_atual', default=None)
+_medicao_templates_instalada = False
+
+
+def impressao_digital(sql):
+    """ Normaliza o SQL trocando valores literais por '?' (agrupa queries iguais). """
+    sql = _RE_STRING.sub('?', sql)
+    sql = _RE_NUMERO.sub('?', sql)
+    sql = _RE_LISTA_IN.sub('IN (...)', sql)
+    return _RE_ESPACOS.sub(' ', sql).strip()
+
+
+def instalar_medicao_templates():
+    """
+    Envolve Template.render para medir o tempo de renderização.
+    Só o template mais externo é somado (includes/extends ficam dentro dele).
+    Fora de uma requisição medida o custo é um ContextVar.get().
+    """
+    global _medicao_templates_instalada
+    if _medicao_templates_instalada:
+        return
+    render_original = Template.render
+
+    def render_medido(self, context):
+        coletor = _coletor_atual.get()
+        if coletor is None:
+            return render_original(self, context)
+        coletor.profundidade_template += 1
+        inicio = time.perf_counter()
+        try:
+            return render_original(self, context)
+        finally:
+            coletor.profundidade_template -= 1
+            if coletor.profundidade_template == 0:
+                coletor.tempo_template += time.perf_counter() - inicio
+
+    Template.render = render_medido
+    _medicao_templates_instalada = True
+
+
+class ColetorRequisicao:
+    """ Acumula as medições de uma requisição. Use como context manager. """
+
+    def __init__(self):
+        self.queries = []  # (sql, duração em segundos)
+        self.tempo_template = 0.0
+        self.profundidade_template = 0
+        self.inicio = None
+        self.duracao = 0.0
+        self._pilha = None
+        self._token = None
+
+    def _wrapper_sql(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - inicio))
+
+    def __enter__(self):
+        self._pilha = ExitStack()
+        for conexao in connections.all():
+            self._pilha.enter_context(conexao.execute_wrapper(self._wrapper_sql))
+        self._token = _coletor_atual.set(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duracao = time.perf_counter() - self.inicio
+        _coletor_atual.reset(self._token)
+        self._pilha.close()
+        return False
+
+    # --- Resultados ---
+
+    @property
+    def tempo_sql(self):
+        return sum(duracao for _, duracao in self.queries)
+
+    def queries_repetidas(self, minimo=2):
+        """ [(impressão digital, vezes)] das queries executadas mais de uma vez. """
+        contagem = Counter(impressao_digital(sql) for sql, _ in self.queries)
+        return [(sql, n) for sql, n in contagem.most_common() if n >= minimo]
+
+    def queries_mais_lentas(self, limite=5):
+        return sorted(self.queries, key=lambda q: q[1], reverse=True)[:limite]
+
+    def resumo(self):
+        return {
+            'tempo_total_ms': round(self.duracao * 1000, 2),
+            'tempo_sql_ms': round(self.tempo_sql * 1000, 2),
+            'tempo_template_ms': round(self.tempo_template * 1000, 2),
+            'queries': len(self.queries),
+            'queries_repetidas': len(self.queries_repetidas()),
+        }
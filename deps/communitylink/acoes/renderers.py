@@ -0,0 +1,102 @@
+"""
+Renderer e parser JSON da API com orjson (opcional), e NDJSON em streaming.
+
+Com o orjson instalado (requirements-production.txt), codificar e decodificar
+o JSON da API fica várias vezes mais rápido que o `json` da biblioteca padrão.
+Sem ele, ou quando o cliente pede indentação, ambos caem no JSONRenderer /
+JSONParser do DRF, então a saída é a mesma nos dois casos: datas, Decimal,
+UUID etc. passam pelo mesmo encoder do DRF.
+
+NDJSON (application/x-ndjson, um objeto JSON por linha) é o formato das
+integrações que puxam o catálogo inteiro: as listagens o servem em streaming
+(resposta_ndjson), lendo o banco em lotes, com memória constante.
+"""
+
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele, o json da biblioteca padrão
+    orjson = None
+
+_encoder = JSONEncoder()
+NDJSON = 'application/x-ndjson'
+# Bytes acumulados antes de mandar um pedaço da resposta
+TAMANHO_BLOCO = 64 * 1024
+
+
+def _padrao(valor):
+    # Tipos que o orjson não conhece (ou que o DRF formata do seu jeito, como datetime)
+    return _encoder.default(valor)
+
+
+class JSONRapidoRenderer(renderers.JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        conteudo = orjson.dumps(data, default=_padrao, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        # Como o JSONRenderer: U+2028/U+2029 escapados (JSON embutido em <script>)
+        return conteudo.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class JSONRapidoParser(parsers.JSONParser):
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            conteudo = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                conteudo = conteudo.decode(encoding)
+            return orjson.loads(conteudo)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+def _linha_json(objeto):
+    if orjson is not None:
+        return orjson.dumps(objeto, default=_padrao, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(objeto, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def gerar_ndjson(objetos):
+    """ Uma linha JSON por objeto, agrupadas em blocos de ~TAMANHO_BLOCO bytes. """
+    bloco, tamanho = [], 0
+    for objeto in objetos:
+        linha = _linha_json(objeto) + b'\n'
+        bloco.append(linha)
+        tamanho += len(linha)
+        if tamanho >= TAMANHO_BLOCO:
+            yield b''.join(bloco)
+            bloco, tamanho = [], 0
+    if bloco:
+        yield b''.join(bloco)
+
+
+def resposta_ndjson(objetos):
+    """ StreamingHttpResponse NDJSON: `objetos` só é percorrido enquanto o corpo é enviado. """
+    return StreamingHttpResponse(gerar_ndjson(objetos), content_type=NDJSON)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Negociação do NDJSON (Accept ou ?format=ndjson). As listagens respondem
+    em streaming sem passar por aqui; o render só atende as demais respostas
+    (erros, detalhe) com uma linha por objeto.
+    """
+    media_type = NDJSON
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b''.join(gerar_ndjson(data if isinstance(data, list) else [data]))
@@ -0,0 +1,198 @@
+"""
+Rollups diários do painel do organizador (RollupDiario).
+
+- Os signals em models.py chamam `marcar_dias()` a cada mudança em ação ou
+  inscrição: só um INSERT idempotente em DiaPendente (organizador, dia local).
+- `agregar_rollups()` reprocessa apenas os dias marcados, contando ações e
+  inscrições daqueles dias nas duas camadas (quente + arquivo). Roda pelo
+  comando agregar_rollups (cron); o painel só adianta um lote pequeno
+  (ROLLUPS_LOTE_PAINEL) dos dias do próprio organizador.
+- `painel()` soma os rollups de um período (uma consulta pelo índice
+  organizador + dia) e calcula as taxas do painel e da API.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Acao, AcaoArquivada, DiaPendente, Inscricao, InscricaoArquivada, RollupDiario
+
+CAMPOS_STATUS = {
+    'PENDENTE': 'pendentes',
+    'ACEITO': 'aceitos',
+    'REJEITADO': 'rejeitados',
+    'CANCELADO': 'cancelados',
+}
+CAMPOS_CONTAGEM = ('acoes', 'vagas', 'inscricoes') + tuple(CAMPOS_STATUS.values())
+
+
+def marcar_dias(pares):
+    """ Marca (organizador_id, data da ação) para reagregação. """
+    pendentes = {(organizador_id, timezone.localdate(data)) for organizador_id, data in pares}
+    DiaPendente.objects.bulk_create(
+        [DiaPendente(organizador_id=organizador_id, dia=dia) for organizador_id, dia in pendentes],
+        ignore_conflicts=True,
+    )
+
+
+def _intervalo(dia):
+    # Filtro por intervalo (e não data__date) para usar o índice de data
+    inicio = timezone.make_aware(datetime.datetime.combine(dia, datetime.time.min))
+    fim = timezone.make_aware(datetime.datetime.combine(dia + datetime.timedelta(days=1), datetime.time.min))
+    return inicio, fim
+
+
+def _contar(pares):
+    linhas = defaultdict(lambda: dict.fromkeys(CAMPOS_CONTAGEM, 0))
+    filtro_acoes = Q()
+    filtro_inscricoes = Q()
+    for organizador_id, dia in pares:
+        inicio, fim = _intervalo(dia)
+        filtro_acoes |= Q(organizador_id=organizador_id, data__gte=inicio, data__lt=fim)
+        filtro_inscricoes |= Q(acao__organizador_id=organizador_id, acao__data__gte=inicio, acao__data__lt=fim)
+    por_status = {campo: Count('pk', filter=Q(status=status)) for status, campo in CAMPOS_STATUS.items()}
+
+    for modelo_acao, modelo_inscricao in ((Acao, Inscricao), (AcaoArquivada, InscricaoArquivada)):
+        acoes = (
+            modelo_acao.objects.filter(filtro_acoes)
+            .annotate(dia=TruncDate('data'))
+            .values('organizador_id', 'categoria', 'dia')
+            .annotate(acoes=Count('pk'), vagas=Sum('numero_vagas'))
+            .order_by()
+        )
+        for linha in acoes:
+            contagem = linhas[(linha['organizador_id'], linha['categoria'], linha['dia'])]
+            contagem['acoes'] += linha['acoes']
+            contagem['vagas'] += linha['vagas'] or 0
+
+        inscricoes = (
+            modelo_inscricao.objects.filter(filtro_inscricoes)
+            .annotate(dia=TruncDate('acao__data'))
+            .values('acao__organizador_id', 'acao__categoria', 'dia')
+            .annotate(inscricoes=Count('pk'), **por_status)
+            .order_by()
+        )
+        for linha in inscricoes:
+            contagem = linhas[(linha['acao__organizador_id'], linha['acao__categoria'], linha['dia'])]
+            for campo in ('inscricoes',) + tuple(CAMPOS_STATUS.values()):
+                contagem[campo] += linha[campo]
+    return linhas
+
+
+def reagregar_dias(pares):
+    """ Regrava os rollups dos dias `pares` [(organizador_id, dia)]. """
+    pares = list(pares)
+    if not pares:
+        return 0
+    linhas = _contar(pares)
+    filtro = Q()
+    for organizador_id, dia in pares:
+        filtro |= Q(organizador_id=organizador_id, dia=dia)
+    RollupDiario.objects.filter(filtro).delete()
+    RollupDiario.objects.bulk_create([
+        RollupDiario(organizador_id=organizador_id, categoria=categoria, dia=dia, **contagem)
+        for (organizador_id, categoria, dia), contagem in linhas.items()
+    ])
+    return len(linhas)
+
+
+def agregar_rollups(organizador_id=None, tamanho_lote=200, max_lotes=None):
+    """
+    Reagrega os dias marcados. Retorna quantos dias foram processados.
+    `max_lotes` limita o trabalho (None = até acabar).
+    """
+    pendentes = DiaPendente.objects.order_by('pk')
+    if organizador_id is not None:
+        pendentes = pendentes.filter(organizador_id=organizador_id)
+    total = lotes = 0
+    # Sem nada pendente (caso comum no painel) custa só este EXISTS
+    while (max_lotes is None or lotes < max_lotes) and pendentes.exists():
+        with transaction.atomic():
+            marcados = list(
+                pendentes.select_for_update(skip_locked=True).values_list('pk', 'organizador_id', 'dia')[:tamanho_lote]
+            )
+            if not marcados:
+                break
+            # Desmarca antes de contar: uma mudança concorrente marca o dia de novo
+            DiaPendente.objects.filter(pk__in=[pk for pk, _, _ in marcados]).delete()
+            reagregar_dias({(organizador, dia) for _, organizador, dia in marcados})
+        total += len(marcados)
+        lotes += 1
+    return total
+
+
+def adiantar_rollups(organizador_id):
+    """ Para o painel: no máximo um lote (ROLLUPS_LOTE_PAINEL) dos dias do organizador. """
+    return agregar_rollups(
+        organizador_id=organizador_id, tamanho_lote=getattr(settings, 'ROLLUPS_LOTE_PAINEL', 20), max_lotes=1,
+    )
+
+
+def marcar_todos_os_dias():
+    """ Marca todos os dias com ações (nas duas camadas) ou com rollups, para --reconstruir. """
+    fontes = [
+        modelo.objects.annotate(dia=TruncDate('data')) for modelo in (Acao, AcaoArquivada)
+    ] + [RollupDiario.objects.all()]  # dias que ficaram sem ações
+    total = 0
+    for queryset in fontes:
+        dias = queryset.values_list('organizador_id', 'dia').distinct().order_by()
+        marcados = [DiaPendente(organizador_id=organizador_id, dia=dia) for organizador_id, dia in dias]
+        DiaPendente.objects.bulk_create(marcados, ignore_conflicts=True, batch_size=1000)
+        total += len(marcados)
+    return total
+
+
+def _taxa(parte, total):
+    return round(100 * parte / total, 1) if total else 0.0
+
+
+def _com_taxas(contagem):
+    contagem['taxa_preenchimento'] = _taxa(contagem['aceitos'], contagem['vagas'])
+    contagem['taxa_aceitacao'] = _taxa(contagem['aceitos'], contagem['inscricoes'])
+    contagem['taxa_rejeicao'] = _taxa(contagem['rejeitados'], contagem['inscricoes'])
+    contagem['taxa_cancelamento'] = _taxa(contagem['cancelados'], contagem['inscricoes'])
+    return contagem
+
+
+def painel(organizador_id, dias=90, hoje=None):
+    """
+    Indicadores do organizador para as ações dos últimos `dias` dias (e as
+    futuras): totais, por categoria e inscrições por semana.
+    """
+    inicio = (hoje or timezone.localdate()) - datetime.timedelta(days=dias)
+    rollups = (
+        RollupDiario.objects.filter(organizador_id=organizador_id, dia__gte=inicio)
+        .order_by('dia')
+        .values_list('categoria', 'dia', *CAMPOS_CONTAGEM)
+    )
+    totais = dict.fromkeys(CAMPOS_CONTAGEM, 0)
+    categorias = defaultdict(lambda: dict.fromkeys(CAMPOS_CONTAGEM, 0))
+    semanas = {}
+    for categoria, dia, *valores in rollups:
+        contagem = dict(zip(CAMPOS_CONTAGEM, valores))
+        for campo, valor in contagem.items():
+            totais[campo] += valor
+            categorias[categoria][campo] += valor
+        semana = dia - datetime.timedelta(days=dia.weekday())
+        linha = semanas.setdefault(semana, {'semana': semana, 'inscricoes': 0, 'aceitos': 0, 'por_categoria': {}})
+        linha['inscricoes'] += contagem['inscricoes']
+        linha['aceitos'] += contagem['aceitos']
+        linha['por_categoria'][categoria] = linha['por_categoria'].get(categoria, 0) + contagem['inscricoes']
+
+    rotulos = dict(Acao.CATEGORIA_CHOICES)
+    por_categoria = [
+        _com_taxas({'categoria': categoria, 'rotulo': rotulos.get(categoria, categoria), **contagem})
+        for categoria, contagem in sorted(categorias.items(), key=lambda item: (-item[1]['inscricoes'], item[0]))
+    ]
+    return {
+        'inicio': inicio,
+        'dias': dias,
+        'totais': _com_taxas(totais),
+        'por_categoria': por_categoria,
+        'por_semana': list(semanas.values()),
+    }
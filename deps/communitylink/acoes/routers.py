@@ -0,0 +1,100 @@
+"""
+Roteamento de leituras para réplicas.
+
+- Escritas sempre vão para o primário ('default').
+- Leituras vão para uma réplica sorteada de settings.DATABASE_REPLICAS,
+  exceto quando a requisição está "fixada" no primário:
+    * requisições que alteram dados (POST, PUT, PATCH, DELETE);
+    * requisições seguintes da mesma sessão dentro de
+      DATABASE_STICKY_SECONDS (cookie definido pelo PrimarioFixoMiddleware),
+      para que a página após o redirect de acao_apply / acao_manage já
+      enxergue o que acabou de ser gravado, apesar do atraso de replicação;
+    * qualquer leitura dentro de uma transação aberta no primário.
+
+Sem réplicas configuradas o roteador não interfere (tudo em 'default').
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+COOKIE_PRIMARIO = 'cl_primario'
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_fixado_no_primario = ContextVar('fixado_no_primario', default=False)
+
+
+def replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def fixado_no_primario():
+    return _fixado_no_primario.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+@contextmanager
+def usar_primario():
+    """ Força leituras no primário dentro do bloco. """
+    token = _fixado_no_primario.set(True)
+    try:
+        yield
+    finally:
+        _fixado_no_primario.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        disponiveis = replicas()
+        if not disponiveis or fixado_no_primario():
+            return DEFAULT_DB_ALIAS
+        return random.choice(disponiveis)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primário e réplicas têm os mesmos dados
+        bancos = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in bancos and obj2._state.db in bancos:
+            return True
+        return None
+
+
+class PrimarioFixoMiddleware:
+    """
+    Fixa no primário as requisições que escrevem e, por
+    DATABASE_STICKY_SECONDS, as requisições seguintes do mesmo navegador.
+    Deve vir antes de qualquer middleware que leia o banco (sessão, auth).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replicas():
+            return self.get_response(request)
+
+        escrita = request.method not in METODOS_SEGUROS
+        try:
+            fixo_ate = float(request.COOKIES.get(COOKIE_PRIMARIO, 0))
+        except ValueError:
+            fixo_ate = 0
+        fixar = escrita or fixo_ate > time.time()
+
+        token = _fixado_no_primario.set(fixar)
+        try:
+            response = self.get_response(request)
+        finally:
+            _fixado_no_primario.reset(token)
+
+        if escrita:
+            janela = getattr(settings, 'DATABASE_STICKY_SECONDS', 5)
+            response.set_cookie(
+                COOKIE_PRIMARIO, f'{time.time() + janela:.3f}', max_age=janela,
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
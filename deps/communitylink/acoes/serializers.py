@@ -1,9 +1,41 @@
+from operator import itemgetter
+
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models import Acao, Inscricao, Notificacao, Perfil
 from django.contrib.auth.models import User
 from django.utils import timezone
 
 
+def campos_da_requisicao(request, disponiveis):
+    """
+    Campos pedidos com ?fields=a,b e/ou ?omit=c, na ordem de `disponiveis`;
+    None quando não há seleção (ou a requisição não é uma leitura). Nomes
+    desconhecidos são ignorados.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    parametros = getattr(request, 'query_params', request.GET)
+    fields, omit = parametros.get('fields'), parametros.get('omit')
+    if not fields and not omit:
+        return None
+    pedidos = {nome.strip() for nome in fields.split(',')} if fields else set(disponiveis)
+    if omit:
+        pedidos -= {nome.strip() for nome in omit.split(',')}
+    return [nome for nome in disponiveis if nome in pedidos]
+
+
+class CamposSelecionaveisMixin:
+    """ ?fields= / ?omit= nas leituras: tira do serializer os campos não pedidos. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        campos = campos_da_requisicao(self.context.get('request'), list(self.fields))
+        if campos is not None:
+            for nome in set(self.fields) - set(campos):
+                self.fields.pop(nome)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -15,10 +47,10 @@ class PerfilSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Perfil
-        fields = ['user', 'endereco', 'preferencias']
+        fields = ['user', 'endereco', 'preferencias', 'latitude', 'longitude']
 
 
-class InscricaoSerializer(serializers.ModelSerializer):
+class InscricaoSerializer(CamposSelecionaveisMixin, serializers.ModelSerializer):
     voluntario = UserSerializer(read_only=True)
     acao_titulo = serializers.CharField(source='acao.titulo', read_only=True)
 
@@ -28,19 +60,21 @@ class InscricaoSerializer(serializers.ModelSerializer):
         read_only_fields = ['data_inscricao']
 
 
-class AcaoSerializer(serializers.ModelSerializer):
+class AcaoSerializer(CamposSelecionaveisMixin, serializers.ModelSerializer):
     organizador = UserSerializer(read_only=True)
     inscricoes = InscricaoSerializer(many=True, read_only=True)
     vagas_preenchidas = serializers.ReadOnlyField()
     esta_cheia = serializers.ReadOnlyField()
     ja_aconteceu = serializers.ReadOnlyField()
+    # Só presente na busca por proximidade (?perto_de=...&raio_km=...)
+    distancia_km = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Acao
         fields = [
-            'id', 'titulo', 'descricao', 'data', 'local', 'numero_vagas',
-            'categoria', 'organizador', 'notas_organizador', 'inscricoes',
-            'vagas_preenchidas', 'esta_cheia', 'ja_aconteceu'
+            'id', 'titulo', 'descricao', 'data', 'local', 'latitude', 'longitude', 'numero_vagas',
+            'duracao_horas', 'categoria', 'organizador', 'notas_organizador', 'serie', 'inscricoes',
+            'vagas_preenchidas', 'esta_cheia', 'ja_aconteceu', 'distancia_km'
         ]
         read_only_fields = ['organizador']
 
@@ -57,10 +91,130 @@ class AcaoSerializer(serializers.ModelSerializer):
         return value
 
 
-class NotificacaoSerializer(serializers.ModelSerializer):
+class NotificacaoSerializer(CamposSelecionaveisMixin, serializers.ModelSerializer):
     destinatario = UserSerializer(read_only=True)
 
     class Meta:
         model = Notificacao
         fields = ['id', 'destinatario', 'mensagem', 'lida', 'created_at', 'link']
-        read_only_fields = ['created_at']
\ No newline at end of file
+        read_only_fields = ['created_at']
+
+
+# --- Serializers planos (somente leitura, para listagens) ---
+# Montam os dicts direto das linhas de .values(): sem instanciar modelos nem
+# passar pelos campos do ModelSerializer em cada objeto. Recebem um queryset
+# e `.data` é a lista já no formato do serializer equivalente (testado em
+# test_serializacao). Cada campo declara as colunas de que precisa, então
+# `campos` (ver campos_da_requisicao) reduz também o SELECT.
+
+USUARIO_COLUNAS = ('id', 'username', 'email', 'first_name', 'last_name')
+
+
+def _data_iso(valor, fuso):
+    """ Mesmo formato do DateTimeField do DRF (fuso atual, 'Z' para UTC). """
+    if valor is None:
+        return None
+    if timezone.is_aware(valor):
+        valor = valor.astimezone(fuso)
+    texto = valor.isoformat()
+    return texto[:-6] + 'Z' if texto.endswith('+00:00') else texto
+
+
+def _coluna(coluna):
+    """ Campo copiado direto de uma coluna. """
+    return (coluna,), lambda serializer: itemgetter(coluna)
+
+
+def _calculado(colunas, funcao):
+    """ Campo calculado por funcao(linha, serializer) a partir de `colunas`. """
+    return colunas, lambda serializer: lambda linha: funcao(linha, serializer)
+
+
+def _data(coluna):
+    return _calculado((coluna,), lambda linha, s: _data_iso(linha[coluna], s.fuso))
+
+
+def _usuario(prefixo):
+    colunas = tuple(f'{prefixo}__{coluna}' for coluna in USUARIO_COLUNAS)
+    return _calculado(colunas, lambda linha, s: {coluna: linha[f'{prefixo}__{coluna}'] for coluna in USUARIO_COLUNAS})
+
+
+class SerializadorPlano(serializers.BaseSerializer):
+    """
+    Base dos serializers planos. `campos` mapeia o nome na saída para
+    (colunas do .values(), fábrica): a fábrica recebe o serializer (fuso,
+    agora) uma vez e devolve a função linha -> valor.
+    """
+    campos = {}
+
+    def __init__(self, instance=None, campos=None, **kwargs):
+        super().__init__(instance, **kwargs)
+        self.selecionados = [nome for nome in self.campos if campos is None or nome in campos]
+
+    def preparar(self, queryset):
+        """ Ajusta o queryset aos campos selecionados (anotações etc.). """
+        return queryset
+
+    def to_representation(self, queryset):
+        return list(self._gerar(queryset))
+
+    def iterar(self, tamanho_lote=2000):
+        """ Os dicts um a um, lendo o banco em lotes (cursor do servidor no PostgreSQL). """
+        return self._gerar(self.instance, tamanho_lote)
+
+    def _gerar(self, queryset, tamanho_lote=None):
+        queryset = self.preparar(queryset)
+        self.fuso = timezone.get_current_timezone()
+        self.agora = timezone.now()
+        colunas = list(dict.fromkeys(c for nome in self.selecionados for c in self.campos[nome][0]))
+        extratores = [(nome, self.campos[nome][1](self)) for nome in self.selecionados]
+        linhas = queryset.values(*colunas)
+        if tamanho_lote:
+            linhas = linhas.iterator(chunk_size=tamanho_lote)
+        for linha in linhas:
+            yield {nome: extrator(linha) for nome, extrator in extratores}
+
+
+class AcaoPlanaSerializer(SerializadorPlano):
+    """ Equivalente a AcaoSerializer na listagem (que já não inclui `inscricoes`). """
+    campos = {
+        'id': _coluna('id'),
+        'titulo': _coluna('titulo'),
+        'descricao': _coluna('descricao'),
+        'data': _data('data'),
+        'local': _coluna('local'),
+        'latitude': _coluna('latitude'),
+        'longitude': _coluna('longitude'),
+        'numero_vagas': _coluna('numero_vagas'),
+        'duracao_horas': _coluna('duracao_horas'),
+        'categoria': _coluna('categoria'),
+        'organizador': _usuario('organizador'),
+        'notas_organizador': _coluna('notas_organizador'),
+        'serie': _coluna('serie_id'),
+        'vagas_preenchidas': _coluna('total_aceitos'),
+        'esta_cheia': _calculado(('total_aceitos', 'numero_vagas'), lambda l, s: l['total_aceitos'] >= l['numero_vagas']),
+        'ja_aconteceu': _calculado(('data',), lambda linha, s: linha['data'] < s.agora),
+        # Só existe (e só aparece) na busca por proximidade
+        'distancia_km': _coluna('distancia_km'),
+    }
+
+    def preparar(self, queryset):
+        anotacoes = queryset.query.annotations
+        if 'distancia_km' not in anotacoes and 'distancia_km' in self.selecionados:
+            self.selecionados.remove('distancia_km')
+        if 'total_aceitos' not in anotacoes and {'vagas_preenchidas', 'esta_cheia'} & set(self.selecionados):
+            queryset = queryset.com_vagas_preenchidas()
+        return queryset
+
+
+class InscricaoPlanaSerializer(SerializadorPlano):
+    """ Equivalente a InscricaoSerializer na listagem. """
+    campos = {
+        'id': _coluna('id'),
+        'acao': _coluna('acao_id'),
+        'voluntario': _usuario('voluntario'),
+        'status': _coluna('status'),
+        'data_inscricao': _data('data_inscricao'),
+        'comentario': _coluna('comentario'),
+        'acao_titulo': _coluna('acao__titulo'),
+    }
@@ -0,0 +1,126 @@
+"""
+Séries de ações recorrentes (SerieAcao).
+
+As ocorrências não são criadas todas de uma vez: `materializar_series()`
+cria, para cada série ativa, só as que caem na janela móvel de
+SERIES_JANELA_DIAS dias à frente e avança `materializada_ate`. Roda pelo
+comando materializar_series (cron diário) e logo após o cadastro da série.
+
+Cada ocorrência é uma Acao comum (vagas, inscrições, edição e histórico
+próprios), então acao_list continua sendo uma única consulta por data.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .calendario import invalidar_calendarios
+from .geo import celula, geocodificar
+from .locais import registrar_locais
+from .models import Acao, SerieAcao
+from .rollups import marcar_dias
+
+
+def janela_dias():
+    return getattr(settings, 'SERIES_JANELA_DIAS', 60)
+
+
+def _meses_entre(inicio, dia):
+    return (dia.year - inicio.year) * 12 + dia.month - inicio.month
+
+
+def cai_no_dia(serie, dia):
+    """ True se a regra da série tem ocorrência em `dia`. """
+    if dia < serie.inicio or (serie.fim and dia > serie.fim):
+        return False
+    if serie.frequencia == 'DIARIA':
+        return (dia - serie.inicio).days % serie.intervalo == 0
+    if serie.frequencia == 'MENSAL':
+        # Mesmo dia do mês do início; meses sem esse dia (ex.: 31) ficam sem ocorrência
+        return dia.day == serie.inicio.day and _meses_entre(serie.inicio, dia) % serie.intervalo == 0
+    dias = serie.get_dias_semana_list() or [serie.inicio.weekday()]
+    # Semanas contadas a partir da segunda-feira da semana de início
+    segunda_inicial = serie.inicio - datetime.timedelta(days=serie.inicio.weekday())
+    semana = (dia - segunda_inicial).days // 7
+    return dia.weekday() in dias and semana % serie.intervalo == 0
+
+
+def ocorrencias(serie, de, ate):
+    """ Datas/horas (aware) das ocorrências da série entre os dias `de` e `ate`, inclusive. """
+    dia = max(de, serie.inicio)
+    ultimo = min(ate, serie.fim) if serie.fim else ate
+    while dia <= ultimo:
+        if cai_no_dia(serie, dia):
+            yield timezone.make_aware(datetime.datetime.combine(dia, serie.hora))
+        dia += datetime.timedelta(days=1)
+
+
+def materializar_serie(serie, ate, agora=None):
+    """ Cria as ocorrências da série até o dia `ate`. Retorna quantas foram criadas. """
+    agora = agora or timezone.now()
+    de = timezone.localdate(agora)
+    if serie.materializada_ate and serie.materializada_ate >= de:
+        de = serie.materializada_ate + datetime.timedelta(days=1)
+    datas = [data for data in ocorrencias(serie, de, ate) if data >= agora]
+    # Datas que já existem (ex.: materializada_ate voltou, ou outra execução
+    # criou antes) saem aqui, para o retorno contar só o que foi criado
+    if datas:
+        existentes = set(Acao.objects.filter(serie=serie, data__in=datas).values_list('data', flat=True))
+        datas = [data for data in datas if data not in existentes]
+    if not datas:
+        # Caso comum no cron diário: nada novo, então nem geocodifica nem normaliza o local
+        _avancar(serie, ate)
+        return 0
+    # bulk_create não chama Acao.save(): geocodifica o local da série uma vez aqui
+    # (e registrar_locais, abaixo, normaliza)
+    latitude, longitude = geocodificar(serie.local) or (None, None)
+    geo_celula = celula(latitude, longitude) if latitude is not None else None
+    novas = [
+        Acao(
+            titulo=serie.titulo, descricao=serie.descricao, data=data, local=serie.local,
+            numero_vagas=serie.numero_vagas, categoria=serie.categoria, duracao_horas=serie.duracao_horas,
+            organizador_id=serie.organizador_id, serie=serie,
+            latitude=latitude, longitude=longitude, geo_celula=geo_celula,
+        )
+        for data in datas
+    ]
+    registrar_locais(novas)
+    # ignore_conflicts + UniqueConstraint(serie, data): uma execução concorrente não duplica
+    Acao.objects.bulk_create(novas, ignore_conflicts=True)
+    # bulk_create não dispara os signals: marca os dias do painel e
+    # invalida o feed de calendário do organizador aqui
+    marcar_dias((serie.organizador_id, acao.data) for acao in novas)
+    invalidar_calendarios(usuario_id=serie.organizador_id)
+    _avancar(serie, ate)
+    return len(novas)
+
+
+def _avancar(serie, ate):
+    SerieAcao.objects.filter(pk=serie.pk).update(materializada_ate=ate)
+    serie.materializada_ate = ate
+
+
+def materializar_series(agora=None, tamanho_lote=100):
+    """ Avança a janela de todas as séries ativas. Retorna quantas ocorrências foram criadas. """
+    agora = agora or timezone.now()
+    ate = timezone.localdate(agora) + datetime.timedelta(days=janela_dias())
+    atrasadas = (
+        SerieAcao.objects.filter(ativa=True)
+        .filter(Q(materializada_ate__isnull=True) | Q(materializada_ate__lt=ate))
+        # Séries encerradas antes da janela atual não têm mais o que criar
+        .exclude(fim__isnull=False, materializada_ate__isnull=False, fim__lte=F('materializada_ate'))
+        .order_by('pk')
+    )
+    total = 0
+    while atrasadas.exists():
+        with transaction.atomic():
+            # skip_locked: execuções simultâneas pegam séries diferentes
+            lote = list(atrasadas.select_for_update(skip_locked=True)[:tamanho_lote])
+            if not lote:
+                break
+            for serie in lote:
+                total += materializar_serie(serie, ate, agora)
+    return total
@@ -0,0 +1,87 @@
+"""
+Framework de orçamento de queries para os testes.
+
+Cada view declara o número máximo de queries que pode executar. O mixin
+roda a mesma requisição com 1×, 10× e 100× o volume de dados e falha se:
+- o orçamento for ultrapassado em qualquer escala, ou
+- o número de queries mudar com o volume (sinal clássico de N+1).
+
+A mensagem de falha lista as queries repetidas (agrupadas por "impressão
+digital", isto é, o SQL sem os valores) e um diff entre as escalas.
+"""
+
+import difflib
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from acoes.profiling import impressao_digital
+
+ESCALAS = (1, 10, 100)
+
+
+def relatorio_queries(queries, limite_repetidas=2):
+    """ Texto com as queries repetidas e a lista completa numerada. """
+    linhas = []
+    repetidas = Counter(impressao_digital(q) for q in queries)
+    duplicadas = [(sql, n) for sql, n in repetidas.most_common() if n >= limite_repetidas]
+    if duplicadas:
+        linhas.append('Queries repetidas:')
+        for sql, n in duplicadas:
+            linhas.append(f'  {n}x {sql}')
+    linhas.append('Todas as queries:')
+    for i, sql in enumerate(queries, start=1):
+        linhas.append(f'  {i}. {sql}')
+    return '\n'.join(linhas)
+
+
+class QueryBudgetMixin:
+    """
+    Mixin para TestCase com assertQueryBudget().
+
+    Uso:
+        self.assertQueryBudget('acoes:acao_list', 8, fazer_requisicao, povoar)
+
+    - fazer_requisicao(): executa a requisição e retorna a resposta
+    - povoar(escala): garante que existam `escala` vezes os dados base
+    """
+
+    escalas = ESCALAS
+
+    def capturar_queries(self, funcao):
+        with CaptureQueriesContext(connection) as contexto:
+            resultado = funcao()
+        return resultado, [q['sql'] for q in contexto.captured_queries]
+
+    def assertQueryBudget(self, nome, maximo, fazer_requisicao, povoar, verificar_escala=True):
+        referencia = None
+        for escala in self.escalas:
+            povoar(escala)
+            resposta, queries = self.capturar_queries(fazer_requisicao)
+
+            if resposta is not None and resposta.status_code >= 400:
+                self.fail(f'{nome}: status {resposta.status_code} com {escala}x dados')
+
+            if len(queries) > maximo:
+                self.fail(
+                    f'{nome}: {len(queries)} queries com {escala}x dados '
+                    f'(orçamento: {maximo}).\n{relatorio_queries(queries)}'
+                )
+
+            if referencia is None:
+                referencia = (escala, queries)
+            elif verificar_escala and len(queries) != len(referencia[1]):
+                escala_ref, queries_ref = referencia
+                diff = difflib.unified_diff(
+                    [impressao_digital(q) for q in queries_ref],
+                    [impressao_digital(q) for q in queries],
+                    fromfile=f'{escala_ref}x ({len(queries_ref)} queries)',
+                    tofile=f'{escala}x ({len(queries)} queries)',
+                    lineterm='',
+                )
+                self.fail(
+                    f'{nome}: o número de queries cresce com o volume de dados '
+                    f'({len(queries_ref)} com {escala_ref}x, {len(queries)} com {escala}x).\n'
+                    + '\n'.join(diff)
+                )
@@ -0,0 +1,158 @@
+"""
+Testes do arquivamento de ações passadas
+
+Este arquivo testa:
+- Comando arquivar_acoes (move ações, inscrições e comentários em lotes)
+- Histórico lendo as duas camadas (quente + arquivo) de forma transparente
+- Detalhe e comentários de ações arquivadas
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.arquivo import arquivar_acoes
+from acoes.historico import atualizar_historico
+from acoes.models import Acao, AcaoArquivada, Inscricao, InscricaoArquivada, RegistroHistorico
+from .query_budget import QueryBudgetMixin
+from .test_base import FullFixturesMixin
+
+
+class ArquivoTestMixin(FullFixturesMixin):
+    def setUp(self):
+        super().setUp()
+        agora = timezone.now()
+        self.acao_antiga = Acao.objects.create(
+            titulo='Mutirão de 2 anos atrás', descricao='Antiga', data=agora - timedelta(days=730),
+            local='Praça', numero_vagas=10, categoria='MEIO_AMBIENTE', organizador=self.organizador_user,
+            notas_organizador='Choveu',
+        )
+        self.inscricao_antiga = Inscricao.objects.create(
+            acao=self.acao_antiga, voluntario=self.voluntario_user, status='ACEITO', comentario='Foi ótimo',
+        )
+        self.acao_recente = Acao.objects.create(
+            titulo='Ação do mês passado', descricao='Recente', data=agora - timedelta(days=30),
+            local='Centro', numero_vagas=10, categoria='SAUDE', organizador=self.organizador_user,
+        )
+        Inscricao.objects.create(acao=self.acao_recente, voluntario=self.voluntario_user, status='ACEITO')
+
+
+class TestArquivarAcoes(ArquivoTestMixin, TestCase):
+    """
+    CT-AR001: Movimentação para o arquivo
+    """
+
+    def test_move_acoes_antigas_com_inscricoes(self):
+        """
+        CT-AR001.1: Ações antes do corte saem das tabelas quentes com as mesmas pks
+        Resultado Esperado: Ação, inscrição, comentário e notas preservados no arquivo
+        """
+        call_command('arquivar_acoes', meses=12, stdout=StringIO())
+
+        self.assertFalse(Acao.objects.filter(pk=self.acao_antiga.pk).exists())
+        self.assertFalse(Inscricao.objects.filter(pk=self.inscricao_antiga.pk).exists())
+        self.assertTrue(Acao.objects.filter(pk=self.acao_recente.pk).exists())
+
+        arquivada = AcaoArquivada.objects.get(pk=self.acao_antiga.pk)
+        self.assertEqual(arquivada.notas_organizador, 'Choveu')
+        self.assertEqual(arquivada.vagas_preenchidas, 1)
+        inscricao = InscricaoArquivada.objects.get(pk=self.inscricao_antiga.pk)
+        self.assertEqual(inscricao.acao, arquivada)
+        self.assertEqual(inscricao.comentario, 'Foi ótimo')
+        self.assertEqual(inscricao.data_inscricao, self.inscricao_antiga.data_inscricao)
+
+    def test_lotes_pequenos_e_idempotente(self):
+        """
+        CT-AR001.2: Lotes menores que o volume arquivam tudo; rodar de novo não faz nada
+        """
+        for i in range(4):
+            Acao.objects.create(titulo=f'Antiga {i}', descricao='x', data=timezone.now() - timedelta(days=400 + i),
+                                local='x', numero_vagas=1, organizador=self.organizador_user)
+        corte = timezone.now() - timedelta(days=365)
+        self.assertEqual(arquivar_acoes(corte, tamanho_lote=2), (5, 1))
+        self.assertEqual(arquivar_acoes(corte, tamanho_lote=2), (0, 0))
+        self.assertEqual(AcaoArquivada.objects.count(), 5)
+
+    def test_simular_nao_altera_dados(self):
+        """
+        CT-AR001.3: --simular só informa a quantidade
+        """
+        saida = StringIO()
+        call_command('arquivar_acoes', meses=12, simular=True, stdout=saida)
+        self.assertIn('1 ações', saida.getvalue())
+        self.assertTrue(Acao.objects.filter(pk=self.acao_antiga.pk).exists())
+
+    def test_pks_acima_de_32_bits(self):
+        """
+        CT-AR001.4: pks do BigAutoField acima de 2^31 passam para o arquivo e o histórico
+        """
+        grande = 2 ** 31 + 7
+        acao = Acao.objects.create(pk=grande, titulo='Grande', descricao='x', data=timezone.now() - timedelta(days=400),
+                                   local='x', numero_vagas=1, organizador=self.organizador_user)
+        Inscricao.objects.create(pk=grande, acao=acao, voluntario=self.voluntario_user, status='ACEITO')
+        atualizar_historico()
+        arquivar_acoes(timezone.now() - timedelta(days=365))
+        self.assertEqual(InscricaoArquivada.objects.get(pk=grande).acao_id, grande)
+        self.assertTrue(RegistroHistorico.objects.filter(acao_id=grande, inscricao_id=grande).exists())
+
+
+class TestHistoricoComArquivo(ArquivoTestMixin, QueryBudgetMixin, TestCase):
+    """
+    CT-AR002: Histórico e detalhe lendo as duas camadas
+    """
+
+    def setUp(self):
+        super().setUp()
+        call_command('arquivar_acoes', meses=12, stdout=StringIO())
+        atualizar_historico()
+
+    def test_historico_mostra_quente_e_arquivo_em_ordem(self):
+        """
+        CT-AR002.1: Participação recente antes da arquivada, ambas visíveis
+        """
+        response = self.client_logged_voluntario.get(reverse('acoes:historico'))
+        participacoes = [r.titulo for r in response.context['historico_participacoes']]
+        self.assertEqual(participacoes, ['Ação do mês passado', 'Mutirão de 2 anos atrás'])
+
+    def test_historico_organizador_e_filtros(self):
+        """
+        CT-AR002.2: Ações organizadas arquivadas aparecem e respeitam os filtros
+        """
+        url = reverse('acoes:historico')
+        response = self.client_logged_organizador.get(url)
+        organizadas = [a.titulo for a in response.context['historico_organizadas']]
+        self.assertIn('Mutirão de 2 anos atrás', organizadas)
+
+        response = self.client_logged_organizador.get(url, {'categoria': 'SAUDE'})
+        organizadas = [a.titulo for a in response.context['historico_organizadas']]
+        self.assertEqual(organizadas, ['Ação do mês passado'])
+
+    def test_comentario_em_inscricao_arquivada(self):
+        """
+        CT-AR002.3: Voluntário edita o comentário de uma participação arquivada
+        """
+        self.client_logged_voluntario.post(reverse('acoes:historico'), {
+            'inscricao_id': self.inscricao_antiga.pk, 'arquivada': '1', 'comentario': 'Voltaria',
+        })
+        self.assertEqual(InscricaoArquivada.objects.get(pk=self.inscricao_antiga.pk).comentario, 'Voltaria')
+
+    def test_detalhe_de_acao_arquivada(self):
+        """
+        CT-AR002.4: Links antigos continuam funcionando, sem gerenciar inscrições
+        """
+        response = self.client_logged_organizador.get(reverse('acoes:acao_detail', args=[self.acao_antiga.pk]))
+        self.assertContains(response, 'Mutirão de 2 anos atrás')
+        self.assertNotContains(response, reverse('acoes:acao_manage', args=[self.acao_antiga.pk]))
+
+    def test_orcamento_com_as_duas_camadas(self):
+        """
+        CT-AR002.5: Histórico com ações arquivadas no mesmo orçamento (10 queries)
+        """
+        cliente = self.client_logged_organizador
+        self.assertQueryBudget('acoes:historico', 10, lambda: cliente.get(reverse('acoes:historico')),
+                               lambda escala: None)
+
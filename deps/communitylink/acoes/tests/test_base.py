@@ -9,6 +9,7 @@ from django.test import TestCase
 from django.contrib.auth.models import User, Group
 from django.utils import timezone
 from datetime import timedelta
+from acoes import limites, tokens
 from acoes.models import Acao, Inscricao
 
 
@@ -24,6 +25,9 @@ class FullFixturesMixin:
 
     def setUp(self):
         super().setUp()
+        # Os contadores dos limites de taxa e os tokens ficam no cache, fora da transação do teste
+        limites.limpar()
+        tokens.limpar()
 
         # Criar grupos
         organizadores_group, _ = Group.objects.get_or_create(name='Organizadores')
@@ -0,0 +1,130 @@
+"""
+Testes dos comandos de benchmark
+
+Este arquivo testa:
+- seed_benchmark: geração de dados em volume com inserts em lote
+- benchmark_urls: medição de latência/queries por rota com saída em JSON
+- Funções auxiliares de percentil e comparação
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from acoes import benchmark
+from acoes.models import Acao, Inscricao, Notificacao, Perfil
+
+
+class TestSeedBenchmark(TestCase):
+    """
+    CT-B001: Geração de dados para benchmark
+    """
+
+    def gerar(self, **kwargs):
+        opcoes = dict(usuarios=20, acoes=10, inscricoes=35, notificacoes=15, lote=7, stdout=StringIO())
+        opcoes.update(kwargs)
+        call_command('seed_benchmark', **opcoes)
+
+    def test_gera_volumes_pedidos(self):
+        """
+        CT-B001.1: Cada tabela recebe exatamente o volume pedido
+        Resultado Esperado: Contagens iguais aos parâmetros
+        """
+        self.gerar()
+        self.assertEqual(User.objects.filter(username__startswith='bench_').count(), 20)
+        self.assertEqual(Perfil.objects.filter(user__username__startswith='bench_').count(), 20)
+        self.assertEqual(Acao.objects.count(), 10)
+        self.assertEqual(Inscricao.objects.count(), 35)
+        self.assertEqual(Notificacao.objects.count(), 15)
+
+    def test_escala_reduz_volumes(self):
+        """
+        CT-B001.2: --escala multiplica todos os volumes
+        """
+        self.gerar(usuarios=200, acoes=100, inscricoes=300, notificacoes=100, escala=0.1)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Acao.objects.count(), 10)
+        self.assertEqual(Inscricao.objects.count(), 30)
+
+    def test_organizadores_recebem_grupo(self):
+        """
+        CT-B001.3: Organizadores das ações gerados no grupo 'Organizadores'
+        """
+        self.gerar()
+        for acao in Acao.objects.select_related('organizador'):
+            self.assertTrue(acao.organizador.groups.filter(name='Organizadores').exists())
+
+    def test_nao_duplica_sem_limpar(self):
+        """
+        CT-B001.4: Rodar de novo sem --limpar é recusado; com --limpar recria
+        """
+        self.gerar()
+        with self.assertRaises(CommandError):
+            self.gerar()
+        self.gerar(limpar=True)
+        self.assertEqual(User.objects.filter(username__startswith='bench_').count(), 20)
+        self.assertEqual(Acao.objects.count(), 10)
+
+
+class TestBenchmarkUrls(TestCase):
+    """
+    CT-B002: Harness de benchmark por rota
+    """
+
+    def setUp(self):
+        call_command('seed_benchmark', usuarios=10, acoes=5, inscricoes=10, notificacoes=10, stdout=StringIO())
+        fd, self.saida = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.saida)
+
+    def test_gera_json_com_rotas_html_e_api(self):
+        """
+        CT-B002.1: Resultado inclui rotas HTML e da API com percentis e queries
+        """
+        call_command('benchmark_urls', repeticoes=2, saida=self.saida, stdout=StringIO())
+        with open(self.saida, encoding='utf-8') as arquivo:
+            documento = json.load(arquivo)
+
+        chaves = {r['chave'] for r in documento['resultados']}
+        self.assertIn('acoes:acao_list', chaves)
+        self.assertIn('acoes:acao_detail', chaves)
+        self.assertIn('acoes:acao-list', chaves)
+        self.assertIn('acoes:notificacao-detail', chaves)
+        item = documento['resultados'][0]
+        for campo in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_max', 'status'):
+            self.assertIn(campo, item)
+        self.assertEqual(documento['benchmark'], 'urls')
+
+    def test_comparar_execucoes(self):
+        """
+        CT-B002.2: --comparar lê uma execução anterior e mostra a variação
+        """
+        call_command('benchmark_urls', repeticoes=1, filtro='acao_list', saida=self.saida, stdout=StringIO())
+        saida = StringIO()
+        call_command('benchmark_urls', repeticoes=1, filtro='acao_list', comparar=self.saida, stdout=saida)
+        self.assertIn('Comparação', saida.getvalue())
+        self.assertIn('acoes:acao_list', saida.getvalue())
+
+
+class TestFuncoesBenchmark(TestCase):
+    """
+    CT-B003: Percentis e comparação
+    """
+
+    def test_percentis(self):
+        resumo = benchmark.resumir([float(i) for i in range(1, 101)])
+        self.assertEqual(resumo['min_ms'], 1.0)
+        self.assertEqual(resumo['max_ms'], 100.0)
+        self.assertAlmostEqual(resumo['p50_ms'], 50.5)
+        self.assertAlmostEqual(resumo['p99_ms'], 99.01)
+
+    def test_comparar(self):
+        antes = {'resultados': [{'chave': 'a', 'p95_ms': 10.0}]}
+        depois = {'resultados': [{'chave': 'a', 'p95_ms': 15.0}, {'chave': 'b', 'p95_ms': 1.0}]}
+        self.assertEqual(benchmark.comparar(antes, depois), [('a', 10.0, 15.0, 50.0)])
@@ -0,0 +1,171 @@
+"""
+Testes dos feeds de calendário (iCal)
+
+Este arquivo testa:
+- Criação/troca do link secreto
+- Conteúdo do feed (participações aceitas e ações organizadas)
+- ETag/304 e cache, com uma única query por consulta do cliente
+- Invalidação quando as linhas do usuário mudam
+"""
+
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.calendario import _dobrar
+from acoes.importacao import importar_acoes
+from acoes.models import FeedCalendario, Inscricao, SerieAcao
+from acoes.series import materializar_serie
+from .test_base import FullFixturesMixin
+
+
+class CalendarioTestMixin(FullFixturesMixin):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.inscricao_aceita = Inscricao.objects.create(
+            acao=self.acao_passada, voluntario=self.voluntario_user, status='ACEITO',
+        )
+        self.client_logged_voluntario.post(reverse('acoes:calendario_token'))
+        self.feed = FeedCalendario.objects.get(usuario=self.voluntario_user)
+        self.url = reverse('acoes:calendario_feed', args=[self.feed.token])
+
+    def ler(self, response):
+        return b''.join(response.streaming_content if response.streaming else [response.content]).decode('utf-8')
+
+
+class TestFeed(CalendarioTestMixin, TestCase):
+    """
+    CT-CA001: Conteúdo e link secreto
+    """
+
+    def test_feed_tem_so_participacoes_aceitas(self):
+        """
+        CT-CA001.1: Eventos das inscrições ACEITAS; pendentes ficam de fora
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        corpo = self.ler(response)
+        self.assertTrue(corpo.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(corpo.endswith('END:VCALENDAR\r\n'))
+        self.assertEqual(corpo.count('BEGIN:VEVENT'), 1)
+        self.assertIn(f'UID:acao-{self.acao_passada.pk}-participacao@communitylink', corpo)
+        self.assertIn(f'SUMMARY:{self.acao_passada.titulo}', corpo)
+        self.assertNotIn(f'UID:acao-{self.acao_futura.pk}-participacao@', corpo)
+
+    def test_feed_do_organizador(self):
+        """
+        CT-CA001.2: Ações organizadas entram com o prefixo "Organização"
+        """
+        self.client_logged_organizador.post(reverse('acoes:calendario_token'))
+        feed = FeedCalendario.objects.get(usuario=self.organizador_user)
+        corpo = self.ler(self.client.get(reverse('acoes:calendario_feed', args=[feed.token])))
+        self.assertIn(f'UID:acao-{self.acao_futura.pk}-organizacao@communitylink', corpo)
+        self.assertIn('SUMMARY:Organização: ', corpo)
+
+    def test_trocar_token_invalida_link_antigo(self):
+        """
+        CT-CA001.3: Gerar novo link derruba o anterior
+        """
+        self.client_logged_voluntario.post(reverse('acoes:calendario_token'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client_logged_voluntario.get(reverse('acoes:calendario_token')).status_code, 405)
+
+    def test_linhas_longas_sao_dobradas(self):
+        """
+        CT-CA001.4: Nenhuma linha passa de 75 octetos
+        """
+        dobrada = _dobrar('DESCRIPTION:' + 'ação ' * 40)
+        self.assertTrue(all(len(linha.encode('utf-8')) <= 75 for linha in dobrada.split('\r\n')))
+        self.assertEqual(dobrada.replace('\r\n ', ''), 'DESCRIPTION:' + 'ação ' * 40 + '\r\n')
+
+
+class TestCacheCalendario(CalendarioTestMixin, TestCase):
+    """
+    CT-CA002: ETag, cache e invalidação
+    """
+
+    def test_304_e_cache_com_uma_query(self):
+        """
+        CT-CA002.1: Com ETag atual responde 304; sem ETag usa o cache; ambos em uma query
+        """
+        primeira = self.client.get(self.url)
+        corpo = self.ler(primeira)
+        etag = primeira['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+            self.assertEqual(self.ler(response), corpo)
+        self.assertFalse(response.streaming)
+
+    def test_mudanca_na_inscricao_gera_novo_etag(self):
+        """
+        CT-CA002.2: Inscrição aceita muda a versão; o feed é regenerado
+        """
+        etag = self.client.get(self.url)['ETag']
+        inscricao = self.inscricao_pendente
+        inscricao.status = 'ACEITO'
+        inscricao.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn(f'UID:acao-{inscricao.acao_id}-participacao@', self.ler(response))
+
+    def test_editar_acao_invalida_voluntarios_aceitos(self):
+        """
+        CT-CA002.3: Mudança na ação sobe a versão dos voluntários aceitos
+        """
+        versao = self.feed.versao
+        acao = self.inscricao_aceita.acao
+        acao.local = 'Novo local'
+        acao.save()
+        self.feed.refresh_from_db()
+        self.assertGreater(self.feed.versao, versao)
+
+    def feed_do_organizador(self):
+        self.client_logged_organizador.post(reverse('acoes:calendario_token'))
+        url = reverse('acoes:calendario_feed', args=[FeedCalendario.objects.get(usuario=self.organizador_user).token])
+        return url, self.client.get(url)['ETag']
+
+    def test_importacao_invalida_o_organizador(self):
+        """
+        CT-CA002.4: Ações importadas (bulk_create, sem signals) mudam o ETag do organizador
+        """
+        url, etag = self.feed_do_organizador()
+        data = (timezone.localtime() + datetime.timedelta(days=10)).strftime('%Y-%m-%dT%H:%M')
+        importar_acoes([{'titulo': 'Importada', 'descricao': 'x', 'local': 'Praça', 'data': data,
+                         'categoria': 'OUTRO', 'numero_vagas': '5'}], self.organizador_user)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('SUMMARY:Organização: Importada', self.ler(response))
+
+    def test_materializar_serie_invalida_o_organizador(self):
+        """
+        CT-CA002.5: Ocorrências materializadas mudam o ETag; rodar de novo sem criar nada não muda
+        """
+        url, etag = self.feed_do_organizador()
+        serie = SerieAcao.objects.create(
+            titulo='Feira', descricao='x', local='Praça', categoria='OUTRO', numero_vagas=8,
+            frequencia='DIARIA', hora=datetime.time(9, 0), inicio=timezone.localdate(),
+            organizador=self.organizador_user,
+        )
+        materializar_serie(serie, timezone.localdate() + datetime.timedelta(days=7))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('SUMMARY:Organização: Feira', self.ler(response))
+
+        materializar_serie(serie, serie.materializada_ate)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
@@ -0,0 +1,79 @@
+"""
+Testes da seleção de campos da API (?fields= / ?omit=)
+
+Este arquivo testa:
+- JSON reduzido aos campos pedidos na listagem e no detalhe
+- SQL reduzido junto: sem colunas, JOINs e contagens que não foram pedidos
+- Escritas e parâmetros desconhecidos não são afetados
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .test_base import FullFixturesMixin
+
+
+class TestCamposDaApi(FullFixturesMixin, TestCase):
+    """
+    CT-CA001: Sparse fieldsets
+    """
+
+    def get(self, url, **parametros):
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client_logged_voluntario.get(url, parametros)
+        self.assertEqual(response.status_code, 200)
+        sql = '\n'.join(q['sql'] for q in contexto.captured_queries if 'acoes_acao' in q['sql'])
+        return response.json(), sql
+
+    def test_listagem_so_com_os_campos_pedidos(self):
+        """
+        CT-CA001.1: ?fields=id,titulo,data não lê descrição, organizador nem conta aceitos
+        """
+        acoes, sql = self.get(reverse('acoes:acao-list'), fields='id,titulo,data')
+        self.assertEqual({tuple(a) for a in acoes}, {('id', 'titulo', 'data')})
+        self.assertNotIn('descricao', sql)
+        self.assertNotIn('auth_user', sql)
+        self.assertNotIn('COUNT', sql.upper())
+
+        _, sql_completo = self.get(reverse('acoes:acao-list'))
+        for trecho in ('DESCRICAO', 'AUTH_USER', 'COUNT'):
+            self.assertIn(trecho, sql_completo.upper())
+
+    def test_omit(self):
+        """
+        CT-CA001.2: ?omit= tira só os campos indicados; esta_cheia continua correto
+        """
+        acoes, _ = self.get(reverse('acoes:acao-list'), omit='descricao,notas_organizador,organizador')
+        self.assertNotIn('descricao', acoes[0])
+        self.assertIn('titulo', acoes[0])
+        cheia = next(a for a in acoes if a['id'] == self.acao_cheia.pk)
+        self.assertTrue(cheia['esta_cheia'])
+
+    def test_detalhe(self):
+        """
+        CT-CA001.3: No detalhe o SELECT usa only() com as colunas dos campos pedidos
+        """
+        url = reverse('acoes:acao-detail', args=[self.acao_cheia.pk])
+        acao, sql = self.get(url, fields='id,titulo,esta_cheia')
+        self.assertEqual(acao, {'id': self.acao_cheia.pk, 'titulo': self.acao_cheia.titulo, 'esta_cheia': True})
+        self.assertNotIn('descricao', sql)
+        completo, _ = self.get(url)
+        self.assertIn('descricao', completo)
+
+    def test_inscricoes_e_parametros_invalidos(self):
+        """
+        CT-CA001.4: Inscrições também aceitam ?fields=; nomes desconhecidos são ignorados
+        """
+        inscricoes, _ = self.get(reverse('acoes:inscricao-list'), fields='id,status,inexistente')
+        self.assertEqual(inscricoes, [{'id': self.inscricao_pendente.pk, 'status': 'PENDENTE'}])
+
+    def test_escrita_ignora_a_selecao(self):
+        """
+        CT-CA001.5: PATCH com ?fields= valida e devolve o serializer completo
+        """
+        url = reverse('acoes:acao-detail', args=[self.acao_futura.pk]) + '?fields=id'
+        response = self.client_logged_organizador.patch(url, {'titulo': 'Novo título'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['titulo'], 'Novo título')
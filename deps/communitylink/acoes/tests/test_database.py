@@ -0,0 +1,157 @@
+"""
+Testes da configuração de banco de produção
+
+Este arquivo testa:
+- Perfis de banco a partir de variáveis de ambiente (SQLite WAL, PostgreSQL)
+- settings_production (DEBUG desligado, SECRET_KEY obrigatória)
+- benchmark_apply: vazão de inscrições com saída em JSON
+"""
+
+import importlib
+import json
+import os
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from acoes.models import Acao
+from communitylink import database
+
+
+class TestPerfisBanco(SimpleTestCase):
+    """
+    CT-DB001: Perfis de banco por variáveis de ambiente
+    """
+
+    def test_sqlite_padrao_com_wal(self):
+        """
+        CT-DB001.1: Sem DB_ENGINE usa SQLite com WAL, busy_timeout e IMMEDIATE
+        """
+        perfil, banco = database.banco_a_partir_do_ambiente({}, Path('/srv/app'))
+        self.assertEqual(perfil, 'sqlite-wal')
+        self.assertEqual(banco['NAME'], '/srv/app/db.sqlite3')
+        self.assertIn('PRAGMA journal_mode=WAL;', banco['OPTIONS']['init_command'])
+        self.assertIn('PRAGMA synchronous=NORMAL;', banco['OPTIONS']['init_command'])
+        self.assertEqual(banco['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(banco['OPTIONS']['timeout'], 5)
+
+    def test_sqlite_busy_timeout_configuravel(self):
+        """
+        CT-DB001.2: SQLITE_BUSY_TIMEOUT_MS ajusta PRAGMA e timeout do driver
+        """
+        _, banco = database.banco_a_partir_do_ambiente({'SQLITE_BUSY_TIMEOUT_MS': '250'}, Path('.'))
+        self.assertIn('PRAGMA busy_timeout=250;', banco['OPTIONS']['init_command'])
+        self.assertEqual(banco['OPTIONS']['timeout'], 0.25)
+
+    def test_postgresql_persistente(self):
+        """
+        CT-DB001.3: PostgreSQL sem pool usa conexões persistentes com health check
+        """
+        perfil, banco = database.banco_a_partir_do_ambiente(
+            {'DB_ENGINE': 'postgresql', 'DB_NAME': 'communitylink', 'CONN_MAX_AGE': '120'}, Path('.')
+        )
+        self.assertEqual(perfil, 'postgresql-persistente')
+        self.assertEqual(banco['CONN_MAX_AGE'], 120)
+        self.assertTrue(banco['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', banco['OPTIONS'])
+
+    def test_postgresql_com_pool(self):
+        """
+        CT-DB001.4: DB_POOL=1 ativa o pool do psycopg e desliga CONN_MAX_AGE
+        """
+        perfil, banco = database.banco_a_partir_do_ambiente(
+            {'DB_ENGINE': 'postgres', 'DB_NAME': 'cl', 'DB_POOL': 'true', 'DB_POOL_MAX': '20'}, Path('.')
+        )
+        self.assertEqual(perfil, 'postgresql-pool')
+        self.assertEqual(banco['CONN_MAX_AGE'], 0)
+        self.assertEqual(banco['OPTIONS']['pool']['max_size'], 20)
+
+    def test_configuracoes_invalidas(self):
+        """
+        CT-DB001.5: Engine desconhecido, DB_NAME ausente ou número inválido falham cedo
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            database.banco_a_partir_do_ambiente({'DB_ENGINE': 'oracle'}, Path('.'))
+        with self.assertRaises(ImproperlyConfigured):
+            database.banco_a_partir_do_ambiente({'DB_ENGINE': 'postgresql'}, Path('.'))
+        with self.assertRaises(ImproperlyConfigured):
+            database.banco_a_partir_do_ambiente({'SQLITE_BUSY_TIMEOUT_MS': 'muito'}, Path('.'))
+
+
+class TestSettingsProducao(SimpleTestCase):
+    """
+    CT-DB002: Módulo communitylink.settings_production
+    """
+
+    def importar(self, **env):
+        sys.modules.pop('communitylink.settings_production', None)
+        with mock.patch.dict(os.environ, env, clear=False):
+            try:
+                return importlib.import_module('communitylink.settings_production')
+            finally:
+                sys.modules.pop('communitylink.settings_production', None)
+
+    def test_debug_desligado_e_banco_do_ambiente(self):
+        """
+        CT-DB002.1: DEBUG falso, hosts e perfil de banco vindos do ambiente
+        """
+        modulo = self.importar(DJANGO_SECRET_KEY='segredo', DJANGO_ALLOWED_HOSTS='a.org, b.org',
+                               DB_ENGINE='sqlite', DJANGO_DEBUG='')
+        self.assertFalse(modulo.DEBUG)
+        self.assertEqual(modulo.ALLOWED_HOSTS, ['a.org', 'b.org'])
+        self.assertEqual(modulo.DATABASE_PROFILE, 'sqlite-wal')
+        self.assertEqual(modulo.LOGGING['loggers']['django.db.backends']['level'], 'WARNING')
+
+    def test_exige_secret_key_e_recusa_debug(self):
+        """
+        CT-DB002.2: Sem DJANGO_SECRET_KEY ou com DJANGO_DEBUG=1 a importação falha
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            self.importar(DJANGO_SECRET_KEY='', DJANGO_DEBUG='')
+        with self.assertRaises(ImproperlyConfigured):
+            self.importar(DJANGO_SECRET_KEY='segredo', DJANGO_DEBUG='1')
+
+
+class TestBenchmarkApply(TestCase):
+    """
+    CT-DB003: Benchmark de vazão de inscrições
+    """
+
+    def setUp(self):
+        arquivo = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+        arquivo.close()
+        self.saida = arquivo.name
+        self.addCleanup(os.remove, self.saida)
+
+    def test_mede_inscricoes_e_limpa_dados(self):
+        """
+        CT-DB003.1: Um cliente inscreve-se em todas as ações; dados removidos ao final
+        """
+        call_command('benchmark_apply', clientes='1', por_cliente=3, saida=self.saida, stdout=StringIO())
+        with open(self.saida, encoding='utf-8') as f:
+            documento = json.load(f)
+        self.assertEqual(documento['benchmark'], 'acao_apply')
+        resultado = documento['resultados'][0]
+        self.assertEqual(resultado['chave'], 'sqlite-padrao:1')
+        self.assertEqual(resultado['inscricoes_criadas'], 3)
+        self.assertEqual(resultado['erros'], 0)
+        self.assertEqual(resultado['n'], 3)
+        self.assertFalse(User.objects.filter(username__startswith='bapply_').exists())
+        self.assertFalse(Acao.objects.filter(titulo__startswith='bapply_').exists())
+
+    def test_clientes_invalidos(self):
+        """
+        CT-DB003.2: --clientes precisa ser uma lista de inteiros positivos
+        """
+        with self.assertRaises(CommandError):
+            call_command('benchmark_apply', clientes='muitos', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('benchmark_apply', clientes='0', stdout=StringIO())
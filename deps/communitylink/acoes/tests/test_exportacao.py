@@ -0,0 +1,114 @@
+"""
+Testes da exportação de inscritos (CSV/XLSX em streaming)
+
+Este arquivo testa:
+- Exportação dos inscritos de uma ação (CSV e XLSX)
+- Exportação de todas as ações do organizador (quente + arquivo)
+- Permissões e formato inválido
+- Número de queries constante ao consumir a resposta
+"""
+
+import csv
+import io
+import zipfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.arquivo import arquivar_acoes
+from acoes.models import Acao, Inscricao
+from .test_base import FullFixturesMixin
+
+
+def ler_csv(response):
+    conteudo = b''.join(response.streaming_content).decode('utf-8-sig')
+    return list(csv.reader(io.StringIO(conteudo)))
+
+
+class TestExportacao(FullFixturesMixin, TestCase):
+    """
+    CT-EX001: Exportação de inscritos
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url_csv = reverse('acoes:acao_export', args=[self.acao_futura.pk, 'csv'])
+
+    def test_csv_da_acao(self):
+        """
+        CT-EX001.1: CSV em streaming com cabeçalho e uma linha por inscrição
+        """
+        response = self.client_logged_organizador.get(self.url_csv)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        linhas = ler_csv(response)
+        self.assertEqual(linhas[0][:3], ['Ação', 'Data da ação', 'Voluntário'])
+        esperado = Inscricao.objects.filter(acao=self.acao_futura).count()
+        self.assertEqual(len(linhas) - 1, esperado)
+        self.assertIn([self.acao_futura.titulo, self.voluntario_user.username],
+                      [[linha[0], linha[2]] for linha in linhas[1:]])
+
+    def test_celulas_com_formula_sao_neutralizadas(self):
+        """
+        CT-EX001.2: Títulos iniciados com '=' não viram fórmula na planilha
+        """
+        self.acao_futura.titulo = '=HYPERLINK("x")'
+        self.acao_futura.save()
+        linhas = ler_csv(self.client_logged_organizador.get(self.url_csv))
+        self.assertEqual(linhas[1][0], '\'=HYPERLINK("x")')
+
+    def test_xlsx_e_um_pacote_valido(self):
+        """
+        CT-EX001.3: XLSX com as partes do pacote e as linhas na planilha
+        """
+        response = self.client_logged_organizador.get(
+            reverse('acoes:acao_export', args=[self.acao_futura.pk, 'xlsx'])
+        )
+        pacote = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIn('xl/workbook.xml', pacote.namelist())
+        planilha = pacote.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertIn(self.voluntario_user.username, planilha)
+        self.assertIn('Data da ação', planilha)
+
+    def test_permissao_e_formato(self):
+        """
+        CT-EX001.4: Só o organizador exporta; formato desconhecido dá 404
+        """
+        response = self.client_logged_voluntario.get(self.url_csv)
+        self.assertRedirects(response, reverse('acoes:acao_detail', args=[self.acao_futura.pk]))
+        url = reverse('acoes:acao_export', args=[self.acao_futura.pk, 'pdf'])
+        self.assertEqual(self.client_logged_organizador.get(url).status_code, 404)
+
+    def test_todas_as_acoes_inclui_arquivadas(self):
+        """
+        CT-EX001.5: Exportação do organizador junta as duas camadas
+        """
+        antiga = Acao.objects.create(
+            titulo='Ação arquivada', descricao='x', data=timezone.now() - timedelta(days=800),
+            local='x', numero_vagas=5, organizador=self.organizador_user,
+        )
+        Inscricao.objects.create(acao=antiga, voluntario=self.voluntario_user, status='ACEITO')
+        arquivar_acoes(timezone.now() - timedelta(days=365))
+
+        linhas = ler_csv(self.client_logged_organizador.get(reverse('acoes:minhas_acoes_export', args=['csv'])))
+        titulos = [linha[0] for linha in linhas[1:]]
+        self.assertIn('Ação arquivada', titulos)
+        self.assertIn(self.acao_futura.titulo, titulos)
+
+    def test_queries_nao_crescem_com_o_volume(self):
+        """
+        CT-EX001.6: Consumir a exportação custa o mesmo número de queries com 10× mais linhas
+        """
+        def consumir():
+            response = self.client_logged_organizador.get(self.url_csv)
+            with self.assertNumQueries(2):  # uma consulta por camada
+                ler_csv(response)
+
+        consumir()
+        extras = User.objects.bulk_create([User(username=f'exp_{i}') for i in range(50)])
+        Inscricao.objects.bulk_create([Inscricao(acao=self.acao_futura, voluntario=u) for u in extras])
+        consumir()
@@ -0,0 +1,137 @@
+"""
+Testes da busca por proximidade
+
+Este arquivo testa:
+- Geocodificador offline e preenchimento das coordenadas ao salvar
+- Grade espacial (faixas de células, inclusive no antimeridiano)
+- Filtro perto_de/raio_km na listagem de ações e na API
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.geo import celula, faixas_de_celulas, geocodificar_offline
+from acoes.models import Acao
+from .test_base import FullFixturesMixin
+
+
+class GeoTestMixin(FullFixturesMixin):
+    def criar_acao(self, titulo, local, **kwargs):
+        return Acao.objects.create(
+            titulo=titulo, descricao='x', data=timezone.now() + timedelta(days=5), local=local,
+            numero_vagas=5, organizador=self.organizador_user, **kwargs
+        )
+
+
+class TestGeocodificacao(GeoTestMixin, TestCase):
+    """
+    CT-GE001: Geocodificação e grade espacial
+    """
+
+    def test_geocodificador_offline(self):
+        """
+        CT-GE001.1: Coordenadas digitadas, cidades com acento e texto desconhecido
+        """
+        self.assertEqual(geocodificar_offline('Praça, -7.12, -34.85'), (-7.12, -34.85))
+        self.assertEqual(geocodificar_offline('Parque da Lagoa - João Pessoa/PB'), (-7.1195, -34.8450))
+        self.assertIsNone(geocodificar_offline('Local de Teste'))
+        with override_settings(GEO_LOCALIDADES={'Bairro dos Estados': (-7.10, -34.84)}):
+            self.assertEqual(geocodificar_offline('bairro dos estados'), (-7.10, -34.84))
+
+    def test_save_geocodifica_quando_o_local_muda(self):
+        """
+        CT-GE001.2: Ação e perfil ganham coordenadas; coordenadas informadas são mantidas
+        """
+        acao = self.criar_acao('Mutirão', 'Centro, Recife')
+        self.assertEqual((acao.latitude, acao.longitude), (-8.0476, -34.8770))
+        self.assertEqual(acao.geo_celula, celula(-8.0476, -34.8770))
+
+        acao = Acao.objects.get(pk=acao.pk)
+        acao.local = 'Natal'
+        acao.save()
+        self.assertEqual(Acao.objects.get(pk=acao.pk).latitude, -5.7945)
+
+        acao.local, acao.latitude, acao.longitude = 'Sede da ONG', -7.0, -35.0
+        acao.save()
+        self.assertEqual(Acao.objects.get(pk=acao.pk).latitude, -7.0)
+
+        perfil = self.voluntario_user.perfil
+        perfil.endereco = 'Rua das Flores, Campina Grande'
+        perfil.save()
+        perfil.refresh_from_db()
+        self.assertEqual((perfil.latitude, perfil.longitude), (-7.2306, -35.8811))
+
+    def test_faixas_no_antimeridiano(self):
+        """
+        CT-GE001.3: Raio que atravessa a longitude 180 vira duas faixas por linha
+        """
+        faixas = faixas_de_celulas(0, 179.95, 20)
+        self.assertEqual(len(faixas), 2 * len({inicio // 3600 for inicio, _ in faixas}))
+        self.assertTrue(any(inicio % 3600 == 0 for inicio, _ in faixas))
+
+    def test_comando_preenche_cadastrados(self):
+        """
+        CT-GE001.4: geocodificar completa as ações sem coordenadas
+        """
+        acao = self.criar_acao('Antiga', 'Fortaleza')
+        Acao.objects.filter(pk=acao.pk).update(latitude=None, longitude=None, geo_celula=None)
+        saida = StringIO()
+        call_command('geocodificar', stdout=saida)
+        self.assertIn('1 ações', saida.getvalue())
+        self.assertEqual(Acao.objects.get(pk=acao.pk).geo_celula, celula(-3.7319, -38.5267))
+
+
+class TestProximidade(GeoTestMixin, TestCase):
+    """
+    CT-GE002: Filtro por proximidade
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.joao_pessoa = self.criar_acao('Praia limpa', 'Cabo Branco, João Pessoa')
+        self.recife = self.criar_acao('Horta', 'Recife')
+        self.campina = self.criar_acao('Leitura', 'Campina Grande')
+        self.ponto = '-7.12,-34.85'
+
+    def test_listagem_por_distancia(self):
+        """
+        CT-GE002.1: Só ações dentro do raio, das mais próximas para as mais longe
+        """
+        url = reverse('acoes:acao_list')
+        response = self.client.get(url, {'perto_de': self.ponto, 'raio_km': 20})
+        self.assertEqual([a.pk for a in response.context['acoes']], [self.joao_pessoa.pk])
+        response = self.client.get(url, {'perto_de': self.ponto, 'raio_km': 150})
+        self.assertEqual(
+            [a.pk for a in response.context['acoes']], [self.joao_pessoa.pk, self.recife.pk, self.campina.pk]
+        )
+        self.assertContains(response, 'km)')
+
+    def test_perto_de_mim_usa_o_perfil(self):
+        """
+        CT-GE002.2: Só raio_km usa o endereço do perfil; sem coordenadas, o filtro é ignorado
+        """
+        url = reverse('acoes:acao_list')
+        response = self.client_logged_voluntario.get(url, {'raio_km': 50})
+        self.assertGreater(len(response.context['acoes']), 1)
+        perfil = self.voluntario_user.perfil
+        perfil.endereco = 'Campina Grande'
+        perfil.save()
+        response = self.client_logged_voluntario.get(url, {'raio_km': 50})
+        self.assertEqual([a.pk for a in response.context['acoes']], [self.campina.pk])
+
+    def test_api(self):
+        """
+        CT-GE002.3: /api/acoes/ filtra, ordena e devolve distancia_km
+        """
+        response = self.client_logged_voluntario.get(reverse('acoes:acao-list'), {'perto_de': self.ponto, 'raio_km': 110})
+        self.assertEqual(response.status_code, 200)
+        dados = response.json()
+        resultados = dados['results'] if isinstance(dados, dict) else dados
+        self.assertEqual([a['id'] for a in resultados], [self.joao_pessoa.pk, self.recife.pk])
+        self.assertLess(resultados[0]['distancia_km'], resultados[1]['distancia_km'])
+        self.assertAlmostEqual(resultados[1]['distancia_km'], 103, delta=5)
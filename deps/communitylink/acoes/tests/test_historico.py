@@ -84,11 +84,11 @@ class TestHistoricoView(FullFixturesMixin, TestCase):
         url = reverse('acoes:historico')
         response = self.client_logged_voluntario.get(url)
 
-        historico = response.context['historico_participacoes']
+        historico = [r.inscricao_id for r in response.context['historico_participacoes']]
 
         # Apenas ação passada deve aparecer
-        self.assertIn(inscricao_passada, historico)
-        self.assertNotIn(inscricao_futura, historico)
+        self.assertIn(inscricao_passada.pk, historico)
+        self.assertNotIn(inscricao_futura.pk, historico)
 
     def test_historico_mostra_apenas_aceitos_ou_cancelados(self):
         """
@@ -133,11 +133,11 @@ class TestHistoricoView(FullFixturesMixin, TestCase):
         url = reverse('acoes:historico')
         response = self.client_logged_voluntario.get(url)
 
-        historico = list(response.context['historico_participacoes'])
+        historico = [r.inscricao_id for r in response.context['historico_participacoes']]
 
         # Apenas aceita deve aparecer para o voluntario_user
-        self.assertIn(inscr_aceita, historico)
-        self.assertNotIn(inscr_pendente, historico)
+        self.assertIn(inscr_aceita.pk, historico)
+        self.assertNotIn(inscr_pendente.pk, historico)
 
     def test_historico_mostra_apenas_inscricoes_do_usuario(self):
         """
@@ -173,10 +173,10 @@ class TestHistoricoView(FullFixturesMixin, TestCase):
         url = reverse('acoes:historico')
         response = self.client_logged_voluntario.get(url)
 
-        historico = response.context['historico_participacoes']
+        historico = [r.inscricao_id for r in response.context['historico_participacoes']]
 
-        self.assertIn(inscr_user, historico)
-        self.assertNotIn(inscr_outro, historico)
+        self.assertIn(inscr_user.pk, historico)
+        self.assertNotIn(inscr_outro.pk, historico)
 
     def test_historico_ordenado_por_data_desc(self):
         """
@@ -217,12 +217,12 @@ class TestHistoricoView(FullFixturesMixin, TestCase):
         url = reverse('acoes:historico')
         response = self.client_logged_voluntario.get(url)
 
-        historico = list(response.context['historico_participacoes'])
+        historico = [r.inscricao_id for r in response.context['historico_participacoes']]
 
         # Mais recente primeiro: 7 dias, 15 dias, 30 dias
-        self.assertEqual(historico[0], inscr2)
-        self.assertEqual(historico[1], inscr3)
-        self.assertEqual(historico[2], inscr1)
+        self.assertEqual(historico[0], inscr2.pk)
+        self.assertEqual(historico[1], inscr3.pk)
+        self.assertEqual(historico[2], inscr1.pk)
 
 
 class TestHistoricoOrganizador(FullFixturesMixin, TestCase):
@@ -249,7 +249,7 @@ class TestHistoricoOrganizador(FullFixturesMixin, TestCase):
         response = self.client_logged_organizador.get(url)
 
         self.assertIsNotNone(response.context['historico_organizadas'])
-        self.assertIn(acao_passada, response.context['historico_organizadas'])
+        self.assertIn(acao_passada.pk, [r.acao_id for r in response.context['historico_organizadas']])
 
     def test_organizador_nao_ve_acoes_de_outros(self):
         """
@@ -282,10 +282,10 @@ class TestHistoricoOrganizador(FullFixturesMixin, TestCase):
         url = reverse('acoes:historico')
         response = self.client_logged_organizador.get(url)
 
-        historico_org = response.context['historico_organizadas']
+        historico_org = [r.acao_id for r in response.context['historico_organizadas']]
 
-        self.assertIn(acao_propria, historico_org)
-        self.assertNotIn(acao_outro, historico_org)
+        self.assertIn(acao_propria.pk, historico_org)
+        self.assertNotIn(acao_outro.pk, historico_org)
 
     def test_voluntario_nao_ve_historico_organizadas(self):
         """
@@ -332,8 +332,8 @@ class TestHistoricoOrganizador(FullFixturesMixin, TestCase):
         response = self.client_logged_organizador.get(url)
 
         # Deve ter ambos
-        self.assertIn(acao_organizada, response.context['historico_organizadas'])
-        self.assertIn(inscr, response.context['historico_participacoes'])
+        self.assertIn(acao_organizada.pk, [r.acao_id for r in response.context['historico_organizadas']])
+        self.assertIn(inscr.pk, [r.inscricao_id for r in response.context['historico_participacoes']])
 
 
 class TestComentariosNotasView(FullFixturesMixin, TestCase):
@@ -559,10 +559,10 @@ class TestHistoricoFiltros(FullFixturesMixin, TestCase):
         url = reverse('acoes:historico') + '?categoria=SAUDE'
         response = self.client_logged_voluntario.get(url)
 
-        historico = response.context['historico_participacoes']
+        historico = [r.inscricao_id for r in response.context['historico_participacoes']]
 
-        self.assertIn(inscr_saude, historico)
-        self.assertNotIn(inscr_educacao, historico)
+        self.assertIn(inscr_saude.pk, historico)
+        self.assertNotIn(inscr_educacao.pk, historico)
 
     def test_historico_paginacao_separada(self):
         """
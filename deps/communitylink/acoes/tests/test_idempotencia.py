@@ -0,0 +1,97 @@
+"""
+Testes das chaves de idempotência da API
+
+Este arquivo testa:
+- Repetição com a mesma Idempotency-Key devolve a resposta original sem reexecutar
+- Chave reutilizada em outra requisição, requisição em andamento e chave expirada
+- Escopo por usuário e limpeza das respostas vencidas
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.idempotencia import limpar_expiradas
+from acoes.models import Inscricao, Notificacao, RespostaIdempotente
+from .test_base import FullFixturesMixin
+
+
+class TestIdempotencia(FullFixturesMixin, TestCase):
+    """
+    CT-ID001: Idempotency-Key nas ações da API
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Voluntário ainda não inscrito na ação futura
+        Inscricao.objects.filter(voluntario=self.voluntario_user).delete()
+        self.url = reverse('acoes:acao-inscrever', args=[self.acao_futura.pk])
+
+    def inscrever(self, chave, client=None):
+        client = client or self.client_logged_voluntario
+        return client.post(self.url, {}, content_type='application/json', HTTP_IDEMPOTENCY_KEY=chave)
+
+    def test_repeticao_devolve_a_resposta_original(self):
+        """
+        CT-ID001.1: A repetição recebe o mesmo 200 (e não "Já inscrito"), sem nova inscrição
+        """
+        primeira = self.inscrever('abc-1')
+        self.assertEqual(primeira.status_code, 200)
+        self.assertNotIn('Idempotent-Replayed', primeira)
+
+        repetida = self.inscrever('abc-1')
+        self.assertEqual(repetida.status_code, 200)
+        self.assertEqual(repetida.json(), primeira.json())
+        self.assertEqual(repetida['Idempotent-Replayed'], 'true')
+        self.assertEqual(Inscricao.objects.filter(voluntario=self.voluntario_user).count(), 1)
+
+        # Sem a chave (ou com outra), a view roda normalmente
+        self.assertEqual(self.inscrever('abc-2').status_code, 400)
+        response = self.client_logged_voluntario.post(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_marcar_lida(self):
+        """
+        CT-ID001.2: marcar_lida repetido devolve o corpo original
+        """
+        notificacao = Notificacao.objects.create(destinatario=self.voluntario_user, mensagem='Olá')
+        url = reverse('acoes:notificacao-marcar-lida', args=[notificacao.pk])
+        primeira = self.client_logged_voluntario.post(url, HTTP_IDEMPOTENCY_KEY='lida-1')
+        repetida = self.client_logged_voluntario.post(url, HTTP_IDEMPOTENCY_KEY='lida-1')
+        self.assertEqual((repetida.status_code, repetida.json()), (200, primeira.json()))
+        self.assertTrue(repetida.json()['lida'])
+
+    def test_conflitos(self):
+        """
+        CT-ID001.3: Chave usada em outra requisição (422) ou ainda em andamento (409)
+        """
+        self.inscrever('abc-1')
+        outra_url = reverse('acoes:acao-inscrever', args=[self.acao_cheia.pk])
+        response = self.client_logged_voluntario.post(outra_url, HTTP_IDEMPOTENCY_KEY='abc-1')
+        self.assertEqual(response.status_code, 422)
+
+        # Simula a primeira requisição ainda rodando: a duplicata não executa a view
+        RespostaIdempotente.objects.update(status=None)
+        response = self.inscrever('abc-1')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+
+        self.assertEqual(self.inscrever('x' * 256).status_code, 400)
+
+    def test_expiracao_e_escopo_por_usuario(self):
+        """
+        CT-ID001.4: Chave expirada executa de novo; a mesma chave de outro usuário não colide
+        """
+        self.inscrever('abc-1')
+        RespostaIdempotente.objects.update(expira_em=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.inscrever('abc-1').status_code, 400)
+
+        response = self.inscrever('abc-1', client=self.client_logged_organizador)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+        RespostaIdempotente.objects.update(expira_em=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(limpar_expiradas(), 2)
+        self.assertFalse(RespostaIdempotente.objects.exists())
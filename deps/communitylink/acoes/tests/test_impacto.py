@@ -0,0 +1,194 @@
+"""
+Testes do histórico materializado e do resumo de impacto
+
+Este arquivo testa:
+- Materialização incremental das ações que passaram (atualizar_historico)
+- Propagação de comentários, notas e status para o histórico (signals)
+- Totais do ResumoImpacto (participações, horas, categorias, organização)
+- Página "Meu Impacto"
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.arquivo import arquivar_acoes
+from acoes.historico import atualizar_historico
+from acoes.models import Acao, Inscricao, InscricaoArquivada, RegistroHistorico, ResumoImpacto
+from .test_base import FullFixturesMixin
+
+
+class HistoricoTestMixin(FullFixturesMixin):
+    def criar_acao(self, dias, categoria='SAUDE', duracao=3, **kwargs):
+        return Acao.objects.create(
+            titulo=kwargs.pop('titulo', f'Ação {dias}'), descricao='x', data=timezone.now() + timedelta(days=dias),
+            local='Centro', numero_vagas=10, categoria=categoria, duracao_horas=duracao,
+            organizador=self.organizador_user, **kwargs,
+        )
+
+
+class TestMaterializacao(HistoricoTestMixin, TestCase):
+    """
+    CT-HM001: Materialização incremental do histórico
+    """
+
+    def test_materializa_somente_acoes_passadas(self):
+        """
+        CT-HM001.1: Ações passadas entram uma vez; futuras ficam de fora
+        """
+        passada = self.criar_acao(-3)
+        futura = self.criar_acao(3)
+        Inscricao.objects.create(acao=passada, voluntario=self.voluntario_user, status='ACEITO')
+        Inscricao.objects.create(acao=futura, voluntario=self.voluntario_user, status='ACEITO')
+
+        self.assertGreaterEqual(atualizar_historico(), 1)
+        self.assertEqual(atualizar_historico(), 0)
+
+        registros = RegistroHistorico.objects.filter(acao_id=passada.pk)
+        self.assertEqual(set(registros.values_list('papel', flat=True)), {'ORGANIZACAO', 'PARTICIPACAO'})
+        self.assertEqual(registros.get(papel='ORGANIZACAO').participantes, 1)
+        self.assertFalse(RegistroHistorico.objects.filter(acao_id=futura.pk).exists())
+
+    def test_ignora_pendentes_e_rejeitadas(self):
+        """
+        CT-HM001.2: Só ACEITO/CANCELADO viram participação
+        """
+        passada = self.criar_acao(-1)
+        Inscricao.objects.create(acao=passada, voluntario=self.voluntario_user, status='PENDENTE')
+        atualizar_historico()
+        self.assertFalse(RegistroHistorico.objects.filter(papel='PARTICIPACAO', acao_id=passada.pk).exists())
+
+    def test_comentario_e_notas_propagam(self):
+        """
+        CT-HM001.3: Edições no histórico (quente e arquivado) atualizam os registros
+        """
+        passada = self.criar_acao(-2)
+        inscricao = Inscricao.objects.create(acao=passada, voluntario=self.voluntario_user, status='ACEITO')
+        atualizar_historico()
+
+        self.client_logged_voluntario.post(reverse('acoes:historico'), {
+            'inscricao_id': inscricao.pk, 'comentario': 'Muito bom',
+        })
+        self.client_logged_organizador.post(reverse('acoes:historico'), {
+            'acao_id': passada.pk, 'notas_organizador': 'Tudo certo',
+        })
+        self.assertEqual(RegistroHistorico.objects.get(inscricao_id=inscricao.pk).comentario, 'Muito bom')
+        self.assertEqual(
+            RegistroHistorico.objects.get(acao_id=passada.pk, papel='ORGANIZACAO').notas_organizador, 'Tudo certo'
+        )
+
+        arquivar_acoes(timezone.now())
+        arquivada = InscricaoArquivada.objects.get(pk=inscricao.pk)
+        arquivada.comentario = 'Lembrança'
+        arquivada.save()
+        self.assertEqual(RegistroHistorico.objects.get(inscricao_id=inscricao.pk).comentario, 'Lembrança')
+
+    def test_acao_remarcada_para_o_futuro_sai_do_historico(self):
+        """
+        CT-HM001.4: Nova data no futuro remove os registros até a ação passar
+        """
+        acao = self.criar_acao(-2)
+        atualizar_historico()
+        acao = Acao.objects.get(pk=acao.pk)
+        acao.data = timezone.now() + timedelta(days=5)
+        acao.save()
+        acao.refresh_from_db()
+        self.assertFalse(acao.historico_materializado)
+        self.assertFalse(RegistroHistorico.objects.filter(acao_id=acao.pk).exists())
+
+    def test_acao_com_inscricao_remarcada_para_o_futuro(self):
+        """
+        CT-HM001.7: Remarcar para o futuro uma ação materializada com inscrição aceita não quebra o save
+        """
+        acao = self.criar_acao(-2)
+        inscricao = Inscricao.objects.create(acao=acao, voluntario=self.voluntario_user, status='ACEITO')
+        atualizar_historico()
+        self.assertTrue(RegistroHistorico.objects.filter(inscricao_id=inscricao.pk).exists())
+
+        acao = Acao.objects.get(pk=acao.pk)
+        acao.data = timezone.now() + timedelta(days=5)
+        acao.save()
+        self.assertFalse(RegistroHistorico.objects.filter(acao_id=acao.pk).exists())
+        self.assertEqual(ResumoImpacto.objects.get(usuario=self.voluntario_user).participacoes, 0)
+
+    def test_comando_reconstroi(self):
+        """
+        CT-HM001.5: --reconstruir refaz o histórico das ações passadas
+        """
+        acao = self.criar_acao(-2)
+        atualizar_historico()
+        RegistroHistorico.objects.all().delete()
+        saida = StringIO()
+        call_command('atualizar_historico', reconstruir=True, stdout=saida)
+        self.assertIn('ações adicionadas', saida.getvalue())
+        self.assertTrue(RegistroHistorico.objects.filter(acao_id=acao.pk).exists())
+
+    @override_settings(HISTORICO_LOTE_PAGINA=1)
+    def test_pagina_adianta_um_lote_do_proprio_usuario(self):
+        """
+        CT-HM001.6: A página só materializa um lote pequeno, e só de ações do usuário
+        """
+        inscritas = [self.criar_acao(dias) for dias in (-3, -2)]
+        for acao in inscritas:
+            Inscricao.objects.create(acao=acao, voluntario=self.voluntario_user, status='ACEITO')
+        alheia = self.criar_acao(-1)
+
+        self.client_logged_voluntario.get(reverse('acoes:historico'))
+        materializadas = set(Acao.objects.filter(historico_materializado=True).values_list('pk', flat=True))
+        self.assertEqual(materializadas & {inscritas[0].pk, inscritas[1].pk, alheia.pk}, {inscritas[0].pk})
+
+        self.client_logged_voluntario.get(reverse('acoes:impacto'))
+        self.assertTrue(Acao.objects.get(pk=inscritas[1].pk).historico_materializado)
+        self.assertFalse(Acao.objects.get(pk=alheia.pk).historico_materializado)
+
+
+class TestResumoImpacto(HistoricoTestMixin, TestCase):
+    """
+    CT-HM002: Totais de impacto
+    """
+
+    def setUp(self):
+        super().setUp()
+        for dias, categoria, duracao, status in [
+            (-10, 'SAUDE', 3, 'ACEITO'),
+            (-20, 'SAUDE', 2, 'ACEITO'),
+            (-30, 'EDUCACAO', 4, 'ACEITO'),
+            (-40, 'ANIMAIS', 5, 'CANCELADO'),
+        ]:
+            acao = self.criar_acao(dias, categoria, duracao)
+            Inscricao.objects.create(acao=acao, voluntario=self.voluntario_user, status=status)
+        atualizar_historico()
+
+    def test_totais_do_voluntario(self):
+        """
+        CT-HM002.1: Participações e horas só contam inscrições aceitas
+        """
+        resumo = ResumoImpacto.objects.get(usuario=self.voluntario_user)
+        self.assertEqual(resumo.participacoes, 3)
+        self.assertEqual(resumo.horas_voluntariadas, 9)
+        self.assertEqual(resumo.por_categoria, {'SAUDE': 2, 'EDUCACAO': 1})
+        self.assertEqual(resumo.categorias(), [('Saúde', 2), ('Educação', 1)])
+
+    def test_totais_do_organizador(self):
+        """
+        CT-HM002.2: Ações realizadas e voluntários aceitos somados
+        """
+        resumo = ResumoImpacto.objects.get(usuario=self.organizador_user)
+        passadas = Acao.objects.filter(organizador=self.organizador_user, data__lt=timezone.now())
+        self.assertEqual(resumo.acoes_organizadas, passadas.count())
+        self.assertEqual(resumo.voluntarios_mobilizados,
+                         Inscricao.objects.filter(acao__in=passadas, status='ACEITO').count())
+
+    def test_pagina_impacto(self):
+        """
+        CT-HM002.3: Página mostra os totais e exige login
+        """
+        response = self.client_logged_voluntario.get(reverse('acoes:impacto'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['resumo'].horas_voluntariadas, 9)
+        self.assertContains(response, 'Horas Voluntariadas')
+        self.assertEqual(self.client.get(reverse('acoes:impacto')).status_code, 302)
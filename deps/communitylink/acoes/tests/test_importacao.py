@@ -0,0 +1,153 @@
+"""
+Testes da importação de ações em lote
+
+Este arquivo testa:
+- Validação por linha com as regras do AcaoForm (e data no passado)
+- Inserção das linhas válidas com bulk_create (queries constantes)
+- Página de importação, endpoint /api/acoes/importar/ e comando importar_acoes
+"""
+
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.importacao import importar_acoes, ler_linhas
+from acoes.models import Acao, DiaPendente
+from .test_base import FullFixturesMixin
+
+
+def linha(titulo='Mutirão', dias=10, **extra):
+    dados = {
+        'titulo': titulo, 'descricao': 'Importada', 'local': 'Praça',
+        'data': (timezone.localtime() + timedelta(days=dias)).strftime('%Y-%m-%dT%H:%M'),
+        'categoria': 'MEIO_AMBIENTE', 'numero_vagas': '10',
+    }
+    dados.update(extra)
+    return dados
+
+
+def csv_de(linhas):
+    cabecalho = list(linhas[0])
+    texto = [','.join(cabecalho)] + [','.join(str(l.get(c, '')) for c in cabecalho) for l in linhas]
+    return '\n'.join(texto).encode('utf-8')
+
+
+class TestImportacao(FullFixturesMixin, TestCase):
+    """
+    CT-IM001: Validação e inserção em lote
+    """
+
+    def test_linhas_validas_e_erros_por_linha(self):
+        """
+        CT-IM001.1: Linhas válidas entram; as inválidas voltam com o campo e a mensagem
+        """
+        linhas = [linha('Válida'), linha('Sem vagas', numero_vagas='0'), linha('Passada', dias=-2),
+                  linha('Categoria', categoria='XYZ')]
+        resultado = importar_acoes(linhas, self.organizador_user)
+
+        self.assertEqual((resultado['total'], resultado['criadas']), (4, 1))
+        erros = {item['linha']: item['erros'] for item in resultado['erros']}
+        self.assertEqual(set(erros), {2, 3, 4})
+        self.assertIn('numero_vagas', erros[2])
+        self.assertEqual(erros[3], {'data': ['A data da ação não pode ser no passado.']})
+        self.assertIn('categoria', erros[4])
+
+        acao = Acao.objects.get(titulo='Válida')
+        self.assertEqual(acao.organizador, self.organizador_user)
+        self.assertEqual(acao.duracao_horas, 2)
+        self.assertTrue(timezone.is_aware(acao.data))
+        self.assertTrue(DiaPendente.objects.filter(organizador_id=self.organizador_user.pk).exists())
+
+    def test_somente_validar(self):
+        """
+        CT-IM001.2: Modo validação não cria nada
+        """
+        resultado = importar_acoes([linha()], self.organizador_user, somente_validar=True)
+        self.assertEqual((resultado['validas'], resultado['criadas']), (1, 0))
+        self.assertFalse(Acao.objects.filter(titulo='Mutirão').exists())
+
+    def test_csv_com_bom_e_ponto_e_virgula(self):
+        """
+        CT-IM001.3: CSV do Excel (BOM, separador ';') é lido
+        """
+        conteudo = '\ufefftitulo;descricao;data;local;categoria;numero_vagas\nA;B;2030-01-01T10:00;C;SAUDE;3'
+        self.assertEqual(ler_linhas(conteudo.encode('utf-8'), 'csv')[0]['titulo'], 'A')
+
+    def test_queries_nao_crescem_com_as_linhas(self):
+        """
+        CT-IM001.4: Inserção em lotes: poucas queries para centenas de linhas
+        """
+        with CaptureQueriesContext(connection) as capturadas:
+            importar_acoes([linha(f'Lote {i}') for i in range(300)], self.organizador_user)
+        # Validação não consulta o banco; só os INSERTs em lote (limite de parâmetros do SQLite),
+        # a marcação e a invalidação do feed de calendário
+        self.assertLess(len(capturadas), 11)
+        self.assertEqual(Acao.objects.filter(titulo__startswith='Lote ').count(), 300)
+
+
+class TestInterfacesImportacao(FullFixturesMixin, TestCase):
+    """
+    CT-IM002: Página, API e comando
+    """
+
+    def test_pagina_importa_csv(self):
+        """
+        CT-IM002.1: Upload de CSV cria as ações e mostra os erros
+        """
+        arquivo = SimpleUploadedFile('acoes.csv', csv_de([linha('Pela página'), linha('Ruim', numero_vagas='x')]))
+        response = self.client_logged_organizador.post(reverse('acoes:acao_import'), {'arquivo': arquivo})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['resultado']['criadas'], 1)
+        self.assertContains(response, 'Linha 2')
+        self.assertTrue(Acao.objects.filter(titulo='Pela página').exists())
+
+    def test_pagina_recusa_extensao_e_voluntario(self):
+        """
+        CT-IM002.2: Extensão desconhecida é recusada; voluntário não acessa
+        """
+        arquivo = SimpleUploadedFile('acoes.txt', b'x')
+        response = self.client_logged_organizador.post(reverse('acoes:acao_import'), {'arquivo': arquivo})
+        self.assertFormError(response.context['form'], 'arquivo', 'Envie um arquivo .csv ou .json.')
+        response = self.client_logged_voluntario.get(reverse('acoes:acao_import'))
+        self.assertRedirects(response, reverse('acoes:acao_list'))
+
+    def test_api_json(self):
+        """
+        CT-IM002.3: API aceita lista JSON; 201 com criadas, 400 só com erros, 403 para voluntário
+        """
+        url = reverse('acoes:acao-importar')
+        response = self.client_logged_organizador.post(url, json.dumps([linha('API')]), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['criadas'], 1)
+
+        response = self.client_logged_organizador.post(
+            url, json.dumps({'acoes': [linha(numero_vagas='0')]}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['erros'][0]['linha'], 1)
+
+        response = self.client_logged_voluntario.post(url, json.dumps([linha()]), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_comando(self):
+        """
+        CT-IM002.4: importar_acoes lê o arquivo e informa o resumo
+        """
+        with tempfile.NamedTemporaryFile(suffix='.json', mode='w', encoding='utf-8') as arquivo:
+            json.dump([linha('Pelo comando'), linha(titulo='')], arquivo)
+            arquivo.flush()
+            saida, erros = StringIO(), StringIO()
+            call_command('importar_acoes', arquivo.name, organizador=self.organizador_user.username,
+                         stdout=saida, stderr=erros)
+        self.assertIn('1 ações criadas', saida.getvalue())
+        self.assertIn('Linha 2: titulo', erros.getvalue())
+        self.assertTrue(Acao.objects.filter(titulo='Pelo comando').exists())
@@ -0,0 +1,144 @@
+"""
+Testes dos lembretes das ações
+
+Este arquivo testa:
+- Agendamento pelos signals (aceite, cancelamento, nova data da ação)
+- Envio pelo scheduler em lotes, sem duplicar em reexecuções
+- Comando run_scheduler (--uma-vez e --agendar)
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase
+from django.utils import timezone
+
+from acoes.lembretes import enviar_lembretes
+from acoes.models import Acao, Inscricao, Lembrete, Notificacao
+from .test_base import FullFixturesMixin
+
+
+class TestAgendamento(FullFixturesMixin, TestCase):
+    """
+    CT-LE001: Agendamento dos lembretes
+    """
+
+    def test_aceite_agenda_uma_vez_por_antecedencia(self):
+        """
+        CT-LE001.1: Inscrição aceita ganha um lembrete por antecedência, sem duplicar
+        """
+        self.inscricao_pendente.status = 'ACEITO'
+        self.inscricao_pendente.save()
+        self.inscricao_pendente.save()
+        lembretes = self.inscricao_pendente.lembretes.order_by('enviar_em')
+        self.assertEqual(
+            [(l.antecedencia_horas, l.enviar_em) for l in lembretes],
+            [(24, self.acao_futura.data - timedelta(hours=24)), (2, self.acao_futura.data - timedelta(hours=2))],
+        )
+
+    def test_cancelamento_descarta_pendentes(self):
+        """
+        CT-LE001.2: Inscrição que deixa de estar aceita perde os lembretes não enviados
+        """
+        self.inscricao_pendente.status = 'ACEITO'
+        self.inscricao_pendente.save()
+        self.inscricao_pendente.status = 'CANCELADO'
+        self.inscricao_pendente.save()
+        self.assertFalse(self.inscricao_pendente.lembretes.exists())
+
+    def test_nova_data_reagenda(self):
+        """
+        CT-LE001.3: Mudar a data da ação recalcula os lembretes pendentes
+        """
+        acao = Acao.objects.get(pk=self.acao_cheia.pk)
+        acao.data += timedelta(days=2)
+        acao.save()
+        lembrete = Lembrete.objects.filter(inscricao__acao=acao, antecedencia_horas=2).first()
+        self.assertEqual(lembrete.enviar_em, acao.data - timedelta(hours=2))
+
+    def test_acao_passada_sem_lembretes(self):
+        """
+        CT-LE001.4: Aceite em ação que já aconteceu não agenda nada
+        """
+        inscricao = Inscricao.objects.create(acao=self.acao_passada, voluntario=self.voluntario_user, status='ACEITO')
+        self.assertFalse(inscricao.lembretes.exists())
+
+
+class TestEnvio(FullFixturesMixin, TestCase):
+    """
+    CT-LE002: Envio pelo scheduler
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.inscricao_pendente.status = 'ACEITO'
+        self.inscricao_pendente.save()
+        self.vespera = self.acao_futura.data - timedelta(hours=23)
+
+    def test_envia_vencidos_uma_unica_vez(self):
+        """
+        CT-LE002.1: Só o lembrete vencido sai; rodar de novo não duplica
+        """
+        self.assertEqual(enviar_lembretes(agora=self.vespera), 1)
+        notificacao = Notificacao.objects.get(destinatario=self.voluntario_user)
+        self.assertIn('Ação Futura de Teste', notificacao.mensagem)
+        self.assertIn('amanhã', notificacao.mensagem)
+        self.assertEqual(enviar_lembretes(agora=self.vespera), 0)
+        self.assertEqual(self.inscricao_pendente.lembretes.filter(enviado_em__isnull=True).count(), 1)
+
+    def test_lotes_em_ordem(self):
+        """
+        CT-LE002.2: Lotes pequenos processam todos os vencidos (ação cheia + futura)
+        """
+        depois = self.acao_futura.data - timedelta(minutes=30)
+        self.assertEqual(enviar_lembretes(agora=depois, tamanho_lote=1), 2)
+        # Os da ação cheia (já começou em `depois`) são marcados sem notificação
+        self.assertFalse(Lembrete.objects.filter(enviado_em__isnull=True).exists())
+
+    def test_falha_desfaz_o_lote(self):
+        """
+        CT-LE002.3: Erro ao notificar mantém o lembrete pendente para a próxima rodada
+        """
+        with mock.patch.object(Notificacao.objects, 'bulk_create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                enviar_lembretes(agora=self.vespera)
+        self.assertEqual(enviar_lembretes(agora=self.vespera), 1)
+
+    def test_comando(self):
+        """
+        CT-LE002.4: --agendar completa inscrições criadas em lote; --uma-vez roda e sai
+        """
+        Inscricao.objects.bulk_create([
+            Inscricao(acao=self.acao_futura, voluntario=self.organizador_user, status='ACEITO'),
+        ])
+        saida = StringIO()
+        call_command('run_scheduler', uma_vez=True, agendar=True, stdout=saida)
+        self.assertIn('1 inscrições com lembretes agendados', saida.getvalue())
+        self.assertIn('0 lembretes enviados', saida.getvalue())
+        self.assertEqual(Lembrete.objects.filter(inscricao__voluntario=self.organizador_user).count(), 2)
+
+    def test_laco_sobrevive_a_erro_de_banco(self):
+        """
+        CT-LE002.5: Erro de banco numa rodada é registrado e o laço segue; cada rodada renova a conexão
+        """
+        rodadas = [OperationalError('server closed the connection unexpectedly'), 1]
+
+        def enviar(tamanho_lote):
+            resultado = rodadas.pop(0)
+            if isinstance(resultado, Exception):
+                raise resultado
+            return resultado
+
+        saida = StringIO()
+        comando = 'acoes.management.commands.run_scheduler'
+        with mock.patch(f'{comando}.enviar_lembretes', side_effect=enviar), \
+                mock.patch(f'{comando}.close_old_connections') as fechar, \
+                mock.patch(f'{comando}.time.sleep', side_effect=[None, KeyboardInterrupt]), \
+                self.assertLogs(comando, 'ERROR'):
+            call_command('run_scheduler', stdout=saida)
+        self.assertEqual(fechar.call_count, 2)
+        self.assertIn('1 lembretes enviados', saida.getvalue())
+        self.assertIn('Scheduler encerrado', saida.getvalue())
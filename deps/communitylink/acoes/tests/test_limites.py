@@ -0,0 +1,128 @@
+"""
+Testes dos limites de taxa
+
+Este arquivo testa:
+- Janela deslizante: até N por período, bloqueio e reposição com o tempo
+- Contagem atômica: requisições simultâneas não passam do limite
+- Limites da API por IP (anônimo), por usuário e por rota, com os cabeçalhos X-RateLimit-*
+- Limite de tentativas de login/cadastro por IP
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from acoes.limites import consumir
+from .test_base import FullFixturesMixin
+
+# Início de uma janela de 1 minuto
+INICIO_JANELA = 1_000_020.0
+
+
+class TestJanelaDeslizante(FullFixturesMixin, TestCase):
+    """
+    CT-LT001: Contagem por janela deslizante
+    """
+
+    def test_limite_bloqueio_e_reposicao(self):
+        """
+        CT-LT001.1: 3/min aceita 3 seguidas, bloqueia a 4ª e libera quando a janela anterior perde peso
+        """
+        cotas = [consumir('teste', 'a', '3/min', agora=1020.0) for _ in range(4)]
+        self.assertEqual([c.permitida for c in cotas], [True, True, True, False])
+        self.assertEqual([c.restantes for c in cotas], [2, 1, 0, 0])
+        # Próxima janela em 60s; as 3 da anterior pesam 2 aos 20s dela
+        self.assertEqual((cotas[-1].espera, cotas[-1].reset), (80, 120))
+
+        self.assertFalse(consumir('teste', 'a', '3/min', agora=1099.0).permitida)
+        self.assertTrue(consumir('teste', 'a', '3/min', agora=1100.0).permitida)
+        # Outra identidade tem a própria contagem
+        self.assertTrue(consumir('teste', 'b', '3/min', agora=1100.0).permitida)
+
+    def test_requisicoes_simultaneas(self):
+        """
+        CT-LT001.2: 30 threads com um cache lento (10ms por operação) não passam de 5 em 5/min
+        """
+        # Cada thread tem a própria instância do backend: o atraso vai na classe
+        backend = type(caches[settings.LIMITES_CACHE])
+
+        def lenta(operacao):
+            def executar(*args, **kwargs):
+                time.sleep(0.01)
+                return operacao(*args, **kwargs)
+            return executar
+
+        barreira = threading.Barrier(30)
+        permitidas = []
+
+        def tentar():
+            barreira.wait()
+            permitidas.append(consumir('login', 'ip:1', '5/min', agora=INICIO_JANELA).permitida)
+
+        with mock.patch.multiple(backend, get=lenta(backend.get), set=lenta(backend.set), add=lenta(backend.add),
+                                 incr=lenta(backend.incr), decr=lenta(backend.decr)):
+            threads = [threading.Thread(target=tentar) for _ in range(30)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(permitidas.count(True), 5)
+
+
+class TestLimitesApi(FullFixturesMixin, TestCase):
+    """
+    CT-LT002: Limites da API e do login
+    """
+
+    @override_settings(LIMITES_TAXA={'anonimo': '2/min', 'usuario': '100/min'})
+    def test_anonimo_por_ip(self):
+        """
+        CT-LT002.1: Anônimo esgota a cota do IP e recebe 429; o usuário logado não é afetado
+        """
+        url = reverse('acoes:acao-list')
+        with mock.patch('acoes.limites.time.time', return_value=INICIO_JANELA):
+            respostas = [self.client.get(url) for _ in range(3)]
+        self.assertEqual([r.status_code for r in respostas], [200, 200, 429])
+        self.assertEqual(respostas[0]['X-RateLimit-Limit'], '2')
+        self.assertEqual([r['X-RateLimit-Remaining'] for r in respostas], ['1', '0', '0'])
+        # Fim da janela (60s) + metade da seguinte, quando as 2 pesam 1
+        self.assertEqual(respostas[2]['Retry-After'], '90')
+
+        response = self.client_logged_voluntario.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-RateLimit-Remaining'], '99')
+
+    @override_settings(LIMITES_TAXA={'usuario': '100/min', 'importacao': '1/hour'})
+    def test_escopo_da_rota(self):
+        """
+        CT-LT002.2: importar tem contagem própria, mais apertada que a geral
+        """
+        url = reverse('acoes:acao-importar') + '?validar=1'
+        primeira = self.client_logged_organizador.post(url, [], content_type='application/json')
+        self.assertNotEqual(primeira.status_code, 429)
+        segunda = self.client_logged_organizador.post(url, [], content_type='application/json')
+        self.assertEqual(segunda.status_code, 429)
+        # A cota mais apertada é a exposta nos cabeçalhos
+        self.assertEqual(primeira['X-RateLimit-Limit'], '1')
+        self.assertEqual(self.client_logged_organizador.get(reverse('acoes:acao-list')).status_code, 200)
+
+    @override_settings(LIMITES_TAXA={'login': '2/min'})
+    def test_tentativas_de_login(self):
+        """
+        CT-LT002.3: Depois de 2 tentativas, nem a senha certa é verificada até a espera acabar
+        """
+        url = reverse('acoes:signin')
+        for _ in range(2):
+            self.client.post(url, {'username': 'voluntario', 'password': 'errada'})
+        response = self.client.post(url, {'username': 'voluntario', 'password': 'test123'})
+        self.assertEqual(response.status_code, 429)
+        self.assertContains(response, 'Muitas tentativas', status_code=429)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        # A página continua abrindo; o cadastro divide a mesma contagem
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.post(reverse('acoes:signup'), {}).status_code, 429)
@@ -0,0 +1,134 @@
+"""
+Testes do dicionário de locais normalizados
+
+Este arquivo testa:
+- Normalização das grafias (acento, caixa, pontuação, UF final)
+- Ligação das ações ao Local (save e comando normalizar_locais)
+- Autocompletar (prefixo e trigramas) servido do índice em memória
+- Filtro de local por igualdade na chave normalizada
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.locais import indice, normalizar_local, sugerir_locais
+from acoes.models import Acao, Local
+from .test_base import FullFixturesMixin
+
+
+class LocalTestMixin(FullFixturesMixin):
+    def setUp(self):
+        super().setUp()
+        self.centro = self.criar_acao('Centro')
+        self.centro_sp = self.criar_acao('  centro - SP')
+        self.comunitario = self.criar_acao('Centro Comunitário')
+        # Índice vazio: a primeira consulta carrega tudo do banco
+        indice.limpar()
+        self.addCleanup(indice.limpar)
+
+    def criar_acao(self, local):
+        return Acao.objects.create(
+            titulo=f'Ação em {local}', descricao='x', data=timezone.now() + timedelta(days=5),
+            local=local, numero_vagas=5, organizador=self.organizador_user,
+        )
+
+
+class TestNormalizacao(LocalTestMixin, TestCase):
+    """
+    CT-LC001: Normalização e ligação das ações
+    """
+
+    def test_variantes_viram_a_mesma_chave(self):
+        """
+        CT-LC001.1: Caixa, acento, espaços e UF final não mudam a chave
+        """
+        for texto in ('Centro', 'centro ', 'Centro - SP', 'CENTRO/pb', 'Céntro'):
+            self.assertEqual(normalizar_local(texto), 'centro')
+        # "Sul" não é UF: continua parte do nome
+        self.assertEqual(normalizar_local('São Paulo - Zona Sul'), 'sao paulo zona sul')
+
+    def test_acoes_apontam_para_um_unico_local(self):
+        """
+        CT-LC001.2: Grafias diferentes compartilham o Local; o nome é a primeira grafia
+        """
+        self.assertEqual(self.centro.local_normalizado_id, self.centro_sp.local_normalizado_id)
+        self.assertEqual(Local.objects.get(chave='centro').nome, 'Centro')
+        self.assertEqual(Local.objects.count(), Local.objects.values('chave').distinct().count())
+
+    def test_comando_liga_acoes_antigas(self):
+        """
+        CT-LC001.3: normalizar_locais preenche as ações sem local normalizado
+        """
+        Acao.objects.update(local_normalizado=None)
+        Local.objects.all().delete()
+        saida = StringIO()
+        call_command('normalizar_locais', lote=2, stdout=saida)
+        self.assertIn(f'{Acao.objects.count()} ações', saida.getvalue())
+        self.assertEqual(Acao.objects.get(pk=self.centro_sp.pk).local_normalizado_id, 'centro')
+
+
+class TestAutocompletar(LocalTestMixin, TestCase):
+    """
+    CT-LC002: Autocompletar e filtro por local
+    """
+
+    def test_prefixo_e_trigramas(self):
+        """
+        CT-LC002.1: Prefixo primeiro; erro de digitação ainda encontra pelos trigramas
+        """
+        response = self.client.get(reverse('acoes:locais_autocomplete'), {'q': 'cen'})
+        self.assertEqual(response.status_code, 200)
+        nomes = [local['nome'] for local in response.json()['resultados']]
+        self.assertEqual(nomes[:2], ['Centro', 'Centro Comunitário'])
+        self.assertEqual(sugerir_locais('Cemtro')[0][0], 'centro')
+        self.assertEqual(sugerir_locais(''), [])
+
+    def test_indice_em_memoria(self):
+        """
+        CT-LC002.2: Depois de carregado, sugere sem consultas; locais novos entram no commit
+        """
+        sugerir_locais('x')
+        with self.assertNumQueries(0):
+            sugerir_locais('centro')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.criar_acao('Parque da Cidade')
+        with self.assertNumQueries(0):
+            self.assertEqual(sugerir_locais('parque')[0][1], 'Parque da Cidade')
+
+    @override_settings(LOCAIS_RECARGA_SEGUNDOS=0)
+    def test_recarga_incremental(self):
+        """
+        CT-LC002.3: Locais criados por outro processo aparecem na próxima recarga
+        """
+        sugerir_locais('x')
+        Local.objects.create(chave='praca da paz', nome='Praça da Paz')
+        self.assertEqual(sugerir_locais('praca')[0][0], 'praca da paz')
+
+    @override_settings(LOCAIS_RECARGA_SEGUNDOS=0)
+    def test_recarga_ve_commit_atrasado(self):
+        """
+        CT-LC002.5: Local com criado_em anterior ao último visto (commit atrasado) entra na recarga
+        """
+        sugerir_locais('x')
+        Local.objects.create(chave='praca da paz', nome='Praça da Paz')
+        sugerir_locais('x')
+        # Gravado por uma transação que começou antes e só fez commit agora
+        atrasado = Local.objects.create(chave='praca da se', nome='Praça da Sé')
+        Local.objects.filter(pk=atrasado.pk).update(criado_em=indice._visto_ate - timedelta(seconds=30))
+        self.assertIn('praca da se', [chave for chave, _ in sugerir_locais('praca')])
+
+    def test_filtro_por_chave(self):
+        """
+        CT-LC002.4: Local conhecido filtra por igualdade (sem pegar "Centro Comunitário")
+        """
+        response = self.client.get(reverse('acoes:acao_list'), {'local': 'centro - sp'})
+        acoes = list(response.context['acoes'])
+        self.assertEqual({a.pk for a in acoes}, {self.centro.pk, self.centro_sp.pk})
+        # Texto parcial continua como busca por trecho
+        response = self.client.get(reverse('acoes:acao_list'), {'local': 'Comunit'})
+        self.assertEqual([a.pk for a in response.context['acoes']], [self.comunitario.pk])
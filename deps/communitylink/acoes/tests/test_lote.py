@@ -0,0 +1,71 @@
+"""
+Testes do lote de leituras da API (/api/batch/)
+
+Este arquivo testa:
+- Várias leituras numa requisição, com o mesmo resultado das chamadas separadas
+- Status por sub-requisição (404, permissão, rota fora da API)
+- Validação do corpo e limite de tamanho do lote
+"""
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .test_base import FullFixturesMixin
+
+
+class TestLoteApi(FullFixturesMixin, TestCase):
+    """
+    CT-LO001: /api/batch/
+    """
+
+    def lote(self, cliente, dados):
+        return cliente.post(reverse('acoes:batch'), dados, content_type='application/json')
+
+    def test_mesmo_resultado_das_chamadas_separadas(self):
+        """
+        CT-LO001.1: Corpos iguais aos das rotas, na ordem pedida, com sessão e usuário lidos uma vez
+        """
+        urls = [
+            reverse('acoes:acao-list') + '?fields=id,titulo&format=ndjson',
+            reverse('acoes:inscricao-list'),
+            reverse('acoes:perfil-meu-perfil'),
+        ]
+        esperado = [self.client_logged_voluntario.get(url.replace('&format=ndjson', '')).json() for url in urls]
+
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.lote(self.client_logged_voluntario, {'requisicoes': [{'url': url} for url in urls]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['url'] for r in response.json()], urls)
+        self.assertEqual([r['status'] for r in response.json()], [200, 200, 200])
+        self.assertEqual([r['corpo'] for r in response.json()], esperado)
+        sessoes = [q for q in contexto.captured_queries if 'django_session' in q['sql']]
+        self.assertEqual(len(sessoes), 1)
+
+    def test_status_por_sub_requisicao(self):
+        """
+        CT-LO001.2: Uma falha não derruba o lote; permissões valem em cada rota
+        """
+        response = self.lote(self.client, [
+            {'url': reverse('acoes:acao-detail', args=[self.acao_futura.pk])},
+            {'url': reverse('acoes:acao-detail', args=[999999])},
+            {'url': reverse('acoes:inscricao-list')},
+            {'url': reverse('acoes:acao_list')},
+            {'url': reverse('acoes:batch')},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.json()], [200, 404, 403, 400, 400])
+        self.assertEqual(response.json()[0]['corpo']['id'], self.acao_futura.pk)
+
+    @override_settings(API_LOTE_MAXIMO=2)
+    def test_corpo_invalido_e_limite(self):
+        """
+        CT-LO001.3: Lista vazia, sem url, método de escrita ou lote grande demais dão 400
+        """
+        url = reverse('acoes:acao-list')
+        for dados in ([], [{}], [{'url': url, 'metodo': 'POST'}], [{'url': url}] * 3):
+            response = self.lote(self.client_logged_voluntario, dados)
+            self.assertEqual(response.status_code, 400, dados)
+            self.assertIn('detail', response.json())
+        self.assertEqual(self.lote(self.client_logged_voluntario, [{'url': url}] * 2).status_code, 200)
@@ -0,0 +1,229 @@
+"""
+Testes das métricas no formato Prometheus
+
+Este arquivo testa:
+- Endpoint /metrics (formato texto, proteção por token)
+- Contadores/histogramas por rota alimentados pelo MetricsMiddleware
+- Medidores calculados no banco (pendentes, não lidas)
+- Agregação entre processos no modo multiprocesso (arquivos por processo)
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes import metrics
+from .test_base import FullFixturesMixin
+
+
+class MetricsTestMixin:
+    def setUp(self):
+        super().setUp()
+        metrics.registro.limpar()
+        cache.clear()
+
+    def coletar(self, **headers):
+        response = self.client.get(reverse('metrics'), **headers)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+
+class TestEndpointMetrics(MetricsTestMixin, FullFixturesMixin, TestCase):
+    """
+    CT-MT001: Endpoint /metrics
+    """
+
+    def test_formato_texto_prometheus(self):
+        """
+        CT-MT001.1: HELP/TYPE de cada métrica e content-type do Prometheus
+        """
+        response = self.client.get(reverse('metrics'))
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        texto = response.content.decode()
+        self.assertIn('# TYPE communitylink_http_requests_total counter', texto)
+        self.assertIn('# TYPE communitylink_http_request_duration_seconds histogram', texto)
+        self.assertIn('# TYPE communitylink_pending_inscriptions gauge', texto)
+
+    def test_requisicoes_por_nome_de_rota(self):
+        """
+        CT-MT001.2: Requisições contadas pelo nome da rota, não pelo path
+        """
+        self.client.get(reverse('acoes:acao_list'))
+        self.client.get(reverse('acoes:acao_list'))
+        self.client.get(reverse('acoes:acao_detail', args=[self.acao_futura.pk]))
+        texto = self.coletar()
+        self.assertIn('communitylink_http_requests_total{view="acoes:acao_list",method="GET",status="200"} 2', texto)
+        self.assertIn('communitylink_http_request_duration_seconds_count{view="acoes:acao_detail"} 1', texto)
+        self.assertIn('communitylink_db_queries_per_request_bucket{view="acoes:acao_list",le="+Inf"} 2', texto)
+
+    def test_medidores_do_banco(self):
+        """
+        CT-MT001.3: Inscrições pendentes e notificações não lidas
+        """
+        # Fixtures: uma inscrição pendente e nenhuma notificação
+        texto = self.coletar()
+        self.assertIn('communitylink_pending_inscriptions 1', texto)
+        self.assertIn('communitylink_unread_notifications 0', texto)
+
+    def test_fanout_de_notificacoes(self):
+        """
+        CT-MT001.4: Edição de ação registra quantas notificações foram geradas
+        """
+        self.client_logged_organizador.post(reverse('acoes:acao_update', args=[self.acao_futura.pk]), {
+            'titulo': 'Editada', 'descricao': 'x', 'local': 'y', 'categoria': 'SAUDE', 'numero_vagas': 5,
+            'data': (timezone.now() + timedelta(days=5)).strftime('%Y-%m-%dT%H:%M'),
+        })
+        texto = self.coletar()
+        self.assertIn('communitylink_notification_fanout_count{event="acao_editada"} 1', texto)
+        self.assertIn('communitylink_notification_fanout_sum{event="acao_editada"} 1', texto)
+
+    @override_settings(METRICS_TOKEN='segredo')
+    def test_token_obrigatorio_quando_configurado(self):
+        """
+        CT-MT001.5: Com METRICS_TOKEN, exige Authorization: Bearer
+        """
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer outro').status_code, 403)
+        self.coletar(HTTP_AUTHORIZATION='Bearer segredo')
+
+    @override_settings(METRICS_TOKEN='', METRICS_REQUIRE_TOKEN=True)
+    def test_producao_sem_token_recusa(self):
+        """
+        CT-MT001.6: Com METRICS_REQUIRE_TOKEN (produção) e sem token configurado, /metrics fica fechado
+        """
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+
+
+class TestHistograma(MetricsTestMixin, TestCase):
+    """
+    CT-MT002: Buckets acumulados do histograma
+    """
+
+    def test_buckets_acumulados(self):
+        for valor in (0.001, 0.02, 0.02, 20):
+            metrics.latencia.observar(valor, view='teste')
+        texto = self.coletar()
+        self.assertIn('communitylink_http_request_duration_seconds_bucket{view="teste",le="0.005"} 1', texto)
+        self.assertIn('communitylink_http_request_duration_seconds_bucket{view="teste",le="0.025"} 3', texto)
+        self.assertIn('communitylink_http_request_duration_seconds_bucket{view="teste",le="10"} 3', texto)
+        self.assertIn('communitylink_http_request_duration_seconds_bucket{view="teste",le="+Inf"} 4', texto)
+
+
+class TestModoMultiprocesso(MetricsTestMixin, TestCase):
+    """
+    CT-MT003: Soma das métricas de vários processos
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.diretorio)
+
+    def test_soma_arquivos_de_outros_workers(self):
+        """
+        CT-MT003.1: Contadores de outro worker são somados aos deste processo
+        """
+        with override_settings(METRICS_MULTIPROC_DIR=self.diretorio):
+            metrics.registrar_cache('feed', True)
+            # Estado gravado por "outro worker"
+            outro = {
+                'communitylink_cache_requests_total': [[['feed', 'hit'], 4], [['feed', 'miss'], 2]],
+            }
+            Path(self.diretorio, f'metricas_{os.getppid()}-abc.json').write_text(json.dumps(outro))
+            texto = self.coletar()
+        self.assertIn('communitylink_cache_requests_total{cache="feed",result="hit"} 5', texto)
+        self.assertIn('communitylink_cache_requests_total{cache="feed",result="miss"} 2', texto)
+
+    def test_grava_arquivo_do_processo(self):
+        """
+        CT-MT003.2: Cada processo grava seu próprio arquivo de estado
+        """
+        with override_settings(METRICS_MULTIPROC_DIR=self.diretorio):
+            metrics.registrar_cache('feed', False)
+            metrics.registro.gravar()
+        arquivos = list(Path(self.diretorio).glob('metricas_*.json'))
+        self.assertEqual(len(arquivos), 1)
+        estado = json.loads(arquivos[0].read_text())
+        self.assertEqual(estado['communitylink_cache_requests_total'], [[['feed', 'miss'], 1]])
+
+    def test_gravacoes_concorrentes_e_falha_de_disco(self):
+        """
+        CT-MT003.3: Threads gravando juntas não colidem no temporário; erro de disco não propaga
+        """
+        erros = []
+
+        def gravar():
+            try:
+                for _ in range(20):
+                    metrics.registro.gravar()
+            except Exception as erro:
+                erros.append(erro)
+
+        with override_settings(METRICS_MULTIPROC_DIR=self.diretorio):
+            metrics.registrar_cache('feed', True)
+            threads = [threading.Thread(target=gravar) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(erros, [])
+
+            with mock.patch('acoes.metrics.os.replace', side_effect=OSError('disco cheio')):
+                with self.assertLogs('acoes.metrics', 'WARNING'):
+                    metrics.registro.gravar()
+        self.assertEqual([arquivo.suffix for arquivo in Path(self.diretorio).iterdir()], ['.json'])
+
+    @mock.patch.object(metrics.registro, '_diretorios_limpos', set())
+    def test_processos_mortos_somados_nos_encerrados(self):
+        """
+        CT-MT003.4: Arquivos de pids que não existem mais saem do diretório sem os totais diminuírem
+        """
+        processo = subprocess.Popen([sys.executable, '-c', ''])
+        processo.wait()
+        morto = processo.pid
+        vivo = Path(self.diretorio, f'metricas_{os.getppid()}-abc.json')
+        vivo.write_text(json.dumps({'communitylink_cache_requests_total': [[['feed', 'hit'], 2]]}))
+        antigos = [Path(self.diretorio, f'metricas_{morto}-abc.json'), Path(self.diretorio, f'metricas_{morto}-abc-x.tmp')]
+        antigos[0].write_text(json.dumps({
+            'communitylink_cache_requests_total': [[['feed', 'hit'], 4]],
+            'communitylink_http_request_duration_seconds': [[['teste'], [1] + [0] * 10 + [0.002, 1]]],
+        }))
+        antigos[1].write_text('{}')
+        esperado = [
+            'communitylink_cache_requests_total{cache="feed",result="hit"} 7',
+            'communitylink_http_request_duration_seconds_count{view="teste"} 1',
+        ]
+
+        with override_settings(METRICS_MULTIPROC_DIR=self.diretorio):
+            metrics.registrar_cache('feed', True)
+            texto = self.coletar()
+            for linha in esperado:
+                self.assertIn(linha, texto)
+            self.assertTrue(vivo.exists())
+            self.assertFalse(any(arquivo.exists() for arquivo in antigos))
+
+            # Um segundo worker encerrado acumula sobre os já somados
+            Path(self.diretorio, f'metricas_{morto}-def.json').write_text(
+                json.dumps({'communitylink_cache_requests_total': [[['feed', 'hit'], 10]]})
+            )
+            metrics.registro._diretorios_limpos.clear()
+            texto = self.coletar()
+        self.assertIn('communitylink_cache_requests_total{cache="feed",result="hit"} 17', texto)
+        self.assertIn(esperado[1], texto)
+        self.assertEqual(
+            sorted(arquivo.name for arquivo in Path(self.diretorio).glob('metricas_*.json')),
+            sorted([metrics.ARQUIVO_ENCERRADOS, vivo.name, f'metricas_{metrics.registro._id_processo}.json']),
+        )
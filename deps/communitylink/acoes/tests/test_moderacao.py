@@ -0,0 +1,159 @@
+"""
+Testes da decisão em lote das inscrições
+
+Este arquivo testa:
+- Aceite em ordem de inscrição até lotar as vagas (o resto volta sem_vaga)
+- Rejeição em lote, inscrições já decididas ignoradas, ação concluída recusada
+- Efeitos que os signals teriam (notificações, lembretes) com queries constantes
+- Página de gerenciamento (formulário com checkboxes) e endpoint da API
+"""
+
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from acoes.models import Inscricao, Lembrete, Notificacao
+from acoes.moderacao import ErroModeracao, decidir_inscricoes
+from .test_base import FullFixturesMixin
+
+
+class ModeracaoTestMixin(FullFixturesMixin):
+    def setUp(self):
+        super().setUp()
+        self.acao_futura.numero_vagas = 3
+        self.acao_futura.save()
+
+    def inscrever(self, quantidade, acao=None):
+        acao = acao or self.acao_futura
+        inicio = User.objects.count()
+        inscricoes = []
+        for i in range(quantidade):
+            voluntario = User.objects.create_user(username=f'lote_{inicio + i}', password='test123')
+            inscricoes.append(Inscricao.objects.create(acao=acao, voluntario=voluntario, status='PENDENTE'))
+        return inscricoes
+
+
+class TestDecisaoEmLote(ModeracaoTestMixin, TestCase):
+    """
+    CT-MO001: Regras da decisão em lote
+    """
+
+    def test_aceita_em_ordem_ate_lotar(self):
+        """
+        CT-MO001.1: Com 3 vagas, aceita as 3 inscrições mais antigas; as demais ficam pendentes
+        """
+        inscricoes = [self.inscricao_pendente] + self.inscrever(4)
+        ids = [i.pk for i in inscricoes]
+        resultado = decidir_inscricoes(self.acao_futura.pk, list(reversed(ids)), 'ACEITO')
+        self.assertEqual(resultado['aplicadas'], ids[:3])
+        self.assertEqual(resultado['sem_vaga'], ids[3:])
+        self.assertEqual(resultado['ignoradas'], [])
+        self.assertEqual(Inscricao.objects.filter(acao=self.acao_futura, status='ACEITO').count(), 3)
+        self.assertEqual(Inscricao.objects.filter(pk__in=ids[3:], status='PENDENTE').count(), 2)
+
+        # Cada aceite notifica o voluntário e agenda os lembretes, como no aceite individual
+        self.assertTrue(Notificacao.objects.filter(destinatario=self.voluntario_user, mensagem__contains='Aceita').exists())
+        self.assertEqual(Lembrete.objects.filter(inscricao_id__in=ids[:3]).count(), 3 * 2)
+
+        # Ação cheia: nenhum aceite a mais
+        resultado = decidir_inscricoes(self.acao_futura.pk, ids[3:], 'ACEITO')
+        self.assertEqual((resultado['aplicadas'], resultado['sem_vaga']), ([], ids[3:]))
+
+    def test_rejeita_e_ignora_decididas(self):
+        """
+        CT-MO001.2: Rejeição em lote; ids de outra ação ou já decididos são ignorados
+        """
+        inscricoes = self.inscrever(2)
+        outra = Inscricao.objects.filter(acao=self.acao_cheia).first()
+        ids = [self.inscricao_pendente.pk] + [i.pk for i in inscricoes]
+        resultado = decidir_inscricoes(self.acao_futura.pk, ids + [outra.pk], 'REJEITADO')
+        self.assertEqual(resultado['aplicadas'], ids)
+        self.assertEqual(resultado['ignoradas'], [outra.pk])
+        self.assertEqual(Inscricao.objects.get(pk=outra.pk).status, 'ACEITO')
+        self.assertFalse(Inscricao.objects.filter(pk__in=ids).exclude(status='REJEITADO').exists())
+
+        resultado = decidir_inscricoes(self.acao_futura.pk, ids, 'ACEITO')
+        self.assertEqual((resultado['aplicadas'], resultado['ignoradas']), ([], ids))
+
+    def test_erros(self):
+        """
+        CT-MO001.3: Status inválido, ids inválidos e ação concluída não alteram nada
+        """
+        with self.assertRaises(ErroModeracao):
+            decidir_inscricoes(self.acao_futura.pk, [self.inscricao_pendente.pk], 'CANCELADO')
+        with self.assertRaises(ErroModeracao):
+            decidir_inscricoes(self.acao_futura.pk, ['abc'], 'ACEITO')
+        passada = self.inscrever(1, acao=self.acao_passada)[0]
+        with self.assertRaises(ErroModeracao):
+            decidir_inscricoes(self.acao_passada.pk, [passada.pk], 'ACEITO')
+        self.assertEqual(Inscricao.objects.get(pk=passada.pk).status, 'PENDENTE')
+
+    def test_queries_nao_dependem_do_lote(self):
+        """
+        CT-MO001.4: Decidir 2 ou 20 inscrições custa o mesmo número de queries
+        """
+        self.acao_futura.numero_vagas = 100
+        self.acao_futura.save()
+        pequeno = [i.pk for i in self.inscrever(2)]
+        grande = [i.pk for i in self.inscrever(20)]
+
+        with CaptureQueriesContext(connection) as pequeno_ctx:
+            decidir_inscricoes(self.acao_futura.pk, pequeno, 'ACEITO')
+        with CaptureQueriesContext(connection) as grande_ctx:
+            decidir_inscricoes(self.acao_futura.pk, grande, 'ACEITO')
+        self.assertEqual(len(pequeno_ctx.captured_queries), len(grande_ctx.captured_queries))
+
+
+class TestDecisaoEmLoteViews(ModeracaoTestMixin, TestCase):
+    """
+    CT-MO002: Página de gerenciamento e API
+    """
+
+    def test_formulario_do_gerenciamento(self):
+        """
+        CT-MO002.1: Organizador aceita as marcadas e vê quantas ficaram sem vaga
+        """
+        response = self.client_logged_organizador.get(reverse('acoes:acao_manage', args=[self.acao_futura.pk]))
+        self.assertContains(response, 'name="inscricoes"')
+
+        ids = [self.inscricao_pendente.pk] + [i.pk for i in self.inscrever(3)]
+        url = reverse('acoes:acao_manage_lote', args=[self.acao_futura.pk])
+        response = self.client_logged_organizador.post(url, {'inscricoes': ids, 'status': 'ACEITO'})
+        self.assertRedirects(response, reverse('acoes:acao_manage', args=[self.acao_futura.pk]))
+        mensagens = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertIn('3 solicitações aceitas.', mensagens)
+        self.assertTrue(any('vagas acabaram' in m for m in mensagens))
+
+    def test_formulario_exige_organizador(self):
+        """
+        CT-MO002.2: Voluntário não decide; GET não é aceito
+        """
+        url = reverse('acoes:acao_manage_lote', args=[self.acao_futura.pk])
+        self.client_logged_voluntario.post(url, {'inscricoes': [self.inscricao_pendente.pk], 'status': 'ACEITO'})
+        self.assertEqual(Inscricao.objects.get(pk=self.inscricao_pendente.pk).status, 'PENDENTE')
+        self.assertEqual(self.client_logged_organizador.get(url).status_code, 405)
+
+    def test_api(self):
+        """
+        CT-MO002.3: POST /api/acoes/{id}/inscricoes/bulk/ devolve o resultado; erros viram 400/403
+        """
+        url = reverse('acoes:acao-inscricoes-bulk', args=[self.acao_futura.pk])
+        corpo = {'status': 'REJEITADO', 'inscricoes': [self.inscricao_pendente.pk]}
+
+        response = self.client_logged_voluntario.post(url, corpo, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client_logged_organizador.post(url, {'status': 'ACEITO'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client_logged_organizador.post(
+            url, {**corpo, 'status': 'TALVEZ'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client_logged_organizador.post(url, corpo, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['aplicadas'], [self.inscricao_pendente.pk])
+        self.assertEqual(Inscricao.objects.get(pk=self.inscricao_pendente.pk).status, 'REJEITADO')
@@ -0,0 +1,97 @@
+"""
+Testes do middleware de profiling
+
+Este arquivo testa:
+- Opt-in: sem PROFILING_ENABLED o middleware sai da cadeia
+- Registro de requisições lentas com queries mais lentas e repetidas
+- Medição de tempo de template e cabeçalho Server-Timing
+- Amostragem com cProfile
+"""
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from acoes.middleware import ProfilingMiddleware
+from acoes.profiling import ColetorRequisicao
+from acoes.models import Acao
+from .test_base import FullFixturesMixin
+
+
+class TestProfilingDesligado(TestCase):
+    """
+    CT-P001: Middleware desligado por padrão
+    """
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_sai_da_cadeia_quando_desligado(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: HttpResponse())
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_sem_server_timing_quando_desligado(self):
+        response = Client().get(reverse('acoes:acao_list'))
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SLOW_MS=0, PROFILING_SAMPLE_RATE=0.0)
+class TestProfilingLigado(FullFixturesMixin, TestCase):
+    """
+    CT-P002: Middleware ligado
+    """
+
+    def test_registra_requisicao_lenta_com_queries(self):
+        """
+        CT-P002.1: Acima do limite, loga tempo, queries mais lentas e repetidas
+        """
+        client = Client()
+        client.login(username='voluntario', password='test123')
+        with self.assertLogs('acoes.profiling', 'WARNING') as logs:
+            response = client.get(reverse('acoes:acao_list'))
+        self.assertEqual(response.status_code, 200)
+        texto = '\n'.join(logs.output)
+        self.assertIn('Requisição lenta: GET /acoes/', texto)
+        self.assertIn('Queries mais lentas:', texto)
+        self.assertIn('acoes_acao', texto)
+
+    def test_server_timing_com_template(self):
+        """
+        CT-P002.2: Cabeçalho Server-Timing com total, db e template
+        """
+        with self.assertLogs('acoes.profiling', 'WARNING'):
+            response = Client().get(reverse('acoes:acao_list'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('tpl;dur=', response['Server-Timing'])
+
+    @override_settings(PROFILING_SLOW_MS=60_000)
+    def test_requisicao_rapida_nao_gera_aviso(self):
+        """
+        CT-P002.3: Abaixo do limite nada é logado em WARNING
+        """
+        with self.assertNoLogs('acoes.profiling', 'WARNING'):
+            Client().get(reverse('acoes:acao_list'))
+
+    @override_settings(PROFILING_SLOW_MS=60_000, PROFILING_SAMPLE_RATE=1.0)
+    def test_amostragem_cprofile(self):
+        """
+        CT-P002.4: Requisições amostradas registram estatísticas do cProfile
+        """
+        with self.assertLogs('acoes.profiling', 'INFO') as logs:
+            Client().get(reverse('acoes:acao_list'))
+        self.assertIn('function calls', '\n'.join(logs.output))
+
+
+class TestColetorRequisicao(FullFixturesMixin, TestCase):
+    """
+    CT-P003: Coletor de queries
+    """
+
+    def test_conta_queries_e_repetidas(self):
+        with ColetorRequisicao() as coletor:
+            for acao in Acao.objects.order_by('pk'):
+                acao.vagas_preenchidas  # N+1 proposital
+        resumo = coletor.resumo()
+        self.assertEqual(resumo['queries'], 4)
+        self.assertEqual(coletor.queries_repetidas()[0][1], 3)
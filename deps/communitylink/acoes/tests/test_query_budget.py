@@ -0,0 +1,222 @@
+"""
+Testes de orçamento de queries por view
+
+Cada rota do app declara em ORCAMENTOS o número máximo de queries que pode
+executar. O teste roda a rota com 1×, 10× e 100× o volume de dados: o
+orçamento precisa valer em todas as escalas e o número de queries não pode
+crescer com o volume (N+1 vira teste falhando, não incidente em produção).
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.management.commands.benchmark_urls import listar_rotas
+from acoes.historico import atualizar_historico
+from acoes.rollups import agregar_rollups, marcar_todos_os_dias
+from acoes.models import Acao, Inscricao, Notificacao
+from acoes.profiling import impressao_digital
+from .query_budget import QueryBudgetMixin
+from .test_base import FullFixturesMixin
+
+# maximo: queries permitidas | cliente: anonimo/voluntario/organizador
+# pk: atributo do teste que fornece o <pk> | metodo/dados: requisição feita
+# preparar: método do teste chamado antes de cada requisição (fora da contagem)
+Orcamento = namedtuple(
+    'Orcamento', 'maximo cliente pk metodo dados preparar', defaults=('voluntario', None, 'get', None, None)
+)
+
+ORCAMENTOS = {
+    # --- Páginas HTML ---
+    'acoes:acao_list': Orcamento(2, 'anonimo'),
+    'acoes:acao_detail': Orcamento(6, 'voluntario', 'acao_futura'),
+    'acoes:acao_create': Orcamento(5, 'organizador'),
+    'acoes:acao_import': Orcamento(5, 'organizador'),
+    'acoes:serie_create': Orcamento(5, 'organizador'),
+    'acoes:acao_update': Orcamento(11, 'organizador', 'acao_futura', 'post', 'dados_edicao'),
+    'acoes:acao_delete': Orcamento(6, 'organizador', 'acao_futura'),
+    # Inscrição nova: cria a Inscricao (e o que os signals marcam) e notifica o organizador
+    'acoes:acao_apply': Orcamento(12, 'voluntario', 'acao_futura', 'post', None, 'desfazer_inscricao'),
+    'acoes:acao_manage': Orcamento(8, 'organizador', 'acao_futura'),
+    'acoes:inscricao_cancel': Orcamento(4, 'voluntario', 'inscricao_pendente'),
+    'acoes:minhas_inscricoes': Orcamento(6, 'voluntario'),
+    'acoes:minhas_acoes': Orcamento(6, 'organizador'),
+    'acoes:notificacoes_list': Orcamento(8, 'voluntario'),
+    'acoes:notificacoes_clear': Orcamento(3, 'voluntario', None, 'post'),
+    'acoes:signup': Orcamento(0, 'anonimo'),
+    'acoes:signin': Orcamento(0, 'anonimo'),
+    'acoes:perfil': Orcamento(6, 'voluntario'),
+    'acoes:historico': Orcamento(10, 'organizador'),
+    'acoes:impacto': Orcamento(7, 'organizador'),
+    'acoes:painel': Orcamento(7, 'organizador'),
+    'acoes:password_reset': Orcamento(0, 'anonimo'),
+    'acoes:password_reset_done': Orcamento(0, 'anonimo'),
+    'acoes:password_reset_complete': Orcamento(0, 'anonimo'),
+    # --- API ---
+    'acoes:acao-list': Orcamento(3, 'voluntario'),
+    'acoes:acao-detail': Orcamento(3, 'voluntario', 'acao_futura'),
+    'acoes:inscricao-list': Orcamento(3, 'voluntario'),
+    'acoes:inscricao-detail': Orcamento(3, 'voluntario', 'inscricao_pendente'),
+    'acoes:notificacao-list': Orcamento(3, 'voluntario'),
+    'acoes:notificacao-detail': Orcamento(3, 'voluntario', 'notificacao'),
+    'acoes:notificacao-marcar-lida': Orcamento(4, 'voluntario', 'notificacao', 'post'),
+    'acoes:perfil-list': Orcamento(3, 'voluntario'),
+    'acoes:perfil-detail': Orcamento(3, 'voluntario', 'perfil'),
+    'acoes:perfil-meu-perfil': Orcamento(3, 'voluntario'),
+    'acoes:painel-list': Orcamento(5, 'organizador'),
+    # Sessão e usuário uma vez só para as quatro leituras (separadas: 4 × 3)
+    'acoes:batch': Orcamento(6, 'voluntario', None, 'post', 'dados_lote'),
+}
+
+# Rotas que não podem ser exercitadas de forma repetível aqui
+ROTAS_SEM_ORCAMENTO = {
+    'acoes:logout': 'encerra a sessão do cliente usado nas demais escalas',
+    'acoes:password_reset_confirm': 'exige uidb64/token válidos',
+    'acoes:acao-inscrever': 'a primeira chamada muda o resultado das seguintes (coberta em test_idempotencia)',
+    'acoes:acao_export': 'streaming: as queries rodam ao consumir o corpo (coberta em test_exportacao)',
+    'acoes:minhas_acoes_export': 'streaming: as queries rodam ao consumir o corpo (coberta em test_exportacao)',
+    'acoes:acao-importar': 'cada chamada cria ações (coberta em test_importacao)',
+    'acoes:calendario_token': 'cada chamada troca o token (coberta em test_calendario)',
+    'acoes:calendario_feed': 'exige o token secreto do feed (coberta em test_calendario)',
+    'acoes:acao_manage_lote': 'a primeira chamada decide as inscrições das seguintes (coberta em test_moderacao)',
+    'acoes:acao-inscricoes-bulk': 'a primeira chamada decide as inscrições das seguintes (coberta em test_moderacao)',
+    'acoes:token': 'cada chamada emite ou revoga um token (coberta em test_tokens)',
+    'acoes:locais_autocomplete': 'servida do índice em memória; só consulta na carga/recarga (coberta em test_locais)',
+}
+
+
+class TestOrcamentoQueries(FullFixturesMixin, QueryBudgetMixin, TestCase):
+    """
+    CT-Q001: Orçamento de queries por rota em 1×, 10× e 100× dados
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.escala_atual = 0
+        self.notificacao = Notificacao.objects.create(destinatario=self.voluntario_user, mensagem='Olá')
+        self.perfil = self.voluntario_user.perfil
+        self.dados_edicao = {
+            'titulo': 'Ação Futura Editada',
+            'descricao': 'Nova descrição',
+            'data': (timezone.now() + timedelta(days=30)).strftime('%Y-%m-%dT%H:%M'),
+            'local': 'Novo Local',
+            'categoria': 'EDUCACAO',
+            'numero_vagas': 500,
+        }
+        self.dados_lote = [
+            {'url': reverse(nome)}
+            for nome in ('acoes:acao-list', 'acoes:inscricao-list', 'acoes:notificacao-list', 'acoes:perfil-meu-perfil')
+        ]
+
+    def desfazer_inscricao(self):
+        """ Volta ao estado sem inscrição do voluntário na ação futura. """
+        Inscricao.objects.filter(acao=self.acao_futura, voluntario=self.voluntario_user).delete()
+
+    def povoar(self, escala):
+        """ Acrescenta dados até chegar a `escala` vezes o volume base. """
+        faltam = escala - self.escala_atual
+        if faltam <= 0:
+            return
+        inicio = self.escala_atual
+        self.escala_atual = escala
+        agora = timezone.now()
+
+        extras = User.objects.bulk_create([
+            User(username=f'extra_{inicio + i}', email=f'extra{inicio + i}@test.com') for i in range(faltam)
+        ])
+        futuras = Acao.objects.bulk_create([
+            Acao(titulo=f'Futura {inicio + i}', descricao='x', data=agora + timedelta(days=1 + i % 30),
+                 local='Centro', numero_vagas=5, categoria='SAUDE', organizador=self.organizador_user)
+            for i in range(faltam)
+        ])
+        passadas = Acao.objects.bulk_create([
+            Acao(titulo=f'Passada {inicio + i}', descricao='x', data=agora - timedelta(days=1 + i % 30),
+                 local='Centro', numero_vagas=5, categoria='OUTRO', organizador=self.organizador_user)
+            for i in range(faltam)
+        ])
+
+        inscricoes = []
+        for usuario, futura, passada in zip(extras, futuras, passadas):
+            inscricoes += [
+                Inscricao(acao=futura, voluntario=usuario, status='ACEITO'),
+                Inscricao(acao=passada, voluntario=usuario, status='ACEITO'),
+                Inscricao(acao=self.acao_futura, voluntario=usuario, status='PENDENTE'),
+                Inscricao(acao=futura, voluntario=self.voluntario_user, status='PENDENTE'),
+                Inscricao(acao=passada, voluntario=self.voluntario_user, status='ACEITO'),
+                Inscricao(acao=passada, voluntario=self.organizador_user, status='ACEITO'),
+            ]
+        Inscricao.objects.bulk_create(inscricoes)
+
+        Notificacao.objects.bulk_create(
+            [Notificacao(destinatario=self.voluntario_user, mensagem=f'Aviso {inicio + i}') for i in range(faltam)]
+            + [Notificacao(destinatario=self.organizador_user, mensagem=f'Aviso {inicio + i}') for i in range(faltam)]
+        )
+        # Estado normal em produção: o cron já materializou as ações passadas
+        # e agregou os rollups do painel (bulk_create não dispara os signals)
+        atualizar_historico()
+        marcar_todos_os_dias()
+        agregar_rollups()
+
+    def requisicao(self, nome, orcamento):
+        clientes = {
+            'anonimo': self.client,
+            'voluntario': self.client_logged_voluntario,
+            'organizador': self.client_logged_organizador,
+        }
+        cliente = clientes[orcamento.cliente]
+        kwargs = {'pk': getattr(self, orcamento.pk).pk} if orcamento.pk else {}
+        url = reverse(nome, kwargs=kwargs)
+        dados = getattr(self, orcamento.dados) if orcamento.dados else None
+        if isinstance(dados, list):
+            return lambda: getattr(cliente, orcamento.metodo)(url, dados, content_type='application/json')
+        return lambda: getattr(cliente, orcamento.metodo)(url, dados)
+
+    def test_todas_as_rotas_declaram_orcamento(self):
+        """
+        CT-Q001.1: Toda rota nomeada do app tem orçamento (ou justificativa)
+        """
+        sem_orcamento = [
+            nome for nome, _ in listar_rotas()
+            if nome not in ORCAMENTOS and nome not in ROTAS_SEM_ORCAMENTO
+        ]
+        self.assertEqual(sem_orcamento, [], 'Declare o orçamento de queries destas rotas em ORCAMENTOS')
+
+
+def _criar_teste_orcamento(nome, orcamento):
+    def teste(self):
+        def povoar(escala):
+            self.povoar(escala)
+            if orcamento.preparar:
+                getattr(self, orcamento.preparar)()
+        self.assertQueryBudget(nome, orcamento.maximo, self.requisicao(nome, orcamento), povoar)
+    teste.__doc__ = f"""
+        CT-Q001.2: {nome} em até {orcamento.maximo} queries com 1×, 10× e 100× dados
+        """
+    return teste
+
+
+# Um teste por rota: cada um começa com o banco limpo e cresce de 1× a 100×
+for _nome, _orcamento in ORCAMENTOS.items():
+    _metodo = 'test_orcamento_' + _nome.split(':', 1)[1].replace('-', '_')
+    setattr(TestOrcamentoQueries, _metodo, _criar_teste_orcamento(_nome, _orcamento))
+
+
+class TestImpressaoDigital(TestCase):
+    """
+    CT-Q002: Normalização de SQL usada nos relatórios
+    """
+
+    def test_ignora_valores_literais(self):
+        a = impressao_digital("SELECT * FROM t WHERE id = 1 AND nome = 'x'")
+        b = impressao_digital("SELECT * FROM t WHERE id = 22 AND nome = 'outro'")
+        self.assertEqual(a, b)
+
+    def test_agrupa_listas_in(self):
+        self.assertEqual(
+            impressao_digital('SELECT 1 FROM t WHERE id IN (1, 2, 3)'),
+            impressao_digital('SELECT 1 FROM t WHERE id IN (4)'),
+        )
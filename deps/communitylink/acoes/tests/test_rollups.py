@@ -0,0 +1,171 @@
+"""
+Testes dos rollups diários e do painel do organizador
+
+Este arquivo testa:
+- Marcação dos dias alterados pelos signals (ação e inscrição)
+- Agregação incremental (agregar_rollups) nas duas camadas
+- Taxas calculadas pelo painel
+- Página do painel e endpoint /api/painel/
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.arquivo import arquivar_acoes
+from acoes.models import Acao, DiaPendente, Inscricao, RollupDiario
+from acoes.rollups import agregar_rollups, painel
+from .test_base import FullFixturesMixin
+
+
+class RollupTestMixin(FullFixturesMixin):
+    def setUp(self):
+        super().setUp()
+        # Descarta o que os fixtures marcaram: cada teste parte de rollups em dia
+        agregar_rollups()
+        self.dia = timezone.now() - timedelta(days=3)
+        self.acao = Acao.objects.create(
+            titulo='Campanha', descricao='x', data=self.dia, local='Centro', numero_vagas=4,
+            categoria='ANIMAIS', organizador=self.organizador_user,
+        )
+
+    def rollup(self, acao=None):
+        acao = acao or self.acao
+        return RollupDiario.objects.get(
+            organizador=self.organizador_user, categoria=acao.categoria, dia=timezone.localdate(acao.data),
+        )
+
+
+class TestAgregacao(RollupTestMixin, TestCase):
+    """
+    CT-RP001: Agregação incremental dos rollups
+    """
+
+    def test_conta_inscricoes_por_status(self):
+        """
+        CT-RP001.1: Mudanças marcam o dia; a agregação conta cada status
+        """
+        Inscricao.objects.create(acao=self.acao, voluntario=self.voluntario_user, status='ACEITO')
+        Inscricao.objects.create(acao=self.acao, voluntario=self.organizador_user, status='REJEITADO')
+        self.assertTrue(DiaPendente.objects.exists())
+
+        self.assertEqual(agregar_rollups(), 1)
+        rollup = self.rollup()
+        self.assertEqual((rollup.acoes, rollup.vagas, rollup.inscricoes), (1, 4, 2))
+        self.assertEqual((rollup.aceitos, rollup.rejeitados, rollup.pendentes), (1, 1, 0))
+        self.assertFalse(DiaPendente.objects.exists())
+        self.assertEqual(agregar_rollups(), 0)
+
+    def test_remarcar_acao_reagrega_os_dois_dias(self):
+        """
+        CT-RP001.2: Nova data move a ação de dia; o dia antigo fica sem linha
+        """
+        agregar_rollups()
+        dia_antigo = timezone.localdate(self.acao.data)
+        acao = Acao.objects.get(pk=self.acao.pk)
+        acao.data = acao.data - timedelta(days=7)
+        acao.save()
+        agregar_rollups()
+        self.assertFalse(RollupDiario.objects.filter(dia=dia_antigo, categoria='ANIMAIS').exists())
+        self.assertEqual(self.rollup(acao).acoes, 1)
+
+    def test_arquivo_mantem_os_rollups(self):
+        """
+        CT-RP001.3: Ação arquivada continua contada (camada fria)
+        """
+        Inscricao.objects.create(acao=self.acao, voluntario=self.voluntario_user, status='CANCELADO')
+        arquivar_acoes(timezone.now())
+        agregar_rollups()
+        rollup = self.rollup()
+        self.assertEqual((rollup.acoes, rollup.cancelados), (1, 1))
+
+    def test_comando_reconstroi(self):
+        """
+        CT-RP001.4: --reconstruir recria os rollups apagados
+        """
+        agregar_rollups()
+        RollupDiario.objects.all().delete()
+        saida = StringIO()
+        call_command('agregar_rollups', reconstruir=True, stdout=saida)
+        self.assertIn('dias reagregados', saida.getvalue())
+        self.assertEqual(self.rollup().acoes, 1)
+
+    @override_settings(ROLLUPS_LOTE_PAINEL=1)
+    def test_painel_adianta_um_lote(self):
+        """
+        CT-RP001.5: O painel reagrega no máximo um lote; o resto fica para o cron
+        """
+        for dias in (5, 6):
+            Acao.objects.create(
+                titulo=f'Outra {dias}', descricao='x', data=timezone.now() - timedelta(days=dias), local='Centro',
+                numero_vagas=2, categoria='ANIMAIS', organizador=self.organizador_user,
+            )
+        self.assertEqual(DiaPendente.objects.count(), 3)
+        self.client_logged_organizador.get(reverse('acoes:painel-list'))
+        self.assertEqual(DiaPendente.objects.count(), 2)
+        self.assertEqual(agregar_rollups(), 2)
+
+
+class TestPainel(RollupTestMixin, TestCase):
+    """
+    CT-RP002: Painel do organizador
+    """
+
+    def setUp(self):
+        super().setUp()
+        Inscricao.objects.create(acao=self.acao, voluntario=self.voluntario_user, status='ACEITO')
+        Inscricao.objects.create(acao=self.acao, voluntario=self.organizador_user, status='CANCELADO')
+        agregar_rollups()
+
+    def test_taxas(self):
+        """
+        CT-RP002.1: Taxas de preenchimento, aceitação e cancelamento da categoria
+        """
+        animais = next(c for c in painel(self.organizador_user.pk)['por_categoria'] if c['categoria'] == 'ANIMAIS')
+        self.assertEqual(animais['rotulo'], 'Animais')
+        self.assertEqual((animais['inscricoes'], animais['vagas']), (2, 4))
+        self.assertEqual(animais['taxa_preenchimento'], 25.0)
+        self.assertEqual(animais['taxa_aceitacao'], 50.0)
+        self.assertEqual(animais['taxa_cancelamento'], 50.0)
+
+    def test_periodo_exclui_dias_antigos(self):
+        """
+        CT-RP002.2: Ações antes do período ficam de fora
+        """
+        dados = painel(self.organizador_user.pk, dias=1)
+        self.assertNotIn('ANIMAIS', [c['categoria'] for c in dados['por_categoria']])
+        self.assertLess(dados['totais']['inscricoes'], painel(self.organizador_user.pk)['totais']['inscricoes'])
+
+    def test_pagina_apenas_organizador(self):
+        """
+        CT-RP002.3: Organizador vê o painel; voluntário é redirecionado
+        """
+        response = self.client_logged_organizador.get(reverse('acoes:painel'), {'dias': 30})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['painel']['dias'], 30)
+        self.assertContains(response, 'Animais')
+        response = self.client_logged_voluntario.get(reverse('acoes:painel'))
+        self.assertRedirects(response, reverse('acoes:acao_list'))
+
+    def test_api(self):
+        """
+        CT-RP002.4: /api/painel/ devolve os mesmos indicadores; voluntário recebe 403
+        """
+        response = self.client_logged_organizador.get(reverse('acoes:painel-list'), {'dias': 30})
+        self.assertEqual(response.status_code, 200)
+        esperado = painel(self.organizador_user.pk, dias=30)['totais']
+        self.assertEqual(response.json()['totais']['inscricoes'], esperado['inscricoes'])
+        self.assertEqual(self.client_logged_voluntario.get(reverse('acoes:painel-list')).status_code, 403)
+
+    def test_superusuario_acessa_pagina_e_api(self):
+        """
+        CT-RP002.5: Superusuário fora do grupo entra nos dois, como nas demais páginas
+        """
+        self.client.force_login(User.objects.create_superuser('admin_painel', password='x'))
+        self.assertEqual(self.client.get(reverse('acoes:painel')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('acoes:painel-list')).status_code, 200)
@@ -0,0 +1,150 @@
+"""
+Testes do roteamento para réplicas de leitura
+
+Este arquivo testa:
+- ReplicaRouter: leituras nas réplicas, escritas e transações no primário
+- PrimarioFixoMiddleware: janela "sticky" no primário após uma escrita
+- Configuração das réplicas a partir do ambiente (somente leitura)
+"""
+
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from acoes.models import Acao
+from acoes.routers import COOKIE_PRIMARIO, PrimarioFixoMiddleware, ReplicaRouter, fixado_no_primario, usar_primario
+from communitylink import database
+
+REPLICAS = ['replica1', 'replica2']
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class TestReplicaRouter(SimpleTestCase):
+    """
+    CT-RR001: Escolha do banco por operação
+    """
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_leitura_vai_para_replica(self):
+        """
+        CT-RR001.1: Fora de transação, leituras usam uma das réplicas
+        """
+        escolhidos = {self.router.db_for_read(Acao) for _ in range(50)}
+        self.assertEqual(escolhidos, set(REPLICAS))
+
+    def test_escrita_sempre_no_primario(self):
+        """
+        CT-RR001.2: db_for_write retorna 'default'
+        """
+        self.assertEqual(self.router.db_for_write(Acao), 'default')
+
+    def test_leitura_em_transacao_ou_fixada_usa_primario(self):
+        """
+        CT-RR001.3: Dentro de transação ou de usar_primario() a leitura vai ao primário
+        """
+        with mock.patch.object(connections['default'], 'in_atomic_block', True):
+            self.assertEqual(self.router.db_for_read(Acao), 'default')
+        with usar_primario():
+            self.assertEqual(self.router.db_for_read(Acao), 'default')
+        self.assertIn(self.router.db_for_read(Acao), REPLICAS)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_sem_replicas_nao_interfere(self):
+        """
+        CT-RR001.4: Sem réplicas configuradas tudo fica em 'default'
+        """
+        self.assertEqual(self.router.db_for_read(Acao), 'default')
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, DATABASE_STICKY_SECONDS=5)
+class TestPrimarioFixoMiddleware(SimpleTestCase):
+    """
+    CT-RR002: Janela sticky no primário
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.observado = None
+
+        def view(request):
+            self.observado = fixado_no_primario()
+            return HttpResponse('ok')
+
+        self.middleware = PrimarioFixoMiddleware(view)
+
+    def test_post_fixa_e_define_cookie(self):
+        """
+        CT-RR002.1: Escrita roda no primário e abre a janela sticky
+        """
+        response = self.middleware(self.factory.post('/acoes/1/inscrever/'))
+        self.assertTrue(self.observado)
+        self.assertIn(COOKIE_PRIMARIO, response.cookies)
+        self.assertEqual(response.cookies[COOKIE_PRIMARIO]['max-age'], 5)
+        self.assertFalse(fixado_no_primario())
+
+    def test_get_dentro_da_janela_usa_primario(self):
+        """
+        CT-RR002.2: GET após o redirect (cookie válido) lê do primário
+        """
+        request = self.factory.get('/acoes/1/gerenciar/')
+        request.COOKIES[COOKIE_PRIMARIO] = str(time.time() + 3)
+        response = self.middleware(request)
+        self.assertTrue(self.observado)
+        self.assertNotIn(COOKIE_PRIMARIO, response.cookies)
+
+    def test_get_fora_da_janela_usa_replica(self):
+        """
+        CT-RR002.3: Cookie expirado ou inválido não fixa a requisição
+        """
+        for valor in (str(time.time() - 1), 'lixo'):
+            request = self.factory.get('/acoes/')
+            request.COOKIES[COOKIE_PRIMARIO] = valor
+            self.middleware(request)
+            self.assertFalse(self.observado)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_sem_replicas_nao_define_cookie(self):
+        """
+        CT-RR002.4: Sem réplicas o middleware não faz nada
+        """
+        response = self.middleware(self.factory.post('/acoes/1/inscrever/'))
+        self.assertNotIn(COOKIE_PRIMARIO, response.cookies)
+
+
+class TestConfiguracaoReplicas(SimpleTestCase):
+    """
+    CT-RR003: Réplicas a partir de DB_REPLICAS
+    """
+
+    def test_replicas_sqlite_somente_leitura(self):
+        """
+        CT-RR003.1: Cada arquivo vira um alias com query_only e espelho nos testes
+        """
+        _, primario = database.banco_a_partir_do_ambiente({}, Path('/srv'))
+        replicas = database.replicas_a_partir_do_ambiente({'DB_REPLICAS': '/tmp/r1.sqlite3, /tmp/r2.sqlite3'}, primario)
+        self.assertEqual(list(replicas), ['replica1', 'replica2'])
+        self.assertEqual(replicas['replica2']['NAME'], '/tmp/r2.sqlite3')
+        self.assertIn('PRAGMA query_only=ON;', replicas['replica1']['OPTIONS']['init_command'])
+        self.assertNotIn('transaction_mode', replicas['replica1']['OPTIONS'])
+        self.assertEqual(replicas['replica1']['TEST'], {'MIRROR': 'default'})
+        self.assertIn('transaction_mode', primario['OPTIONS'])
+
+    def test_replicas_postgresql(self):
+        """
+        CT-RR003.2: host[:porta][/banco] com transações somente leitura
+        """
+        _, primario = database.banco_a_partir_do_ambiente({'DB_ENGINE': 'postgresql', 'DB_NAME': 'cl'}, Path('.'))
+        replicas = database.replicas_a_partir_do_ambiente(
+            {'DB_REPLICAS': 'replica.interna:5433,localhost/cl_replica'}, primario
+        )
+        self.assertEqual((replicas['replica1']['HOST'], replicas['replica1']['PORT'], replicas['replica1']['NAME']),
+                         ('replica.interna', '5433', 'cl'))
+        self.assertEqual((replicas['replica2']['HOST'], replicas['replica2']['NAME']), ('localhost', 'cl_replica'))
+        self.assertEqual(replicas['replica2']['OPTIONS']['options'], '-c default_transaction_read_only=on')
+        self.assertEqual(database.replicas_a_partir_do_ambiente({}, primario), {})
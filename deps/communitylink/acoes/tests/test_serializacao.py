@@ -0,0 +1,188 @@
+"""
+Testes da serialização rápida da API
+
+Este arquivo testa:
+- Serializers planos (.values()) com a mesma saída dos ModelSerializers
+- Renderer/parser com orjson idênticos aos do DRF (e o fallback sem orjson)
+- Listagens em NDJSON, em streaming
+- Comando benchmark_serializacao
+"""
+
+import json
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from acoes.geo import celula, filtrar_por_proximidade
+from acoes.models import Acao, Inscricao
+from acoes.renderers import JSONRapidoParser, JSONRapidoRenderer, gerar_ndjson
+from acoes.serializers import AcaoPlanaSerializer, AcaoSerializer, InscricaoPlanaSerializer, InscricaoSerializer
+from .test_base import FullFixturesMixin
+
+
+class TestSerializersPlanos(FullFixturesMixin, TestCase):
+    """
+    CT-SE001: Serializers planos
+    """
+
+    def test_acoes_iguais_ao_model_serializer(self):
+        """
+        CT-SE001.1: Mesmos campos e valores (vagas, datas, ação passada, distância)
+        """
+        Acao.objects.filter(pk=self.acao_futura.pk).update(
+            latitude=-7.12, longitude=-34.85, geo_celula=celula(-7.12, -34.85)
+        )
+        consultas = [
+            Acao.objects.com_vagas_preenchidas().select_related('organizador').order_by('pk'),
+            filtrar_por_proximidade(
+                Acao.objects.com_vagas_preenchidas().select_related('organizador'), -7.1, -34.8, 50
+            ),
+        ]
+        for consulta in consultas:
+            esperado = AcaoSerializer(consulta.all(), many=True).data
+            self.assertTrue(esperado)
+            self.assertEqual(AcaoPlanaSerializer(consulta.all()).data, json.loads(json.dumps(esperado)))
+
+    def test_inscricoes_iguais_ao_model_serializer(self):
+        """
+        CT-SE001.2: Inscrições com voluntário aninhado e título da ação
+        """
+        consulta = Inscricao.objects.select_related('voluntario', 'acao').order_by('pk')
+        esperado = json.loads(json.dumps(InscricaoSerializer(consulta, many=True).data))
+        self.assertEqual(InscricaoPlanaSerializer(consulta).data, esperado)
+
+    def test_listagens_da_api(self):
+        """
+        CT-SE001.3: /api/acoes/ e /api/inscricoes/ usam os serializers planos
+        """
+        response = self.client_logged_voluntario.get(reverse('acoes:acao-list'))
+        self.assertEqual({a['id'] for a in response.json()}, set(Acao.objects.values_list('pk', flat=True)))
+        cheia = next(a for a in response.json() if a['id'] == self.acao_cheia.pk)
+        self.assertEqual((cheia['vagas_preenchidas'], cheia['esta_cheia']), (2, True))
+        response = self.client_logged_voluntario.get(reverse('acoes:inscricao-list'))
+        self.assertEqual([i['id'] for i in response.json()], [self.inscricao_pendente.pk])
+
+
+class TestJSONRapido(TestCase):
+    """
+    CT-SE002: Renderer e parser JSON
+    """
+
+    dados = {
+        'texto': 'ação\u2028fim',
+        'data': timezone.now(),
+        'dia': timezone.now().date(),
+        'duracao': timedelta(hours=2),
+        'valor': Decimal('1.50'),
+        'lista': [1, 2.5, None, True],
+    }
+
+    def test_renderer_igual_ao_do_drf(self):
+        """
+        CT-SE002.1: Mesmos bytes do JSONRenderer, com e sem orjson; indentação usa o do DRF
+        """
+        esperado = JSONRenderer().render(self.dados)
+        self.assertEqual(JSONRapidoRenderer().render(self.dados), esperado)
+        with mock.patch('acoes.renderers.orjson', None):
+            self.assertEqual(JSONRapidoRenderer().render(self.dados), esperado)
+        self.assertEqual(JSONRapidoRenderer().render(None), b'')
+        indentado = JSONRapidoRenderer().render(self.dados, 'application/json; indent=2')
+        self.assertIn(b'\n  "texto"', indentado)
+
+    def test_parser(self):
+        """
+        CT-SE002.2: Mesmo resultado do JSONParser; JSON inválido vira ParseError
+        """
+        corpo = json.dumps({'titulo': 'Mutirão', 'ids': [1, 2]}).encode()
+        self.assertEqual(JSONRapidoParser().parse(BytesIO(corpo)), JSONParser().parse(BytesIO(corpo)))
+        latin1 = '{"local": "São"}'.encode('latin-1')
+        self.assertEqual(JSONRapidoParser().parse(BytesIO(latin1), parser_context={'encoding': 'latin-1'}),
+                         {'local': 'São'})
+        for invalido in (b'{"a":', b'NaN'):
+            with self.assertRaises(ParseError):
+                JSONRapidoParser().parse(BytesIO(invalido))
+
+
+class TestNDJSON(FullFixturesMixin, TestCase):
+    """
+    CT-SE004: Listagens em NDJSON
+    """
+
+    def linhas(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(linha) for linha in b''.join(response.streaming_content).splitlines()]
+
+    def test_mesmos_objetos_da_listagem_json(self):
+        """
+        CT-SE004.1: Uma linha por ação, em ordem de pk, iguais ao JSON; Accept ou ?format=ndjson
+        """
+        url = reverse('acoes:acao-list')
+        esperado = sorted(self.client_logged_voluntario.get(url).json(), key=lambda a: a['id'])
+        por_accept = self.client_logged_voluntario.get(url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(self.linhas(por_accept), esperado)
+        por_formato = self.client_logged_voluntario.get(url, {'format': 'ndjson', 'fields': 'id,esta_cheia'})
+        self.assertEqual(self.linhas(por_formato), [{'id': a['id'], 'esta_cheia': a['esta_cheia']} for a in esperado])
+
+        inscricoes = self.client_logged_voluntario.get(reverse('acoes:inscricao-list'), {'format': 'ndjson'})
+        self.assertEqual([i['id'] for i in self.linhas(inscricoes)], [self.inscricao_pendente.pk])
+
+    def test_banco_lido_durante_o_envio(self):
+        """
+        CT-SE004.2: A view não carrega as ações; a consulta roda ao consumir o corpo
+        """
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client_logged_voluntario.get(reverse('acoes:acao-list'), {'format': 'ndjson'})
+        self.assertFalse(any('acoes_acao' in q['sql'] for q in contexto.captured_queries))
+        total = Acao.objects.count()
+        with CaptureQueriesContext(connection) as contexto:
+            self.assertEqual(len(self.linhas(response)), total)
+        self.assertEqual(sum('acoes_acao' in q['sql'] for q in contexto.captured_queries), 1)
+
+    def test_blocos_e_fallback(self):
+        """
+        CT-SE004.3: Linhas agrupadas em blocos; mesmos bytes sem orjson
+        """
+        objetos = [{'i': i, 'texto': 'ação ' * 100} for i in range(500)]
+        blocos = list(gerar_ndjson(objetos))
+        self.assertGreater(len(blocos), 1)
+        self.assertLess(len(blocos), len(objetos))
+        self.assertTrue(all(bloco.endswith(b'\n') for bloco in blocos))
+        with mock.patch('acoes.renderers.orjson', None):
+            self.assertEqual(list(gerar_ndjson(objetos)), blocos)
+
+
+class TestBenchmarkSerializacao(TestCase):
+    """
+    CT-SE003: Comando benchmark_serializacao
+    """
+
+    def test_mede_variantes_sem_deixar_dados(self):
+        """
+        CT-SE003.1: Grava as três variantes com vazão e não deixa ações no banco
+        """
+        fd, caminho = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, caminho)
+        call_command('benchmark_serializacao', acoes=20, repeticoes=2, saida=caminho, stdout=StringIO())
+        with open(caminho, encoding='utf-8') as arquivo:
+            documento = json.load(arquivo)
+        self.assertEqual([r['chave'] for r in documento['resultados']], ['drf', 'drf_rapido', 'plano'])
+        self.assertTrue(all(r['vazao_por_s'] > 0 for r in documento['resultados']))
+        # Mesma saída nas três variantes
+        self.assertEqual(len({r['bytes'] for r in documento['resultados']}), 1)
+        self.assertFalse(Acao.objects.exists())
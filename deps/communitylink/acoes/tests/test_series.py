@@ -0,0 +1,182 @@
+"""
+Testes das séries de ações recorrentes
+
+Este arquivo testa:
+- Regras de recorrência (diária, semanal com intervalo, mensal)
+- Materialização na janela móvel (incremental e idempotente)
+- Cadastro da série e ocorrências na listagem de ações
+"""
+
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from acoes.models import Acao, SerieAcao
+from acoes.series import materializar_serie, materializar_series, ocorrencias
+from .test_base import FullFixturesMixin
+
+
+class SerieTestMixin(FullFixturesMixin):
+    def criar_serie(self, **kwargs):
+        dados = dict(
+            titulo='Feira de adoção', descricao='Todo sábado', local='Praça', categoria='ANIMAIS',
+            numero_vagas=8, frequencia='SEMANAL', dias_semana='5', hora=datetime.time(9, 0),
+            inicio=timezone.localdate(), organizador=self.organizador_user,
+        )
+        dados.update(kwargs)
+        return SerieAcao.objects.create(**dados)
+
+
+class TestRecorrencia(SerieTestMixin, TestCase):
+    """
+    CT-SR001: Regras de recorrência
+    """
+
+    def test_semanal_quinzenal(self):
+        """
+        CT-SR001.1: Sábados alternados a partir da semana de início
+        """
+        inicio = datetime.date(2030, 1, 5)  # sábado
+        serie = self.criar_serie(inicio=inicio, intervalo=2)
+        datas = [d.date() for d in ocorrencias(serie, inicio, inicio + datetime.timedelta(days=35))]
+        self.assertEqual(datas, [datetime.date(2030, 1, 5), datetime.date(2030, 1, 19), datetime.date(2030, 2, 2)])
+
+    def test_mensal_e_fim(self):
+        """
+        CT-SR001.2: Mensal no mesmo dia; nada depois do último dia
+        """
+        inicio = datetime.date(2030, 1, 31)
+        serie = self.criar_serie(frequencia='MENSAL', inicio=inicio, fim=datetime.date(2030, 5, 1))
+        datas = [d.date() for d in ocorrencias(serie, inicio, datetime.date(2030, 12, 31))]
+        # Fevereiro e abril não têm dia 31
+        self.assertEqual(datas, [datetime.date(2030, 1, 31), datetime.date(2030, 3, 31)])
+
+    def test_diaria_com_hora(self):
+        """
+        CT-SR001.3: A cada 3 dias, no horário da série e com fuso
+        """
+        inicio = datetime.date(2030, 1, 1)
+        serie = self.criar_serie(frequencia='DIARIA', intervalo=3, inicio=inicio, hora=datetime.time(18, 30))
+        datas = list(ocorrencias(serie, inicio, datetime.date(2030, 1, 7)))
+        self.assertEqual([d.day for d in datas], [1, 4, 7])
+        self.assertTrue(all(timezone.is_aware(d) for d in datas))
+        self.assertEqual(timezone.localtime(datas[0]).time(), datetime.time(18, 30))
+
+
+class TestMaterializacaoSeries(SerieTestMixin, TestCase):
+    """
+    CT-SR002: Janela móvel de ocorrências
+    """
+
+    @override_settings(SERIES_JANELA_DIAS=28)
+    def test_cria_so_a_janela_e_avanca(self):
+        """
+        CT-SR002.1: Só as ocorrências da janela; rodar de novo não duplica; janela maior avança
+        """
+        serie = self.criar_serie(frequencia='DIARIA')
+        hoje = timezone.localdate()
+        agora = timezone.make_aware(datetime.datetime.combine(hoje, datetime.time(0, 0)))
+
+        criadas = materializar_series(agora=agora)
+        self.assertEqual(criadas, 29)  # hoje + 28 dias
+        self.assertEqual(materializar_series(agora=agora), 0)
+        serie.refresh_from_db()
+        self.assertEqual(serie.materializada_ate, hoje + datetime.timedelta(days=28))
+
+        amanha = agora + datetime.timedelta(days=1)
+        self.assertEqual(materializar_series(agora=amanha), 1)
+        ocorrencias_criadas = serie.ocorrencias.all()
+        self.assertEqual(ocorrencias_criadas.count(), 30)
+        self.assertEqual(set(ocorrencias_criadas.values_list('numero_vagas', flat=True)), {8})
+
+    def test_serie_inativa(self):
+        """
+        CT-SR002.2: Série inativa não gera ocorrências
+        """
+        self.criar_serie(frequencia='DIARIA', ativa=False)
+        self.assertEqual(materializar_series(), 0)
+
+    def test_comando(self):
+        """
+        CT-SR002.3: materializar_series informa quantas ocorrências criou
+        """
+        self.criar_serie(frequencia='DIARIA', fim=timezone.localdate() + datetime.timedelta(days=2))
+        saida = StringIO()
+        call_command('materializar_series', stdout=saida)
+        self.assertIn('ocorrências criadas', saida.getvalue())
+        self.assertLessEqual(Acao.objects.filter(serie__isnull=False).count(), 3)
+
+    def test_retorno_conta_so_as_criadas(self):
+        """
+        CT-SR002.4: Com as datas já existentes (materializada_ate zerada), retorna só as novas
+        """
+        serie = self.criar_serie(frequencia='DIARIA')
+        hoje = timezone.localdate()
+        agora = timezone.make_aware(datetime.datetime.combine(hoje, datetime.time(0, 0)))
+        self.assertEqual(materializar_serie(serie, hoje + datetime.timedelta(days=5), agora), 6)
+
+        serie.materializada_ate = None
+        self.assertEqual(materializar_serie(serie, hoje + datetime.timedelta(days=7), agora), 2)
+        self.assertEqual(serie.ocorrencias.count(), 8)
+
+    def test_sem_datas_novas_nao_geocodifica(self):
+        """
+        CT-SR002.5: Rodada sem ocorrências novas não consulta o geocodificador, mas avança a janela
+        """
+        serie = self.criar_serie(frequencia='DIARIA')
+        hoje = timezone.localdate()
+        materializar_serie(serie, hoje + datetime.timedelta(days=3))
+        serie.materializada_ate = None
+        with mock.patch('acoes.series.geocodificar') as geocodificar, \
+                mock.patch('acoes.series.registrar_locais') as registrar:
+            self.assertEqual(materializar_serie(serie, hoje + datetime.timedelta(days=3)), 0)
+        geocodificar.assert_not_called()
+        registrar.assert_not_called()
+        serie.refresh_from_db()
+        self.assertEqual(serie.materializada_ate, hoje + datetime.timedelta(days=3))
+
+
+class TestCadastroSerie(SerieTestMixin, TestCase):
+    """
+    CT-SR003: Cadastro e listagem
+    """
+
+    def test_organizador_cria_serie_e_ocorrencias_aparecem(self):
+        """
+        CT-SR003.1: Série criada pela página já tem ocorrências na listagem
+        """
+        inicio = timezone.localdate() + datetime.timedelta(days=1)
+        response = self.client_logged_organizador.post(reverse('acoes:serie_create'), {
+            'titulo': 'Feira semanal', 'descricao': 'x', 'local': 'Praça', 'categoria': 'ANIMAIS',
+            'numero_vagas': 5, 'duracao_horas': 3, 'frequencia': 'SEMANAL', 'intervalo': 1,
+            'dias_semana': [str(inicio.weekday())], 'hora': '09:00', 'inicio': inicio.isoformat(),
+        })
+        self.assertRedirects(response, reverse('acoes:minhas_acoes'))
+        serie = SerieAcao.objects.get(titulo='Feira semanal')
+        self.assertEqual(serie.dias_semana, str(inicio.weekday()))
+        self.assertGreater(serie.ocorrencias.count(), 0)
+
+        response = self.client.get(reverse('acoes:acao_list'))
+        self.assertContains(response, 'Feira semanal')
+        self.assertContains(response, 'Recorrente')
+
+    def test_validacoes(self):
+        """
+        CT-SR003.2: Início no passado e fim antes do início são recusados; voluntário não acessa
+        """
+        ontem = timezone.localdate() - datetime.timedelta(days=1)
+        response = self.client_logged_organizador.post(reverse('acoes:serie_create'), {
+            'titulo': 'X', 'descricao': 'x', 'local': 'x', 'categoria': 'OUTRO', 'numero_vagas': 1,
+            'duracao_horas': 1, 'frequencia': 'DIARIA', 'intervalo': 1, 'hora': '09:00',
+            'inicio': ontem.isoformat(), 'fim': (ontem - datetime.timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('inicio', response.context['form'].errors)
+        self.assertIn('fim', response.context['form'].errors)
+        response = self.client_logged_voluntario.get(reverse('acoes:serie_create'))
+        self.assertRedirects(response, reverse('acoes:acao_list'))
@@ -0,0 +1,81 @@
+"""
+Testes da estratégia de sessão
+
+Este arquivo testa:
+- SESSION_STRATEGY -> SESSION_ENGINE (e erro para estratégia desconhecida)
+- benchmark_sessoes: queries em django_session por estratégia, sem deixar dados
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from acoes.models import Acao
+from communitylink.sessoes import motor_de_sessao
+
+
+class TestEstrategiaSessao(SimpleTestCase):
+    """
+    CT-SS001: SESSION_STRATEGY
+    """
+
+    def test_motores(self):
+        """
+        CT-SS001.1: Cada estratégia vira o backend do Django; desconhecida é erro de configuração
+        """
+        self.assertEqual(motor_de_sessao('db'), 'django.contrib.sessions.backends.db')
+        self.assertEqual(motor_de_sessao('cached_db'), 'django.contrib.sessions.backends.cached_db')
+        self.assertEqual(motor_de_sessao('signed_cookies'), 'django.contrib.sessions.backends.signed_cookies')
+        with self.assertRaises(ImproperlyConfigured):
+            motor_de_sessao('redis')
+
+
+class TestBenchmarkSessoes(TestCase):
+    """
+    CT-SS002: Comando benchmark_sessoes
+    """
+
+    def setUp(self):
+        fd, self.saida = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.saida)
+
+    def test_leituras_de_sessao_por_estrategia(self):
+        """
+        CT-SS002.1: db lê django_session a cada requisição; cached_db e signed_cookies não
+        """
+        call_command('benchmark_sessoes', clientes=1, por_cliente=2, saida=self.saida, stdout=StringIO())
+        with open(self.saida, encoding='utf-8') as arquivo:
+            documento = json.load(arquivo)
+        resultados = {r['chave']: r for r in documento['resultados']}
+        self.assertEqual(list(resultados), ['db', 'cached_db', 'signed_cookies'])
+        self.assertEqual([r['requisicoes'] for r in resultados.values()], [4, 4, 4])
+        self.assertEqual([r['inscricoes_criadas'] for r in resultados.values()], [2, 2, 2])
+        self.assertEqual(resultados['db']['leituras_sessao'], 4)
+        self.assertEqual(resultados['cached_db']['leituras_sessao'], 0)
+        self.assertEqual(resultados['signed_cookies']['sessao_por_requisicao'], 0)
+        self.assertTrue(all(r['erros'] == 0 for r in resultados.values()))
+
+        self.assertFalse(User.objects.filter(username__startswith='bsessao_').exists())
+        self.assertFalse(Acao.objects.filter(titulo__startswith='bsessao_').exists())
+        self.assertFalse(Session.objects.exists())
+
+    def test_salvar_sempre_e_validacao(self):
+        """
+        CT-SS002.2: --salvar-sempre grava a sessão em toda requisição; estratégia inválida é erro
+        """
+        call_command('benchmark_sessoes', estrategias='db', clientes=1, por_cliente=1, salvar_sempre=True,
+                     saida=self.saida, stdout=StringIO())
+        with open(self.saida, encoding='utf-8') as arquivo:
+            resultado = json.load(arquivo)['resultados'][0]
+        self.assertEqual(resultado['escritas_sessao'], 2)
+        with self.assertRaises(CommandError):
+            call_command('benchmark_sessoes', estrategias='arquivo', stdout=StringIO())
@@ -0,0 +1,110 @@
+"""
+Testes da autenticação por token da API
+
+Este arquivo testa:
+- Emissão do token e uso com Authorization: Bearer, sem CSRF
+- Requisições seguintes sem nenhuma query de autenticação (cache)
+- Revogação e mudanças de grupo invalidando o cache
+"""
+
+import time
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from acoes import tokens
+from acoes.models import Notificacao
+from .test_base import FullFixturesMixin
+
+TABELAS_DE_AUTENTICACAO = ('acoes_tokenapi', 'auth_user', 'auth_group', 'django_session')
+
+
+class TestTokensApi(FullFixturesMixin, TestCase):
+    """
+    CT-TK001: Tokens da API
+    """
+
+    def emitir(self, username='voluntario'):
+        response = self.client.post(reverse('acoes:token'), {'username': username, 'password': 'test123'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return {'HTTP_AUTHORIZATION': f"Bearer {response.json()['token']}"}
+
+    def test_sem_queries_de_autenticacao_no_cache(self):
+        """
+        CT-TK001.1: Depois da primeira requisição, o token não custa query; escrita sem CSRF
+        """
+        cabecalho = self.emitir()
+        url = reverse('acoes:acao-list') + '?fields=id,titulo'
+        self.assertEqual(self.client.get(url, **cabecalho).status_code, 200)
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(url, **cabecalho)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(contexto.captured_queries), 1)
+        self.assertFalse([q['sql'] for q in contexto.captured_queries
+                          if any(tabela in q['sql'] for tabela in TABELAS_DE_AUTENTICACAO)])
+
+        notificacao = Notificacao.objects.create(destinatario=self.voluntario_user, mensagem='Olá')
+        cliente_csrf = Client(enforce_csrf_checks=True)
+        response = cliente_csrf.post(reverse('acoes:notificacao-marcar-lida', args=[notificacao.pk]), **cabecalho)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['lida'])
+
+    def test_credenciais_e_token_invalidos(self):
+        """
+        CT-TK001.2: Senha errada dá 400; token desconhecido e anônimo recebem 401
+        """
+        response = self.client.post(reverse('acoes:token'), {'username': 'voluntario', 'password': 'errada'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        url = reverse('acoes:inscricao-list')
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer inexistente').status_code, 401)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+
+    def test_revogacao(self):
+        """
+        CT-TK001.3: DELETE revoga na hora; outro processo deixa de aceitar ao fim do cache local
+        """
+        cabecalho = self.emitir()
+        url = reverse('acoes:inscricao-list')
+        self.assertEqual(self.client.get(url, **cabecalho).status_code, 200)
+        # Cópia local de "outro worker", feita antes da revogação
+        locais = dict(tokens._locais)
+
+        self.assertEqual(self.client.delete(reverse('acoes:token'), **cabecalho).status_code, 204)
+        self.assertEqual(self.client.get(url, **cabecalho).status_code, 401)
+
+        tokens._locais.update(locais)
+        token = cabecalho['HTTP_AUTHORIZATION'].split()[1]
+        self.assertIsNotNone(tokens.autenticar(token))
+        with mock.patch('acoes.tokens.time.time', return_value=time.time() + 6):
+            self.assertIsNone(tokens.autenticar(token))
+
+    def test_grupos_invalidam_o_cache(self):
+        """
+        CT-TK001.4: Entrar no grupo Organizadores vale na próxima requisição com o mesmo token
+        """
+        cabecalho = self.emitir()
+        url = reverse('acoes:painel-list')
+        self.assertEqual(self.client.get(url, **cabecalho).status_code, 403)
+        Group.objects.get(name='Organizadores').user_set.add(self.voluntario_user)
+        self.assertEqual(self.client.get(url, **cabecalho).status_code, 200)
+
+    def test_usuario_do_cache_tem_os_campos_certos(self):
+        """
+        CT-TK001.5: O usuário montado do cache tem os mesmos dados do banco (sem virar superusuário)
+        """
+        cabecalho = self.emitir()
+        token = cabecalho['HTTP_AUTHORIZATION'].split()[1]
+        tokens.autenticar(token)
+        tokens._locais.clear()
+        usuario, _ = tokens.autenticar(token)
+        for campo in tokens.CAMPOS_USUARIO:
+            self.assertEqual(getattr(usuario, campo), getattr(self.voluntario_user, campo), campo)
+        self.assertFalse(usuario.is_superuser)
@@ -0,0 +1,185 @@
+"""
+Autenticação da API por token (Authorization: Bearer <token>), sem sessão.
+
+O token é emitido em POST /api/token/ (usuário e senha, ou a sessão do
+site) e só o sha256 dele fica no banco (TokenApi). Na primeira requisição
+com um token, o registro, o usuário e os grupos são lidos numa query e
+guardados no cache API_TOKEN_CACHE por até API_TOKEN_CACHE_SEGUNDOS; as
+seguintes montam o usuário a partir do cache, sem tocar no banco (nem
+sessão, nem auth_user, nem grupos) e sem CSRF.
+
+Invalidação:
+- revogar() (DELETE /api/token/ ou o admin) grava revogado_em e apaga a
+  entrada do cache compartilhado na hora;
+- mudanças no usuário ou nos grupos dele incrementam a versão do usuário
+  no cache (signals em models.py), e as entradas com versão antiga são
+  relidas do banco.
+
+Cada processo ainda guarda os tokens verificados por
+API_TOKEN_CACHE_LOCAL_SEGUNDOS, então uma revogação chega a todos os workers
+em no máximo esse tempo. Como em LIMITES_CACHE, o cache precisa ser
+compartilhado entre os workers (Redis/Memcached/DatabaseCache) para isso
+valer; o LocMemCache padrão vale só por processo.
+"""
+
+import hashlib
+import secrets
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import TokenApi
+
+PALAVRA = 'Bearer'
+# Na ordem dos campos do modelo: User.from_db casa os valores por posição
+CAMPOS_USUARIO = tuple(
+    campo.attname for campo in User._meta.concrete_fields
+    if campo.attname in {'id', 'username', 'first_name', 'last_name', 'email', 'is_active', 'is_staff', 'is_superuser'}
+)
+# Acima disso o cache local do processo é esvaziado
+MAXIMO_LOCAL = 10_000
+
+# chave -> (válido até, dados ou None); por processo
+_locais = {}
+
+
+def _cache():
+    return caches[getattr(settings, 'API_TOKEN_CACHE', 'default')]
+
+
+def _chave_cache(chave):
+    return f'token-api:{chave}'
+
+
+def _chave_versao(usuario_id):
+    return f'token-api-usuario:{usuario_id}'
+
+
+def hash_do_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def emitir(usuario, nome=''):
+    """ Cria um token para `usuario`; devolve (token, registro). O token não é recuperável depois. """
+    token = secrets.token_urlsafe(32)
+    registro = TokenApi.objects.create(
+        chave=hash_do_token(token), usuario=usuario, nome=nome[:100],
+        expira_em=timezone.now() + timedelta(days=getattr(settings, 'API_TOKEN_VALIDADE_DIAS', 30)),
+    )
+    return token, registro
+
+
+def revogar(chaves):
+    """ Revoga os tokens (sha256) e tira do cache; devolve quantos foram revogados. """
+    chaves = list(chaves)
+    revogados = TokenApi.objects.filter(chave__in=chaves, revogado_em__isnull=True).update(revogado_em=timezone.now())
+    _cache().delete_many([_chave_cache(chave) for chave in chaves])
+    for chave in chaves:
+        _locais.pop(chave, None)
+    return revogados
+
+
+def invalidar_usuarios(usuario_ids):
+    """ Dados ou grupos dos usuários mudaram: os tokens deles são relidos do banco. """
+    cache = _cache()
+    for usuario_id in usuario_ids:
+        chave = _chave_versao(usuario_id)
+        if not cache.add(chave, 1, timeout=None):
+            try:
+                cache.incr(chave)
+            except ValueError:  # expirou entre o add e o incr
+                cache.set(chave, 1, timeout=None)
+    _locais.clear()
+
+
+def autenticar(token):
+    """ (usuário, chave) do token válido, ou None. Sem query quando o token está em cache. """
+    chave = hash_do_token(token)
+    agora = time.time()
+    local = _locais.get(chave)
+    if local and local[0] > agora:
+        dados = local[1]
+    else:
+        dados = _ler(chave, agora)
+        if len(_locais) >= MAXIMO_LOCAL:
+            _locais.clear()
+        _locais[chave] = (agora + getattr(settings, 'API_TOKEN_CACHE_LOCAL_SEGUNDOS', 5), dados)
+    if not dados or dados['expira'] <= agora:
+        return None
+    return _montar_usuario(dados), chave
+
+
+def _ler(chave, agora):
+    cache = _cache()
+    dados = cache.get(_chave_cache(chave))
+    if dados == 0:
+        return None
+    if dados and dados['versao'] == cache.get(_chave_versao(dados['usuario'][0]), 0):
+        return dados
+    return _carregar(chave, agora)
+
+
+def _carregar(chave, agora):
+    cache = _cache()
+    validade = getattr(settings, 'API_TOKEN_CACHE_SEGUNDOS', 300)
+    registro = (
+        TokenApi.objects.filter(chave=chave, revogado_em__isnull=True, expira_em__gt=timezone.now(),
+                                usuario__is_active=True)
+        .select_related('usuario').first()
+    )
+    if registro is None:
+        # Token desconhecido/revogado também fica em cache: não vira uma query por tentativa
+        cache.set(_chave_cache(chave), 0, timeout=validade)
+        return None
+    usuario = registro.usuario
+    dados = {
+        'usuario': [getattr(usuario, 'pk' if campo == 'id' else campo) for campo in CAMPOS_USUARIO],
+        'grupos': list(usuario.groups.values_list('name', flat=True)),
+        'expira': registro.expira_em.timestamp(),
+        'versao': cache.get(_chave_versao(usuario.pk), 0),
+    }
+    cache.set(_chave_cache(chave), dados, timeout=max(1, min(validade, int(dados['expira'] - agora))))
+    return dados
+
+
+def _montar_usuario(dados):
+    # Como se viesse do banco: os campos fora de CAMPOS_USUARIO ficam adiados
+    usuario = User.from_db(DEFAULT_DB_ALIAS, CAMPOS_USUARIO, dados['usuario'])
+    # Lido por permissions.no_grupo
+    usuario._nomes_grupos = set(dados['grupos'])
+    return usuario
+
+
+def limpar():
+    """ Esvazia os caches de tokens (testes). """
+    _cache().clear()
+    _locais.clear()
+
+
+class TokenApiAuthentication(BaseAuthentication):
+    """ Authorization: Bearer <token>. Sem o cabeçalho, passa a vez (sessão). """
+
+    def authenticate(self, request):
+        partes = get_authorization_header(request).split()
+        if not partes or partes[0].lower() != PALAVRA.lower().encode():
+            return None
+        if len(partes) != 2:
+            raise AuthenticationFailed('Cabeçalho Authorization inválido.')
+        try:
+            token = partes[1].decode('ascii')
+        except UnicodeDecodeError:
+            raise AuthenticationFailed('Cabeçalho Authorization inválido.')
+        resultado = autenticar(token)
+        if resultado is None:
+            raise AuthenticationFailed('Token inválido, expirado ou revogado.')
+        return resultado
+
+    def authenticate_header(self, request):
+        return PALAVRA
@@ -8,9 +8,12 @@ urlpatterns = [
     # READ
     path('', views.acao_list, name='acao_list'),
     path('<int:pk>/', views.acao_detail, name='acao_detail'),
+    path('locais/autocomplete/', views.locais_autocomplete, name='locais_autocomplete'),
     
     # CREATE
     path('nova/', views.acao_create, name='acao_create'),
+    path('importar/', views.acao_import, name='acao_import'),
+    path('series/nova/', views.serie_create, name='serie_create'),
     
     # UPDATE
     path('<int:pk>/editar/', views.acao_update, name='acao_update'),
@@ -21,11 +24,15 @@ urlpatterns = [
     # Inscrição
     path('<int:pk>/inscrever/', views.acao_apply, name='acao_apply'),
     path('<int:pk>/gerenciar/', views.acao_manage, name='acao_manage'),
+    path('<int:pk>/gerenciar/lote/', views.acao_manage_lote, name='acao_manage_lote'),
+    path('<int:pk>/exportar/<str:formato>/', views.acao_export, name='acao_export'),
     path('inscricao/<int:pk>/cancelar/', views.inscricao_cancel, name='inscricao_cancel'),
 
     #Páginas de usuário
     path('minhas-inscricoes/', views.minhas_inscricoes, name='minhas_inscricoes'),
     path('minhas-acoes/', views.minhas_acoes, name='minhas_acoes'),
+    path('minhas-acoes/exportar/<str:formato>/', views.minhas_acoes_export, name='minhas_acoes_export'),
+    path('painel/', views.painel_view, name='painel'),
 
     # Notificações
     path('notificacoes/', views.notificacoes_list, name='notificacoes_list'),
@@ -39,6 +46,9 @@ urlpatterns = [
     # Perfil
     path('perfil/', views.perfil_view, name='perfil'), #Ver/editar perfil
     path('historico/', views.historico_view, name='historico'),
+    path('impacto/', views.impacto_view, name='impacto'),
+    path('calendario/token/', views.calendario_token, name='calendario_token'),
+    path('calendario/<str:token>.ics', views.calendario_feed, name='calendario_feed'),
 
 
    # --- RECUPERAÇÃO DE SENHA (PASSWORD RESET) ---
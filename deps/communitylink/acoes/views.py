@@ -5,10 +5,23 @@ from django.contrib.auth.models import Group
 from django.contrib.auth.decorators import login_required
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.http import HttpResponseNotAllowed
-from django.http import HttpResponseForbidden
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, HttpResponseNotModified, Http404, StreamingHttpResponse
+from django.utils.http import parse_etags
+from django.core.cache import cache
 from django.contrib import messages
-from .models import Acao, Inscricao, Notificacao, Perfil
-from .forms import AcaoForm, SignUpForm, SignInForm, UserUpdateForm, PerfilUpdateForm
+from . import metrics
+from .models import (
+    Acao, AcaoArquivada, FeedCalendario, Inscricao, InscricaoArquivada, Notificacao, Perfil, RegistroHistorico,
+    ResumoImpacto,
+)
+from .historico import adiantar_historico
+from .rollups import adiantar_rollups, painel
+from .exportacao import FORMATOS, linhas_inscricoes, resposta_exportacao
+from .importacao import ErroImportacao, formato_do_arquivo, importar_acoes, ler_linhas
+from .series import janela_dias, materializar_serie
+from .moderacao import ErroModeracao, decidir_inscricoes
+from . import calendario, geo, limites, locais
+from .forms import AcaoForm, ImportacaoAcoesForm, SerieAcaoForm, SignUpForm, SignInForm, UserUpdateForm, PerfilUpdateForm
 from django.db.models import Q # Importante para filtros complexos
 import datetime # Importante para o filtro de data
 from django.urls import reverse # Para criar links nas notificações
@@ -37,13 +50,18 @@ def filtrar_acoes_queryset(request, queryset):
 
     # Define o prefixo de busca (para o modelo Inscricao)
     # Se o queryset for de Inscrição, precisamos filtrar por 'acao__categoria'
-    prefix = 'acao__' if queryset.model == Inscricao else ''
+    prefix = 'acao__' if queryset.model in (Inscricao, InscricaoArquivada) else ''
 
     if categoria_filter:
         queryset = queryset.filter(**{f'{prefix}categoria': categoria_filter})
     
     if local_filter:
-        queryset = queryset.filter(**{f'{prefix}local__icontains': local_filter})
+        # Local conhecido (ex.: escolhido no autocompletar): igualdade na chave normalizada
+        chave = locais.normalizar_local(local_filter)
+        if queryset.model in (Acao, Inscricao) and locais.local_conhecido(chave):
+            queryset = queryset.filter(**{f'{prefix}local_normalizado_id': chave})
+        else:
+            queryset = queryset.filter(**{f'{prefix}local__icontains': local_filter})
         
     if data_inicio_filter:
         try:
@@ -54,6 +72,10 @@ def filtrar_acoes_queryset(request, queryset):
         except ValueError:
             pass # Ignora data inválida
 
+    # Proximidade (?perto_de=lat,lon&raio_km=N): só Ação/Inscrição têm coordenadas
+    if queryset.model in (Acao, Inscricao):
+        queryset = geo.aplicar_filtro_da_requisicao(request, queryset, prefix)
+
     return queryset
 
 # --- CRUD Views ---
@@ -62,13 +84,14 @@ def filtrar_acoes_queryset(request, queryset):
 def acao_list(request):
     """ Mostra a lista de todas as ações. """
     # filtra apenas ações de hoje em diante.
-    acoes_list = Acao.objects.filter(data__gte=timezone.localdate())
+    acoes_list = Acao.objects.com_vagas_preenchidas().filter(data__gte=timezone.localdate())
 
     # --- Aplica os filtros do formulário (categoria, local, etc.) ---
     acoes_list = filtrar_acoes_queryset(request, acoes_list)
     
-    # Ordena DEPOIS de filtrar
-    acoes_list = acoes_list.order_by('data')
+    # Ordena DEPOIS de filtrar (a busca por proximidade já vem ordenada pela distância)
+    if not acoes_list.ordered:
+        acoes_list = acoes_list.order_by('data')
 
     # Paginação
     page_obj = paginar_queryset(request, acoes_list, itens_por_pagina=10)
@@ -77,6 +100,7 @@ def acao_list(request):
         'acoes': page_obj,
         'categorias_choices': Acao.CATEGORIA_CHOICES, # Passa as opções de categoria
         'filter_values': request.GET, # Passa os valores do filtro (para preencher o form)
+        'filtro_proximidade': True, # Mostra o campo de raio no formulário
         'page_param': 'page' # Nome do parametro na URL
     }
     return render(request, 'acoes/acao_list.html', context)
@@ -84,17 +108,22 @@ def acao_list(request):
 # READ (Detail)
 def acao_detail(request, pk):
     """ Mostra os detalhes de uma única ação. """
-    acao = get_object_or_404(Acao, pk=pk)
+    acao = Acao.objects.com_vagas_preenchidas().select_related('organizador').filter(pk=pk).first()
+    modelo_inscricao = Inscricao
+    if acao is None:
+        # Ações antigas continuam acessíveis pelo arquivo (links do histórico e notificações)
+        acao = get_object_or_404(AcaoArquivada.objects.select_related('organizador'), pk=pk)
+        modelo_inscricao = InscricaoArquivada
     
     # Lógica de inscrição
     ja_inscrito = False
     inscricao_status = None
     if request.user.is_authenticated:
         try:
-            inscricao = Inscricao.objects.get(acao=acao, voluntario=request.user)
+            inscricao = modelo_inscricao.objects.get(acao=acao, voluntario=request.user)
             ja_inscrito = True
             inscricao_status = inscricao.get_status_display()
-        except Inscricao.DoesNotExist:
+        except modelo_inscricao.DoesNotExist:
             ja_inscrito = False
             
     context = {
@@ -141,6 +170,60 @@ def acao_create(request):
     context = {'form': form, 'is_create': True}
     return render(request, 'acoes/acao_form.html', context)
 
+@login_required
+def acao_import(request):
+    """ Cria várias ações de uma vez a partir de um arquivo CSV ou JSON. """
+    is_organizador = request.user.groups.filter(name='Organizadores').exists()
+    if not is_organizador and not request.user.is_superuser:
+        messages.error(request, 'Apenas organizadores podem importar ações.')
+        return redirect('acoes:acao_list')
+
+    resultado = None
+    if request.method == 'POST':
+        form = ImportacaoAcoesForm(request.POST, request.FILES)
+        if form.is_valid():
+            arquivo = form.cleaned_data['arquivo']
+            try:
+                linhas = ler_linhas(arquivo.read(), formato_do_arquivo(arquivo.name))
+            except ErroImportacao as erro:
+                form.add_error('arquivo', str(erro))
+            else:
+                resultado = importar_acoes(
+                    linhas, request.user, somente_validar=form.cleaned_data['somente_validar'],
+                )
+                if resultado['criadas']:
+                    messages.success(request, f"{resultado['criadas']} ações criadas.")
+                if resultado['erros']:
+                    messages.error(request, f"{len(resultado['erros'])} linhas com erro.")
+    else:
+        form = ImportacaoAcoesForm()
+
+    return render(request, 'acoes/acao_import.html', {'form': form, 'resultado': resultado})
+
+@login_required
+def serie_create(request):
+    """ Cria uma série recorrente; as ocorrências da janela inicial já são criadas. """
+    is_organizador = request.user.groups.filter(name='Organizadores').exists()
+    if not is_organizador and not request.user.is_superuser:
+        messages.error(request, 'Apenas organizadores podem criar séries de ações.')
+        return redirect('acoes:acao_list')
+
+    if request.method == 'POST':
+        form = SerieAcaoForm(request.POST)
+        if form.is_valid():
+            serie = form.save(commit=False)
+            serie.organizador = request.user
+            serie.save()
+            # As próximas ocorrências ficam para o materializar_series (cron)
+            ate = timezone.localdate() + datetime.timedelta(days=janela_dias())
+            criadas = materializar_serie(serie, ate)
+            messages.success(request, f'Série criada com {criadas} ações nos próximos {janela_dias()} dias.')
+            return redirect('acoes:minhas_acoes')
+    else:
+        form = SerieAcaoForm()
+
+    return render(request, 'acoes/serie_form.html', {'form': form})
+
 # UPDATE
 @login_required
 def acao_update(request, pk):
@@ -171,13 +254,18 @@ def acao_update(request, pk):
 
             # --- NOVO: Notificar voluntários sobre a edição ---
             # Pega todos que estão aceitos ou pendentes
+            # (um único INSERT em lote, sem carregar os usuários)
             inscritos = Inscricao.objects.filter(acao=acao, status__in=['ACEITO', 'PENDENTE'])
-            for inscr in inscritos:
-                Notificacao.objects.create(
-                    destinatario=inscr.voluntario,
+            link = reverse('acoes:acao_detail', args=[acao.pk])
+            notificacoes = Notificacao.objects.bulk_create([
+                Notificacao(
+                    destinatario_id=voluntario_id,
                     mensagem=f"A ação '{acao.titulo}' sofreu alterações pelo organizador.",
-                    link=reverse('acoes:acao_detail', args=[acao.pk])
+                    link=link
                 )
+                for voluntario_id in inscritos.values_list('voluntario_id', flat=True)
+            ])
+            metrics.registrar_fanout('acao_editada', len(notificacoes))
             
             return redirect(acao.get_absolute_url())
     else:
@@ -210,21 +298,24 @@ def acao_delete(request, pk):
         # Filtramos por status para não avisar quem já tinha sido rejeitado ou cancelado, se quiser
         inscricoes_afetadas = Inscricao.objects.filter(acao=acao, status__in=['ACEITO', 'PENDENTE'])
         
-        # Criamos uma lista com os objetos User dos voluntários
+        # Criamos uma lista com os ids dos voluntários
         # É IMPORTANTE converter para list() agora, para buscar do banco antes de deletar
-        voluntarios_para_avisar = [i.voluntario for i in inscricoes_afetadas]
+        voluntarios_para_avisar = list(inscricoes_afetadas.values_list('voluntario_id', flat=True))
 
         # --- PASSO B: Deletar a ação ---
         # Isso vai apagar a Ação e todas as Inscrições (CASCADE)
         acao.delete()
 
-        # --- PASSO C: Enviar Notificações ---
-        for voluntario in voluntarios_para_avisar:
-            Notificacao.objects.create(
-                destinatario=voluntario,
+        # --- PASSO C: Enviar Notificações (em lote) ---
+        Notificacao.objects.bulk_create([
+            Notificacao(
+                destinatario_id=voluntario_id,
                 mensagem=f"Atenção: A ação '{titulo_acao}' foi cancelada/excluída pelo organizador.",
                 link="" # DEIXE VAZIO! A página da ação não existe mais (daria Erro 404)
             )
+            for voluntario_id in voluntarios_para_avisar
+        ])
+        metrics.registrar_fanout('acao_excluida', len(voluntarios_para_avisar))
 
         messages.success(request, 'Ação deletada e voluntários notificados com sucesso.')
         return redirect('acoes:acao_list')
@@ -297,7 +388,7 @@ def acao_apply(request, pk):
 @login_required
 def acao_manage(request, pk):
     """ Página para o organizador gerenciar as solicitações. """
-    acao = get_object_or_404(Acao, pk=pk)
+    acao = get_object_or_404(Acao.objects.select_related('organizador'), pk=pk)
 
     # Superusuários também devem poder gerenciar
     if acao.organizador != request.user and not request.user.is_superuser:
@@ -366,9 +457,14 @@ def acao_manage(request, pk):
 
 
     # Pega todas as inscrições para esta ação
-    solicitacoes_pendentes = acao.inscricao_set.filter(status='PENDENTE').order_by('data_inscricao')
-    solicitacoes_aceitas = acao.inscricao_set.filter(status='ACEITO').order_by('voluntario__username')
-    solicitacoes_rejeitadas = acao.inscricao_set.filter(status='REJEITADO').order_by('voluntario__username')
+    # (list() para o template não repetir a query a cada .count / if)
+    inscricoes = acao.inscricao_set.select_related('voluntario')
+    solicitacoes_pendentes = list(inscricoes.filter(status='PENDENTE').order_by('data_inscricao'))
+    solicitacoes_aceitas = list(inscricoes.filter(status='ACEITO').order_by('voluntario__username'))
+    solicitacoes_rejeitadas = list(inscricoes.filter(status='REJEITADO').order_by('voluntario__username'))
+
+    # O template consulta esta_cheia em cada linha; reaproveita a contagem já feita
+    acao.total_aceitos = len(solicitacoes_aceitas)
 
     context = {
         'acao': acao,
@@ -378,6 +474,36 @@ def acao_manage(request, pk):
     }
     return render(request, 'acoes/acao_manage.html', context)
 
+
+@login_required
+def acao_manage_lote(request, pk):
+    """ Aceita ou rejeita, de uma vez, as solicitações marcadas na página de gerenciamento. """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    acao = get_object_or_404(Acao, pk=pk)
+    if acao.organizador_id != request.user.pk and not request.user.is_superuser:
+        messages.error(request, 'Você não tem permissão para gerenciar esta ação.')
+        return redirect(acao.get_absolute_url())
+
+    selecionadas = request.POST.getlist('inscricoes')
+    if not selecionadas:
+        messages.error(request, 'Selecione ao menos uma solicitação.')
+        return redirect('acoes:acao_manage', pk=pk)
+    try:
+        resultado = decidir_inscricoes(acao.pk, selecionadas, request.POST.get('status'))
+    except ErroModeracao as erro:
+        messages.error(request, str(erro))
+        return redirect('acoes:acao_manage', pk=pk)
+
+    if resultado['aplicadas']:
+        decisao = 'aceitas' if resultado['status'] == 'ACEITO' else 'rejeitadas'
+        messages.success(request, f"{len(resultado['aplicadas'])} solicitações {decisao}.")
+    if resultado['sem_vaga']:
+        messages.warning(request, f"{len(resultado['sem_vaga'])} solicitações não foram aceitas: as vagas acabaram.")
+    if resultado['ignoradas']:
+        messages.info(request, f"{len(resultado['ignoradas'])} solicitações já tinham sido decididas.")
+    return redirect('acoes:acao_manage', pk=pk)
+
     # --- NOVA VIEW PARA VOLUNTÁRIOS ---
 
 @login_required
@@ -385,7 +511,7 @@ def minhas_inscricoes(request):
     """ Mostra todas as ações nas quais o usuário logado se inscreveu. """
     
     # Filtra as inscrições pelo usuário logado
-    inscricoes_list = Inscricao.objects.filter(voluntario=request.user)
+    inscricoes_list = Inscricao.objects.filter(voluntario=request.user).select_related('acao')
 
     inscricoes_list = filtrar_acoes_queryset(request, inscricoes_list)
     
@@ -409,7 +535,7 @@ def minhas_acoes(request):
     """ Mostra todas as ações criadas pelo usuário logado (organizador). """
     
     # Filtra as ações pelo organizador (usuário logado)
-    acoes_list = Acao.objects.filter(organizador=request.user)
+    acoes_list = Acao.objects.com_vagas_preenchidas().filter(organizador=request.user)
 
     acoes_list = filtrar_acoes_queryset(request, acoes_list)
         
@@ -426,6 +552,31 @@ def minhas_acoes(request):
     }
     return render(request, 'acoes/minhas_acoes.html', context)
 
+@login_required
+def acao_export(request, pk, formato):
+    """ Exporta os inscritos de uma ação (CSV ou XLSX), inclusive de ações arquivadas. """
+    if formato not in FORMATOS:
+        raise Http404('Formato de exportação inválido.')
+    acao = Acao.objects.filter(pk=pk).only('organizador_id').first()
+    if acao is None:
+        acao = get_object_or_404(AcaoArquivada.objects.only('organizador_id'), pk=pk)
+
+    if acao.organizador_id != request.user.pk and not request.user.is_superuser:
+        messages.error(request, 'Você não tem permissão para exportar os inscritos desta ação.')
+        return redirect('acoes:acao_detail', pk=pk)
+
+    return resposta_exportacao(linhas_inscricoes(acao_id=pk), formato, f'inscritos-acao-{pk}')
+
+
+@login_required
+def minhas_acoes_export(request, formato):
+    """ Exporta os inscritos de todas as ações do organizador logado. """
+    if formato not in FORMATOS:
+        raise Http404('Formato de exportação inválido.')
+    return resposta_exportacao(
+        linhas_inscricoes(acao__organizador=request.user), formato, f'inscritos-{request.user.username}'
+    )
+
 # --- VIEW PARA NOTIFICACOES ---
 
 @login_required
@@ -439,11 +590,12 @@ def notificacoes_list(request):
     # Paginação
     page_obj = paginar_queryset(request, qs, itens_por_pagina=10)
     
-    # Atualiza as que estão SENDO EXIBIDAS agora
-    for notif in page_obj:
-        if not notif.lida:
+    # Atualiza as que estão SENDO EXIBIDAS agora (um único UPDATE para a página)
+    ids_nao_lidas = [notif.pk for notif in page_obj if not notif.lida]
+    if ids_nao_lidas:
+        Notificacao.objects.filter(pk__in=ids_nao_lidas).update(lida=True)
+        for notif in page_obj:
             notif.lida = True
-            notif.save()
 
     # Recalcula contagem geral para o botão limpar
     lidas_count = Notificacao.objects.filter(destinatario=request.user, lida=True).count()
@@ -473,6 +625,10 @@ def notificacoes_clear(request):
 # --- VIEWS DE AUTENTICAÇÃO ---
 def signup_view(request):
     if request.method == 'POST':
+        espera = limites.tentativa_de_login_bloqueada(request)
+        if espera:
+            messages.error(request, f'Muitas tentativas. Tente novamente em {espera} segundos.')
+            return render(request, 'acoes/sign_up.html', {'form': SignUpForm()}, status=429)
         form = SignUpForm(request.POST)
         if form.is_valid():
             # 1. Salva o usuário no banco (mas ainda sem o grupo)
@@ -502,6 +658,11 @@ def signup_view(request):
 
 def signin_view(request):
     if request.method == 'POST':
+        # Antes do hash da senha: rajadas de tentativas não consomem CPU
+        espera = limites.tentativa_de_login_bloqueada(request)
+        if espera:
+            messages.error(request, f'Muitas tentativas. Tente novamente em {espera} segundos.')
+            return render(request, 'acoes/sign_in.html', {'form': SignInForm()}, status=429)
         form = SignInForm(request=request, data=request.POST)
         if form.is_valid():
             user = form.get_user()
@@ -540,10 +701,56 @@ def perfil_view(request):
 
     context = {
         'u_form': u_form,
-        'p_form': p_form
+        'p_form': p_form,
+        'feed_calendario': FeedCalendario.objects.filter(usuario=request.user).first(),
     }
     return render(request, 'acoes/perfil.html', context)
 
+
+@login_required
+def calendario_token(request):
+    """ Cria (ou troca, invalidando o anterior) o link secreto do calendário. """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    feed, criado = FeedCalendario.objects.get_or_create(
+        usuario=request.user, defaults={'token': calendario.gerar_token()},
+    )
+    if not criado:
+        feed.token = calendario.gerar_token()
+        feed.versao += 1
+        feed.save(update_fields=['token', 'versao'])
+        messages.success(request, 'Novo link do calendário gerado. O link anterior deixou de funcionar.')
+    else:
+        messages.success(request, 'Link do calendário criado.')
+    return redirect('acoes:perfil')
+
+
+def locais_autocomplete(request):
+    """ Sugestões de local (?q=) para o filtro, servidas do índice em memória. """
+    sugestoes = locais.sugerir_locais(request.GET.get('q', '')[:100])
+    return JsonResponse({'resultados': [{'chave': chave, 'nome': nome} for chave, nome in sugestoes]})
+
+
+def calendario_feed(request, token):
+    """ Feed iCal do usuário dono do token (sem login: o link é o segredo). """
+    feed = get_object_or_404(FeedCalendario, token=token)
+    etag = calendario.etag(feed)
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        corpo = cache.get(calendario.chave_cache(feed))
+        metrics.registrar_cache('calendario', corpo is not None)
+        if corpo is not None:
+            response = HttpResponse(corpo, content_type=calendario.CONTENT_TYPE)
+        else:
+            url_base = request.build_absolute_uri('/').rstrip('/')
+            response = StreamingHttpResponse(
+                calendario.gerar_e_guardar(feed, url_base), content_type=calendario.CONTENT_TYPE,
+            )
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=900'
+    return response
+
 @login_required
 def historico_view(request):
     hoje = timezone.now()
@@ -557,7 +764,9 @@ def historico_view(request):
             acao_id = request.POST.get('acao_id')
             notas = request.POST.get('notas_organizador')
             # Garante que a ação pertence ao usuário logado
-            acao = get_object_or_404(Acao, pk=acao_id, organizador=request.user)
+            # (a ação pode já ter ido para o arquivo; a pk é a mesma)
+            acao = (Acao.objects.filter(pk=acao_id, organizador=request.user).first()
+                    or get_object_or_404(AcaoArquivada, pk=acao_id, organizador=request.user))
             acao.notas_organizador = notas
             acao.save()
             messages.success(request, 'Suas notas sobre a ação foram salvas.')
@@ -566,7 +775,8 @@ def historico_view(request):
         elif 'inscricao_id' in request.POST:
             inscricao_id = request.POST.get('inscricao_id')
             comentario_texto = request.POST.get('comentario')
-            inscricao = get_object_or_404(Inscricao, id=inscricao_id, voluntario=request.user)
+            inscricao = (Inscricao.objects.filter(id=inscricao_id, voluntario=request.user).first()
+                         or get_object_or_404(InscricaoArquivada, id=inscricao_id, voluntario=request.user))
             inscricao.comentario = comentario_texto
             inscricao.save()
             messages.success(request, 'Seu comentário foi salvo!')
@@ -574,14 +784,15 @@ def historico_view(request):
     
     # --- Lógica de Exibição (GET) ---
     
+    # Tudo vem do histórico materializado (RegistroHistorico). O cron
+    # (atualizar_historico) faz o grosso; aqui só um lote pequeno das ações
+    # deste usuário que passaram desde então (1 query se não há nenhuma).
+    adiantar_historico(request.user, hoje)
+
     # 1. Histórico de PARTICIPAÇÃO (Todo mundo tem, inclusive organizadores)
-    qs_participacao = Inscricao.objects.filter(
-        voluntario=request.user, 
-        status__in=['ACEITO', 'CANCELADO'], 
-        acao__data__lt=hoje
-    )
+    qs_participacao = RegistroHistorico.objects.filter(usuario=request.user, papel='PARTICIPACAO')
     # Aplica filtros
-    qs_participacao = filtrar_acoes_queryset(request, qs_participacao).order_by('-acao__data')
+    qs_participacao = filtrar_acoes_queryset(request, qs_participacao).order_by('-data')
 
     # Paginando com nome diferente 'page_part'
     page_participacoes = paginar_queryset(request, qs_participacao, 5, param_name='page_part')
@@ -590,7 +801,7 @@ def historico_view(request):
     page_organizadas = None
     
     if is_organizador:
-        qs_organizacao = Acao.objects.filter(organizador=request.user, data__lt=hoje)
+        qs_organizacao = RegistroHistorico.objects.filter(usuario=request.user, papel='ORGANIZACAO')
         # Aplica filtros
         qs_organizacao = filtrar_acoes_queryset(request, qs_organizacao).order_by('-data')
         # Paginando com nome diferente 'page_org'
@@ -606,6 +817,40 @@ def historico_view(request):
     return render(request, 'acoes/historico.html', context)
 
 
+@login_required
+def impacto_view(request):
+    """ Resumo do impacto do usuário (totais do histórico materializado). """
+    adiantar_historico(request.user)
+    resumo = ResumoImpacto.objects.filter(usuario=request.user).first() or ResumoImpacto(usuario=request.user)
+    context = {
+        'resumo': resumo,
+        'is_organizador': request.user.groups.filter(name='Organizadores').exists(),
+    }
+    return render(request, 'acoes/impacto.html', context)
+
+
+@login_required
+def painel_view(request):
+    """ Painel do organizador: indicadores lidos dos rollups diários. """
+    is_organizador = request.user.groups.filter(name='Organizadores').exists()
+    if not is_organizador and not request.user.is_superuser:
+        messages.error(request, 'Apenas organizadores têm acesso ao painel.')
+        return redirect('acoes:acao_list')
+
+    try:
+        dias = min(max(int(request.GET.get('dias', 90)), 1), 730)
+    except ValueError:
+        dias = 90
+    # O cron (agregar_rollups) faz o grosso; aqui só um lote pequeno dos
+    # dias deste organizador que mudaram desde então
+    adiantar_rollups(request.user.pk)
+    context = {
+        'painel': painel(request.user.pk, dias=dias),
+        'periodos': [30, 90, 365],
+    }
+    return render(request, 'acoes/painel.html', context)
+
+
 @login_required
 def inscricao_cancel(request, pk):
     """ Permite ao voluntário cancelar sua própria inscrição. """
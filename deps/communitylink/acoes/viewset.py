@@ -1,19 +1,86 @@
+from django.contrib.auth import authenticate
 from .models import Acao, Inscricao, Notificacao, Perfil
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .serializers import AcaoSerializer, InscricaoSerializer, NotificacaoSerializer, PerfilSerializer
-from .permissions import IsOrganizadorOrReadOnly
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from .serializers import (
+    AcaoPlanaSerializer, AcaoSerializer, InscricaoPlanaSerializer, InscricaoSerializer, NotificacaoSerializer,
+    PerfilSerializer, campos_da_requisicao,
+)
+from .permissions import IsOrganizador, IsOrganizadorOrReadOnly
+from .renderers import NDJSONRenderer, resposta_ndjson
+from .rollups import adiantar_rollups, painel
+from .geo import aplicar_filtro_da_requisicao
+from .idempotencia import idempotente
+from .lote import ErroLote, executar_lote, ler_pedidos
+from .tokens import TokenApiAuthentication, emitir, revogar
+from .moderacao import ErroModeracao, decidir_inscricoes
+from .importacao import ErroImportacao, formato_do_arquivo, importar_acoes, ler_linhas, linhas_de_json
 
-class AcaoViewSet(viewsets.ModelViewSet):
-    queryset = Acao.objects.all()
+class ListagemPlanaMixin:
+    """
+    list() pelo serializer plano (`serializer_plano`, direto de .values()) com
+    os campos de ?fields=/?omit=. Com Accept: application/x-ndjson (ou
+    ?format=ndjson) a listagem sai em streaming, uma linha por objeto, lida do
+    banco em lotes: catálogos inteiros com memória constante.
+    """
+    serializer_plano = None
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.serializer_plano(queryset, campos=self.campos_pedidos())
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            if not queryset.ordered:
+                # Ordem estável para quem processa o catálogo em partes
+                serializer.instance = queryset.order_by('pk')
+            return resposta_ndjson(serializer.iterar())
+        return Response(serializer.data)
+
+
+class AcaoViewSet(ListagemPlanaMixin, viewsets.ModelViewSet):
+    queryset = Acao.objects.com_vagas_preenchidas().select_related('organizador')
     serializer_class = AcaoSerializer
+    serializer_plano = AcaoPlanaSerializer
     permission_classes = [IsOrganizadorOrReadOnly]
+    # Escopo extra de limite de taxa (acoes.limites.RotaThrottle), definido por @action
+    throttle_scope = None
+    # Colunas que cada campo do serializer lê (o padrão é a coluna de mesmo nome)
+    COLUNAS_POR_CAMPO = {
+        'vagas_preenchidas': (), 'esta_cheia': ('numero_vagas',), 'ja_aconteceu': ('data',),
+        'inscricoes': (), 'distancia_km': (),
+    }
+
+    def campos_pedidos(self):
+        """ ?fields= / ?omit= (só nas leituras); None = todos os campos. """
+        return campos_da_requisicao(self.request, AcaoSerializer.Meta.fields)
+
+    def get_queryset(self):
+        # O SQL acompanha os campos pedidos: sem a contagem de aceitos, sem o
+        # JOIN do organizador e, no detalhe, só as colunas usadas (only)
+        campos = self.campos_pedidos()
+        queryset = Acao.objects.all()
+        if campos is None or {'vagas_preenchidas', 'esta_cheia'} & set(campos):
+            queryset = queryset.com_vagas_preenchidas()
+        if campos is None or 'organizador' in campos:
+            queryset = queryset.select_related('organizador')
+        if campos is not None and self.action == 'retrieve':
+            colunas = [coluna for campo in campos for coluna in self.COLUNAS_POR_CAMPO.get(campo, (campo,))]
+            queryset = queryset.only(*colunas or ['id'])
+        if self.action == 'list':
+            # ?perto_de=lat,lon&raio_km=N: mais próximas primeiro, com distancia_km
+            queryset = aplicar_filtro_da_requisicao(self.request, queryset)
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(organizador=self.request.user)
 
-    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_scope='inscricao')
+    @idempotente
     def inscrever(self, request, pk=None):
         acao = self.get_object()
         inscricao, created = Inscricao.objects.get_or_create(
@@ -26,14 +93,63 @@ class AcaoViewSet(viewsets.ModelViewSet):
         serializer = InscricaoSerializer(inscricao)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'], url_path='inscricoes/bulk', url_name='inscricoes-bulk')
+    @idempotente
+    def inscricoes_bulk(self, request, pk=None):
+        """
+        Aceita/rejeita várias inscrições pendentes numa transação:
+        {"status": "ACEITO" | "REJEITADO", "inscricoes": [ids]}. Aceites seguem a
+        ordem de inscrição até lotar; o resto volta em "sem_vaga".
+        """
+        acao = self.get_object()
+        inscricoes = request.data.get('inscricoes')
+        if not isinstance(inscricoes, list) or not inscricoes:
+            return Response({'detail': 'Informe a lista "inscricoes".'}, status=400)
+        try:
+            resultado = decidir_inscricoes(acao.pk, inscricoes, request.data.get('status'))
+        except ErroModeracao as erro:
+            return Response({'detail': str(erro)}, status=400)
+        return Response(resultado)
+
+    @action(detail=False, methods=['post'], throttle_scope='importacao')
+    @idempotente
+    def importar(self, request):
+        """
+        Importa várias ações: corpo JSON (lista ou {"acoes": [...]}) ou
+        arquivo .csv/.json no campo 'arquivo'. ?validar=1 só valida.
+        """
+        try:
+            arquivo = request.FILES.get('arquivo')
+            if arquivo:
+                linhas = ler_linhas(arquivo.read(), formato_do_arquivo(arquivo.name))
+            else:
+                linhas = linhas_de_json(request.data)
+        except ErroImportacao as erro:
+            return Response({'detail': str(erro)}, status=400)
 
-class InscricaoViewSet(viewsets.ModelViewSet):
+        somente_validar = request.query_params.get('validar') in ('1', 'true')
+        resultado = importar_acoes(linhas, request.user, somente_validar=somente_validar)
+        status = 201 if resultado['criadas'] else (400 if resultado['erros'] else 200)
+        return Response(resultado, status=status)
+
+
+class InscricaoViewSet(ListagemPlanaMixin, viewsets.ModelViewSet):
     queryset = Inscricao.objects.all()
     serializer_class = InscricaoSerializer
+    serializer_plano = InscricaoPlanaSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def campos_pedidos(self):
+        return campos_da_requisicao(self.request, InscricaoSerializer.Meta.fields)
+
     def get_queryset(self):
-        return Inscricao.objects.filter(voluntario=self.request.user)
+        queryset = Inscricao.objects.filter(voluntario=self.request.user)
+        campos = self.campos_pedidos()
+        if campos is None or 'voluntario' in campos:
+            queryset = queryset.select_related('voluntario')
+        if campos is None or 'acao_titulo' in campos:
+            queryset = queryset.select_related('acao')
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(voluntario=self.request.user)
@@ -45,9 +161,10 @@ class NotificacaoViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Notificacao.objects.filter(destinatario=self.request.user)
+        return Notificacao.objects.filter(destinatario=self.request.user).select_related('destinatario')
 
     @action(detail=True, methods=['post'])
+    @idempotente
     def marcar_lida(self, request, pk=None):
         notificacao = self.get_object()
         notificacao.lida = True
@@ -62,7 +179,7 @@ class PerfilViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Perfil.objects.filter(user=self.request.user)
+        return Perfil.objects.filter(user=self.request.user).select_related('user')
 
     @action(detail=False, methods=['get', 'put', 'patch'])
     def meu_perfil(self, request):
@@ -75,4 +192,57 @@ class PerfilViewSet(viewsets.ModelViewSet):
             serializer.save()
         else:
             serializer = self.get_serializer(perfil)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class PainelViewSet(viewsets.ViewSet):
+    """ Indicadores do organizador logado, lidos dos rollups diários (?dias=90). """
+    permission_classes = [IsOrganizador]
+
+    def list(self, request):
+        try:
+            dias = min(max(int(request.query_params.get('dias', 90)), 1), 730)
+        except ValueError:
+            return Response({'detail': 'dias deve ser um número inteiro.'}, status=400)
+        adiantar_rollups(request.user.pk)
+        return Response(painel(request.user.pk, dias=dias))
+
+
+class LoteView(APIView):
+    """
+    POST /api/batch/: vários GETs da API numa requisição só (ver acoes.lote).
+    Cada sub-requisição aplica as próprias permissões e limites de taxa.
+    """
+    throttle_scope = None
+
+    def post(self, request):
+        try:
+            urls = ler_pedidos(request.data)
+        except ErroLote as erro:
+            return Response({'detail': str(erro)}, status=400)
+        return Response(executar_lote(request, urls))
+
+
+class TokenView(APIView):
+    """
+    POST /api/token/ emite um token para Authorization: Bearer (com
+    username/password ou pela sessão do site; "nome" opcional identifica o
+    aparelho). DELETE /api/token/, autenticado pelo token, revoga-o.
+    """
+    throttle_scope = 'login'
+
+    def post(self, request):
+        usuario = request.user if request.user.is_authenticated else authenticate(
+            request._request, username=request.data.get('username'), password=request.data.get('password'),
+        )
+        if usuario is None:
+            return Response({'detail': 'Usuário ou senha inválidos.'}, status=400)
+        nome = request.data.get('nome')
+        token, registro = emitir(usuario, nome=nome if isinstance(nome, str) else '')
+        return Response({'token': token, 'expira_em': registro.expira_em}, status=201)
+
+    def delete(self, request):
+        if not isinstance(request.successful_authenticator, TokenApiAuthentication):
+            return Response({'detail': 'Envie o token a revogar em Authorization: Bearer.'}, status=400)
+        revogar([request.auth])
+        return Response(status=204)
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'communitylink.settings')
 
 application = get_asgi_application()
+
+# Autocompletar de locais: índice em memória carregado antes da 1ª requisição
+from acoes.locais import aquecer_indice  # noqa: E402
+aquecer_indice()
@@ -0,0 +1,135 @@
+"""
+Configuração do banco de dados a partir de variáveis de ambiente.
+
+Usado por settings_production.py. Perfis suportados (DB_ENGINE):
+
+- sqlite (padrão): SQLite ajustado para concorrência. Os PRAGMAs são
+  aplicados a cada nova conexão via `init_command`:
+    journal_mode=WAL     leitores não bloqueiam o escritor
+    synchronous=NORMAL   seguro com WAL e bem mais rápido que FULL
+    busy_timeout         espera o lock em vez de falhar na hora
+    mmap_size            leituras via memória mapeada
+  e `transaction_mode=IMMEDIATE` pega o lock de escrita no início da
+  transação (evita "database is locked" no meio de um upgrade de lock).
+
+- postgresql: conexões persistentes (CONN_MAX_AGE + health checks) ou,
+  com DB_POOL=1, o pool nativo do psycopg 3 (Django 5.1+).
+
+Réplicas de leitura (DB_REPLICAS, separadas por vírgula) viram os aliases
+replica1, replica2... e são usadas pelo acoes.routers.ReplicaRouter:
+- sqlite: caminhos de arquivo (ex: /tmp/replica.sqlite3, uma cópia do banco);
+- postgresql: host[:porta][/banco] (ex: localhost/communitylink_replica).
+As conexões de réplica são somente leitura, então uma escrita roteada
+errado falha em vez de divergir do primário.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+PRAGMAS_SQLITE_PADRAO = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,          # ms
+    'mmap_size': 268_435_456,      # 256 MiB
+    'cache_size': -20_000,         # negativo = KiB (~20 MB)
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+
+def _inteiro(env, nome, padrao):
+    valor = env.get(nome)
+    if valor in (None, ''):
+        return padrao
+    try:
+        return int(valor)
+    except ValueError:
+        raise ImproperlyConfigured(f'{nome} deve ser um número inteiro (recebido: {valor!r}).')
+
+
+def _verdadeiro(env, nome, padrao=False):
+    valor = env.get(nome)
+    if valor in (None, ''):
+        return padrao
+    return valor.lower() in ('1', 'true', 'sim', 'yes', 'on')
+
+
+def init_command_sqlite(pragmas):
+    return ' '.join(f'PRAGMA {nome}={valor};' for nome, valor in pragmas.items())
+
+
+def banco_sqlite(env, base_dir):
+    pragmas = dict(PRAGMAS_SQLITE_PADRAO)
+    pragmas['busy_timeout'] = _inteiro(env, 'SQLITE_BUSY_TIMEOUT_MS', pragmas['busy_timeout'])
+    pragmas['mmap_size'] = _inteiro(env, 'SQLITE_MMAP_SIZE', pragmas['mmap_size'])
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': env.get('DB_NAME') or str(base_dir / 'db.sqlite3'),
+        'OPTIONS': {
+            'init_command': init_command_sqlite(pragmas),
+            'transaction_mode': 'IMMEDIATE',
+            # timeout do driver (segundos) alinhado ao busy_timeout
+            'timeout': pragmas['busy_timeout'] / 1000,
+        },
+    }
+
+
+def banco_postgresql(env):
+    if not env.get('DB_NAME'):
+        raise ImproperlyConfigured('DB_NAME é obrigatório com DB_ENGINE=postgresql.')
+    banco = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env['DB_NAME'],
+        'USER': env.get('DB_USER', ''),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', 'localhost'),
+        'PORT': env.get('DB_PORT', '5432'),
+        'OPTIONS': {},
+    }
+    if _verdadeiro(env, 'DB_POOL'):
+        # Pool do psycopg 3; incompatível com conexões persistentes (CONN_MAX_AGE)
+        banco['CONN_MAX_AGE'] = 0
+        banco['OPTIONS']['pool'] = {
+            'min_size': _inteiro(env, 'DB_POOL_MIN', 2),
+            'max_size': _inteiro(env, 'DB_POOL_MAX', 10),
+            'timeout': _inteiro(env, 'DB_POOL_TIMEOUT', 10),
+        }
+    else:
+        banco['CONN_MAX_AGE'] = _inteiro(env, 'CONN_MAX_AGE', 60)
+        banco['CONN_HEALTH_CHECKS'] = True
+    return banco
+
+
+def banco_a_partir_do_ambiente(env, base_dir):
+    """ Retorna (nome do perfil, configuração do banco 'default'). """
+    engine = env.get('DB_ENGINE', 'sqlite').lower()
+    if engine in ('sqlite', 'sqlite3'):
+        return 'sqlite-wal', banco_sqlite(env, base_dir)
+    if engine in ('postgresql', 'postgres'):
+        banco = banco_postgresql(env)
+        perfil = 'postgresql-pool' if 'pool' in banco['OPTIONS'] else 'postgresql-persistente'
+        return perfil, banco
+    raise ImproperlyConfigured(f'DB_ENGINE desconhecido: {engine!r} (use sqlite ou postgresql).')
+
+
+def _replica(primario, entrada):
+    banco = {**primario, 'OPTIONS': dict(primario.get('OPTIONS', {}))}
+    if banco['ENGINE'].endswith('sqlite3'):
+        banco['NAME'] = entrada
+        banco['OPTIONS']['init_command'] = banco['OPTIONS'].get('init_command', '') + ' PRAGMA query_only=ON;'
+        banco['OPTIONS'].pop('transaction_mode', None)
+    else:
+        endereco, _, nome = entrada.partition('/')
+        host, _, porta = endereco.partition(':')
+        banco['HOST'] = host or primario['HOST']
+        banco['PORT'] = porta or primario['PORT']
+        banco['NAME'] = nome or primario['NAME']
+        banco['OPTIONS']['options'] = '-c default_transaction_read_only=on'
+    # Nos testes a réplica aponta para o banco de teste do primário
+    banco['TEST'] = {'MIRROR': 'default'}
+    return banco
+
+
+def replicas_a_partir_do_ambiente(env, primario):
+    """ Retorna {alias: configuração} das réplicas listadas em DB_REPLICAS. """
+    entradas = [e.strip() for e in env.get('DB_REPLICAS', '').split(',') if e.strip()]
+    return {f'replica{i}': _replica(primario, entrada) for i, entrada in enumerate(entradas, start=1)}
@@ -0,0 +1,34 @@
+"""
+Estratégia de sessão a partir de SESSION_STRATEGY (variável de ambiente).
+
+- db (padrão): sessão no banco; toda página autenticada lê django_session
+  (SELECT) e grava nela quando a sessão muda.
+- cached_db: lê do cache SESSION_CACHE_ALIAS ('sessoes') e só vai ao banco
+  quando não está lá; escritas continuam indo ao banco (write-through), então
+  nada se perde se o cache for esvaziado. Com o LocMemCache padrão cada
+  processo tem o próprio cache: com vários workers, aponte SESSOES_CACHE_BACKEND
+  para Redis/Memcached, senão um logout num worker demora a valer nos outros.
+- signed_cookies: os dados ficam no próprio cookie (assinado com SECRET_KEY,
+  não criptografado) e o banco não é tocado. O logout só apaga o cookie do
+  navegador; uma cópia do cookie continua válida até SESSION_COOKIE_AGE.
+
+Compare as estratégias com `manage.py benchmark_sessoes`.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+ESTRATEGIAS = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+
+def motor_de_sessao(estrategia):
+    """ SESSION_ENGINE da estratégia ('db', 'cached_db' ou 'signed_cookies'). """
+    try:
+        return ESTRATEGIAS[estrategia]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"SESSION_STRATEGY inválida: {estrategia!r} (use {', '.join(ESTRATEGIAS)})."
+        )
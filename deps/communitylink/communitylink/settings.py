@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .sessoes import motor_de_sessao
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +45,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'acoes.middleware.ProfilingMiddleware',  # Opt-in: só atua com PROFILING_ENABLED
+    'acoes.middleware.MetricsMiddleware',  # Métricas expostas em /metrics
+    'acoes.middleware.LimitesMiddleware',  # Cabeçalhos X-RateLimit-* (acoes.limites)
+    'acoes.routers.PrimarioFixoMiddleware',  # Leituras pós-escrita no primário (com réplicas)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +89,110 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+# Nome do perfil de banco (registrado nos resultados de benchmark).
+# Em produção use communitylink.settings_production (WAL, PostgreSQL, pool...).
+DATABASE_PROFILE = 'sqlite-padrao'
+
+# Réplicas de leitura (aliases em DATABASES). Vazio = tudo no 'default'.
+DATABASE_ROUTERS = ['acoes.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+# Após uma escrita, as leituras do mesmo navegador ficam no primário por N segundos
+DATABASE_STICKY_SECONDS = 5
+
+# Ações com mais de N meses vão para o arquivo (manage.py arquivar_acoes)
+ARQUIVO_MESES = 12
+
+# Histórico: o cron (manage.py atualizar_historico) materializa as ações que passaram;
+# as páginas de histórico/impacto adiantam no máximo N ações do próprio usuário
+HISTORICO_LOTE_PAGINA = 50
+
+# Painel: o cron (manage.py agregar_rollups) reagrega os dias marcados;
+# o painel (página e /api/painel/) adianta no máximo N dias do próprio organizador
+ROLLUPS_LOTE_PAINEL = 20
+
+# Séries recorrentes: ocorrências criadas até N dias à frente (manage.py materializar_series)
+SERIES_JANELA_DIAS = 60
+
+# Lembretes aos voluntários aceitos, N horas antes da ação (manage.py run_scheduler)
+LEMBRETES_ANTECEDENCIAS_HORAS = (24, 2)
+
+# Autocompletar de locais: cada processo busca no banco os locais novos a cada N segundos
+LOCAIS_RECARGA_SEGUNDOS = 60
+# Cada recarga relê também os locais criados até N segundos antes do último visto
+# (transações longas, como uma importação, fazem commit depois de locais mais novos)
+LOCAIS_RECARGA_MARGEM_SEGUNDOS = 600
+
+# Limites de taxa (janela deslizante, acoes.limites): até N requisições por período
+LIMITES_TAXA = {
+    'anonimo': '60/min',      # API sem login, por IP
+    'usuario': '600/min',     # API logada, por usuário
+    'importacao': '20/hour',  # POST /api/acoes/importar/
+    'inscricao': '30/min',    # POST /api/acoes/{id}/inscrever/
+    'login': '10/min',        # POST em signin/signup, por IP
+}
+# Os contadores precisam ser vistos por todos os workers e incrementados de
+# forma atômica: em produção aponte o cache 'limites' para Redis/Memcached.
+# O LocMemCache padrão vale só por processo.
+LIMITES_CACHE = 'limites'
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'limites': {
+        'BACKEND': os.environ.get('LIMITES_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('LIMITES_CACHE_LOCATION', 'limites'),
+    },
+    'tokens': {
+        'BACKEND': os.environ.get('TOKENS_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('TOKENS_CACHE_LOCATION', 'tokens'),
+    },
+    'sessoes': {
+        'BACKEND': os.environ.get('SESSOES_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('SESSOES_CACHE_LOCATION', 'sessoes'),
+    },
+}
+
+# Sessões: db (padrão), cached_db ou signed_cookies (ver communitylink/sessoes.py).
+# cached_db e signed_cookies tiram o SELECT em django_session de cada página
+# autenticada, que no SQLite disputa o arquivo com as escritas de inscrições.
+SESSION_STRATEGY = os.environ.get('SESSION_STRATEGY', 'db')
+SESSION_ENGINE = motor_de_sessao(SESSION_STRATEGY)
+SESSION_CACHE_ALIAS = 'sessoes'
+
+# Tokens da API (acoes.tokens): validade, cache dos tokens verificados (precisa
+# ser compartilhado entre os workers, como o 'limites') e por quanto tempo cada
+# processo confia na própria cópia, ou seja, o atraso máximo de uma revogação
+API_TOKEN_VALIDADE_DIAS = 30
+API_TOKEN_CACHE = 'tokens'
+API_TOKEN_CACHE_SEGUNDOS = 300
+API_TOKEN_CACHE_LOCAL_SEGUNDOS = 5
+
+REST_FRAMEWORK = {
+    # JSON com orjson quando instalado (acoes.renderers); sem ele, o json padrão
+    'DEFAULT_RENDERER_CLASSES': [
+        'acoes.renderers.JSONRapidoRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'acoes.renderers.JSONRapidoParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token (Bearer) primeiro: quem o envia não paga sessão nem CSRF
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'acoes.tokens.TokenApiAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'acoes.limites.AnonimoThrottle',
+        'acoes.limites.UsuarioThrottle',
+        'acoes.limites.RotaThrottle',
+    ],
+}
+
+# Idempotency-Key na API: por quantas horas a resposta original é devolvida nas repetições
+IDEMPOTENCIA_TTL_HORAS = 24
+
+# /api/batch/: máximo de sub-requisições por lote
+API_LOTE_MAXIMO = 20
 
 
 # Password validation
@@ -133,4 +244,37 @@ LOGIN_URL = '/acoes/signin/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+
+# Profiling por requisição (acoes.middleware.ProfilingMiddleware)
+# Desligado por padrão: o middleware se remove da cadeia e não custa nada.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '') == '1'
+# Requisições acima deste tempo são registradas com as queries mais lentas
+PROFILING_SLOW_MS = float(os.environ.get('PROFILING_SLOW_MS', '500'))
+# Fração das requisições executadas sob cProfile (0.0 a 1.0)
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_TOP_SQL = 5
+
+# Métricas no formato Prometheus (acoes.metrics, endpoint /metrics)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+# Com vários workers (gunicorn), cada processo grava suas métricas neste
+# diretório e /metrics soma todos. Vazio = modo de processo único.
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_INTERVAL = 1.0  # segundos entre gravações de cada processo
+METRICS_GAUGE_TTL = 60  # cache das contagens feitas no banco
+# Se definido, /metrics exige "Authorization: Bearer <token>"
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Com True e sem METRICS_TOKEN, /metrics responde 403 (settings_production liga)
+METRICS_REQUIRE_TOKEN = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'acoes.profiling': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -0,0 +1,51 @@
+"""
+Settings de produção, configurados por variáveis de ambiente.
+
+Uso:
+    DJANGO_SETTINGS_MODULE=communitylink.settings_production
+
+Variáveis principais:
+    DJANGO_SECRET_KEY (obrigatória), DJANGO_ALLOWED_HOSTS (separados por vírgula)
+    DB_ENGINE=sqlite|postgresql e demais DB_* (ver communitylink/database.py)
+    DB_REPLICAS (réplicas de leitura), DATABASE_STICKY_SECONDS
+    SESSION_STRATEGY=db|cached_db|signed_cookies (ver communitylink/sessoes.py)
+    METRICS_TOKEN (sem ele /metrics responde 403)
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .database import banco_a_partir_do_ambiente, replicas_a_partir_do_ambiente
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, LOGGING
+
+# Com DEBUG = True o Django guarda TODAS as queries de cada requisição em
+# memória (connection.queries) e mostra páginas de erro detalhadas.
+DEBUG = False
+if os.environ.get('DJANGO_DEBUG', '').lower() in ('1', 'true'):
+    raise ImproperlyConfigured('DJANGO_DEBUG não pode ser ativado com settings_production.')
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', '')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Defina DJANGO_SECRET_KEY para rodar em produção.')
+
+ALLOWED_HOSTS = [h.strip() for h in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if h.strip()]
+
+DATABASE_PROFILE, _banco = banco_a_partir_do_ambiente(os.environ, BASE_DIR)
+DATABASES = {'default': _banco, **replicas_a_partir_do_ambiente(os.environ, _banco)}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+if os.environ.get('DATABASE_STICKY_SECONDS'):
+    DATABASE_STICKY_SECONDS = float(os.environ['DATABASE_STICKY_SECONDS'])
+
+# /metrics expõe rotas, tráfego e totais do banco: só com o token do Prometheus
+METRICS_REQUIRE_TOKEN = True
+
+# Nunca logar SQL em produção (django.db.backends em DEBUG loga cada query)
+LOGGING = {
+    **LOGGING,
+    'loggers': {
+        **LOGGING['loggers'],
+        'django.db.backends': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
@@ -16,8 +16,10 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from acoes.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),  # Métricas no formato Prometheus
     path('acoes/', include('acoes.urls', namespace='acoes')),  # Inclui as URLs do app 'acoes'
 ]
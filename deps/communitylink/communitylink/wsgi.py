@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'communitylink.settings')
 
 application = get_wsgi_application()
+
+# Autocompletar de locais: índice em memória carregado antes da 1ª requisição
+from acoes.locais import aquecer_indice  # noqa: E402
+aquecer_indice()
@@ -162,4 +162,28 @@ document.addEventListener('DOMContentLoaded', function() {
             this.style.boxShadow = 'none';
         });
     });
+
+    // ===== Location autocomplete (normalized place index on the server) =====
+    document.querySelectorAll('input[data-autocomplete-url]').forEach(input => {
+        const list = document.getElementById(input.getAttribute('list'));
+        let timer;
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            const term = input.value.trim();
+            if (term.length < 2) return;
+
+            timer = setTimeout(() => {
+                fetch(input.dataset.autocompleteUrl + '?q=' + encodeURIComponent(term))
+                    .then(response => response.json())
+                    .then(data => {
+                        list.replaceChildren(...data.resultados.map(local => {
+                            const option = document.createElement('option');
+                            option.value = local.nome;
+                            return option;
+                        }));
+                    });
+            }, 200);
+        });
+    });
 });